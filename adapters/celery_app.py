@@ -23,58 +23,76 @@ celery_app.conf.update(
 scraper = IrisScraper()
 
 
+def _score_result(result):
+    """Attach trust/alignment scores to an ingested signal; returns the trust score."""
+    trust_score = 0.0
+    alignment_score = 0.0
+    if result is not None:
+        signal_ingest_counter.labels(source=result["source"]).inc()
+        # If this is a forecast (has 'forecast' key), enrich trust metadata
+        if "forecast" in result:
+            from trust_system.trust_engine import enrich_trust_metadata
+
+            try:
+                enriched = enrich_trust_metadata(result)
+                result.update(enriched)
+                trust_score = result.get("confidence", 0.0) or 0.0
+                alignment_score = result.get("alignment_score", 0.0) or 0.0
+            except Exception as e:
+                logging.error(f"Trust enrichment failed: {e}")
+                trust_score = 0.0
+                alignment_score = 0.0
+            result["trust_score"] = float(trust_score)
+            result["alignment_score"] = float(alignment_score)
+            signal_score_histogram.observe(float(trust_score))
+        else:
+            # For raw signals, attach a simple quality score or skip scoring
+            result["trust_score"] = 0.0
+            result["alignment_score"] = 0.0
+    else:
+        logging.error("Result is None, skipping trust and alignment scoring.")
+    return trust_score
+
+
+def _realtime_update(trust_scores):
+    """Feed one real-time model update per trust score, reading features once."""
+    try:
+        from analytics.feature_store import feature_store
+        from forecast_engine.ai_forecaster import update as ai_update
+
+        feature_store.clear_cache()
+        feature_names = feature_store.list_features()
+        features_values = [feature_store.get(name).iloc[-1] for name in feature_names]
+        ai_update(
+            [
+                {"features": features_values, "adjustment": trust_score}
+                for trust_score in trust_scores
+            ]
+        )
+    except Exception as e:
+        logging.getLogger("pulse.celery").error(f"Real-time update error: {e}")
+
+
+def _ingest(signal_data):
+    return scraper.ingest_signal(
+        name=signal_data["name"],
+        value=signal_data["value"],
+        source=signal_data.get("source", "celery"),
+        timestamp=signal_data.get("timestamp"),
+    )
+
+
 @celery_app.task(bind=True, name="ingest_and_score_signal")
 def ingest_and_score_signal(self, signal_data):
     """Celery task: ingest, score, and enrich a signal."""
     import traceback
 
-    trust_score = 0.0
-    alignment_score = 0.0
     try:
         # Ingest
-        result = scraper.ingest_signal(
-            name=signal_data["name"],
-            value=signal_data["value"],
-            source=signal_data.get("source", "celery"),
-            timestamp=signal_data.get("timestamp"),
-        )
-        if result is not None:
-            signal_ingest_counter.labels(source=result["source"]).inc()
-            # If this is a forecast (has 'forecast' key), enrich trust metadata
-            if "forecast" in result:
-                from trust_system.trust_engine import enrich_trust_metadata
-
-                try:
-                    enriched = enrich_trust_metadata(result)
-                    result.update(enriched)
-                    trust_score = result.get("confidence", 0.0) or 0.0
-                    alignment_score = result.get("alignment_score", 0.0) or 0.0
-                except Exception as e:
-                    logging.error(f"Trust enrichment failed: {e}")
-                    trust_score = 0.0
-                    alignment_score = 0.0
-                result["trust_score"] = float(trust_score)
-                result["alignment_score"] = float(alignment_score)
-                signal_score_histogram.observe(float(trust_score))
-            else:
-                # For raw signals, attach a simple quality score or skip scoring
-                result["trust_score"] = 0.0
-                result["alignment_score"] = 0.0
-        else:
-            logging.error("Result is None, skipping trust and alignment scoring.")
+        result = _ingest(signal_data)
+        trust_score = _score_result(result)
         # Real-time model update
-        try:
-            from analytics.feature_store import feature_store
-            from forecast_engine.ai_forecaster import update as ai_update
-
-            feature_store.clear_cache()
-            feature_names = feature_store.list_features()
-            features_values = [
-                feature_store.get(name).iloc[-1] for name in feature_names
-            ]
-            ai_update([{"features": features_values, "adjustment": trust_score}])
-        except Exception as e:
-            logging.getLogger("pulse.celery").error(f"Real-time update error: {e}")
+        _realtime_update([trust_score])
         # Optionally: save to DB, log, or further process
         return result
     except Exception as e:
@@ -84,6 +102,32 @@ def ingest_and_score_signal(self, signal_data):
         raise self.retry(exc=e, countdown=10, max_retries=3)
 
 
+@celery_app.task(bind=True, name="ingest_and_score_signal_batch")
+def ingest_and_score_signal_batch(self, signals):
+    """
+    Celery task: ingest and score a micro-batch of signals.
+
+    Signals that fail are logged and skipped rather than retrying the whole
+    batch, which would re-ingest the signals that succeeded. The real-time
+    model update reads the feature store once per batch.
+    """
+    results = []
+    trust_scores = []
+    for signal_data in signals:
+        try:
+            result = _ingest(signal_data)
+            trust_scores.append(_score_result(result))
+            results.append(result)
+        except Exception as e:
+            logging.getLogger("pulse.celery").error(
+                f"Celery ingest_and_score_signal_batch error for {signal_data}: {e}"
+            )
+            results.append(None)
+    if trust_scores:
+        _realtime_update(trust_scores)
+    return results
+
+
 @celery_app.task(bind=True, name="autopilot_engage_task")
 def autopilot_engage_task(self, action: str, parameters: dict):
     """Celery task: engage autopilot with specified action and parameters."""
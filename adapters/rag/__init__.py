@@ -12,6 +12,6 @@ The RAG implementation follows these principles:
 - Efficient: Optimized for performance with caching and smart retrieval
 """
 
-from chatmode.rag.context_provider import ContextProvider
+from adapters.rag.context_provider import ContextProvider
 
 __all__ = ["ContextProvider"]
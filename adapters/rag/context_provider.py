@@ -7,8 +7,8 @@ the conversational interface with specific codebase knowledge.
 import logging
 from typing import List, Dict, Any, Optional
 
-from chatmode.vector_store.codebase_vector_store import CodebaseVectorStore
-from chatmode.vector_store.build_vector_store import load_vector_store
+from adapters.vector_store.codebase_vector_store import CodebaseVectorStore
+from adapters.vector_store.build_vector_store import load_vector_store
 
 # Configure logging
 logging.basicConfig(
@@ -69,42 +69,59 @@ class ContextProvider:
         Returns:
             List of context snippets with metadata
         """
-        # Check if query is in cache
-        if query in self._context_cache:
-            logger.info(f"Using cached context for query: '{query[:30]}...'")
-            return self._context_cache[query]
+        return self.get_relevant_context_batch([query], k=k)[0]
 
-        # Return empty list if vector store is not available
-        if not self.vector_store:
-            logger.warning("Vector store not available. Cannot retrieve context.")
-            return []
-
-        # Get number of snippets to return
-        k = k or self.max_snippets
-
-        try:
-            # Get context from vector store
-            results = self.vector_store.search(query, k=k)
+    def get_relevant_context_batch(
+        self, queries: List[str], k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Get relevant context snippets for several queries at once.
 
-            # Filter out low similarity results
-            filtered_results = [
-                r
-                for r in results
-                if r.get("score", float("inf")) <= self.min_similarity
-            ]
+        Uncached queries are embedded and searched in a single batch.
 
-            # Log results
-            logger.info(
-                f"Retrieved {len(filtered_results)} relevant context snippets for query: '{query[:30]}...'"
-            )
+        Args:
+            queries: The user queries to get context for
+            k: Number of snippets to return per query, or None to use default
 
-            # Cache results
-            self._context_cache[query] = filtered_results
+        Returns:
+            One list of context snippets per query, in input order
+        """
+        k = k or self.max_snippets
+        missing = [
+            q for q in dict.fromkeys(queries) if (q, k) not in self._context_cache
+        ]
+        cached = len(queries) - len(missing)
+        if cached:
+            logger.info(f"Using cached context for {cached} queries")
+
+        if missing:
+            # Return empty lists if vector store is not available
+            if not self.vector_store:
+                logger.warning("Vector store not available. Cannot retrieve context.")
+                return [self._context_cache.get((q, k), []) for q in queries]
 
-            return filtered_results
-        except Exception as e:
-            logger.error(f"Error retrieving context: {str(e)}")
-            return []
+            try:
+                # Get context from vector store
+                batch_results = self.vector_store.search_batch(missing, k=k)
+            except Exception as e:
+                logger.error(f"Error retrieving context: {str(e)}")
+                return [self._context_cache.get((q, k), []) for q in queries]
+
+            for query, results in zip(missing, batch_results):
+                # Filter out low similarity results
+                filtered_results = [
+                    r
+                    for r in results
+                    if r.get("score", float("inf")) <= self.min_similarity
+                ]
+                logger.info(
+                    f"Retrieved {len(filtered_results)} relevant context snippets "
+                    f"for query: '{query[:30]}...'"
+                )
+                # Cache results
+                self._context_cache[(query, k)] = filtered_results
+
+        return [self._context_cache[(q, k)] for q in queries]
 
     def format_snippets_for_prompt(
         self, snippets: List[Dict[str, Any]], max_chars: int = 12000
@@ -9,14 +9,15 @@ import os
 import sys
 import argparse
 import time
-import faiss
-import pickle
 import logging
 
 import json
 
-from chatmode.vector_store.codebase_vector_store import CodebaseVectorStore
-from chatmode.vector_store.codebase_parser import load_codebase_artifacts
+from adapters.vector_store.codebase_vector_store import (
+    CodebaseVectorStore,
+    HashingEmbedder,
+)
+from adapters.vector_store.codebase_parser import load_codebase_artifacts
 
 # Configure logging
 logging.basicConfig(
@@ -38,7 +39,6 @@ CODEBASE_DIRECTORIES = [
     # Instead, list specific directories to include
     "./docs",
     "./tests",
-    "./chatmode",
     "./core",
     "./intelligence",
     "./simulation_engine",
@@ -65,22 +65,36 @@ EXCLUDED_DIRECTORIES = [
     "memory-bank",  # Per user instructions to ignore
 ]
 
-# Paths for vector store and metadata files
-VECTOR_STORE_PATH = "./chatmode/vector_store/codebase.faiss"
-METADATA_PATH = "./chatmode/vector_store/codebase_metadata.pkl"
-STATS_PATH = "./chatmode/vector_store/build_stats.json"
+# Directory holding the persisted store (see CodebaseVectorStore.save)
+VECTOR_STORE_DIR = "./adapters/vector_store/codebase_index"
+STATS_PATH = os.path.join(VECTOR_STORE_DIR, "build_stats.json")
+
+
+def _make_embedder(model_name):
+    """The deterministic offline embedder for "hashing", else sentence-transformers."""
+    return HashingEmbedder() if model_name == "hashing" else None
 
 
 def build_and_save_vector_store(
-    directories=None, model_name="all-MiniLM-L6-v2", quantize=False
+    directories=None,
+    model_name="all-MiniLM-L6-v2",
+    quantize=False,
+    index_type="flat",
+    rebuild=False,
 ):
     """
-    Builds the vector store from codebase artifacts and saves it to disk.
+    Builds or incrementally updates the vector store and saves it to disk.
+
+    An existing store built with the same model is loaded and synced with
+    the current artifacts, so only new or changed documents are embedded.
 
     Args:
         directories (list, optional): List of directories to scan. Defaults to None.
-        model_name (str, optional): Name of the sentence transformer model to use.
+        model_name (str, optional): Sentence transformer model to use, or
+            "hashing" for the offline hashing embedder.
         quantize (bool, optional): Whether to quantize vectors to reduce size.
+        index_type (str, optional): "flat" or "ivf" (for large corpora).
+        rebuild (bool, optional): Ignore any existing store and re-embed everything.
 
     Returns:
         dict: Statistics about the build process
@@ -91,10 +105,7 @@ def build_and_save_vector_store(
     # Use provided directories or default list
     directories = directories or CODEBASE_DIRECTORIES
 
-    # 1. Make sure vector store directory exists
-    os.makedirs(os.path.dirname(VECTOR_STORE_PATH), exist_ok=True)
-
-    # 2. Load codebase artifacts
+    # 1. Load codebase artifacts
     logger.info(f"Loading codebase artifacts from {len(directories)} directories...")
     logger.info(f"Excluding directories: {EXCLUDED_DIRECTORIES}")
 
@@ -119,13 +130,19 @@ def build_and_save_vector_store(
             "elapsed_time": time.time() - start_time,
         }
 
-    # 2. Initialize the vector store with specified model
-    logger.info(f"Initializing vector store with model: {model_name}")
-    vector_store = CodebaseVectorStore(model_name=model_name)
+    # 2. Reuse the existing store when possible
+    vector_store = None if rebuild else load_vector_store(model_name, index_type)
+    if vector_store is None:
+        logger.info(f"Initializing vector store with model: {model_name}")
+        vector_store = CodebaseVectorStore(
+            model_name=model_name,
+            embedder=_make_embedder(model_name),
+            index_type=index_type,
+        )
 
-    # 3. Add documents to the vector store
-    logger.info("Adding documents to vector store and generating embeddings...")
-    vector_store.add_documents(documents)
+    # 3. Embed new and changed documents, drop deleted ones
+    logger.info("Syncing documents with the vector store...")
+    sync_stats = vector_store.sync_documents(documents)
 
     # 4. Quantization has been temporarily disabled due to compatibility issues
     if quantize and hasattr(vector_store, "index"):
@@ -135,29 +152,25 @@ def build_and_save_vector_store(
         # The quantization functionality will be implemented in a future update
         # when we have better understanding of the faiss library's interfaces
 
-    # 5. Save the Faiss index and metadata to disk
-    os.makedirs(os.path.dirname(VECTOR_STORE_PATH), exist_ok=True)
+    # 5. Save the store to disk
     try:
-        logger.info(f"Saving vector store to {VECTOR_STORE_PATH}")
-        faiss.write_index(vector_store.index, VECTOR_STORE_PATH)
-
-        logger.info(f"Saving metadata to {METADATA_PATH}")
-        with open(METADATA_PATH, "wb") as f:
-            pickle.dump(vector_store.document_metadata, f)
+        logger.info(f"Saving vector store to {VECTOR_STORE_DIR}")
+        vector_store.save(VECTOR_STORE_DIR)
 
         # Create build statistics
         build_stats = {
             "status": "success",
             "build_time": time.strftime("%Y-%m-%d %H:%M:%S"),
             "elapsed_seconds": round(time.time() - start_time, 2),
-            "document_count": len(documents),
+            "document_count": len(vector_store),
             "vector_count": vector_store.index.ntotal,
             "embedding_dimension": vector_store.embedding_dimension,
             "model_name": model_name,
+            "index_type": index_type,
             "quantized": quantize,
             "directories": directories,
-            "vector_store_path": VECTOR_STORE_PATH,
-            "metadata_path": METADATA_PATH,
+            "vector_store_dir": VECTOR_STORE_DIR,
+            **sync_stats,
         }
 
         # Save build statistics
@@ -167,13 +180,16 @@ def build_and_save_vector_store(
         logger.info(
             f"Vector store build complete in {build_stats['elapsed_seconds']} seconds."
         )
-        logger.info(f"Processed {build_stats['document_count']} documents.")
+        logger.info(
+            f"Embedded {sync_stats['embedded']} of {len(documents)} documents "
+            f"({sync_stats['unchanged']} unchanged, {sync_stats['removed']} removed)."
+        )
         logger.info(f"Vector store contains {build_stats['vector_count']} vectors.")
 
         return build_stats
 
     except Exception as e:
-        logger.error(f"Error saving vector store or metadata: {e}")
+        logger.error(f"Error saving vector store: {e}")
         return {
             "status": "failed",
             "reason": str(e),
@@ -181,71 +197,60 @@ def build_and_save_vector_store(
         }
 
 
-def load_vector_store(model_name="all-MiniLM-L6-v2"):
+def load_vector_store(model_name="all-MiniLM-L6-v2", index_type="flat"):
     """
-    Loads the vector store and metadata from disk.
+    Loads the vector store from disk.
 
     Args:
-        model_name (str, optional): Name of the sentence transformer model.
-                                   Must match the model used to build the store.
+        model_name (str, optional): Name of the sentence transformer model, or
+            "hashing". Must match the model used to build the store.
+        index_type (str, optional): "flat" or "ivf".
 
     Returns:
         CodebaseVectorStore or None: The loaded vector store instance, or None if loading fails.
     """
-    if not os.path.exists(VECTOR_STORE_PATH) or not os.path.exists(METADATA_PATH):
+    if not os.path.exists(os.path.join(VECTOR_STORE_DIR, "manifest.json")):
         logger.warning(
             "Vector store files not found. Please build the vector store first."
         )
         return None
 
     try:
-        # Initialize a CodebaseVectorStore to load the model and get embedding dimension
-        # We don't need the index initialized here as we will load it
-        temp_vector_store = CodebaseVectorStore(model_name=model_name)
-        embedding_dimension = temp_vector_store.embedding_dimension
-
-        logger.info(f"Loading vector store from {VECTOR_STORE_PATH}")
-        index = faiss.read_index(VECTOR_STORE_PATH)
-
-        # Ensure the loaded index has the correct dimension
-        if index.d != embedding_dimension:
-            logger.error(
-                f"Error loading index: Dimension mismatch. Expected {embedding_dimension}, got {
-                    index.d}")
-            return None
-
-        logger.info(f"Loading metadata from {METADATA_PATH}")
-        with open(METADATA_PATH, "rb") as f:
-            metadata = pickle.load(f)
-
-        # Create a new CodebaseVectorStore instance and assign the loaded index
-        # and metadata
-        loaded_vector_store = CodebaseVectorStore(model_name=model_name)
-        loaded_vector_store.index = index
-        loaded_vector_store.document_metadata = metadata
-
+        logger.info(f"Loading vector store from {VECTOR_STORE_DIR}")
+        loaded_vector_store = CodebaseVectorStore.load(
+            VECTOR_STORE_DIR,
+            model_name=model_name,
+            embedder=_make_embedder(model_name),
+            index_type=index_type,
+        )
         logger.info(
-            f"Vector store loaded successfully. Total vectors: {
-                loaded_vector_store.index.ntotal}")
+            "Vector store loaded successfully. Total vectors: "
+            f"{loaded_vector_store.index.ntotal}"
+        )
         return loaded_vector_store
 
     except Exception as e:
-        logger.error(f"Error loading vector store or metadata: {e}")
+        logger.error(f"Error loading vector store: {e}")
         return None
 
 
-def test_vector_store(query="How does the conversational interface work?", k=3):
+def test_vector_store(
+    query="How does the conversational interface work?",
+    k=3,
+    model_name="all-MiniLM-L6-v2",
+):
     """
     Test the vector store with a sample query.
 
     Args:
         query (str): The query to search for
         k (int): Number of results to return
+        model_name (str): Model the store was built with
 
     Returns:
         list: The search results
     """
-    vector_store = load_vector_store()
+    vector_store = load_vector_store(model_name=model_name)
     if not vector_store:
         return []
 
@@ -279,7 +284,19 @@ def main():
     parser.add_argument(
         "--model",
         default="all-MiniLM-L6-v2",
-        help="Name of the sentence transformer model to use (default: all-MiniLM-L6-v2)",
+        help="Name of the sentence transformer model to use, or 'hashing' for the "
+        "offline hashing embedder (default: all-MiniLM-L6-v2)",
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=["flat", "ivf"],
+        default="flat",
+        help="Index type; ivf suits large corpora and needs faiss (default: flat)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Re-embed every document instead of updating the existing store",
     )
     parser.add_argument(
         "--quantize", action="store_true", help="Quantize vectors to reduce size"
@@ -300,7 +317,10 @@ def main():
 
     if args.action == "build":
         build_stats = build_and_save_vector_store(
-            model_name=args.model, quantize=args.quantize
+            model_name=args.model,
+            quantize=args.quantize,
+            index_type=args.index_type,
+            rebuild=args.rebuild,
         )
         if build_stats.get("status") == "success":
             logger.info("Vector store build completed successfully!")
@@ -312,12 +332,10 @@ def main():
                         'Unknown error')}")
 
     elif args.action == "test":
-        test_vector_store(query=args.query, k=args.results)
+        test_vector_store(query=args.query, k=args.results, model_name=args.model)
 
     elif args.action == "info":
         if os.path.exists(STATS_PATH):
-            import json
-
             with open(STATS_PATH, "r") as f:
                 stats = json.load(f)
                 logger.info("Vector store build information:")
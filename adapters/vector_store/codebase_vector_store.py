@@ -1,7 +1,33 @@
-import numpy as np
+"""
+Vector store of codebase snippets for retrieval-augmented generation.
+
+Documents are embedded once and kept by document id together with a hash of
+their content, so re-indexing only embeds documents whose content changed
+(see ``sync_documents``). Vectors live in an id-mapped index that supports
+incremental add/remove: a faiss ``IndexIDMap2``/``IndexIVFFlat`` when faiss
+is installed, otherwise an exact NumPy index. The store persists to a
+directory with ``save``/``load``.
+
+Embedders are pluggable: ``SentenceTransformerEmbedder`` (the default) or the
+deterministic, dependency-free ``HashingEmbedder`` for offline use and tests.
+"""
+
+import hashlib
+import json
 import logging
-from sentence_transformers import SentenceTransformer
-import faiss
+import math
+import os
+import pickle
+import re
+import tempfile
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.lazy_import import is_available, lazy_import
+
+faiss = lazy_import("faiss", "pip install faiss-cpu")
 
 # Configure logging
 logging.basicConfig(
@@ -9,77 +35,414 @@ logging.basicConfig(
 )
 logger = logging.getLogger("CodebaseVectorStore")
 
+STORE_FORMAT_VERSION = 2
+
+_UNVERSIONED_FILES = {
+    "vectors": "vectors.npy",
+    "ids": "ids.npy",
+    "documents": "documents.pkl",
+}
+_DATA_FILE_PATTERN = re.compile(r"(vectors|ids)(-\d+)?\.npy|documents(-\d+)?\.pkl")
+
+
+def content_hash(text: str) -> str:
+    """Hash identifying the content of a document."""
+    data = text.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def default_document_id(metadata: Dict[str, Any]) -> str:
+    """
+    Document id derived from its location: file, chunk type and name/heading.
+
+    Line numbers are deliberately left out so that editing one function does
+    not change the ids of the chunks below it.
+    """
+    return "{}::{}:{}".format(
+        metadata.get("file_path", ""),
+        metadata.get("type", ""),
+        metadata.get("name") or metadata.get("heading") or "",
+    )
+
+
+def _read_manifest(directory: str) -> Dict[str, Any]:
+    """Manifest of the store saved in directory, or {} if there is none."""
+    try:
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _document_ids(documents: Sequence[Dict[str, Any]]) -> List[str]:
+    """Ids of documents, suffixing repeats (e.g. two ``main`` headings in a file)."""
+    seen: Counter = Counter()
+    ids = []
+    for doc in documents:
+        doc_id = doc.get("id") or default_document_id(doc.get("metadata", {}))
+        seen[doc_id] += 1
+        ids.append(doc_id if seen[doc_id] == 1 else f"{doc_id}#{seen[doc_id]}")
+    return ids
+
+
+# --- Embedders ---------------------------------------------------------------
+
+
+class SentenceTransformerEmbedder:
+    """Embeds texts with a sentence-transformers model."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.name = model_name
+        self.batch_size = batch_size
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        embeddings = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            show_progress_bar=len(texts) > 10 * self.batch_size,
+        )
+        return np.asarray(embeddings, dtype="float32")
+
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder based on feature hashing.
+
+    Word unigrams and bigrams are hashed into a fixed number of signed
+    buckets with sublinear term frequency and the result is L2-normalised.
+    It needs no model download, so it suits offline use and tests.
+    """
+
+    _TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self.name = f"hashing-{dimension}"
+
+    def _features(self, text: str) -> Counter:
+        tokens = [t.lower() for t in self._TOKEN.findall(text)]
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype="float32")
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little"
+                )
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dimension] += sign * (
+                    1.0 + math.log(count)
+                )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+# --- Indexes -----------------------------------------------------------------
+
+
+class NumpyIndex:
+    """Exact squared-L2 index over an id-mapped matrix (faiss-free fallback)."""
+
+    def __init__(self, dimension: int):
+        self.d = dimension
+        self._vectors = np.empty((0, dimension), dtype="float32")
+        self._ids = np.empty(0, dtype="int64")
+
+    @property
+    def ntotal(self) -> int:
+        return len(self._ids)
+
+    def add_with_ids(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        self._vectors = np.vstack([self._vectors, vectors])
+        self._ids = np.concatenate([self._ids, ids])
+
+    def remove_ids(self, ids: np.ndarray) -> int:
+        keep = ~np.isin(self._ids, ids)
+        removed = int(len(keep) - keep.sum())
+        self._vectors, self._ids = self._vectors[keep], self._ids[keep]
+        return removed
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(queries)
+        distances = np.full((n, k), np.inf, dtype="float32")
+        labels = np.full((n, k), -1, dtype="int64")
+        if not self.ntotal:
+            return distances, labels
+        scores = (
+            (queries * queries).sum(axis=1)[:, None]
+            - 2.0 * queries @ self._vectors.T
+            + (self._vectors * self._vectors).sum(axis=1)[None, :]
+        )
+        np.maximum(scores, 0.0, out=scores)
+        top = min(k, self.ntotal)
+        part = np.argpartition(scores, top - 1, axis=1)[:, :top]
+        order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)
+        best = np.take_along_axis(part, order, axis=1)
+        distances[:, :top] = np.take_along_axis(scores, best, axis=1)
+        labels[:, :top] = self._ids[best]
+        return distances, labels
+
+
+def build_index(
+    vectors: np.ndarray,
+    ids: np.ndarray,
+    dimension: int,
+    index_type: str = "flat",
+    nlist: int = 100,
+    nprobe: int = 8,
+) -> Any:
+    """
+    Build an id-mapped index over vectors.
+
+    Args:
+        vectors: float32 matrix, one row per document.
+        ids: int64 document ids.
+        dimension: Embedding dimension.
+        index_type: "flat" (exact) or "ivf" (inverted lists, for large corpora).
+        nlist: Number of IVF lists.
+        nprobe: Lists visited per IVF query.
+
+    Returns:
+        A faiss index when faiss is installed, otherwise a NumpyIndex. IVF
+        needs faiss and at least 39 * nlist training vectors; smaller corpora
+        get a flat index.
+    """
+    if not is_available("faiss"):
+        if index_type == "ivf":
+            logger.warning("faiss is not installed; using an exact NumPy index")
+        index = NumpyIndex(dimension)
+    elif index_type == "ivf" and len(vectors) >= 39 * nlist:
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        index.train(vectors)
+        index.nprobe = nprobe
+        # IndexIVFFlat keeps a reference to the quantizer
+        index.quantizer_ref = quantizer
+    else:
+        index = faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+    if len(vectors):
+        index.add_with_ids(vectors, ids)
+    return index
+
+
+# --- Store -------------------------------------------------------------------
+
 
 class CodebaseVectorStore:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        embedder: Optional[Any] = None,
+        index_type: str = "flat",
+        nlist: int = 100,
+        nprobe: int = 8,
+    ):
         """
-        Initializes the CodebaseVectorStore with a SentenceTransformer model and Faiss index.
+        Initializes the CodebaseVectorStore with an embedder and an id-mapped index.
 
         Args:
-            model_name (str): The name of the SentenceTransformer model to use.
+            model_name (str): The SentenceTransformer model used when no
+                embedder is given.
+            embedder: Object with ``name``, ``dimension`` and ``encode(texts)``
+                (e.g. HashingEmbedder for offline use).
+            index_type (str): "flat" for exact search or "ivf" for an
+                inverted-file index on large corpora (requires faiss).
+            nlist (int): Number of IVF lists.
+            nprobe (int): IVF lists searched per query.
         """
-        self.model = SentenceTransformer(model_name)
-        self.embedding_dimension = self.model.get_sentence_embedding_dimension()
+        self.embedder = embedder or SentenceTransformerEmbedder(model_name)
+        self.embedding_dimension = self.embedder.dimension
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
 
-        # Initialize Faiss index
-        # Using IndexFlatL2 for simplicity, stores vectors directly and uses L2 distance
-        self.index = faiss.IndexFlatL2(self.embedding_dimension)
-        # Store metadata and original texts for lookup
-        self.document_metadata = []  # To store metadata corresponding to the index
-        self.document_texts = []  # To store the original text for each document
+        # Internal int64 id -> {"doc_id", "text", "metadata", "content_hash"}
+        self.documents: Dict[int, Dict[str, Any]] = {}
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._ids_by_doc: Dict[str, int] = {}
+        self._next_id = 0
+        self.index = build_index(
+            np.empty((0, self.embedding_dimension), dtype="float32"),
+            np.empty(0, dtype="int64"),
+            self.embedding_dimension,
+            index_type,
+            nlist,
+            nprobe,
+        )
 
-        logger.info(f"Initialized CodebaseVectorStore with model: {model_name}")
         logger.info(
-            f"Faiss index initialized with dimension {self.embedding_dimension}"
+            f"Initialized CodebaseVectorStore with embedder: {self.embedder.name}"
+        )
+
+    # Backwards-compatible views, in insertion order
+    @property
+    def document_metadata(self) -> List[Dict[str, Any]]:
+        return [doc["metadata"] for doc in self.documents.values()]
+
+    @property
+    def document_texts(self) -> List[str]:
+        return [doc["text"] for doc in self.documents.values()]
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _maybe_upgrade_index(self) -> None:
+        """Switch a flat index to IVF once the corpus is large enough."""
+        if (
+            self.index_type == "ivf"
+            and is_available("faiss")
+            and not isinstance(self.index, faiss.IndexIVFFlat)
+            and len(self._vectors) >= 39 * self.nlist
+        ):
+            self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        """Rebuild the index from the stored vectors (e.g. to retrain IVF lists)."""
+        ids = np.fromiter(self._vectors, dtype="int64", count=len(self._vectors))
+        vectors = (
+            np.stack([self._vectors[i] for i in ids])
+            if len(ids)
+            else np.empty((0, self.embedding_dimension), dtype="float32")
+        )
+        self.index = build_index(
+            vectors,
+            ids,
+            self.embedding_dimension,
+            self.index_type,
+            self.nlist,
+            self.nprobe,
         )
 
-    def add_documents(self, documents):
+    def add_documents(self, documents: Sequence[Dict[str, Any]]) -> Dict[str, int]:
         """
-        Adds documents to the vector store.
+        Adds or updates documents in the vector store.
+
+        Documents whose id is already stored with the same content are not
+        re-embedded; documents whose content changed replace their old vector.
+        A document with new content that is identical to a stored document
+        reuses that document's embedding.
 
         Args:
-            documents (list): A list of dictionaries, where each dictionary
-                              contains 'text' and 'metadata' keys.
-                              Metadata should include information like 'file_path'.
+            documents (list): Dictionaries with 'text' and 'metadata' keys and an
+                optional 'id'; the id defaults to default_document_id(metadata).
+
+        Returns:
+            dict: Counts of "added", "updated", "unchanged" and "embedded" documents.
         """
-        if not documents:
-            return
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "embedded": 0}
+        to_store = {
+            doc_id: {
+                "doc_id": doc_id,
+                "text": doc["text"],
+                "metadata": doc.get("metadata", {}),
+                "content_hash": content_hash(doc["text"]),
+            }
+            for doc_id, doc in zip(_document_ids(documents), documents)
+        }
+        if not to_store:
+            return stats
 
-        texts = [doc["text"] for doc in documents]
-        metadata = [doc["metadata"] for doc in documents]
+        by_hash = {doc["content_hash"]: i for i, doc in self.documents.items()}
+        replaced: List[int] = []
+        new_ids: List[int] = []
+        new_vectors: List[Optional[np.ndarray]] = []
+        to_embed: List[int] = []
+        for doc_id, doc in to_store.items():
+            old_id = self._ids_by_doc.get(doc_id)
+            if old_id is not None:
+                if self.documents[old_id]["content_hash"] == doc["content_hash"]:
+                    # Metadata such as line numbers may still move
+                    self.documents[old_id]["metadata"] = doc["metadata"]
+                    stats["unchanged"] += 1
+                    continue
+                replaced.append(old_id)
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
 
-        # Store the original texts for retrieval during search
-        self.document_texts.extend(texts)
+            reuse = by_hash.get(doc["content_hash"])
+            new_vectors.append(self._vectors[reuse] if reuse is not None else None)
+            if reuse is None:
+                to_embed.append(len(new_ids))
+            new_ids.append(self._assign_id(doc))
 
-        logger.info(f"Generating embeddings for {len(texts)} documents...")
-        try:
-            embeddings = self.model.encode(texts, show_progress_bar=True)
-            logger.info("Embedding generation complete.")
-        except Exception as e:
-            logger.error(f"Error generating embeddings: {str(e)}")
-            raise
+        if to_embed:
+            logger.info(f"Generating embeddings for {len(to_embed)} documents...")
+            embeddings = self.embedder.encode(
+                [self.documents[new_ids[k]]["text"] for k in to_embed]
+            )
+            for k, vector in zip(to_embed, np.asarray(embeddings, dtype="float32")):
+                new_vectors[k] = vector
+            stats["embedded"] = len(to_embed)
 
-        # Convert embeddings to numpy array with float32 dtype for Faiss
-        embeddings = np.array(embeddings).astype("float32")
+        self._drop(replaced)
+        if new_ids:
+            vectors = np.stack(new_vectors).astype("float32", copy=False)
+            ids = np.asarray(new_ids, dtype="int64")
+            self._vectors.update(zip(new_ids, vectors))
+            self.index.add_with_ids(vectors, ids)
+            self._maybe_upgrade_index()
 
-        # Add embeddings to the Faiss index
-        # Note: Ignoring Pylance warnings about parameter names as faiss bindings
-        # work correctly at runtime
-        try:
-            self.index.add(embeddings)
-            logger.debug(f"Added {embeddings.shape[0]} embeddings to index")
-        except Exception as e:
-            logger.error(f"Error adding embeddings to index: {str(e)}")
-            raise
+        logger.info(
+            f"Vector store updated: {stats}. Total documents: {len(self.documents)}"
+        )
+        return stats
 
-        # Store metadata, maintaining the same order as the embeddings added to
-        # the index
-        self.document_metadata.extend(metadata)
+    def _assign_id(self, doc: Dict[str, Any]) -> int:
+        internal_id = self._next_id
+        self._next_id += 1
+        self.documents[internal_id] = doc
+        self._ids_by_doc[doc["doc_id"]] = internal_id
+        return internal_id
 
-        logger.info(
-            f"Added {
-                len(documents)} documents to the vector store. Total documents: {
-                self.index.ntotal}")
+    def _drop(self, internal_ids: List[int]) -> None:
+        if not internal_ids:
+            return
+        self.index.remove_ids(np.asarray(internal_ids, dtype="int64"))
+        for internal_id in internal_ids:
+            doc = self.documents.pop(internal_id)
+            self._vectors.pop(internal_id, None)
+            if self._ids_by_doc.get(doc["doc_id"]) == internal_id:
+                del self._ids_by_doc[doc["doc_id"]]
+
+    def remove_documents(self, doc_ids: Iterable[str]) -> int:
+        """
+        Removes documents by document id.
+
+        Returns:
+            int: Number of documents removed.
+        """
+        internal_ids = [
+            self._ids_by_doc[doc_id] for doc_id in doc_ids if doc_id in self._ids_by_doc
+        ]
+        self._drop(internal_ids)
+        return len(internal_ids)
+
+    def sync_documents(self, documents: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Makes the store match a full document set.
+
+        New and changed documents are (re-)embedded, unchanged ones are kept
+        and documents that no longer exist are removed.
+
+        Returns:
+            dict: add_documents counts plus "removed".
+        """
+        documents = list(documents)
+        stats = self.add_documents(documents)
+        current = set(_document_ids(documents))
+        stats["removed"] = self.remove_documents(
+            [doc_id for doc_id in self._ids_by_doc if doc_id not in current]
+        )
+        return stats
 
     def search(self, query, k=5):
         """
@@ -92,57 +455,182 @@ class CodebaseVectorStore:
         Returns:
             list: A list of dictionaries, each containing 'text', 'metadata', and 'score'.
         """
-        if self.index.ntotal == 0:
-            logger.warning("Vector store is empty. Cannot perform search.")
-            return []
+        return self.search_batch([query], k=k)[0]
 
-        try:
-            logger.info(f"Generating embedding for query: '{query}'")
-            query_embedding = self.model.encode(query)
-        except Exception as e:
-            logger.error(f"Error encoding query: {str(e)}")
+    def search_batch(
+        self, queries: Sequence[str], k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Searches for several queries with one embedding call and one index search.
+
+        Args:
+            queries: The user queries.
+            k: Number of snippets to retrieve per query.
+
+        Returns:
+            One result list per query, in input order. Each result has 'text',
+            'metadata', 'score' (squared L2 distance; lower is closer) and 'id'.
+        """
+        queries = list(queries)
+        if not queries:
             return []
-        query_embedding = np.array([query_embedding]).astype(
-            "float32"
-        )  # Faiss expects a 2D array
+        if self.index.ntotal == 0:
+            logger.warning("Vector store is empty. Cannot perform search.")
+            return [[] for _ in queries]
 
-        # Perform search
-        # Note: Ignoring Pylance warnings about parameter names as faiss bindings
-        # work correctly at runtime
         try:
-            distances, indices = self.index.search(query_embedding, k)
-            logger.debug(f"Search returned {len(indices[0])} results")
+            query_embeddings = np.asarray(
+                self.embedder.encode(queries), dtype="float32"
+            )
+            distances, labels = self.index.search(query_embeddings, k)
         except Exception as e:
-            logger.error(f"Error searching index: {str(e)}")
-            return []
+            logger.error(f"Error searching vector store: {str(e)}")
+            return [[] for _ in queries]
 
         results = []
-        # Retrieve results and their metadata
-        for i in range(len(indices[0])):
-            doc_index = indices[0][i]
-            if doc_index != -1:  # Check if a valid result was found
-                score = float(
-                    distances[0][i]
-                )  # Convert from numpy float to Python float
-                metadata = self.document_metadata[doc_index]
-
-                # Get the text from our stored document_texts to ensure we have the
-                # right text
-                text = (
-                    self.document_texts[doc_index]
-                    if doc_index < len(self.document_texts)
-                    else "Text not found"
+        for row_distances, row_labels in zip(distances, labels):
+            hits = []
+            for score, label in zip(row_distances.tolist(), row_labels.tolist()):
+                doc = self.documents.get(label)
+                if label == -1 or doc is None:
+                    continue
+                hits.append(
+                    {
+                        "text": doc["text"],
+                        "metadata": doc["metadata"],
+                        "score": float(score),
+                        "id": doc["doc_id"],
+                    }
                 )
+            results.append(hits)
+        logger.debug(f"Searched {len(queries)} queries with k={k}")
+        return results
 
-                results.append({"text": text, "metadata": metadata, "score": score})
+    # --- Persistence ---------------------------------------------------------
 
-        logger.info(f"Found {len(results)} results for query: '{query}'")
-        return results
+    def save(self, directory: str) -> None:
+        """
+        Persists vectors, documents and content hashes to a directory.
+
+        Data files carry the save's generation number in their names and are
+        only referenced once manifest.json, written last, is moved into
+        place. An interrupted save therefore leaves the previous store
+        intact; files of older generations are removed afterwards.
+        """
+        os.makedirs(directory, exist_ok=True)
+        ids = np.fromiter(self.documents, dtype="int64", count=len(self.documents))
+        vectors = (
+            np.stack([self._vectors[i] for i in ids])
+            if len(ids)
+            else np.empty((0, self.embedding_dimension), dtype="float32")
+        )
+        generation = _read_manifest(directory).get("generation", 0) + 1
+        files = {
+            "vectors": f"vectors-{generation}.npy",
+            "ids": f"ids-{generation}.npy",
+            "documents": f"documents-{generation}.pkl",
+        }
+        manifest = {
+            "format_version": STORE_FORMAT_VERSION,
+            "generation": generation,
+            "files": files,
+            "embedder": self.embedder.name,
+            "dimension": self.embedding_dimension,
+            "index_type": self.index_type,
+            "document_count": len(ids),
+            "next_id": self._next_id,
+        }
+
+        def write(name: str, writer) -> None:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    writer(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, os.path.join(directory, name))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        write(files["vectors"], lambda f: np.save(f, vectors))
+        write(files["ids"], lambda f: np.save(f, ids))
+        write(files["documents"], lambda f: pickle.dump(self.documents, f))
+        manifest_bytes = json.dumps(manifest).encode()
+        write("manifest.json", lambda f: f.write(manifest_bytes))
+
+        current = set(files.values())
+        for name in os.listdir(directory):
+            if name not in current and _DATA_FILE_PATTERN.fullmatch(name):
+                try:
+                    os.unlink(os.path.join(directory, name))
+                except OSError as e:
+                    logger.warning(f"Could not remove stale store file {name}: {e}")
+        logger.info(f"Saved {len(ids)} documents to {directory} (gen {generation})")
+
+    @classmethod
+    def load(
+        cls,
+        directory: str,
+        model_name: str = "all-MiniLM-L6-v2",
+        embedder: Optional[Any] = None,
+        **kwargs,
+    ) -> "CodebaseVectorStore":
+        """
+        Loads a store written by save().
+
+        Raises:
+            FileNotFoundError: If the directory holds no saved store.
+            ValueError: If the store was built with a different embedder, or
+                its files do not match the manifest.
+        """
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        # Stores saved before generation stamps used fixed file names
+        files = manifest.get("files") or _UNVERSIONED_FILES
+        store = cls(model_name=model_name, embedder=embedder, **kwargs)
+        if (
+            manifest.get("embedder") != store.embedder.name
+            or manifest.get("dimension") != store.embedding_dimension
+        ):
+            raise ValueError(
+                f"Vector store in {directory} was built with "
+                f"{manifest.get('embedder')} ({manifest.get('dimension')}d), "
+                f"not {store.embedder.name}"
+            )
+
+        vectors = np.load(os.path.join(directory, files["vectors"]))
+        ids = np.load(os.path.join(directory, files["ids"]))
+        with open(os.path.join(directory, files["documents"]), "rb") as f:
+            store.documents = pickle.load(f)
+        expected = manifest.get("document_count", len(ids))
+        if not (
+            len(vectors) == len(ids) == len(store.documents) == expected
+            and set(ids.tolist()) == set(store.documents)
+        ):
+            raise ValueError(
+                f"Vector store in {directory} is inconsistent: manifest lists "
+                f"{expected} documents, files hold {len(vectors)} vectors, "
+                f"{len(ids)} ids and {len(store.documents)} documents"
+            )
+        store._vectors = dict(zip(ids.tolist(), vectors))
+        store._ids_by_doc = {doc["doc_id"]: i for i, doc in store.documents.items()}
+        store._next_id = manifest.get("next_id", int(ids.max(initial=-1)) + 1)
+        store.index = build_index(
+            vectors,
+            ids,
+            store.embedding_dimension,
+            store.index_type,
+            store.nlist,
+            store.nprobe,
+        )
+        logger.info(f"Loaded {len(store.documents)} documents from {directory}")
+        return store
 
 
 if __name__ == "__main__":
     # Example Usage (for testing the class structure)
-    vector_store = CodebaseVectorStore()
+    vector_store = CodebaseVectorStore(embedder=HashingEmbedder())
 
     # Example documents (replace with actual codebase artifacts)
     sample_documents = [
@@ -150,47 +638,40 @@ if __name__ == "__main__":
             "text": "def calculate_forecast(data): # Calculates the forecast",
             "metadata": {
                 "file_path": "forecast_engine/forecaster.py",
-                "text": "def calculate_forecast(data): # Calculates the forecast",
+                "type": "def",
+                "name": "calculate_forecast",
             },
         },
         {
             "text": "class SimulationEngine: # Handles running simulations",
             "metadata": {
                 "file_path": "simulation_engine/engine.py",
-                "text": "class SimulationEngine: # Handles running simulations",
+                "type": "class",
+                "name": "SimulationEngine",
             },
         },
         {
             "text": "def get_historical_data(symbol): # Retrieves historical data",
             "metadata": {
                 "file_path": "data_access/data_retriever.py",
-                "text": "def get_historical_data(symbol): # Retrieves historical data",
+                "type": "def",
+                "name": "get_historical_data",
             },
         },
         {
             "text": "The main function to run the Pulse application.",
-            "metadata": {
-                "file_path": "main.py",
-                "text": "The main function to run the Pulse application.",
-            },
-        },
-        {
-            "text": "This file contains utility functions for data processing.",
-            "metadata": {
-                "file_path": "utils/data_utils.py",
-                "text": "This file contains utility functions for data processing.",
-            },
+            "metadata": {"file_path": "main.py", "type": "file"},
         },
     ]
 
     vector_store.add_documents(sample_documents)
 
-    search_results = vector_store.search("how to get historical data", k=2)
-    print("Search Results:")
-    for result in search_results:
-        print(f"Score: {result['score']:.4f}, Metadata: {result['metadata']}")
-
-    search_results_2 = vector_store.search("what is the main entry point", k=1)
-    print("\nSearch Results 2:")
-    for result in search_results_2:
-        print(f"Score: {result['score']:.4f}, Metadata: {result['metadata']}")
+    for query, results in zip(
+        ["how to get historical data", "what is the main entry point"],
+        vector_store.search_batch(
+            ["how to get historical data", "what is the main entry point"], k=2
+        ),
+    ):
+        print(f"Search Results for {query!r}:")
+        for result in results:
+            print(f"Score: {result['score']:.4f}, Metadata: {result['metadata']}")
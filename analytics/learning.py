@@ -44,7 +44,7 @@ except ImportError:
 from analytics.trace_memory import TraceMemory
 from analytics.variable_performance_tracker import VariablePerformanceTracker
 from engine.variable_registry import VariableRegistry
-from analytics.optimized_trust_tracker import optimized_bayesian_trust_tracker
+from analytics.trust_service import trust_service
 from trust_system.trust_engine import TrustEngine
 
 
@@ -330,8 +330,8 @@ class LearningEngine:
 
                 log_variable_weight_change(var, old_weight, round(trust_adj, 3))
             self.registry._save()
-            # Use the optimized trust tracker for better performance
-            optimized_bayesian_trust_tracker.update(variable_id, outcome)
+            # Record the outcome in the shared trust service
+            trust_service.update(variable_id, outcome)
         except Exception as e:
             logging.error(f"Variable weight update failed: {e}")
 
@@ -349,8 +349,8 @@ class LearningEngine:
             from analytics.pulse_learning_log import log_variable_weight_change
 
             log_variable_weight_change(variable_id, old_weight, new_weight)
-        # Use optimized trust tracker for better performance
-        optimized_bayesian_trust_tracker.update(variable_id, profile_outcome)
+        # Record the outcome in the shared trust service
+        trust_service.update(variable_id, profile_outcome)
 
     def apply_variable_mutation_pressure(self, variable_id, mutation_success):
         drift_vars = self.tracker.detect_variable_drift(threshold=0.25)
@@ -364,22 +364,22 @@ class LearningEngine:
             from analytics.pulse_learning_log import log_variable_weight_change
 
             log_variable_weight_change(var, old, new)
-            # Use optimized trust tracker for better performance
-            optimized_bayesian_trust_tracker.update(var, mutation_success)
+            # Record the outcome in the shared trust service
+            trust_service.update(var, mutation_success)
             print(
                 f"[VariableTrust] {var}: trust={
-                    optimized_bayesian_trust_tracker.get_trust(var):.3f}, CI={
-                    optimized_bayesian_trust_tracker.get_confidence_interval(var)}")
+                    trust_service.get_trust(var):.3f}, CI={
+                    trust_service.get_confidence_interval(var)}")
 
     def apply_rule_mutation_pressure(self, rule_id, mutation_success):
         print("[Rule Learning] Applying pressure to mutate causal rules...")
         from engine.rule_mutation_engine import apply_rule_mutations
 
         apply_rule_mutations()
-        # Use optimized trust tracker for better performance
-        optimized_bayesian_trust_tracker.update(rule_id, mutation_success)
-        trust = optimized_bayesian_trust_tracker.get_trust(rule_id)
-        conf_int = optimized_bayesian_trust_tracker.get_confidence_interval(rule_id)
+        # Record the outcome in the shared trust service
+        trust_service.update(rule_id, mutation_success)
+        trust = trust_service.get_trust(rule_id)
+        conf_int = trust_service.get_confidence_interval(rule_id)
         print(f"[RuleTrust] {rule_id}: trust={trust:.3f}, CI={conf_int}")
 
     def audit_cluster_volatility(self):
@@ -404,7 +404,7 @@ class LearningEngine:
 
                     log_variable_weight_change(var, old, new)
                     # Update trust scores using optimized batch operations when possible
-                    optimized_bayesian_trust_tracker.update(
+                    trust_service.update(
                         var, False
                     )  # Reduce trust due to volatility
             for v in c["variables"]:
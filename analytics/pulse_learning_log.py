@@ -25,7 +25,7 @@ from contextlib import suppress
 from engine.path_registry import PATHS
 
 # Add import for Bayesian trust tracker
-from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+from analytics.trust_service import trust_service
 
 
 def _get_log_path() -> str:
@@ -196,10 +196,10 @@ class PulseLearningLogger:
             key (str): Variable or rule identifier.
             kind (str): 'variable' or 'rule'.
         """
-        trust = bayesian_trust_tracker.get_trust(key)
-        ci = bayesian_trust_tracker.get_confidence_interval(key)
-        confidence = bayesian_trust_tracker.get_confidence_strength(key)
-        sample_size = bayesian_trust_tracker.get_sample_size(key)
+        trust = trust_service.get_trust(key)
+        ci = trust_service.get_confidence_interval(key)
+        confidence = trust_service.get_confidence_strength(key)
+        sample_size = trust_service.get_sample_size(key)
 
         # Both print to console and log to file
         print(
@@ -257,7 +257,7 @@ class PulseLearningLogger:
         Returns:
             Dict containing trust metrics report
         """
-        report = bayesian_trust_tracker.generate_report(min_samples)
+        report = trust_service.generate_report(min_samples)
         self.log_event(
             "trust_report_generated",
             {
@@ -279,7 +279,7 @@ class PulseLearningLogger:
             bool: Success status
         """
         try:
-            bayesian_trust_tracker.export_to_file(filepath)
+            trust_service.export_to_file(filepath)
             self.log_event("trust_data_exported", {"filepath": filepath})
             return True
         except Exception as e:
@@ -296,7 +296,7 @@ class PulseLearningLogger:
         Returns:
             bool: Success status
         """
-        success = bayesian_trust_tracker.import_from_file(filepath)
+        success = trust_service.import_from_file(filepath)
         if success:
             self.log_event("trust_data_imported", {"filepath": filepath})
         else:
@@ -428,9 +428,9 @@ def _test_logging():
         log_learning_summary({"summary": "test summary"})
 
         # Test trust metrics logging
-        bayesian_trust_tracker.update("test_variable", True, 1.0)
-        bayesian_trust_tracker.update("test_variable", False, 0.5)
-        bayesian_trust_tracker.update("test_variable", True, 1.0)
+        trust_service.update("test_variable", True, 1.0)
+        trust_service.update("test_variable", False, 0.5)
+        trust_service.update("test_variable", True, 1.0)
         log_bayesian_trust_metrics("test_variable", "variable")
 
         # Test rule effectiveness logging
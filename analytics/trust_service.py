@@ -0,0 +1,641 @@
+"""
+TrustService
+
+Unified Bayesian trust service combining the tracker, the write buffer and
+persistence in one place. State is partitioned into key-hashed shards, each
+guarded by its own lock, so concurrent updates to unrelated rules/variables do
+not contend. Buffered updates are aggregated per key before being applied,
+snapshots are written in a compact binary format, and a delta-tracking mode
+lets worker processes ship the trust they learned back to the coordinator.
+
+Usage:
+    from analytics.trust_service import trust_service
+
+    trust_service.update("R001_HopeTrust", True)
+    trust_service.buffer_update("spx_close", False, 0.5)
+    trust_service.flush()
+    trust_service.save_snapshot("trust.bin")
+"""
+
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Uniform Beta(1, 1) prior used for unseen keys.
+PRIOR: Tuple[float, float] = (1.0, 1.0)
+
+SNAPSHOT_MAGIC = b"PTS1"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, entry count
+_KEY_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<ddd")  # alpha, beta, last_update
+
+# key -> (alpha increment, beta increment, last update time)
+TrustDeltas = Dict[str, Tuple[float, float, float]]
+TrustUpdate = Union[Tuple[str, bool], Tuple[str, bool, float]]
+
+
+class _TrustShard:
+    """One partition of the trust state, guarded by its own lock."""
+
+    __slots__ = ("lock", "stats", "last_update", "timestamps")
+
+    def __init__(self, history_size: int):
+        self.lock = threading.RLock()
+        self.stats: Dict[str, Tuple[float, float]] = {}
+        self.last_update: Dict[str, float] = {}
+        self.timestamps: Dict[str, Deque[Tuple[float, float]]] = defaultdict(
+            lambda: deque(maxlen=history_size)
+        )
+
+
+class TrustService:
+    """
+    Sharded, buffered Bayesian trust tracker.
+
+    Exposes the same read/update API as BayesianTrustTracker so it can be used
+    as a drop-in replacement, plus:
+    - buffer_update()/flush() for aggregated, low-contention writes
+    - save_snapshot()/load_snapshot() for compact binary persistence
+    - export_deltas()/merge_deltas() for merging worker state (track_deltas=True)
+    """
+
+    def __init__(
+        self,
+        num_shards: int = 16,
+        buffer_threshold: int = 256,
+        history_size: int = 100,
+        track_deltas: bool = False,
+    ):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.buffer_threshold = buffer_threshold
+        self.history_size = history_size
+        self.track_deltas = track_deltas
+
+        self._shards = [_TrustShard(history_size) for _ in range(num_shards)]
+
+        # Write buffer: key -> [alpha increment, beta increment]
+        self._buffer_lock = threading.Lock()
+        self._buffer: Dict[str, List[float]] = {}
+        self._buffered_count = 0
+
+        # Delta log for multiprocess merging: key -> [d_alpha, d_beta, last_update]
+        self._delta_lock = threading.Lock()
+        self._deltas: Dict[str, List[float]] = {}
+
+        self._stats_lock = threading.Lock()
+        self.service_stats = {
+            "updates_applied": 0,
+            "updates_buffered": 0,
+            "flush_operations": 0,
+            "deltas_merged": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Sharding helpers
+    # ------------------------------------------------------------------
+    def _shard_index(self, key: str) -> int:
+        # crc32 is stable across processes, unlike the salted built-in hash()
+        return zlib.crc32(key.encode("utf-8")) % self.num_shards
+
+    def _shard(self, key: str) -> _TrustShard:
+        return self._shards[self._shard_index(key)]
+
+    def _group_by_shard(
+        self, increments: Dict[str, List[float]]
+    ) -> Dict[int, List[Tuple[str, float, float]]]:
+        grouped: Dict[int, List[Tuple[str, float, float]]] = defaultdict(list)
+        for key, (d_alpha, d_beta) in increments.items():
+            grouped[self._shard_index(key)].append((key, d_alpha, d_beta))
+        return grouped
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.service_stats[name] += amount
+
+    def _apply_increments(
+        self,
+        increments: Dict[str, List[float]],
+        update_times: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Apply aggregated increments, taking each shard lock once.
+
+        update_times optionally gives the time each key was last updated
+        (e.g. in a worker); keys without one are stamped with the current
+        time. last_update never moves backwards.
+        """
+        now = time.time()
+        for index, entries in self._group_by_shard(increments).items():
+            shard = self._shards[index]
+            with shard.lock:
+                for key, d_alpha, d_beta in entries:
+                    alpha, beta = shard.stats.get(key, PRIOR)
+                    alpha += d_alpha
+                    beta += d_beta
+                    shard.stats[key] = (alpha, beta)
+                    stamp = update_times.get(key, now) if update_times else now
+                    stamp = max(stamp, shard.last_update.get(key, 0.0))
+                    shard.last_update[key] = stamp
+                    shard.timestamps[key].append((stamp, alpha / (alpha + beta)))
+        if self.track_deltas:
+            self._record_deltas(increments, now, update_times)
+
+    def _record_deltas(
+        self,
+        increments: Dict[str, List[float]],
+        now: float,
+        update_times: Optional[Dict[str, float]] = None,
+    ) -> None:
+        with self._delta_lock:
+            for key, (d_alpha, d_beta) in increments.items():
+                stamp = update_times.get(key, now) if update_times else now
+                entry = self._deltas.setdefault(key, [0.0, 0.0, stamp])
+                entry[0] += d_alpha
+                entry[1] += d_beta
+                entry[2] = max(entry[2], stamp)
+
+    @staticmethod
+    def _aggregate(updates: Iterable[TrustUpdate]) -> Dict[str, List[float]]:
+        aggregated: Dict[str, List[float]] = {}
+        for update in updates:
+            key, success = update[0], update[1]
+            weight = float(update[2]) if len(update) > 2 else 1.0
+            entry = aggregated.setdefault(key, [0.0, 0.0])
+            entry[0 if success else 1] += weight
+        return aggregated
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update(self, key: str, success: bool, weight: float = 1.0):
+        """
+        Update the Beta distribution for a rule/variable immediately.
+        Args:
+            key (str): Rule or variable identifier.
+            success (bool): Outcome (True=success, False=failure).
+            weight (float): Weight of the observation (default=1.0).
+        """
+        increment = [weight, 0.0] if success else [0.0, weight]
+        self._apply_increments({key: increment})
+        self._count("updates_applied")
+
+    def batch_update(self, results: List[TrustUpdate]) -> None:
+        """
+        Aggregate and apply many updates at once.
+        Args:
+            results: List of (key, success) or (key, success, weight) tuples.
+        """
+        if not results:
+            return
+        self._apply_increments(self._aggregate(results))
+        self._count("updates_applied", len(results))
+
+    def buffer_update(self, key: str, success: bool, weight: float = 1.0) -> bool:
+        """
+        Queue an update in the write buffer. Updates for the same key are
+        summed and applied together on flush.
+
+        Returns:
+            True if the buffer reached its threshold and was flushed.
+        """
+        with self._buffer_lock:
+            entry = self._buffer.setdefault(key, [0.0, 0.0])
+            entry[0 if success else 1] += weight
+            self._buffered_count += 1
+            should_flush = self._buffered_count >= self.buffer_threshold
+        self._count("updates_buffered")
+        if should_flush:
+            self.flush()
+        return should_flush
+
+    def buffer_updates(self, updates: List[TrustUpdate]) -> bool:
+        """Queue many updates in the write buffer. See buffer_update()."""
+        if not updates:
+            return False
+        aggregated = self._aggregate(updates)
+        with self._buffer_lock:
+            for key, (d_alpha, d_beta) in aggregated.items():
+                entry = self._buffer.setdefault(key, [0.0, 0.0])
+                entry[0] += d_alpha
+                entry[1] += d_beta
+            self._buffered_count += len(updates)
+            should_flush = self._buffered_count >= self.buffer_threshold
+        self._count("updates_buffered", len(updates))
+        if should_flush:
+            self.flush()
+        return should_flush
+
+    def flush(self) -> int:
+        """
+        Apply all buffered updates.
+
+        Returns:
+            Number of buffered updates that were applied.
+        """
+        with self._buffer_lock:
+            if not self._buffer:
+                return 0
+            pending, self._buffer = self._buffer, {}
+            count, self._buffered_count = self._buffered_count, 0
+        self._apply_increments(pending)
+        with self._stats_lock:
+            self.service_stats["updates_applied"] += count
+            self.service_stats["flush_operations"] += 1
+        return count
+
+    def pending_count(self) -> int:
+        """Number of updates waiting in the write buffer."""
+        with self._buffer_lock:
+            return self._buffered_count
+
+    def apply_decay(self, key: str, decay_factor: float = 0.99, min_count: int = 5):
+        """
+        Apply time decay to reduce certainty of old observations.
+        Args:
+            key: Key to apply decay to
+            decay_factor: How much to preserve (0.99 = 99% preserved)
+            min_count: Minimum count to maintain after decay
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            self._decay_locked(shard, key, decay_factor, min_count)
+
+    def apply_global_decay(self, decay_factor: float = 0.99, min_count: int = 5):
+        """Apply decay to all tracked entities, one shard at a time."""
+        for shard in self._shards:
+            with shard.lock:
+                for key in list(shard.stats):
+                    self._decay_locked(shard, key, decay_factor, min_count)
+
+    @staticmethod
+    def _decay_locked(
+        shard: _TrustShard, key: str, decay_factor: float, min_count: int
+    ) -> None:
+        if key in shard.stats:
+            alpha, beta = shard.stats[key]
+            if alpha + beta > min_count:
+                shard.stats[key] = (
+                    max(1.0, alpha * decay_factor),
+                    max(1.0, beta * decay_factor),
+                )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get_stats(self, key: str) -> Tuple[float, float]:
+        """Get raw alpha/beta values."""
+        return self._shard(key).stats.get(key, PRIOR)
+
+    def get_trust(self, key: str) -> float:
+        """Returns the mean trust/confidence for a rule/variable."""
+        alpha, beta = self.get_stats(key)
+        return alpha / (alpha + beta)
+
+    def get_trust_batch(self, keys: List[str]) -> Dict[str, float]:
+        """Get trust values for multiple keys at once."""
+        return {key: self.get_trust(key) for key in keys}
+
+    def get_confidence_interval(self, key: str, z: float = 1.96) -> Tuple[float, float]:
+        """
+        Returns a confidence interval for the trust estimate.
+        Args:
+            z (float): Z-score for confidence level (default 1.96 for 95%).
+        """
+        alpha, beta = self.get_stats(key)
+        n = alpha + beta
+        p = alpha / n
+        se = (p * (1 - p) / n) ** 0.5
+        return max(0.0, p - z * se), min(1.0, p + z * se)
+
+    def get_sample_size(self, key: str) -> int:
+        """Get total number of observations."""
+        alpha, beta = self.get_stats(key)
+        return int(alpha + beta - 2)  # Subtract prior
+
+    def get_confidence_strength(self, key: str) -> float:
+        """
+        Returns how confident we are in the trust estimate (0-1).
+        Higher values mean more data points and narrower confidence intervals.
+        """
+        alpha, beta = self.get_stats(key)
+        n = alpha + beta - 2  # Subtract prior
+        return 1 / (1 + math.exp(-0.1 * (n - 10)))
+
+    def get_time_since_update(self, key: str) -> float:
+        """Get time in seconds since last update."""
+        last = self._shard(key).last_update.get(key)
+        if last is None:
+            return float("inf")
+        return time.time() - last
+
+    def get_history(self, key: str) -> List[Tuple[float, float]]:
+        """Get the bounded (time, trust) history for a key."""
+        shard = self._shard(key)
+        with shard.lock:
+            return list(shard.timestamps.get(key, ()))
+
+    def keys(self) -> List[str]:
+        """All tracked keys."""
+        result: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                result.extend(shard.stats)
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(shard.stats) for shard in self._shards)
+
+    def _items(self) -> List[Tuple[str, float, float, float]]:
+        items = []
+        for shard in self._shards:
+            with shard.lock:
+                for key, (alpha, beta) in shard.stats.items():
+                    items.append((key, alpha, beta, shard.last_update.get(key, 0.0)))
+        return items
+
+    @property
+    def stats(self) -> Dict[str, Tuple[float, float]]:
+        """Merged view of alpha/beta for all keys (copy)."""
+        return {key: (alpha, beta) for key, alpha, beta, _ in self._items()}
+
+    @property
+    def timestamps(self) -> Dict[str, List[Tuple[float, float]]]:
+        """Merged view of per-key (time, trust) history (copy)."""
+        merged: Dict[str, List[Tuple[float, float]]] = {}
+        for shard in self._shards:
+            with shard.lock:
+                for key, history in shard.timestamps.items():
+                    merged[key] = list(history)
+        return merged
+
+    # ------------------------------------------------------------------
+    # Multiprocess delta merging
+    # ------------------------------------------------------------------
+    def export_deltas(self, reset: bool = True) -> TrustDeltas:
+        """
+        Return the trust increments applied since the last export.
+        Requires track_deltas=True. Buffered updates are flushed first.
+
+        The result is a plain dict, safe to pickle back from a Dask or
+        multiprocessing worker and pass to merge_deltas() on the coordinator.
+        """
+        if not self.track_deltas:
+            raise RuntimeError("export_deltas() requires track_deltas=True")
+        self.flush()
+        with self._delta_lock:
+            deltas = {key: tuple(entry) for key, entry in self._deltas.items()}
+            if reset:
+                self._deltas = {}
+        return deltas  # type: ignore[return-value]
+
+    def merge_deltas(self, deltas: TrustDeltas) -> int:
+        """
+        Merge trust increments exported by another process.
+
+        Increments are additive, so deltas from many workers can be merged in
+        any order without losing or overwriting each other.
+
+        Returns:
+            Number of keys merged.
+        """
+        if not deltas:
+            return 0
+        increments = {key: [delta[0], delta[1]] for key, delta in deltas.items()}
+        update_times = {
+            key: float(delta[2]) for key, delta in deltas.items() if len(delta) > 2
+        }
+        self._apply_increments(increments, update_times)
+        self._count("deltas_merged", len(deltas))
+        return len(deltas)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save_snapshot(self, filepath: str) -> int:
+        """
+        Write alpha/beta/last_update for every key to a compact binary file.
+        The write is atomic (temp file + rename). Buffered updates are flushed
+        first.
+
+        Returns:
+            Number of entries written.
+        """
+        self.flush()
+        items = self._items()
+        parts = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(items))]
+        for key, alpha, beta, last_update in items:
+            encoded = key.encode("utf-8")
+            parts.append(_KEY_LEN.pack(len(encoded)))
+            parts.append(encoded)
+            parts.append(_ENTRY.pack(alpha, beta, last_update))
+        temp_filepath = filepath + ".tmp"
+        with open(temp_filepath, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(temp_filepath, filepath)
+        return len(items)
+
+    def load_snapshot(self, filepath: str, merge: bool = False) -> bool:
+        """
+        Load a binary snapshot written by save_snapshot().
+
+        Args:
+            filepath: Snapshot path.
+            merge: If False (default) existing state is replaced; if True the
+                snapshot's entries overwrite matching keys only.
+
+        Returns:
+            True on success, False if the file is missing or invalid.
+        """
+        if not os.path.exists(filepath):
+            return False
+        try:
+            with open(filepath, "rb") as f:
+                data = f.read()
+            magic, version, count = _HEADER.unpack_from(data, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"not a trust snapshot (magic={magic!r})")
+            offset = _HEADER.size
+            entries = []
+            for _ in range(count):
+                (key_len,) = _KEY_LEN.unpack_from(data, offset)
+                offset += _KEY_LEN.size
+                key = data[offset : offset + key_len].decode("utf-8")
+                offset += key_len
+                alpha, beta, last_update = _ENTRY.unpack_from(data, offset)
+                offset += _ENTRY.size
+                entries.append((key, alpha, beta, last_update))
+        except (struct.error, ValueError, UnicodeDecodeError) as e:
+            logger.error(f"Error loading trust snapshot {filepath}: {e}")
+            return False
+
+        if not merge:
+            self.clear()
+        self._load_entries(entries)
+        return True
+
+    def export_entries(self) -> List[Tuple[str, float, float, float]]:
+        """
+        (key, alpha, beta, last_update) for every key, e.g. for embedding trust
+        state in simulation checkpoints. Buffered updates are flushed first.
+        """
+        self.flush()
+        return self._items()
+
+    def restore_entries(
+        self, entries: Iterable[Tuple[str, float, float, float]], merge: bool = False
+    ) -> None:
+        """Load entries from export_entries(), replacing existing state unless merge."""
+        if not merge:
+            self.clear()
+        self._load_entries(entries)
+
+    def _load_entries(self, entries: Iterable[Tuple[str, float, float, float]]):
+        for key, alpha, beta, last_update in entries:
+            shard = self._shard(key)
+            with shard.lock:
+                shard.stats[key] = (alpha, beta)
+                if last_update:
+                    shard.last_update[key] = last_update
+
+    def export_to_file(self, filepath: str):
+        """Export tracker state to a JSON file (BayesianTrustTracker format)."""
+        self.flush()
+        data = {
+            "stats": {k: [a, b] for k, a, b, _ in self._items()},
+            "last_update": {k: t for k, _, _, t in self._items()},
+            "timestamps": self.timestamps,
+            "export_time": time.time(),
+        }
+        temp_filepath = filepath + ".tmp"
+        with open(temp_filepath, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_filepath, filepath)
+
+    def import_from_file(self, filepath: str) -> bool:
+        """Import tracker state from a JSON file (BayesianTrustTracker format)."""
+        if not os.path.exists(filepath):
+            return False
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error importing trust data: {e}")
+            return False
+
+        self.clear()
+        last_update = data.get("last_update", {})
+        self._load_entries(
+            (k, float(v[0]), float(v[1]), float(last_update.get(k, 0.0)))
+            for k, v in data.get("stats", {}).items()
+        )
+        for key, history in data.get("timestamps", {}).items():
+            if isinstance(history, dict):  # OptimizedBayesianTrustTracker format
+                history = list(zip(history.get("times", []), history.get("values", [])))
+            shard = self._shard(key)
+            with shard.lock:
+                shard.timestamps[key].extend(tuple(item) for item in history)
+        return True
+
+    def clear(self) -> None:
+        """Drop all trust state, buffered updates and recorded deltas."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.stats.clear()
+                shard.last_update.clear()
+                shard.timestamps.clear()
+        with self._buffer_lock:
+            self._buffer = {}
+            self._buffered_count = 0
+        with self._delta_lock:
+            self._deltas = {}
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def generate_report(self, min_sample_size: int = 5) -> Dict[str, Any]:
+        """
+        Generate a statistical report on tracked entities.
+        Args:
+            min_sample_size: Minimum samples to include in report
+        """
+        report: Dict[str, Any] = {
+            "high_trust": [],
+            "low_trust": [],
+            "high_confidence": [],
+            "low_confidence": [],
+            "recently_updated": [],
+            "stale": [],
+            "summary": {},
+        }
+        items = self._items()
+        now = time.time()
+        trust_sum = 0.0
+        confidence_sum = 0.0
+        active = 0
+        for key, alpha, beta, last in items:
+            trust = alpha / (alpha + beta)
+            confidence = 1 / (1 + math.exp(-0.1 * (alpha + beta - 2 - 10)))
+            trust_sum += trust
+            confidence_sum += confidence
+            if alpha + beta - 2 < min_sample_size:
+                continue
+            active += 1
+            since_update = now - last if last else float("inf")
+            entry = {
+                "key": key,
+                "trust": trust,
+                "confidence": confidence,
+                "ci": self.get_confidence_interval(key),
+                "sample_size": int(alpha + beta - 2),
+                "last_update": since_update,
+            }
+            if trust > 0.8:
+                report["high_trust"].append(entry)
+            if trust < 0.2:
+                report["low_trust"].append(entry)
+            if confidence > 0.8:
+                report["high_confidence"].append(entry)
+            if confidence < 0.2:
+                report["low_confidence"].append(entry)
+            if since_update < 3600:  # 1 hour
+                report["recently_updated"].append(entry)
+            if since_update > 86400:  # 1 day
+                report["stale"].append(entry)
+
+        report["summary"] = {
+            "total_entities": len(items),
+            "active_entities": active,
+            "avg_trust": trust_sum / max(1, len(items)),
+            "avg_confidence": confidence_sum / max(1, len(items)),
+        }
+        return report
+
+    def get_service_stats(self) -> Dict[str, Any]:
+        """Counters describing service usage."""
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self.service_stats)
+        stats["tracked_keys"] = len(self)
+        stats["pending_updates"] = self.pending_count()
+        stats["num_shards"] = self.num_shards
+        return stats
+
+
+# Singleton instance for global use.
+trust_service = TrustService()
+
+
+def get_trust_service() -> TrustService:
+    """Return the process-wide TrustService instance."""
+    return trust_service
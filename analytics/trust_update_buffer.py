@@ -2,8 +2,8 @@
 TrustUpdateBuffer
 
 An efficient buffer for collecting and batching trust updates before
-sending them to the OptimizedBayesianTrustTracker. This reduces lock
-contention and improves performance during high-throughput training.
+sending them to the shared TrustService. This reduces lock contention and
+improves performance during high-throughput training.
 """
 
 import logging
@@ -12,7 +12,7 @@ import time
 from typing import Dict, List, Tuple, Any, Optional
 from collections import defaultdict
 
-from analytics.optimized_trust_tracker import optimized_bayesian_trust_tracker
+from analytics.trust_service import trust_service
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 class TrustUpdateBuffer:
     """
     Efficiently buffers trust updates before sending them to the
-    OptimizedBayesianTrustTracker in optimized batches.
+    TrustService in optimized batches.
 
     Features:
     - Collects updates in memory with efficient NumPy structures
@@ -67,7 +67,7 @@ class TrustUpdateBuffer:
         }
 
         # Get the trust tracker
-        self.trust_tracker = optimized_bayesian_trust_tracker
+        self.trust_tracker = trust_service
 
     def add_update(self, key: str, success: bool, weight: float = 1.0) -> bool:
         """
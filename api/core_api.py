@@ -10,7 +10,7 @@ from analytics.feature_store import FeatureStore
 # from intelligence.autopilot import get_autopilot_status, get_autopilot_data
 
 # Initialize core components
-variable_registry = VariableRegistry()
+variable_registry = VariableRegistry(example_forecasts=True)
 feature_store = FeatureStore()
 
 app = Flask(__name__)
@@ -0,0 +1,170 @@
+"""
+Compiled structural causal models for batched counterfactual inference.
+
+``CompiledSCM`` turns a StructuralCausalModel into an ordered list of
+vectorised structural equations. Queries are evaluated as matrices (one row
+per query, one column per variable), so abduction, action and prediction
+for thousands of interventions cost one pass over the variables.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from causal_model.structural_causal_model import StructuralCausalModel
+from utils.lazy_import import lazy_import
+
+nx = lazy_import("networkx")
+
+logger = logging.getLogger(__name__)
+
+
+def causal_order(scm: StructuralCausalModel) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Order the variables so that every cause precedes its effects.
+
+    Cyclic graphs (e.g. the bidirectional skeletons produced by correlation
+    based discovery) have no such order. Strongly connected components are
+    then ordered topologically, variables within a component keep their
+    insertion order, and edges pointing backwards in that order are dropped.
+
+    Returns:
+        The variable order and the list of dropped feedback edges.
+    """
+    graph = scm.graph
+    try:
+        return list(nx.topological_sort(graph)), []
+    except nx.NetworkXUnfeasible:
+        pass
+
+    position = {var: k for k, var in enumerate(graph.nodes)}
+    condensed = nx.condensation(graph)
+    order: List[str] = []
+    for component in nx.topological_sort(condensed):
+        order.extend(sorted(condensed.nodes[component]["members"], key=position.get))
+    rank = {var: k for k, var in enumerate(order)}
+    dropped = [(u, v) for u, v in graph.edges if rank[u] >= rank[v]]
+    return order, dropped
+
+
+class CompiledSCM:
+    """
+    A StructuralCausalModel compiled into vectorised structural equations.
+
+    Every equation is additive in its noise term, ``X = f(parents) + U``, so
+    abduction recovers ``U = x - f(parents)`` from evidence. Unobserved
+    variables take ``U = 0``.
+    """
+
+    def __init__(self, scm: StructuralCausalModel):
+        self.order, self.dropped_edges = causal_order(scm)
+        if self.dropped_edges:
+            logger.warning(
+                f"SCM has cycles; ignoring {len(self.dropped_edges)} feedback "
+                "edges for counterfactual inference"
+            )
+        self.variables: List[str] = list(self.order)
+        self.index: Dict[str, int] = {var: k for k, var in enumerate(self.variables)}
+        self.version = getattr(scm, "version", 0)
+        self.signature = self.graph_signature(scm)
+
+        dropped = set(self.dropped_edges)
+        self._equations = []
+        for var in self.order:
+            parents = [
+                p for p in scm.graph.predecessors(var) if (p, var) not in dropped
+            ]
+            equation = scm.equations.get(var) if hasattr(scm, "equations") else None
+            equation = equation or {}
+            function = equation.get("function")
+            coefficients = equation.get("coefficients", {})
+            if function is None:
+                # Only parents with a non-zero weight take part
+                parents = [p for p in parents if coefficients.get(p, 0.0)]
+            self._equations.append(
+                (
+                    self.index[var],
+                    np.array([self.index[p] for p in parents], dtype=np.intp),
+                    parents,
+                    np.array([coefficients.get(p, 0.0) for p in parents]),
+                    equation.get("intercept", 0.0),
+                    function,
+                )
+            )
+
+    @staticmethod
+    def graph_signature(scm: StructuralCausalModel) -> Tuple[int, int, int]:
+        """Cheap fingerprint used to notice edits that bypass the SCM methods."""
+        return (
+            getattr(scm, "version", 0),
+            scm.graph.number_of_nodes(),
+            scm.graph.number_of_edges(),
+        )
+
+    def _structural(self, values: np.ndarray, equation) -> np.ndarray:
+        _, parent_idx, parents, weights, intercept, function = equation
+        if function is not None:
+            inputs = {name: values[:, k] for name, k in zip(parents, parent_idx)}
+            return np.asarray(function(inputs), dtype=float).reshape(len(values))
+        if not len(parent_idx):
+            return np.full(len(values), intercept)
+        return intercept + values[:, parent_idx] @ weights
+
+    def abduct(self, evidence: np.ndarray) -> np.ndarray:
+        """
+        Infer the exogenous noise of each query from its evidence.
+
+        Args:
+            evidence: Queries x variables matrix, NaN where unobserved.
+
+        Returns:
+            Noise matrix of the same shape (0 for unobserved variables).
+        """
+        observed = ~np.isnan(evidence)
+        factual = np.empty_like(evidence)
+        noise = np.zeros_like(evidence)
+        for equation in self._equations:
+            k = equation[0]
+            predicted = self._structural(factual, equation)
+            factual[:, k] = np.where(observed[:, k], evidence[:, k], predicted)
+            noise[:, k] = np.where(observed[:, k], evidence[:, k] - predicted, 0.0)
+        return noise
+
+    def predict(
+        self,
+        noise: np.ndarray,
+        intervention_mask: Optional[np.ndarray] = None,
+        intervention_values: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Apply do-interventions and propagate through the equations in order.
+
+        Args:
+            noise: Queries x variables noise matrix (see abduct).
+            intervention_mask: True where a variable is intervened on.
+            intervention_values: Values of the intervened variables.
+
+        Returns:
+            Queries x variables matrix of counterfactual values.
+        """
+        values = np.empty_like(noise)
+        for equation in self._equations:
+            k = equation[0]
+            values[:, k] = self._structural(values, equation) + noise[:, k]
+            if intervention_mask is not None:
+                values[:, k] = np.where(
+                    intervention_mask[:, k], intervention_values[:, k], values[:, k]
+                )
+        return values
+
+    def counterfactuals(
+        self,
+        evidence: np.ndarray,
+        intervention_mask: np.ndarray,
+        intervention_values: np.ndarray,
+    ) -> np.ndarray:
+        """Abduction, action and prediction for a batch of queries."""
+        return self.predict(
+            self.abduct(evidence), intervention_mask, intervention_values
+        )
@@ -1,16 +1,23 @@
 """
 Counterfactual engine for structural causal models.
 Supports optimized counterfactual inference with caching and batch processing.
+
+The SCM is compiled once into topologically ordered, vectorised structural
+equations (see causal_model.compiled_scm); batches of queries are answered
+with one abduction/action/prediction pass over a query x variable matrix.
 """
 
 import os
 import logging
+import threading
 import time
-import hashlib
 import json
-from typing import Dict, Any, List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, List, Tuple, Optional
+
+import numpy as np
 
+from causal_model.compiled_scm import CompiledSCM
 from causal_model.structural_causal_model import StructuralCausalModel
 
 logger = logging.getLogger(__name__)
@@ -19,7 +26,7 @@ logger = logging.getLogger(__name__)
 class CounterfactualEngine:
     """
     Performs counterfactual inference using do-calculus on an SCM.
-    Features optimized computation with caching and parallelization.
+    Features vectorised batch inference and an LRU result cache.
     """
 
     def __init__(
@@ -33,39 +40,62 @@ class CounterfactualEngine:
 
         Args:
             scm: The structural causal model to use for inference
-            max_cache_size: Maximum number of results to cache
-            max_workers: Maximum number of parallel workers for batch operations (default: CPU count - 1)
+            max_cache_size: Maximum number of results to cache (least recently
+                used results are evicted)
+            max_workers: Kept for API compatibility; batches are vectorised
+                rather than spread over threads
         """
         self.scm = scm
         self.max_workers = max_workers or max(1, (os.cpu_count() or 4) - 1)
 
-        # Set up caching
-        self._cache = {}
+        # LRU cache of results keyed by (evidence, interventions)
+        self._cache: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
         self._cache_hits = 0
         self._cache_misses = 0
+        self._cache_evictions = 0
         self._max_cache_size = max_cache_size
+        self._lock = threading.RLock()
 
-        # Precompute a topological ordering of variables for efficient inference
-        self._ordered_variables = self._compute_variable_ordering()
+        # Compile the SCM into topologically ordered structural equations
+        self._compiled = CompiledSCM(scm)
+        self._ordered_variables = self._compiled.order
 
         logger.info(
-            f"CounterfactualEngine initialized with {
-                self.max_workers} workers and cache size {max_cache_size}")
+            f"CounterfactualEngine initialized with {len(self._ordered_variables)} "
+            f"variables and cache size {max_cache_size}"
+        )
 
     def _compute_variable_ordering(self) -> List[str]:
         """
         Compute an ordering of the variables for efficient inference.
 
         Returns:
-            List of variable names in a logical order for inference
+            Variables in topological order (causes before effects)
         """
-        # For now, just return all variables
-        # In a more sophisticated implementation, we would compute a topological sort
-        return list(self.scm.variables())
+        return list(self._get_compiled().order)
+
+    def _get_compiled(self) -> CompiledSCM:
+        """Return the compiled SCM, recompiling if the model changed."""
+        with self._lock:
+            if self._compiled.signature != CompiledSCM.graph_signature(self.scm):
+                self.refresh()
+            return self._compiled
+
+    def refresh(self) -> None:
+        """
+        Recompile the SCM and drop cached results.
+
+        Changes made through the StructuralCausalModel methods are picked up
+        automatically; call this after editing ``scm.graph`` directly.
+        """
+        with self._lock:
+            self._compiled = CompiledSCM(self.scm)
+            self._ordered_variables = self._compiled.order
+            self._cache.clear()
 
     def _compute_cache_key(
         self, evidence: Dict[str, Any], interventions: Dict[str, Any]
-    ) -> str:
+    ) -> Hashable:
         """
         Compute a cache key for a counterfactual query.
 
@@ -74,16 +104,41 @@ class CounterfactualEngine:
             interventions: Variables to intervene on with assigned values
 
         Returns:
-            A string hash key
+            A hashable key; falls back to a JSON string for unhashable values
         """
-        # Combine evidence and interventions into a sorted JSON string for
-        # consistent hashing
-        key_dict = {
-            "evidence": dict(sorted(evidence.items())),
-            "interventions": dict(sorted(interventions.items())),
-        }
-        key_str = json.dumps(key_dict, sort_keys=True)
-        return hashlib.md5(key_str.encode()).hexdigest()
+        try:
+            key = (
+                tuple(sorted(evidence.items())),
+                tuple(sorted(interventions.items())),
+            )
+            hash(key)
+            return key
+        except TypeError:
+            return json.dumps(
+                {"evidence": evidence, "interventions": interventions},
+                sort_keys=True,
+                default=str,
+            )
+
+    def _cache_get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return result.copy()
+
+    def _cache_put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        if self._max_cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = result.copy()
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
 
     def predict_counterfactual(
         self, evidence: Dict[str, Any], interventions: Dict[str, Any]
@@ -98,153 +153,115 @@ class CounterfactualEngine:
 
         Returns:
             Counterfactual predictions as a dict of variable values.
-        """
-        # Check cache first
-        cache_key = self._compute_cache_key(evidence, interventions)
-        if cache_key in self._cache:
-            self._cache_hits += 1
-            return self._cache[cache_key].copy()
 
-        self._cache_misses += 1
-
-        # Perform counterfactual inference
-        start_time = time.time()
-
-        # Implementation of proper counterfactual inference would involve:
-        # 1. Abduction: Update the exogenous variables to be consistent with evidence
-        # 2. Action: Modify the model by removing incoming edges to intervention variables
-        # 3. Prediction: Compute the values of all variables in the modified model
-
-        # For now, we have a simple placeholder implementation
-        cf_results = evidence.copy()
-        cf_results.update(interventions)
-
-        # We'll iterate through variables in our computed order to simulate proper
-        # inference
-        for var in self._ordered_variables:
-            # Skip intervention variables (their values are fixed)
-            if var in interventions:
-                continue
-
-            # In a real implementation, we would apply the structural equations for each variable
-            # For now, just keep the values from evidence or placeholder values
-            if var not in cf_results:
-                # This is a placeholder - in a real implementation we would compute
-                # the value based on the SCM's structural equations
-                cf_results[var] = 0.5
-
-        # Store in cache if not full
-        if len(self._cache) < self._max_cache_size:
-            self._cache[cache_key] = cf_results.copy()
-        else:
-            # In a more sophisticated implementation, we would use an LRU cache
-            # For now, just log that the cache is full
-            logger.debug("Counterfactual cache is full, not storing result")
-
-        inference_time = time.time() - start_time
-        logger.debug(f"Counterfactual inference completed in {inference_time:.4f}s")
-
-        return cf_results
+        Raises:
+            ValueError: If a model variable is given a non-numeric value.
+        """
+        result = self.predict_counterfactuals_batch([(evidence, interventions)])[0]
+        if "error" in result and len(result) == 1:
+            raise ValueError(result["error"])
+        return result
 
     def predict_counterfactuals_batch(
         self, queries: List[Tuple[Dict[str, Any], Dict[str, Any]]]
     ) -> List[Dict[str, Any]]:
         """
-        Process multiple counterfactual queries in parallel for improved performance.
+        Answer many counterfactual queries with one vectorised pass.
+
+        Results are aligned with the input: ``results[i]`` answers
+        ``queries[i]``. Duplicate queries are computed once.
 
         Args:
             queries: List of (evidence, interventions) tuples
 
         Returns:
-            List of counterfactual prediction results
+            List of counterfactual prediction results; a query with invalid
+            values yields ``{"error": message}``
         """
         if not queries:
             return []
 
-        # If only one query, just use the regular method
-        if len(queries) == 1:
-            evidence, interventions = queries[0]
-            return [self.predict_counterfactual(evidence, interventions)]
-
-        # Check cache first to avoid unnecessary parallel processing
-        results = []
-        uncached_indices = []
-        uncached_queries = []
-
-        # Process cached queries first
+        compiled = self._get_compiled()  # drops cached results if the SCM changed
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        # Unique uncached queries -> indices of the inputs they answer
+        pending: "OrderedDict[Hashable, List[int]]" = OrderedDict()
         for i, (evidence, interventions) in enumerate(queries):
-            cache_key = self._compute_cache_key(evidence, interventions)
-            if cache_key in self._cache:
-                self._cache_hits += 1
-                results.append(self._cache[cache_key].copy())
+            key = self._compute_cache_key(evidence, interventions)
+            if key in pending:
+                pending[key].append(i)
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[i] = cached
             else:
-                self._cache_misses += 1
-                # Use None as a placeholder for uncached results
-                results.append(None)
-                uncached_indices.append(i)
-                uncached_queries.append((evidence, interventions))
-
-        # If all queries were cached, return results
-        if not uncached_queries:
-            return results
-
-        # Process uncached queries in parallel
-        start_time = time.time()
-        logger.info(
-            f"Processing {
-                len(uncached_queries)} uncached counterfactual queries in parallel")
-
-        # Use ThreadPoolExecutor for parallelization (ProcessPoolExecutor is
-        # harder to use with shared objects)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all uncached queries
-            futures = []
-            for evidence, interventions in uncached_queries:
-                futures.append(
-                    executor.submit(
-                        self._process_counterfactual_query, evidence, interventions
-                    )
-                )
-
-            # Process results as they complete
-            for i, future in enumerate(as_completed(futures)):
-                try:
-                    cf_result = future.result()
-                    # Update results list with the computed result
-                    results[uncached_indices[i]] = cf_result
-                except Exception as e:
-                    logger.error(f"Error in parallel counterfactual computation: {e}")
-                    # Set a default error result
-                    results[uncached_indices[i]] = {"error": str(e)}
-
-        parallel_time = time.time() - start_time
-        logger.info(
-            f"Batch counterfactual processing completed in {parallel_time:.4f}s"
-        )
+                pending[key] = [i]
+
+        if pending:
+            start_time = time.time()
+            keys = list(pending)
+            computed = self._infer(
+                compiled, [queries[pending[key][0]] for key in keys]
+            )
+            for key, result in zip(keys, computed):
+                if "error" not in result:
+                    self._cache_put(key, result)
+                for i in pending[key]:
+                    results[i] = result.copy()
+            logger.debug(
+                f"Counterfactual inference for {len(keys)} queries completed in "
+                f"{time.time() - start_time:.4f}s"
+            )
+
+        return results  # type: ignore[return-value]
+
+    def _infer(
+        self,
+        compiled: CompiledSCM,
+        queries: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Run abduction, action and prediction for uncached queries."""
+        index = compiled.index
+        shape = (len(queries), len(compiled.variables))
+        evidence = np.full(shape, np.nan)
+        mask = np.zeros(shape, dtype=bool)
+        values = np.zeros(shape)
+        errors: Dict[int, str] = {}
+
+        for row, (query_evidence, query_interventions) in enumerate(queries):
+            try:
+                for var, value in query_evidence.items():
+                    k = index.get(var)
+                    if k is not None and value is not None:
+                        evidence[row, k] = float(value)
+                for var, value in query_interventions.items():
+                    k = index.get(var)
+                    if k is not None:
+                        values[row, k] = float(value)
+                        mask[row, k] = True
+            except (TypeError, ValueError) as e:
+                errors[row] = f"Non-numeric value for {var!r}: {e}"
+                evidence[row], mask[row] = np.nan, False
+
+        outcome = compiled.counterfactuals(evidence, mask, values).tolist()
 
+        results = []
+        for row, (query_evidence, query_interventions) in enumerate(queries):
+            if row in errors:
+                logger.error(f"Counterfactual query failed: {errors[row]}")
+                results.append({"error": errors[row]})
+                continue
+            # Variables outside the model are passed through unchanged
+            cf_results = dict(query_evidence)
+            cf_results.update(zip(compiled.variables, outcome[row]))
+            cf_results.update(query_interventions)
+            results.append(cf_results)
         return results
 
-    def _process_counterfactual_query(
-        self, evidence: Dict[str, Any], interventions: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Process a single counterfactual query, for use in parallel execution.
-
-        Args:
-            evidence: Observed variable values
-            interventions: Variables to intervene on with assigned values
-
-        Returns:
-            Counterfactual prediction result
-        """
-        # Compute the counterfactual
-        result = self.predict_counterfactual(evidence, interventions)
-        return result
-
     def clear_cache(self):
         """Clear the counterfactual cache."""
-        cache_size = len(self._cache)
-        self._cache = {}
+        with self._lock:
+            cache_size = len(self._cache)
+            self._cache.clear()
         logger.info(f"Cleared counterfactual cache ({cache_size} entries)")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -257,5 +274,6 @@ class CounterfactualEngine:
             "max_cache_size": self._max_cache_size,
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
+            "cache_evictions": self._cache_evictions,
             "hit_ratio": hit_ratio,
         }
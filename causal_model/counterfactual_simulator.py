@@ -269,6 +269,9 @@ class CounterfactualSimulator:
                 f"Unknown causal discovery method: {method}, using default approach"
             )
 
+        # Structural equations used for counterfactual inference
+        self.scm.fit_linear_equations(data)
+
         # Save the SCM
         if self.storage_enabled:
             scm_path = os.path.join(self.model_path, "scm.pkl")
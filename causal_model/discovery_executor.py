@@ -0,0 +1,568 @@
+"""
+Discovery Execution Layer
+
+Runs the conditional independence test sequences of OptimizedCausalDiscovery.
+Compared with a fresh process pool per batch of edges, this layer uses:
+
+- one long-lived worker pool per process (``get_worker_pool``), reused across
+  batches and discovery runs;
+- a dataset copied once into shared memory (``SharedDataset``); workers
+  attach to it by name instead of receiving a pickled DataFrame per task;
+- work units sized from the measured cost of recent tasks
+  (``AdaptiveChunker``) instead of a fixed number of edges;
+- a p-value cache keyed by (x, y, conditioning set) (``CITestCache``), shared
+  by symmetric edges, conditioning-set levels and repeated runs. P-values
+  are cached rather than decisions, so runs with a different alpha reuse it.
+
+Test semantics follow the original implementation: for a pair (x, y) the
+remaining variables are scanned in column order with conditioning sets of
+growing size, and the pair is independent as soon as the correlation of
+``x - mean(S)`` and ``y - mean(S)`` has a p-value above alpha.
+"""
+
+import atexit
+import itertools
+import logging
+import math
+import multiprocessing as mp
+import sys
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import special
+
+logger = logging.getLogger(__name__)
+
+# Conditioning sets have at most this many variables. The empty set is not
+# tested: the mean of no columns is undefined, so the residual test could
+# never report independence for it.
+MAX_CONDITIONING_SIZE = 2
+
+# Upper bound on the number of floats materialised per vectorised block
+BLOCK_ELEMENTS = 1_000_000
+
+PairTask = Tuple[int, int, int]  # (x index, y index, first test index)
+PairOutcome = Tuple[int, int, int, np.ndarray]  # task + p-values from start
+
+
+# --- Test sequence -----------------------------------------------------------
+
+
+def conditioning_sizes(n_others: int) -> range:
+    """Conditioning set sizes tested for a pair with n_others candidate variables."""
+    return range(1, min(MAX_CONDITIONING_SIZE, n_others - 1) + 1)
+
+
+@lru_cache(maxsize=64)
+def _combinations(n: int, size: int) -> np.ndarray:
+    """All size-combinations of range(n) in itertools.combinations order."""
+    if size == 1:
+        combos = np.arange(n).reshape(-1, 1)
+    elif size == 2:
+        combos = np.column_stack(np.triu_indices(n, 1))
+    else:
+        flat = np.fromiter(
+            (k for combo in itertools.combinations(range(n), size) for k in combo),
+            dtype=np.intp,
+            count=math.comb(n, size) * size,
+        )
+        combos = flat.reshape(-1, size)
+    combos.setflags(write=False)
+    return combos
+
+
+def total_tests(n_vars: int) -> int:
+    """Length of the full test sequence of a pair in a dataset of n_vars columns."""
+    n_others = n_vars - 2
+    return sum(math.comb(n_others, size) for size in conditioning_sizes(n_others))
+
+
+def sequence_index(
+    n_vars: int, x: int, y: int, cond_set: Sequence[int]
+) -> Optional[int]:
+    """
+    Position of a conditioning set in the test sequence of (x, y).
+
+    Args:
+        n_vars: Number of dataset columns.
+        x, y: Column indices of the pair.
+        cond_set: Column indices of the conditioning variables.
+
+    Returns:
+        The sequence index, or None if the set is never tested for this pair.
+    """
+    n_others = n_vars - 2
+    size = len(cond_set)
+    if size not in conditioning_sizes(n_others) or {x, y} & set(cond_set):
+        return None
+    # Position of each conditioning column among the other columns
+    positions = sorted(c - (c > x) - (c > y) for c in cond_set)
+    if len(set(positions)) != size or positions[0] < 0 or positions[-1] >= n_others:
+        return None
+
+    index = sum(math.comb(n_others, s) for s in range(1, size))
+    previous = -1
+    for t, position in enumerate(positions):
+        for v in range(previous + 1, position):
+            index += math.comb(n_others - 1 - v, size - 1 - t)
+        previous = position
+    return index
+
+
+def residual_pvalues(x: np.ndarray, y: np.ndarray, means: np.ndarray) -> np.ndarray:
+    """
+    Pearson p-values of ``x - means[:, k]`` against ``y - means[:, k]`` for every k.
+
+    Matches scipy.stats.pearsonr; degenerate (constant or NaN) residuals give NaN.
+    """
+    n = x.shape[0]
+    rx = x[:, None] - means
+    ry = y[:, None] - means
+    rx -= rx.mean(axis=0)
+    ry -= ry.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.einsum("ij,ij->j", rx, ry) / np.sqrt(
+            np.einsum("ij,ij->j", rx, rx) * np.einsum("ij,ij->j", ry, ry)
+        )
+        r = np.clip(r, -1.0, 1.0)
+        if n < 3:
+            return np.where(np.isnan(r), np.nan, 1.0) if n == 2 else r * np.nan
+        dof = n - 2
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        return 2.0 * special.stdtr(dof, -np.abs(t))
+
+
+def pair_test_pvalues(
+    data: np.ndarray,
+    x: int,
+    y: int,
+    start: int,
+    alpha: float,
+    has_nan: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    Run the test sequence of (x, y) from index start until the first independence.
+
+    Tests are evaluated in vectorised blocks of conditioning sets.
+
+    Args:
+        data: Samples x variables float matrix.
+        x, y: Column indices of the pair.
+        start: First sequence index to evaluate.
+        alpha: Significance threshold; evaluation stops at the first p > alpha.
+        has_nan: Whether data contains missing values (checked if None).
+
+    Returns:
+        P-values of sequence indices start, start + 1, ... up to and including
+        the first one above alpha (or to the end of the sequence).
+    """
+    n_samples, n_vars = data.shape
+    others = np.delete(np.arange(n_vars), [x, y])
+    if has_nan is None:
+        has_nan = bool(np.isnan(data).any())
+    col_x, col_y = data[:, x], data[:, y]
+
+    pvalues: List[np.ndarray] = []
+    offset = 0
+    for size in conditioning_sizes(len(others)):
+        combos = _combinations(len(others), size)
+        count = len(combos)
+        if start >= offset + count:
+            offset += count
+            continue
+        max_block = max(1, BLOCK_ELEMENTS // max(1, n_samples * size))
+        # Start small: many pairs separate on one of their first tests
+        block_size = min(64, max_block)
+        position = max(start - offset, 0)
+        while position < count:
+            block = combos[position: position + block_size]
+            block_size = min(2 * block_size, max_block)
+            cond = data[:, others[block]]  # samples x block x size
+            if has_nan:
+                # pandas' row mean skips missing values
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    means = np.nanmean(cond, axis=2)
+            else:
+                means = cond.mean(axis=2)
+            block_p = residual_pvalues(col_x, col_y, means)
+            hits = np.flatnonzero(block_p > alpha)
+            if hits.size:
+                pvalues.append(block_p[: hits[0] + 1])
+                return np.concatenate(pvalues)
+            pvalues.append(block_p)
+            position += len(block)
+        offset += count
+    return np.concatenate(pvalues) if pvalues else np.empty(0)
+
+
+def run_pair_tasks(
+    data: np.ndarray, tasks: Iterable[PairTask], alpha: float
+) -> List[PairOutcome]:
+    """Run a work unit of pair tasks against a data matrix."""
+    has_nan = bool(np.isnan(data).any())
+    return [
+        (x, y, start, pair_test_pvalues(data, x, y, start, alpha, has_nan))
+        for x, y, start in tasks
+    ]
+
+
+# --- Shared memory -----------------------------------------------------------
+
+
+class SharedDataset:
+    """
+    A float64 data matrix placed once in shared memory for pool workers.
+
+    The segment is unlinked by close(), or when the object is garbage
+    collected or the interpreter exits.
+    """
+
+    def __init__(self, matrix: np.ndarray):
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes))
+        view = np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)
+        view[...] = matrix
+        del view
+        self.spec: Tuple[str, Tuple[int, ...]] = (shm.name, matrix.shape)
+        self._finalizer = weakref.finalize(self, _release_shared, shm)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """Release and unlink the shared segment."""
+        self._finalizer()
+
+
+def _release_shared(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        logger.debug(f"Shared dataset {shm.name} still referenced; unlinking only")
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# Worker-side attachments, most recently used last
+_ATTACHED: "OrderedDict[str, Tuple[shared_memory.SharedMemory, np.ndarray]]" = (
+    OrderedDict()
+)
+_MAX_ATTACHED = 4
+
+
+def _attach_shared(spec: Tuple[str, Tuple[int, ...]]) -> np.ndarray:
+    """Attach to a SharedDataset by name, reusing the attachment across tasks."""
+    name, shape = spec
+    entry = _ATTACHED.get(name)
+    if entry is not None:
+        _ATTACHED.move_to_end(name)
+        return entry[1]
+
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # The segment is already tracked by the creating process
+        shm = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _ATTACHED[name] = (shm, array)
+    while len(_ATTACHED) > _MAX_ATTACHED:
+        _, (old_shm, old_array) = _ATTACHED.popitem(last=False)
+        del old_array
+        try:
+            old_shm.close()
+        except BufferError:
+            pass
+    return array
+
+
+def _worker_run(
+    spec: Tuple[str, Tuple[int, ...]], tasks: List[PairTask], alpha: float
+) -> Tuple[List[PairOutcome], float]:
+    """Pool entry point: run a work unit and report its wall time."""
+    started = time.perf_counter()
+    outcomes = run_pair_tasks(_attach_shared(spec), tasks, alpha)
+    return outcomes, time.perf_counter() - started
+
+
+# --- Worker pool -------------------------------------------------------------
+
+_POOL_LOCK = threading.Lock()
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def _pool_context():
+    """
+    Multiprocessing context for pool workers.
+
+    Forking a process that already runs threads can copy held locks into the
+    child, so workers come from a forkserver that preloads this module, or
+    are spawned where forkserver is unavailable.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["causal_model.discovery_executor"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def get_worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the process-wide discovery pool, creating it on first use.
+
+    A pool with at least max_workers workers is reused; callers bound their
+    own concurrency by the number of work units they keep in flight. When a
+    larger pool is needed it replaces the old one, which finishes its
+    submitted work units in the background.
+    """
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS < max_workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            logger.info(f"Starting causal discovery pool with {max_workers} workers")
+            _POOL = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_pool_context()
+            )
+            _POOL_WORKERS = max_workers
+        return _POOL
+
+
+def shutdown_worker_pool(wait_for_tasks: bool = True) -> None:
+    """Shut down the process-wide discovery pool (it is recreated on next use)."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=wait_for_tasks, cancel_futures=not wait_for_tasks)
+        _POOL, _POOL_WORKERS = None, 0
+
+
+atexit.register(shutdown_worker_pool)
+
+
+# --- Scheduling and caching --------------------------------------------------
+
+
+class AdaptiveChunker:
+    """Sizes work units so each takes about target_seconds of worker time."""
+
+    def __init__(
+        self,
+        target_seconds: float = 0.05,
+        initial_size: int = 4,
+        max_size: int = 512,
+        smoothing: float = 0.3,
+    ):
+        self.target_seconds = target_seconds
+        self.max_size = max_size
+        self.smoothing = smoothing
+        self._size = max(1, min(initial_size, max_size))
+        self.cost_per_task: Optional[float] = None
+
+    def size(self) -> int:
+        """Number of tasks to put in the next work unit."""
+        return self._size
+
+    def record(self, tasks: int, elapsed: float) -> None:
+        """Update the per-task cost estimate from a completed work unit."""
+        if tasks <= 0:
+            return
+        cost = max(elapsed, 1e-6) / tasks
+        if self.cost_per_task is None:
+            self.cost_per_task = cost
+        else:
+            self.cost_per_task += self.smoothing * (cost - self.cost_per_task)
+        self._size = int(
+            max(1, min(self.max_size, self.target_seconds / self.cost_per_task))
+        )
+
+
+class CITestCache:
+    """
+    P-values of conditional independence tests keyed by (x, y, conditioning set).
+
+    Each unordered pair stores the p-values of the prefix of its test sequence
+    evaluated so far, so lookups by conditioning set and resuming a sequence
+    are both O(1). Least recently used pairs are evicted once more than
+    max_tests p-values are held.
+    """
+
+    def __init__(self, n_vars: int, max_tests: int = 5_000_000):
+        self.n_vars = n_vars
+        self.max_tests = max_tests
+        self._prefixes: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(x: int, y: int) -> Tuple[int, int]:
+        return (x, y) if x < y else (y, x)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def prefix(self, x: int, y: int) -> np.ndarray:
+        """P-values cached for (x, y), in test sequence order."""
+        with self._lock:
+            key = self._key(x, y)
+            values = self._prefixes.get(key)
+            if values is None:
+                return np.empty(0)
+            self._prefixes.move_to_end(key)
+            return values
+
+    def extend(self, x: int, y: int, start: int, pvalues: np.ndarray) -> None:
+        """Append p-values for sequence indices start, start + 1, ... of (x, y)."""
+        with self._lock:
+            key = self._key(x, y)
+            current = self._prefixes.pop(key, np.empty(0))
+            self._size -= len(current)
+            if start > len(current):
+                return  # the prefix was evicted meanwhile
+            merged = np.concatenate([current[:start], pvalues])
+            self._prefixes[key] = merged
+            self._size += len(merged)
+            while self._size > self.max_tests and len(self._prefixes) > 1:
+                _, evicted = self._prefixes.popitem(last=False)
+                self._size -= len(evicted)
+
+    def p_value(self, x: int, y: int, cond_set: Sequence[int]) -> Optional[float]:
+        """Cached p-value of x independent of y given cond_set, if known."""
+        x, y = self._key(x, y)
+        index = sequence_index(self.n_vars, x, y, cond_set)
+        if index is None:
+            return None
+        values = self.prefix(x, y)
+        return float(values[index]) if index < len(values) else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._prefixes.clear()
+            self._size = 0
+
+
+class DiscoveryExecutor:
+    """Runs pair test sequences inline or on the shared worker pool."""
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        max_workers: int = 1,
+        cache: Optional[CITestCache] = None,
+        chunker: Optional[AdaptiveChunker] = None,
+    ):
+        """
+        Args:
+            matrix: Samples x variables data matrix.
+            max_workers: Worker processes to use (1 runs inline).
+            cache: P-value cache (a new one is created if omitted).
+            chunker: Work unit sizing policy.
+        """
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        self.n_vars = self.matrix.shape[1]
+        self.max_workers = max(1, int(max_workers))
+        self.cache = cache if cache is not None else CITestCache(self.n_vars)
+        self.chunker = chunker or AdaptiveChunker()
+        self._shared: Optional[SharedDataset] = None
+        self._lock = threading.Lock()
+        self.stats = {"pairs": 0, "cache_hits": 0, "tests": 0, "work_units": 0}
+
+    def _shared_spec(self) -> Tuple[str, Tuple[int, ...]]:
+        with self._lock:
+            if self._shared is None or self._shared.closed:
+                self._shared = SharedDataset(self.matrix)
+            return self._shared.spec
+
+    def close(self) -> None:
+        """Release the shared copy of the dataset (the pool stays up)."""
+        with self._lock:
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+
+    def independent_pairs(
+        self, pairs: Iterable[Tuple[int, int]], alpha: float
+    ) -> Dict[Tuple[int, int], bool]:
+        """
+        Decide conditional independence for each unordered pair.
+
+        Args:
+            pairs: Column index pairs; (x, y) and (y, x) are the same test.
+            alpha: Significance threshold.
+
+        Returns:
+            Dict keyed by (min, max) index pair, True if independent.
+        """
+        total = total_tests(self.n_vars)
+        decisions: Dict[Tuple[int, int], bool] = {}
+        pending: List[PairTask] = []
+        seen = set()
+        for x, y in pairs:
+            key = (x, y) if x < y else (y, x)
+            if key in seen:
+                continue
+            seen.add(key)
+            prefix = self.cache.prefix(*key)
+            if (prefix > alpha).any():
+                decisions[key] = True
+            elif len(prefix) >= total:
+                decisions[key] = False
+            else:
+                pending.append((key[0], key[1], len(prefix)))
+                continue
+            self.stats["cache_hits"] += 1
+        self.stats["pairs"] += len(seen)
+
+        for x, y, start, pvalues in self._run(pending, alpha):
+            self.cache.extend(x, y, start, pvalues)
+            self.stats["tests"] += len(pvalues)
+            decisions[(x, y)] = bool((pvalues > alpha).any())
+        return decisions
+
+    def _run(self, tasks: List[PairTask], alpha: float) -> List[PairOutcome]:
+        if not tasks:
+            return []
+        if self.max_workers == 1 or len(tasks) == 1:
+            self.stats["work_units"] += 1
+            return run_pair_tasks(self.matrix, tasks, alpha)
+
+        outcomes: List[PairOutcome] = []
+        queue = deque(tasks)
+        in_flight: Dict[object, List[PairTask]] = {}
+        try:
+            pool = get_worker_pool(self.max_workers)
+            spec = self._shared_spec()
+            while queue or in_flight:
+                while queue and len(in_flight) < 2 * self.max_workers:
+                    size = min(self.chunker.size(), len(queue))
+                    unit = [queue.popleft() for _ in range(size)]
+                    in_flight[pool.submit(_worker_run, spec, unit, alpha)] = unit
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    # A failed unit stays in flight so the fallback reruns it
+                    unit_outcomes, elapsed = future.result()
+                    unit = in_flight.pop(future)
+                    self.chunker.record(len(unit), elapsed)
+                    self.stats["work_units"] += 1
+                    outcomes.extend(unit_outcomes)
+        except Exception as e:
+            # Broken pool or shared memory unavailable: finish inline
+            logger.warning(f"Parallel independence tests failed, running inline: {e}")
+            for future, unit in in_flight.items():
+                future.cancel()
+                queue.extendleft(reversed(unit))
+            shutdown_worker_pool(wait_for_tasks=False)
+            outcomes.extend(run_pair_tasks(self.matrix, list(queue), alpha))
+        return outcomes
@@ -6,9 +6,7 @@ Provides efficient implementations of causal discovery algorithms for the Pulse
 
 import logging
 import os
-import itertools
 from typing import List, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Handle pandas import properly
 try:
@@ -28,7 +26,11 @@ except ImportError:
     NX_AVAILABLE = False
 
 from causal_model.structural_causal_model import StructuralCausalModel
-from scipy.stats import pearsonr
+from causal_model.discovery_executor import (
+    CITestCache,
+    DiscoveryExecutor,
+    pair_test_pvalues,
+)
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -38,6 +40,11 @@ class OptimizedCausalDiscovery:
     """
     Optimized implementation of causal discovery algorithms.
     Uses vectorized operations, parallel processing, and caching for performance.
+
+    Independence tests run through a DiscoveryExecutor: a persistent worker
+    pool reading the dataset from shared memory, with a p-value cache that
+    lives as long as this instance. Call close() to release the shared copy
+    of the dataset early.
     """
 
     def __init__(self, data, max_workers: Optional[int] = None):
@@ -66,6 +73,30 @@ class OptimizedCausalDiscovery:
             )
             self.corr_matrix = None
 
+        self._executor: Optional[DiscoveryExecutor] = None
+
+    @property
+    def executor(self) -> DiscoveryExecutor:
+        """Execution layer for independence tests, created on first use."""
+        if self._executor is None:
+            matrix = self.data.to_numpy(dtype=float)
+            self._executor = DiscoveryExecutor(
+                matrix,
+                max_workers=self.max_workers,
+                cache=CITestCache(matrix.shape[1]),
+            )
+        return self._executor
+
+    @property
+    def ci_cache(self) -> CITestCache:
+        """P-values of the independence tests run so far."""
+        return self.executor.cache
+
+    def close(self) -> None:
+        """Release the shared-memory copy of the dataset."""
+        if self._executor is not None:
+            self._executor.close()
+
     def vectorized_pc_algorithm(self, alpha: float = 0.05) -> StructuralCausalModel:
         """
         Vectorized implementation of the PC algorithm for causal discovery.
@@ -116,43 +147,29 @@ class OptimizedCausalDiscovery:
         """
         Run conditional independence tests in parallel for edge removal.
 
+        Both directions of an edge share one test sequence, and sequences
+        already decided by cached p-values are not run again.
+
         Args:
             scm: Structural causal model to modify
             alpha: Significance threshold
         """
-        # Get all edges as an array for vectorized operations
+        columns = {var: k for k, var in enumerate(self.data.columns)}
         edges = list(scm.graph.edges())
+        pairs = [(columns[var1], columns[var2]) for var1, var2 in edges]
+
+        independent = self.executor.independent_pairs(pairs, alpha)
 
-        # Process in batches to avoid memory issues with large graphs
-        batch_size = 100
-        for i in range(0, len(edges), batch_size):
-            edge_batch = edges[i: i + batch_size]
-
-            # Run tests in parallel
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = []
-                for edge in edge_batch:
-                    var1, var2 = edge
-                    futures.append(
-                        executor.submit(
-                            self._test_conditional_independence,
-                            var1,
-                            var2,
-                            list(scm.graph.nodes()),
-                            alpha,
-                        )
-                    )
-
-                # Process results
-                edges_to_remove = []
-                for future, edge in zip(as_completed(futures), edge_batch):
-                    if future.result():
-                        edges_to_remove.append(edge)
-
-            # Remove edges found to be conditionally independent
-            for edge in edges_to_remove:
-                if scm.graph.has_edge(*edge):
-                    scm.graph.remove_edge(*edge)
+        # Remove edges found to be conditionally independent
+        for (var1, var2), (i, j) in zip(edges, pairs):
+            if independent[(min(i, j), max(i, j))] and scm.graph.has_edge(var1, var2):
+                scm.graph.remove_edge(var1, var2)
+
+        stats = self.executor.stats
+        self.logger.debug(
+            f"Independence tests: {stats['pairs']} pairs, "
+            f"{stats['cache_hits']} from cache, {stats['tests']} tests run"
+        )
 
     def _test_conditional_independence(
         self, var1: str, var2: str, all_vars: List[str], alpha: float
@@ -169,41 +186,11 @@ class OptimizedCausalDiscovery:
         Returns:
             True if variables are conditionally independent, False otherwise
         """
-        # Get potential conditioning sets (excluding the variables themselves)
-        conditioning_vars = [v for v in all_vars if v != var1 and v != var2]
-
-        # Test with increasingly large conditioning sets
-        for size in range(
-            min(3, len(conditioning_vars))
-        ):  # Limit to sets of size 3 for performance
-            for cond_set in itertools.combinations(conditioning_vars, size):
-                # Calculate partial correlation
-                try:
-                    # For simplicity, using residual correlation
-                    # In a production system, use proper partial correlation
-                    X = self.data[list(cond_set) + [var1]]
-                    Y = self.data[list(cond_set) + [var2]]
-
-                    # Get residuals after regressing out conditioning variables
-                    X_resid = X[var1] - X[list(cond_set)].mean(axis=1)
-                    Y_resid = Y[var2] - Y[list(cond_set)].mean(axis=1)
-
-                    # Calculate correlation of residuals
-                    _corr, p_value_raw = pearsonr(X_resid, Y_resid)
-                    p_value_scalar: float = float(
-                        p_value_raw
-                    )  # Extract the scalar p-value and cast to float
-
-                    # If p-value is high, variables are independent given conditioning
-                    # set
-                    if p_value_scalar > alpha:
-                        return True
-                except Exception as e:
-                    self.logger.warning(
-                        f"Error in independence test for {var1},{var2}: {e}"
-                    )
-
-        return False
+        matrix = self.data[list(all_vars)].to_numpy(dtype=float)
+        pvalues = pair_test_pvalues(
+            matrix, all_vars.index(var1), all_vars.index(var2), 0, alpha
+        )
+        return bool((pvalues > alpha).any())
 
     def _orient_edges(self, scm: StructuralCausalModel) -> None:
         """
@@ -1,10 +1,20 @@
 """
 Structural Causal Model representation for Pulse.
 Defines a causal graph and supports setting up relationships.
+
+Each variable may carry a structural equation with additive noise,
+``X = f(parents) + U``. Equations are linear (intercept plus one coefficient
+per parent) unless a vectorised function is supplied; variables without an
+equation default to ``X = U``.
 """
 
-from typing import List, Tuple
-import networkx as nx
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.lazy_import import lazy_import
+
+nx = lazy_import("networkx")
 
 
 class StructuralCausalModel:
@@ -15,14 +25,96 @@ class StructuralCausalModel:
     def __init__(self):
         # Directed graph where edges indicate causal influence
         self.graph = nx.DiGraph()
+        # Structural equations keyed by variable
+        self.equations: Dict[str, Dict] = {}
+        # Bumped on every change made through this interface
+        self.version = 0
+
+    def __setstate__(self, state):
+        # Models pickled before equations were introduced
+        state.setdefault("equations", {})
+        state.setdefault("version", 0)
+        self.__dict__.update(state)
 
     def add_variable(self, name: str):
         """Add a variable node to the graph."""
         self.graph.add_node(name)
+        self.version += 1
 
     def add_causal_edge(self, cause: str, effect: str):
         """Add a directed edge from cause to effect."""
         self.graph.add_edge(cause, effect)
+        self.version += 1
+
+    def set_equation(
+        self,
+        variable: str,
+        coefficients: Optional[Dict[str, float]] = None,
+        intercept: float = 0.0,
+        function: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None,
+    ):
+        """
+        Set the structural equation of a variable.
+
+        Args:
+            variable: Variable the equation defines.
+            coefficients: Linear weight per parent; parents without a weight
+                contribute nothing.
+            intercept: Constant term of the linear equation.
+            function: Vectorised alternative to the linear form. Called with
+                a dict of parent name -> array of parent values (one entry per
+                query) and must return an array of the same length.
+        """
+        if variable not in self.graph:
+            self.graph.add_node(variable)
+        self.equations[variable] = {
+            "coefficients": dict(coefficients or {}),
+            "intercept": float(intercept),
+            "function": function,
+        }
+        self.version += 1
+
+    def equation(self, variable: str) -> Optional[Dict]:
+        """Return the structural equation of a variable, if one is set."""
+        return self.equations.get(variable)
+
+    def fit_linear_equations(self, data) -> None:
+        """
+        Fit a linear equation for every variable by least squares on its parents.
+
+        Feedback edges of cyclic graphs (see compiled_scm.causal_order) are
+        not used as regressors, matching how counterfactuals are evaluated.
+
+        Args:
+            data: DataFrame with one column per variable; variables missing
+                from it keep their current equation.
+        """
+        from causal_model.compiled_scm import causal_order
+
+        _, dropped = causal_order(self)
+        dropped = set(dropped)
+        for variable in self.graph.nodes:
+            if variable not in data.columns:
+                continue
+            parents = [
+                p
+                for p in self.graph.predecessors(variable)
+                if p in data.columns and (p, variable) not in dropped
+            ]
+            subset = data[[variable] + parents].dropna()
+            if subset.empty:
+                continue
+            design = np.column_stack(
+                [np.ones(len(subset)), subset[parents].to_numpy(dtype=float)]
+            )
+            solution, *_ = np.linalg.lstsq(
+                design, subset[variable].to_numpy(dtype=float), rcond=None
+            )
+            self.set_equation(
+                variable,
+                coefficients=dict(zip(parents, solution[1:].tolist())),
+                intercept=float(solution[0]),
+            )
 
     def variables(self) -> List[str]:
         """List all variables in the model."""
@@ -39,10 +131,13 @@ class StructuralCausalModel:
     def remove_variable(self, name: str):
         """Remove a variable node from the model."""
         self.graph.remove_node(name)
+        self.equations.pop(name, None)
+        self.version += 1
 
     def remove_causal_edge(self, cause: str, effect: str):
         """Remove a causal edge from cause to effect."""
         self.graph.remove_edge(cause, effect)
+        self.version += 1
 
     def parents(self, variable: str):
         """Return parent variables of the given variable."""
@@ -12,45 +12,31 @@ Usage:
 Options:
     --turns N   Number of simulation turns to run (default: 5)
     --output FILE   Optional output file for digest
+
+Subsystems are imported inside the command that needs them, so a short
+invocation such as ``list-versions`` does not pay for loading the
+simulation engine, and importing this module has no side effects.
 """
 
-from ingestion.utils.historical_data_repair import (
-    repair_variable_data,
-    simulate_repair,
-    get_repair_report,
-    revert_to_original,
-    compare_versions,
-    get_all_versions,
-    DEFAULT_REPAIR_STRATEGIES,  # Import for choices
-)
-from analytics.pulse_learning_log import log_learning_event
-from forecast_output.pfpa_logger import log_forecast_to_pfpa
-from forecast_output.forecast_generator import generate_forecast
-from engine.causal_rules import apply_causal_rules
-from engine.turn_engine import run_turn
-from engine.worldstate import WorldState
-from analytics.forecast_memory import ForecastMemory
-from operator_interface.strategos_digest import generate_strategos_digest
-from forecast_output.digest_logger import save_digest_to_file
-from utils.log_utils import get_logger
-from engine.pulse_config import (
-    STARTUP_BANNER,
-    CONFIG_PATH,
-)  # Import centralized configuration
 import sys
 import os
 import argparse
+import importlib
 import json  # Import the json module
 from datetime import datetime, timezone
 
+from utils.log_utils import get_logger
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
 logger = get_logger(__name__)
 
-logger.info("🧠 Starting Pulse...")
 
-print(STARTUP_BANNER)
+def log_learning_event(event_type, data):
+    from analytics.pulse_learning_log import log_learning_event as _log
+
+    _log(event_type, data)
 
 
 # sig_path = ingester.ingest_once()
@@ -64,6 +50,15 @@ def run_pulse_simulation(turns: int = 1):
     Args:
         turns (int): Number of simulation turns to execute.
     """
+    from analytics.forecast_memory import ForecastMemory
+    from engine.causal_rules import apply_causal_rules
+    from engine.turn_engine import run_turn
+    from engine.worldstate import WorldState
+    from forecast_output.digest_logger import save_digest_to_file
+    from forecast_output.forecast_generator import generate_forecast
+    from forecast_output.pfpa_logger import log_forecast_to_pfpa
+    from operator_interface.strategos_digest import generate_strategos_digest
+
     logger.info("\n🌐 Initializing Pulse...\n")
     state = WorldState()
     memory = ForecastMemory()
@@ -107,63 +102,72 @@ def run_pulse_simulation(turns: int = 1):
     save_digest_to_file(digest)
 
 
-# Replace hardcoded paths with configuration-driven design
-try:
-    CONFIG = json.load(open(CONFIG_PATH))
-except FileNotFoundError:
-    logger.error(f"Configuration file not found at {CONFIG_PATH}")
-    CONFIG = {}
-except json.JSONDecodeError as e:
-    logger.error(f"Error parsing configuration file: {e}")
-    CONFIG = {}
-
-# Run post-simulation retrodiction test
-try:
-    from trust_system.retrodiction_engine import simulate_retrodiction_test
-
-    simulate_retrodiction_test()
-    log_learning_event(
-        "forecast_scored",
-        {
-            "forecast_id": "retrodiction_test",
-            "score": "success",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
-    )
-except Exception as e:
-    logger.warning(f"⚠️ Retrodiction failed: {e}")
-    log_learning_event(
-        "exception",
-        {
-            "error": str(e),
-            "context": "retrodiction_test",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
-    )
-# Strategic trust audit
-try:
-    from analytics.trust_audit import audit_forecasts
-
-    audit_forecasts()
-    log_learning_event(
-        "symbolic_contradiction",
-        {
-            "details": "audit_success",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
-    )
-except Exception as e:
-    logger.warning(f"⚠️ Audit failed: {e}")
-    log_learning_event(
-        "exception",
-        {
-            "error": str(e),
-            "context": "trust_audit",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
-    )
+def load_config() -> dict:
+    """Load the configuration-driven paths used by the simulate command."""
+    from engine.pulse_config import CONFIG_PATH
+
+    # Replace hardcoded paths with configuration-driven design
+    try:
+        return json.load(open(CONFIG_PATH))
+    except FileNotFoundError:
+        logger.error(f"Configuration file not found at {CONFIG_PATH}")
+        return {}
+    except json.JSONDecodeError as e:
+        logger.error(f"Error parsing configuration file: {e}")
+        return {}
+
+
+def run_startup_checks() -> None:
+    """Run the retrodiction test and strategic trust audit."""
+    # Run post-simulation retrodiction test
+    try:
+        from trust_system.retrodiction_engine import simulate_retrodiction_test
+
+        simulate_retrodiction_test()
+        log_learning_event(
+            "forecast_scored",
+            {
+                "forecast_id": "retrodiction_test",
+                "score": "success",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Retrodiction failed: {e}")
+        log_learning_event(
+            "exception",
+            {
+                "error": str(e),
+                "context": "retrodiction_test",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    # Strategic trust audit
+    try:
+        from analytics.trust_audit import audit_forecasts
+
+        audit_forecasts()
+        log_learning_event(
+            "symbolic_contradiction",
+            {
+                "details": "audit_success",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Audit failed: {e}")
+        log_learning_event(
+            "exception",
+            {
+                "error": str(e),
+                "context": "trust_audit",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
 
-if __name__ == "__main__":
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser. No subsystem is imported here."""
     parser = argparse.ArgumentParser(
         description="Pulse Simulation and Data Management Engine"
     )
@@ -196,7 +200,6 @@ if __name__ == "__main__":
         "--variable-type",
         type=str,
         default="raw",
-        choices=list(DEFAULT_REPAIR_STRATEGIES.keys()),
         help="Type of variable for strategy selection",
     )
     repair_parser.add_argument(
@@ -219,7 +222,6 @@ if __name__ == "__main__":
         "--variable-type",
         type=str,
         default="raw",
-        choices=list(DEFAULT_REPAIR_STRATEGIES.keys()),
         help="Type of variable for strategy selection",
     )
 
@@ -265,110 +267,219 @@ if __name__ == "__main__":
     )
     versions_parser.add_argument("variable_name", type=str, help="Name of the variable")
 
-    args = parser.parse_args()
-
-    if args.command == "simulate":
-        run_pulse_simulation(turns=args.turns)
-        if args.output:
-            try:
-                with open(args.output, "w", encoding="utf-8") as f:
-                    f.write("# Strategos Digest\n\n")
-                    f.write(
-                        str(
-                            generate_strategos_digest(
-                                ForecastMemory(), n=min(args.turns, 5)
-                            )
+    return parser
+
+
+def _check_variable_type(parser: argparse.ArgumentParser, variable_type: str) -> None:
+    from ingestion.utils.historical_data_repair import DEFAULT_REPAIR_STRATEGIES
+
+    if variable_type not in DEFAULT_REPAIR_STRATEGIES:
+        parser.error(
+            f"argument --variable-type: invalid choice: {variable_type!r} "
+            f"(choose from {', '.join(DEFAULT_REPAIR_STRATEGIES)})"
+        )
+
+
+def cmd_simulate(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    from engine.pulse_config import STARTUP_BANNER
+
+    logger.info("🧠 Starting Pulse...")
+    print(STARTUP_BANNER)
+
+    config = load_config()
+    run_startup_checks()
+
+    run_pulse_simulation(turns=args.turns)
+    if args.output:
+        try:
+            from analytics.forecast_memory import ForecastMemory
+            from operator_interface.strategos_digest import generate_strategos_digest
+
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write("# Strategos Digest\n\n")
+                f.write(
+                    str(
+                        generate_strategos_digest(
+                            ForecastMemory(), n=min(args.turns, 5)
                         )
                     )
-                logger.info(f"Digest exported to {args.output}")
-            except Exception as e:
-                logger.error(f"Failed to export digest: {e}")
-                log_learning_event(
-                    "exception",
-                    {
-                        "error": str(e),
-                        "context": "digest_export",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
                 )
-        # --- Epistemic Mirror Curriculum Learning ---
-        if getattr(args, "auto_upgrade", False):
-            try:
-                import subprocess
+            logger.info(f"Digest exported to {args.output}")
+        except Exception as e:
+            logger.error(f"Failed to export digest: {e}")
+            log_learning_event(
+                "exception",
+                {
+                    "error": str(e),
+                    "context": "digest_export",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+    # --- Epistemic Mirror Curriculum Learning ---
+    if getattr(args, "auto_upgrade", False):
+        try:
+            import subprocess
 
-                upgrade_path = CONFIG.get(
-                    "upgrade_plan_path", "plans/epistemic_upgrade_plan.json"
-                )
-                batch_path = CONFIG.get(
-                    "batch_output_path", "logs/strategic_batch_output.jsonl"
-                )
-                revised_path = CONFIG.get(
-                    "revised_forecasts_path", "logs/revised_forecasts.jsonl"
-                )
-                # Step 1: Generate upgrade plan
+            upgrade_path = config.get(
+                "upgrade_plan_path", "plans/epistemic_upgrade_plan.json"
+            )
+            batch_path = config.get(
+                "batch_output_path", "logs/strategic_batch_output.jsonl"
+            )
+            revised_path = config.get(
+                "revised_forecasts_path", "logs/revised_forecasts.jsonl"
+            )
+            # Step 1: Generate upgrade plan
+            subprocess.run(
+                [
+                    sys.executable,
+                    "dev_tools/propose_epistemic_upgrades.py",
+                    "--output",
+                    upgrade_path,
+                ],
+                check=True,
+            )
+            logger.info(f"Epistemic upgrade plan generated at {upgrade_path}")
+            # Step 2: Apply upgrade plan to latest batch
+            if os.path.exists(batch_path) and os.path.exists(upgrade_path):
                 subprocess.run(
                     [
                         sys.executable,
-                        "dev_tools/propose_epistemic_upgrades.py",
-                        "--output",
+                        "dev_tools/apply_symbolic_upgrades.py",
+                        "--batch",
+                        batch_path,
+                        "--plan",
                         upgrade_path,
+                        "--out",
+                        revised_path,
                     ],
                     check=True,
                 )
-                logger.info(f"Epistemic upgrade plan generated at {upgrade_path}")
-                # Step 2: Apply upgrade plan to latest batch
-                if os.path.exists(batch_path) and os.path.exists(upgrade_path):
-                    subprocess.run(
-                        [
-                            sys.executable,
-                            "dev_tools/apply_symbolic_upgrades.py",
-                            "--batch",
-                            batch_path,
-                            "--plan",
-                            upgrade_path,
-                            "--out",
-                            revised_path,
-                        ],
-                        check=True,
-                    )
-                    logger.info(
-                        f"Applied epistemic upgrade plan to {batch_path}, output: {revised_path}")
-                else:
-                    logger.warning(
-                        f"Batch or upgrade plan not found for application: {batch_path}, {upgrade_path}")
-            except Exception as e:
-                logger.error(f"Failed to generate/apply epistemic upgrade plan: {e}")
-
-    elif args.command == "repair":
-        result = repair_variable_data(
-            args.variable_name,
-            variable_type=args.variable_type,
-            skip_smoothing=args.skip_smoothing,
-            skip_cross_source=args.skip_cross_source,
-        )
-        print(json.dumps(result.to_dict(), indent=2))
+                logger.info(
+                    f"Applied epistemic upgrade plan to {batch_path}, "
+                    f"output: {revised_path}"
+                )
+            else:
+                logger.warning(
+                    "Batch or upgrade plan not found for application: "
+                    f"{batch_path}, {upgrade_path}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to generate/apply epistemic upgrade plan: {e}")
 
-    elif args.command == "simulate-repair":
-        result = simulate_repair(args.variable_name, variable_type=args.variable_type)
-        print(json.dumps(result.to_dict(), indent=2))
 
-    elif args.command == "repair-report":
-        result = get_repair_report(args.variable_name, version_id=args.version)
-        print(json.dumps(result, indent=2))
+def cmd_repair(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    _check_variable_type(parser, args.variable_type)
+    from ingestion.utils.historical_data_repair import repair_variable_data
 
-    elif args.command == "revert":
-        result = revert_to_original(args.variable_name, version_id=args.version)
-        print(json.dumps(result, indent=2))
+    result = repair_variable_data(
+        args.variable_name,
+        variable_type=args.variable_type,
+        skip_smoothing=args.skip_smoothing,
+        skip_cross_source=args.skip_cross_source,
+    )
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+def cmd_simulate_repair(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> None:
+    _check_variable_type(parser, args.variable_type)
+    from ingestion.utils.historical_data_repair import simulate_repair
+
+    result = simulate_repair(args.variable_name, variable_type=args.variable_type)
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+def cmd_repair_report(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> None:
+    from ingestion.utils.historical_data_repair import get_repair_report
+
+    result = get_repair_report(args.variable_name, version_id=args.version)
+    print(json.dumps(result, indent=2))
 
-    elif args.command == "compare-versions":
-        result = compare_versions(
-            args.variable_name, args.version_id1, version_id2=args.version2
-        )
-        print(json.dumps(result, indent=2))
 
-    elif args.command == "list-versions":
-        result = get_all_versions(args.variable_name)
-        print(json.dumps(result, indent=2))
+def cmd_revert(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    from ingestion.utils.historical_data_repair import revert_to_original
 
-    else:
+    result = revert_to_original(args.variable_name, version_id=args.version)
+    print(json.dumps(result, indent=2))
+
+
+def cmd_compare_versions(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> None:
+    from ingestion.utils.historical_data_repair import compare_versions
+
+    result = compare_versions(
+        args.variable_name, args.version_id1, version_id2=args.version2
+    )
+    print(json.dumps(result, indent=2))
+
+
+def cmd_list_versions(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> None:
+    from ingestion.utils.historical_data_repair import get_all_versions
+
+    result = get_all_versions(args.variable_name)
+    print(json.dumps(result, indent=2))
+
+
+COMMANDS = {
+    "simulate": cmd_simulate,
+    "repair": cmd_repair,
+    "simulate-repair": cmd_simulate_repair,
+    "repair-report": cmd_repair_report,
+    "revert": cmd_revert,
+    "compare-versions": cmd_compare_versions,
+    "list-versions": cmd_list_versions,
+}
+
+
+_REPAIR_MODULES = ("ingestion.utils.historical_data_repair",)
+
+# Subsystems each command imports lazily; loaded up front by main() so a
+# missing dependency is reported without masking ImportErrors raised later
+COMMAND_MODULES = {
+    "simulate": (
+        "engine.pulse_config",
+        "engine.worldstate",
+        "engine.turn_engine",
+        "engine.causal_rules",
+        "analytics.forecast_memory",
+        "forecast_output.forecast_generator",
+        "forecast_output.pfpa_logger",
+        "forecast_output.digest_logger",
+        "operator_interface.strategos_digest",
+    ),
+    "repair": _REPAIR_MODULES,
+    "simulate-repair": _REPAIR_MODULES,
+    "repair-report": _REPAIR_MODULES,
+    "revert": _REPAIR_MODULES,
+    "compare-versions": _REPAIR_MODULES,
+    "list-versions": _REPAIR_MODULES,
+}
+
+
+def main(argv=None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    handler = COMMANDS.get(args.command)
+    if handler is None:
         logger.warning("No valid command provided. Use --help for options.")
+        return
+    try:
+        for module in COMMAND_MODULES.get(args.command, ()):
+            importlib.import_module(module)
+    except ImportError as e:
+        # Only the selected subsystem is imported, so a missing module or
+        # dependency only disables the commands that need it
+        parser.exit(1, f"{args.command} is unavailable: {e}\n")
+    handler(args, parser)
+
+
+if __name__ == "__main__":
+    main()
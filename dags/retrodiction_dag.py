@@ -1,11 +1,18 @@
 """
 Airflow DAG to schedule Pulse historical retrodiction runs.
+
+The sweep itself lives in engine.retrodiction_scheduler and can be run
+without Airflow (python -m engine.retrodiction_scheduler ...); this DAG
+only forwards its params.
 """
 
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
-from engine.historical_retrodiction_runner import run_retrodiction_tests
+from engine.retrodiction_scheduler import (
+    DEFAULT_OUTPUT_DIR,
+    run_retrodiction_sweep,
+)
 
 default_args = {
     "owner": "pulse",
@@ -20,19 +27,28 @@ default_args = {
 with DAG(
     "historical_retrodiction",
     default_args=default_args,
-    schedule_interval="@daily`",
+    schedule_interval="@daily",
     catchup=False,
 ) as dag:
 
     def task_retrodict(**kwargs):
         params = kwargs.get("params", {})
-        dates = params.get("start_dates", ["2020-01-01"])
-        days = params.get("days", 30)
-        workers = params.get("parallel", 4)
-        run_retrodiction_tests(dates, days=days, max_workers=workers)
+        report = run_retrodiction_sweep(
+            params.get("start_dates", ["2020-01-01"]),
+            days=params.get("days", 30),
+            max_workers=params.get("parallel", 4),
+            truth_path=params.get("truth_path"),
+            output_dir=params.get("output_dir", DEFAULT_OUTPUT_DIR),
+        )
+        if report["windows_completed"] == 0 and report["windows_total"]:
+            raise RuntimeError("All retrodiction windows failed")
+        return {
+            key: report[key]
+            for key in ("windows_completed", "windows_failed", "mean_window_mae")
+        }
 
     retrodict = PythonOperator(
-        task_id="run_retrodiction", python_callable=task_retrodict, provide_context=True
+        task_id="run_retrodiction", python_callable=task_retrodict
     )
 
     retrodict
@@ -1,17 +1,31 @@
 import logging
 from collections import deque
+from typing import Optional, Union
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Pass as critical_variables to monitor every variable seen in record_step
+MONITOR_ALL = "*"
+
 
 class ShadowModelMonitor:
     """
     Monitors the influence of the gravity model on critical variables by tracking
     the proportion of variance it explains compared to the causal model.
+
+    The rolling window is a ring buffer of shape (window_steps, variables) for
+    causal and gravity deltas, with running sums of squares per variable that
+    are updated as steps are pushed and evicted, so trigger evaluation costs
+    O(variables) per step regardless of the window length.
     """
 
     def __init__(
-        self, threshold: float, window_steps: int, critical_variables: list[str]
+        self,
+        threshold: float,
+        window_steps: int,
+        critical_variables: Union[list[str], str],
     ):
         """
         Initializes the ShadowModelMonitor.
@@ -21,12 +35,14 @@ class ShadowModelMonitor:
                        If gravity explains more than this proportion of variance
                        for a critical variable, a trigger condition is met.
             window_steps: The number of simulation steps to consider in the rolling window.
-            critical_variables: A list of variable names to monitor.
+            critical_variables: A list of variable names to monitor, or
+                       MONITOR_ALL ("*") to monitor every variable recorded.
         """
         if not (0 < threshold < 1):
             raise ValueError("Threshold must be between 0 and 1 (exclusive).")
         if window_steps <= 0:
             raise ValueError("Window steps must be a positive integer.")
+        self.monitor_all = critical_variables == MONITOR_ALL
         if not critical_variables:
             logger.warning(
                 "ShadowModelMonitor initialized with no critical variables to monitor."
@@ -34,18 +50,61 @@ class ShadowModelMonitor:
 
         self.threshold = threshold
         self.window_steps = window_steps
-        self.critical_variables = critical_variables
-
-        # Data storage for the rolling window
-        # Each entry in the deque will be a tuple: (causal_deltas_step, gravity_deltas_step)
-        # where each _deltas_step is a dict: {var_name: delta_value}
-        self.delta_window: deque[tuple[dict[str, float], dict[str, float]]] = deque(
-            maxlen=window_steps
+        self.critical_variables: list[str] = (
+            [] if self.monitor_all else list(critical_variables)
         )
+        self._columns = {var: col for col, var in enumerate(self.critical_variables)}
+
+        # Ring buffers of per-step deltas; a presence mask remembers which
+        # variables each step actually reported.
+        width = max(len(self.critical_variables), 1)
+        self._causal = np.zeros((window_steps, width))
+        self._gravity = np.zeros((window_steps, width))
+        self._present_causal = np.zeros((window_steps, width), dtype=bool)
+        self._present_gravity = np.zeros((window_steps, width), dtype=bool)
+        self._sumsq_causal = np.zeros(width)
+        self._sumsq_gravity = np.zeros(width)
+        self._head = 0  # row the next step is written to
+        self._count = 0
         # For internal tracking if needed, though `current_step` is passed in
         # `record_step`
         self.current_step_internal = 0
 
+    @property
+    def active(self) -> bool:
+        """Whether there is anything to monitor."""
+        return self.monitor_all or bool(self.critical_variables)
+
+    def watched_variables(self, values: Optional[dict] = None) -> list[str]:
+        """
+        Variables to compute deltas for: the critical variables, plus (when
+        monitoring all variables) any new numeric variables in ``values``.
+        """
+        if self.monitor_all and values:
+            for var, value in values.items():
+                if (
+                    var not in self._columns
+                    and isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                ):
+                    self._add_column(var)
+        return self.critical_variables
+
+    def _add_column(self, var: str) -> None:
+        col = len(self.critical_variables)
+        self.critical_variables.append(var)
+        self._columns[var] = col
+        if col < self._causal.shape[1]:
+            return
+        extra = max(col, 8)
+        pad = ((0, 0), (0, extra))
+        self._causal = np.pad(self._causal, pad)
+        self._gravity = np.pad(self._gravity, pad)
+        self._present_causal = np.pad(self._present_causal, pad)
+        self._present_gravity = np.pad(self._present_gravity, pad)
+        self._sumsq_causal = np.pad(self._sumsq_causal, (0, extra))
+        self._sumsq_gravity = np.pad(self._sumsq_gravity, (0, extra))
+
     def record_step(
         self,
         causal_deltas: dict[str, float],
@@ -62,24 +121,72 @@ class ShadowModelMonitor:
                             applied by the gravity correction.
             current_step: The current simulation step number.
         """
-        # Filter deltas to only include critical variables to save space and processing
-        causal_deltas_critical = {
-            var: causal_deltas.get(var, 0.0)
-            for var in self.critical_variables
-            if var in causal_deltas
-        }
-        gravity_deltas_critical = {
-            var: gravity_deltas.get(var, 0.0)
-            for var in self.critical_variables
-            if var in gravity_deltas
-        }
-
-        self.delta_window.append((causal_deltas_critical, gravity_deltas_critical))
+        if self.monitor_all:
+            self.watched_variables(causal_deltas)
+            self.watched_variables(gravity_deltas)
+
+        row = self._head
+        evicting = self._count == self.window_steps
+        if not evicting:
+            self._count += 1
+        for deltas, values, present, sums in (
+            (causal_deltas, self._causal, self._present_causal, self._sumsq_causal),
+            (gravity_deltas, self._gravity, self._present_gravity, self._sumsq_gravity),
+        ):
+            if evicting:
+                # Remove the oldest step from the running sums. Where it
+                # dominated a sum, the difference has lost its precision and
+                # the column is recomputed from the window.
+                evicted = values[row] ** 2
+                values[row] = 0.0
+                before = sums.copy()
+                sums -= evicted
+                lossy = sums < 1e-6 * before
+                if lossy.any():
+                    sums[lossy] = (values[:, lossy] ** 2).sum(axis=0)
+            present[row] = False
+            for var, value in deltas.items():
+                col = self._columns.get(var)
+                if col is not None:
+                    values[row, col] = value
+                    present[row, col] = True
+            sums += values[row] ** 2
+        self._head = (row + 1) % self.window_steps
         self.current_step_internal = current_step  # Keep track if needed
 
-    def _sum_of_squares(self, values: list[float]) -> float:
-        """Helper to calculate sum of squares."""
-        return sum(v**2 for v in values)
+    @property
+    def delta_window(self) -> deque[tuple[dict[str, float], dict[str, float]]]:
+        """
+        The rolling window as (causal_deltas, gravity_deltas) dicts per step,
+        oldest first, with the critical variables each step reported.
+        """
+        window: deque = deque(maxlen=self.window_steps)
+        start = (self._head - self._count) % self.window_steps
+        for k in range(self._count):
+            row = (start + k) % self.window_steps
+            window.append(
+                (
+                    {
+                        var: float(self._causal[row, col])
+                        for var, col in self._columns.items()
+                        if self._present_causal[row, col]
+                    },
+                    {
+                        var: float(self._gravity[row, col])
+                        for var, col in self._columns.items()
+                        if self._present_gravity[row, col]
+                    },
+                )
+            )
+        return window
+
+    def variance_explained(self) -> dict[str, float]:
+        """Proportion of variance explained by gravity for every monitored variable."""
+        width = len(self.critical_variables)
+        gravity = self._sumsq_gravity[:width]
+        total = gravity + self._sumsq_causal[:width]
+        ratios = np.divide(gravity, total, out=np.zeros(width), where=total > 0)
+        return dict(zip(self.critical_variables, ratios.tolist()))
 
     def calculate_variance_explained(self, variable: str) -> float:
         """
@@ -97,31 +204,21 @@ class ShadowModelMonitor:
             The proportion of variance explained by gravity (between 0.0 and 1.0).
             Returns -1.0 if the variable is not found or data is insufficient.
         """
-        if variable not in self.critical_variables:
+        col = self._columns.get(variable)
+        if col is None:
             logger.warning(
-                f"Variable '{variable}' not in critical_variables list for ShadowModelMonitor.")
+                f"Variable '{variable}' not in critical_variables list for "
+                f"ShadowModelMonitor."
+            )
             return -1.0  # Or raise error
 
-        if not self.delta_window:
+        if not self._count:
             return 0.0  # No data yet
 
-        causal_deltas_for_var_in_window = []
-        gravity_deltas_for_var_in_window = []
+        sum_sq_gravity = float(self._sumsq_gravity[col])
+        denominator = sum_sq_gravity + float(self._sumsq_causal[col])
 
-        for causal_step_deltas, gravity_step_deltas in self.delta_window:
-            causal_deltas_for_var_in_window.append(
-                causal_step_deltas.get(variable, 0.0)
-            )
-            gravity_deltas_for_var_in_window.append(
-                gravity_step_deltas.get(variable, 0.0)
-            )
-
-        sum_sq_gravity = self._sum_of_squares(gravity_deltas_for_var_in_window)
-        sum_sq_causal = self._sum_of_squares(causal_deltas_for_var_in_window)
-
-        denominator = sum_sq_gravity + sum_sq_causal
-
-        if denominator == 0:
+        if denominator <= 0:
             return 0.0
 
         return sum_sq_gravity / denominator
@@ -136,26 +233,21 @@ class ShadowModelMonitor:
             trigger_met (bool): True if the threshold was exceeded for any critical variable.
             list_of_problematic_variables (list[str]): Names of variables that exceeded the threshold.
         """
-        if len(self.delta_window) < self.window_steps:
+        if self._count < self.window_steps:
             # Not enough data yet to fill the window
             return False, []
 
         problematic_vars = []
-        triggered = False
-
-        for var in self.critical_variables:
-            variance_explained_by_gravity = self.calculate_variance_explained(var)
-            if variance_explained_by_gravity > self.threshold:
+        for var, explained in self.variance_explained().items():
+            if explained > self.threshold:
                 problematic_vars.append(var)
-                triggered = True
                 logger.debug(
-                    f"ShadowModelMonitor: Variable '{var}' exceeded threshold. " f"Gravity explained {
-                        variance_explained_by_gravity *
-                        100:.2f}% of variance " f"(Threshold: {
-                        self.threshold *
-                        100:.2f}%).")
+                    f"ShadowModelMonitor: Variable '{var}' exceeded threshold. "
+                    f"Gravity explained {explained * 100:.2f}% of variance "
+                    f"(Threshold: {self.threshold * 100:.2f}%)."
+                )
 
-        return triggered, problematic_vars
+        return bool(problematic_vars), problematic_vars
 
 
 if __name__ == "__main__":
@@ -24,10 +24,13 @@ from engine.pulse_config import SHADOW_MONITOR_CONFIG
 from engine.path_registry import PATHS
 import json
 import os
+import time
 import traceback
 import tempfile
 import shutil
 import argparse  # Added argparse
+import multiprocessing as mp
+from multiprocessing import connection as mp_connection
 from typing import Dict, List, Optional, Any
 
 # Ensure log_utils is imported before its potential first use
@@ -72,6 +75,318 @@ def load_batch_config(path: str) -> List[Dict[str, Any]]:
         return json.load(f)
 
 
+def _create_shadow_monitor():
+    """ShadowModelMonitor configured from SHADOW_MONITOR_CONFIG, or None."""
+    if not (
+        ShadowModelMonitor
+        and SHADOW_MONITOR_CONFIG
+        and SHADOW_MONITOR_CONFIG.get("enabled", False)
+    ):
+        log_info("[BATCH] ShadowModelMonitor is disabled or not configured.")
+        return None
+    try:
+        shadow_monitor = ShadowModelMonitor(
+            threshold=SHADOW_MONITOR_CONFIG["threshold_variance_explained"],
+            window_steps=SHADOW_MONITOR_CONFIG["window_steps"],
+            critical_variables=SHADOW_MONITOR_CONFIG["critical_variables"],
+        )
+        log_info("[BATCH] ShadowModelMonitor enabled and initialized.")
+        return shadow_monitor
+    except KeyError as e:
+        log_info(
+            f"[BATCH] Error initializing ShadowModelMonitor from config: "
+            f"Missing key {e}. Monitor disabled."
+        )
+    except Exception as e:
+        log_info(
+            f"[BATCH] Error initializing ShadowModelMonitor: {e}. Monitor disabled."
+        )
+    return None
+
+
+def _error_result(
+    cfg: Dict[str, Any], index: int, error_type: str, message: str, tb: str = ""
+) -> Dict[str, Any]:
+    return {
+        "config": cfg,
+        "batch_index": index,
+        "error": {"type": error_type, "message": message, "traceback": tb},
+    }
+
+
+def run_single_config(
+    cfg: Dict[str, Any],
+    index: int,
+    learning_engine=None,
+    shadow_monitor=None,
+    gravity_enabled: bool = True,
+    gravity_config: Optional[GravityEngineConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Simulates one config and runs its forecasts through the pipeline.
+
+    Returns:
+        Dict: Pipeline result tagged with the config and batch index, or an
+        error record if any stage raised.
+    """
+    try:
+        state = WorldState()  # Initialize WorldState
+
+        # Initialize or update overlays
+        state_overrides = cfg.get("state_overrides", {})
+        if state_overrides:
+            if not hasattr(state, "overlays") or not isinstance(
+                state.overlays, SymbolicOverlays
+            ):
+                state.overlays = SymbolicOverlays.from_dict(state_overrides)
+            else:  # It is a SymbolicOverlays instance, update it
+                current_overlays_dict = (
+                    state.overlays.as_dict()
+                    if hasattr(state.overlays, "as_dict")
+                    else {}
+                )
+                current_overlays_dict.update(state_overrides)
+                state.overlays = SymbolicOverlays.from_dict(current_overlays_dict)
+        elif not hasattr(state, "overlays") or state.overlays is None:
+            state.overlays = SymbolicOverlays.from_dict({})
+
+        num_turns = cfg.get("turns", 1)
+        simulation_results = simulate_forward(
+            state=state,
+            turns=num_turns,
+            use_symbolism=cfg.get("use_symbolism", True),
+            # Only the final state is used; compact mode avoids holding a
+            # full snapshot per turn
+            return_mode="compact",
+            keyframe_every=cfg.get("keyframe_every", 10),
+            module_logger=log_info,
+            learning_engine=learning_engine,
+            shadow_monitor_instance=shadow_monitor,
+            gravity_enabled=gravity_enabled,  # Pass the gravity_enabled parameter
+            gravity_config=gravity_config,  # Pass the gravity_config parameter
+        )
+
+        final_state_snapshot = {}
+        if simulation_results:
+            final_state_data = simulation_results[-1].get("full_state")
+            if final_state_data and isinstance(final_state_data, dict):
+                final_state_snapshot = final_state_data
+            else:
+                log_info(
+                    "[BATCH] Warning: 'full_state' not found or not a dict in last "
+                    "sim step. Using current WorldState."
+                )
+                final_state_snapshot = (
+                    state.to_dict() if hasattr(state, "to_dict") else vars(state)
+                )
+        else:
+            log_info(
+                "[BATCH] Warning: Simulation produced no results. "
+                "Using initial state for forecast."
+            )
+            final_state_snapshot = (
+                state.to_dict() if hasattr(state, "to_dict") else vars(state)
+            )
+
+        forecasts = generate_forecast(final_state_snapshot)
+
+        if isinstance(forecasts, dict):  # Ensure forecasts is a list for pipeline
+            forecasts = [forecasts]
+        pipeline_result_data = run_forecast_pipeline(forecasts)
+        pipeline_result_data["config"] = cfg
+        pipeline_result_data["batch_index"] = index
+        return pipeline_result_data
+
+    except Exception as e:
+        tb = traceback.format_exc()
+        log_info(f"[BATCH] Error on batch {index + 1}: {type(e).__name__}: {e}\n{tb}")
+        return _error_result(cfg, index, type(e).__name__, str(e), tb)
+
+
+def config_key(cfg: Dict[str, Any]) -> str:
+    """Canonical JSON form of a config, used to match configs on resume."""
+    return json.dumps(cfg, sort_keys=True, default=str)
+
+
+def _load_completed(export_path: str) -> List[Dict[str, Any]]:
+    """
+    Successful results already in export_path.
+
+    The file is rewritten without error records and truncated lines (e.g.
+    from a run that was killed mid-write), so reruns append cleanly.
+    """
+    if not os.path.exists(export_path):
+        return []
+    completed = []
+    with open(export_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "config" in record:
+                if "error" not in record:
+                    completed.append(record)
+
+    temp_dir = os.path.dirname(export_path) or "."
+    with tempfile.NamedTemporaryFile(
+        "w", delete=False, dir=temp_dir, encoding="utf-8"
+    ) as tf:
+        for record in completed:
+            tf.write(json.dumps(record) + "\n")
+        tempname = tf.name
+    shutil.move(tempname, export_path)
+    return completed
+
+
+def _batch_worker(
+    conn, runner, learning_engine, gravity_enabled, gravity_config
+) -> None:
+    """
+    Worker loop: receive (index, config) tasks, send back JSON results.
+
+    Results are serialised in the worker so that unpicklable values cannot
+    break the pipe; None shuts the worker down. runner is the
+    run_single_config the parent resolved, passed explicitly because the
+    worker starts from a fresh interpreter state.
+    """
+    shadow_monitor = _create_shadow_monitor()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        index, cfg = task
+        result = runner(
+            cfg, index, learning_engine, shadow_monitor, gravity_enabled, gravity_config
+        )
+        conn.send(json.dumps(result, default=str))
+    conn.close()
+
+
+class _WorkerSlot:
+    """One pool process with its pipe and the task it is running."""
+
+    def __init__(self, ctx, worker_args):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_batch_worker, args=(child_conn, *worker_args), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = 0.0
+
+    def submit(self, index: int, cfg: Dict[str, Any]) -> None:
+        self.task = (index, cfg)
+        self.started = time.monotonic()
+        self.conn.send(self.task)
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+def _worker_context():
+    """
+    Multiprocessing context for batch workers.
+
+    fork is avoided because the parent may be running threads (metrics
+    servers, monitors), which Python 3.12 warns about. forkserver children
+    are forked from a single-threaded server that has already imported this
+    module, so starting a worker stays cheap; spawn is the fallback where
+    forkserver is unavailable.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["engine.batch_runner"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def _run_parallel(tasks, max_workers, timeout, worker_args, emit) -> None:
+    """
+    Run (index, config) tasks on a pool of worker processes.
+
+    A worker that exceeds the timeout is terminated and one that dies is
+    replaced; in both cases only its own config gets an error record.
+    """
+    ctx = _worker_context()
+    worker_args = (run_single_config, *worker_args)
+    pending = list(reversed(tasks))
+    slots = [
+        _WorkerSlot(ctx, worker_args) for _ in range(min(max_workers, len(tasks)))
+    ]
+    try:
+        while True:
+            for k, slot in enumerate(slots):
+                if slot.task is None and pending:
+                    try:
+                        slot.submit(*pending.pop())
+                    except (BrokenPipeError, OSError):
+                        pending.append(slot.task)
+                        slot.kill()
+                        slots[k] = _WorkerSlot(ctx, worker_args)
+            busy = {slot.conn: slot for slot in slots if slot.task is not None}
+            if not busy:
+                break
+
+            wait_for = None
+            if timeout is not None:
+                now = time.monotonic()
+                wait_for = max(
+                    0.0, min(slot.started + timeout - now for slot in busy.values())
+                )
+            ready = mp_connection.wait(list(busy), timeout=wait_for)
+
+            for conn in ready:
+                slot = busy[conn]
+                index, cfg = slot.task
+                try:
+                    result = json.loads(conn.recv())
+                except (EOFError, OSError):
+                    slot.process.join(timeout=5)
+                    message = f"Worker exited with code {slot.process.exitcode}"
+                    log_info(f"[BATCH] Batch {index + 1} crashed: {message}")
+                    result = _error_result(cfg, index, "WorkerCrashed", message)
+                    slot.kill()
+                    slots[slots.index(slot)] = _WorkerSlot(ctx, worker_args)
+                slot.task = None
+                emit(result)
+
+            if timeout is not None:
+                now = time.monotonic()
+                for k, slot in enumerate(slots):
+                    if slot.task is not None and now - slot.started >= timeout:
+                        index, cfg = slot.task
+                        message = f"Config exceeded the {timeout}s timeout"
+                        log_info(f"[BATCH] Batch {index + 1} timed out; terminated.")
+                        slot.kill()
+                        slots[k] = _WorkerSlot(ctx, worker_args)
+                        emit(_error_result(cfg, index, "TimeoutError", message))
+    finally:
+        for slot in slots:
+            if slot.task is None:
+                slot.stop()
+            else:
+                slot.kill()
+
+
 def run_batch_from_config(
     configs: List[Dict[str, Any]],
     export_path: Optional[str] = None,
@@ -80,148 +395,104 @@ def run_batch_from_config(
     gravity_config: Optional[
         GravityEngineConfig
     ] = None,  # Added gravity_config parameter
+    max_workers: int = 1,
+    timeout: Optional[float] = None,
+    resume: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Executes a batch of simulation configs.
 
+    With max_workers > 1 or a timeout, each config runs in a pool of worker
+    processes: a config that hangs past the timeout or crashes its worker
+    is recorded as an error and the rest of the batch carries on. Results
+    are appended to export_path as each config completes.
+
     Args:
         configs (List[Dict]): Simulation configurations
-        export_path (str): Optional output path for saving results
-        learning_engine: Optional LearningEngine instance for hooks
+        export_path (str): Optional JSONL output path, written incrementally
+        learning_engine: Optional LearningEngine instance for hooks (each
+            worker process gets its own pickled copy when running in parallel)
         gravity_enabled (bool): Whether gravity correction is enabled (default: True)
         gravity_config (GravityEngineConfig, optional): Configuration for the gravity engine
+        max_workers (int): Number of worker processes (1 runs in-process)
+        timeout (float, optional): Per-config time limit in seconds
+        resume (bool): Skip configs that already have a successful result in
+            export_path; failed results are dropped and retried
 
     Returns:
-        List[Dict]: Pipeline results per config, including error info if failed.
+        List[Dict]: Pipeline results per config in config order, including
+        error info if failed.
     """
-    results = []
-
-    shadow_monitor = None  # Removed type hint to fix Pylance error
-    if (
-        ShadowModelMonitor
-        and SHADOW_MONITOR_CONFIG
-        and SHADOW_MONITOR_CONFIG.get("enabled", False)
-    ):
-        try:
-            shadow_monitor = ShadowModelMonitor(
-                threshold=SHADOW_MONITOR_CONFIG["threshold_variance_explained"],
-                window_steps=SHADOW_MONITOR_CONFIG["window_steps"],
-                critical_variables=SHADOW_MONITOR_CONFIG["critical_variables"],
-            )
-            log_info("[BATCH] ShadowModelMonitor enabled and initialized.")
-        except KeyError as e:
-            log_info(
-                f"[BATCH] Error initializing ShadowModelMonitor from config: Missing key {e}. Monitor disabled.")
-            shadow_monitor = None
-        except Exception as e:
-            log_info(
-                f"[BATCH] Error initializing ShadowModelMonitor: {e}. Monitor disabled."
-            )
-            shadow_monitor = None
-    else:
-        log_info("[BATCH] ShadowModelMonitor is disabled or not configured.")
-
-    for i, cfg in enumerate(configs):
-        try:
-            log_info(f"[BATCH] Running batch {i + 1}/{len(configs)}")
-            state = WorldState()  # Initialize WorldState
-
-            # Initialize or update overlays
-            state_overrides = cfg.get("state_overrides", {})
-            if state_overrides:
-                if not hasattr(state, "overlays") or not isinstance(
-                    state.overlays, SymbolicOverlays
-                ):
-                    state.overlays = SymbolicOverlays.from_dict(state_overrides)
-                else:  # It is a SymbolicOverlays instance, update it
-                    current_overlays_dict = (
-                        state.overlays.as_dict()
-                        if hasattr(state.overlays, "as_dict")
-                        else {}
-                    )
-                    current_overlays_dict.update(state_overrides)
-                    state.overlays = SymbolicOverlays.from_dict(current_overlays_dict)
-            elif not hasattr(state, "overlays") or state.overlays is None:
-                state.overlays = SymbolicOverlays.from_dict({})
-
-            num_turns = cfg.get("turns", 1)
-            simulation_results = simulate_forward(
-                state=state,
-                turns=num_turns,
-                use_symbolism=cfg.get("use_symbolism", True),
-                return_mode="full",  # Shadow monitor needs detailed state
-                logger=log_info,
-                learning_engine=learning_engine,
-                shadow_monitor_instance=shadow_monitor,
-                gravity_enabled=gravity_enabled,  # Pass the gravity_enabled parameter
-                gravity_config=gravity_config,  # Pass the gravity_config parameter
-            )
-
-            final_state_snapshot = {}
-            if simulation_results:
-                final_state_data = simulation_results[-1].get("full_state")
-                if final_state_data and isinstance(final_state_data, dict):
-                    final_state_snapshot = final_state_data
-                else:
-                    log_info(
-                        "[BATCH] Warning: 'full_state' not found or not a dict in last sim step. Using current WorldState."
-                    )
-                    final_state_snapshot = (
-                        state.to_dict() if hasattr(state, "to_dict") else vars(state)
-                    )
+    results: Dict[int, Dict[str, Any]] = {}
+    tasks = list(enumerate(configs))
+
+    if resume and export_path:
+        done: Dict[str, List[Dict[str, Any]]] = {}
+        for record in _load_completed(export_path):
+            done.setdefault(config_key(record["config"]), []).append(record)
+        remaining = []
+        for index, cfg in tasks:
+            previous = done.get(config_key(cfg))
+            if previous:
+                results[index] = previous.pop(0)
+                results[index]["batch_index"] = index
             else:
-                log_info(
-                    "[BATCH] Warning: Simulation produced no results. Using initial state for forecast."
-                )
-                final_state_snapshot = (
-                    state.to_dict() if hasattr(state, "to_dict") else vars(state)
-                )
-
-            forecasts = generate_forecast(final_state_snapshot)
+                remaining.append((index, cfg))
+        log_info(
+            f"[BATCH] Resuming: {len(results)} configs already complete, "
+            f"{len(remaining)} to run"
+        )
+        tasks = remaining
 
-            if isinstance(forecasts, dict):  # Ensure forecasts is a list for pipeline
-                forecasts = [forecasts]
-            pipeline_result_data = run_forecast_pipeline(forecasts)
-            pipeline_result_data["config"] = cfg
-            pipeline_result_data["batch_index"] = i
-            results.append(pipeline_result_data)
+    export_file = None
+    if export_path:
+        export_dir = os.path.dirname(export_path) or "."
+        os.makedirs(export_dir, exist_ok=True)  # Ensure directory exists
+        export_file = open(
+            export_path, "a" if resume else "w", encoding="utf-8", buffering=1
+        )
 
+    def emit(result: Dict[str, Any]) -> None:
+        results[result["batch_index"]] = result
+        log_info(f"[BATCH] Completed {len(results)}/{len(configs)}")
+        if export_file is None:
+            return
+        try:
+            export_file.write(json.dumps(result, default=str) + "\n")
+            export_file.flush()
         except Exception as e:
             tb = traceback.format_exc()
-            log_info(f"[BATCH] Error on batch {i + 1}: {type(e).__name__}: {e}\n{tb}")
-            results.append(
-                {
-                    "config": cfg,
-                    "batch_index": i,
-                    "error": {
-                        "type": type(e).__name__,
-                        "message": str(e),
-                        "traceback": tb,
-                    },
-                }
+            log_info(f"[BATCH] Failed to export result: {type(e).__name__}: {e}\n{tb}")
+
+    try:
+        if max_workers > 1 or timeout is not None:
+            _run_parallel(
+                tasks,
+                max(1, max_workers),
+                timeout,
+                (learning_engine, gravity_enabled, gravity_config),
+                emit,
             )
-
-    if export_path:
-        try:
-            # Write to a temp file and move atomically
-            temp_dir = os.path.dirname(export_path)
-            if not temp_dir:  # Handle case where export_path is just a filename
-                temp_dir = "."
-            os.makedirs(temp_dir, exist_ok=True)  # Ensure directory exists
-
-            with tempfile.NamedTemporaryFile(
-                "w", delete=False, dir=temp_dir, encoding="utf-8"
-            ) as tf:
-                for r in results:
-                    tf.write(json.dumps(r) + "\n")
-                tempname = tf.name
-            shutil.move(tempname, export_path)
+        elif tasks:
+            shadow_monitor = _create_shadow_monitor()
+            for index, cfg in tasks:
+                log_info(f"[BATCH] Running batch {index + 1}/{len(configs)}")
+                emit(
+                    run_single_config(
+                        cfg,
+                        index,
+                        learning_engine,
+                        shadow_monitor,
+                        gravity_enabled,
+                        gravity_config,
+                    )
+                )
+    finally:
+        if export_file is not None:
+            export_file.close()
             log_info(f"[BATCH] Results saved to {export_path}")
-        except Exception as e:
-            tb = traceback.format_exc()
-            log_info(f"[BATCH] Failed to export batch: {type(e).__name__}: {e}\n{tb}")
 
-    return results
+    return [results[index] for index in sorted(results)]
 
 
 if __name__ == "__main__":
@@ -306,14 +577,44 @@ if __name__ == "__main__":
             grav_cfg.DEFAULT_SHADOW_MODEL_VARIANCE_THRESHOLD}).",
     )
 
-    # TODO: Add CLI/config file support for batch execution.
-    # For now, using sample configs
+    # Batch execution options
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="JSON file with a list of simulation configs (default: sample configs).",
+    )
+    parser.add_argument(
+        "--output",
+        default=str(DEFAULT_BATCH_OUTPUT),
+        help=f"JSONL file results are streamed to (default: {DEFAULT_BATCH_OUTPUT}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, in-process).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Per-config time limit in seconds; hung configs are terminated.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip configs that already have a successful result in --output.",
+    )
+
     args = parser.parse_args()
 
-    sample_configs_main = [
-        {"state_overrides": {"hope": 0.6, "despair": 0.2}, "turns": 1},
-        {"state_overrides": {"hope": 0.3, "despair": 0.5}, "turns": 1},
-    ]
+    if args.config:
+        sample_configs_main = load_batch_config(args.config)
+    else:
+        sample_configs_main = [
+            {"state_overrides": {"hope": 0.6, "despair": 0.2}, "turns": 1},
+            {"state_overrides": {"hope": 0.3, "despair": 0.5}, "turns": 1},
+        ]
 
     # Determine whether gravity is enabled based on flags
     # --enable-residual-gravity overrides --gravity-off
@@ -362,7 +663,10 @@ if __name__ == "__main__":
     # Pass the gravity_enabled flag and gravity_config to the runner function
     run_batch_from_config(
         sample_configs_main,
-        export_path=str(DEFAULT_BATCH_OUTPUT),
+        export_path=args.output,
         gravity_enabled=gravity_enabled,
         gravity_config=gravity_config,
+        max_workers=args.workers,
+        timeout=args.timeout,
+        resume=args.resume,
     )
@@ -17,7 +17,7 @@ from engine.state_mutation import (
 from engine.variable_accessor import get_variable, get_overlay
 from engine.pulse_config import CONFIDENCE_THRESHOLD, DEFAULT_FRAGILITY_THRESHOLD
 from analytics.pulse_learning_log import log_bayesian_trust_metrics
-from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+from analytics.trust_service import trust_service
 import logging
 
 logger = logging.getLogger("causal_rules")
@@ -125,7 +125,7 @@ def apply_rule(state: WorldState, rule_id: str, condition_func, effect_func) ->
         return False
 
     # Get trust score for this rule
-    trust = bayesian_trust_tracker.get_trust(rule_id)
+    trust = trust_service.get_trust(rule_id)
     importance = RULES[rule_id]["importance"]
 
     # Modulate effect by rule trust and importance
@@ -359,10 +359,10 @@ def generate_rule_statistics() -> dict:
     """
     stats = {}
     for rule_id in RULES:
-        trust = bayesian_trust_tracker.get_trust(rule_id)
-        confidence = bayesian_trust_tracker.get_confidence_strength(rule_id)
-        sample_size = bayesian_trust_tracker.get_sample_size(rule_id)
-        ci = bayesian_trust_tracker.get_confidence_interval(rule_id)
+        trust = trust_service.get_trust(rule_id)
+        confidence = trust_service.get_confidence_strength(rule_id)
+        sample_size = trust_service.get_sample_size(rule_id)
+        ci = trust_service.get_confidence_interval(rule_id)
 
         stats[rule_id] = {
             "description": RULES[rule_id]["description"],
@@ -0,0 +1,208 @@
+"""
+compact_trajectory.py
+
+Compact storage for the per-turn results of simulate_forward.
+
+``return_mode="full"`` keeps a complete ``WorldState.snapshot()`` for every
+turn, including a copy of the ever-growing event log, so memory grows
+quadratically with the horizon. ``CompactTrajectory`` instead records the
+numeric overlays, variables and capital of each turn as rows of
+preallocated float arrays, keeps full snapshots only every ``keyframe_every``
+turns (plus requested turns and the final turn), and rebuilds intermediate
+states from the nearest keyframe on access.
+
+It behaves like the list returned by the full mode: ``trajectory[i]`` is
+the turn result dict including ``"full_state"``, materialised on demand.
+"""
+
+import copy
+import logging
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GROUPS = ("overlays", "variables", "capital")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+class CompactTrajectory(Sequence):
+    """
+    Per-turn simulation results stored as numeric arrays plus keyframes.
+
+    Overlays, capital and numeric variables are exact for every turn, as is
+    the event log (reconstructed as a prefix of the final log). Metadata and
+    non-numeric variables of an intermediate turn are taken from the nearest
+    earlier keyframe; request exact snapshots with ``snapshot_turns``.
+    """
+
+    def __init__(
+        self,
+        turns: int,
+        keyframe_every: int = 10,
+        snapshot_turns: Optional[Iterable[int]] = None,
+    ):
+        """
+        Args:
+            turns: Number of turns to preallocate.
+            keyframe_every: Keep a full snapshot every this many turns.
+            snapshot_turns: Turn indices (0-based) that always get a snapshot.
+        """
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be a positive integer")
+        self.capacity = turns
+        self.keyframe_every = keyframe_every
+        self.snapshot_turns = set(snapshot_turns or ())
+        self.columns: Dict[str, Dict[str, int]] = {group: {} for group in GROUPS}
+        self.values: Dict[str, np.ndarray] = {
+            group: np.full((turns, 8), np.nan) for group in GROUPS
+        }
+        self.turn_numbers = np.zeros(turns, dtype=np.int64)
+        self.event_counts = np.zeros(turns, dtype=np.int64)
+        self.keyframes: Dict[int, Dict[str, Any]] = {}
+        self.summaries: List[Dict[str, Any]] = []
+        self._event_log: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        result = dict(self.summaries[index])
+        result["overlays"] = self._row("overlays", index)
+        result["full_state"] = self.state_at(index)
+        return result
+
+    def _column(self, group: str, name: str) -> int:
+        columns = self.columns[group]
+        col = columns.get(name)
+        if col is None:
+            col = columns[name] = len(columns)
+            values = self.values[group]
+            if col >= values.shape[1]:
+                grown = np.full((self.capacity, 2 * values.shape[1]), np.nan)
+                grown[:, : values.shape[1]] = values
+                self.values[group] = grown
+        return col
+
+    def _row(self, group: str, index: int) -> Dict[str, float]:
+        row = self.values[group][index]
+        return {
+            name: float(row[col])
+            for name, col in self.columns[group].items()
+            if not np.isnan(row[col])
+        }
+
+    def record(self, state: Any, turn_result: Dict[str, Any]) -> None:
+        """
+        Store one turn: numeric state as an array row, the summary dict
+        without its overlays, and a snapshot if this turn is a keyframe.
+        """
+        index = len(self.summaries)
+        if index >= self.capacity:
+            self._grow(max(1, self.capacity))
+        sources = {
+            "overlays": state.overlays.as_dict(),
+            "variables": getattr(state.variables, "data", {}),
+            "capital": state.capital.as_dict(),
+        }
+        for group, values in sources.items():
+            for name, value in values.items():
+                if _is_number(value):
+                    self.values[group][index, self._column(group, name)] = value
+        self.turn_numbers[index] = getattr(state, "turn", index)
+        self._event_log = state.event_log
+        self.event_counts[index] = len(state.event_log)
+
+        summary = dict(turn_result)
+        summary.pop("overlays", None)
+        summary.pop("full_state", None)
+        self.summaries.append(summary)
+        if index % self.keyframe_every == 0 or index in self.snapshot_turns:
+            self.snapshot(state, index)
+
+    def snapshot(self, state: Any, index: Optional[int] = None) -> None:
+        """Keep a full snapshot of state (without the event log) for a turn."""
+        index = len(self.summaries) - 1 if index is None else index
+        keyframe = state.snapshot()
+        keyframe.pop("event_log", None)
+        self.keyframes[index] = keyframe
+
+    def finalize(self, state: Any, summaries: Optional[List[Dict]] = None) -> None:
+        """
+        Snapshot the final turn and adopt post-processed summaries (e.g. after
+        batch trust enrichment).
+        """
+        if summaries is not None:
+            for k, summary in enumerate(summaries):
+                summary = dict(summary)
+                summary.pop("overlays", None)
+                self.summaries[k] = summary
+        if self.summaries and len(self.summaries) - 1 not in self.keyframes:
+            self.snapshot(state)
+        self._event_log = list(state.event_log)
+
+    def _grow(self, extra: int) -> None:
+        self.capacity += extra
+        for group in GROUPS:
+            values = self.values[group]
+            grown = np.full((self.capacity, values.shape[1]), np.nan)
+            grown[: len(values)] = values
+            self.values[group] = grown
+        self.turn_numbers = np.resize(self.turn_numbers, self.capacity)
+        self.event_counts = np.resize(self.event_counts, self.capacity)
+
+    def state_at(self, index: int) -> Dict[str, Any]:
+        """
+        Reconstruct the state snapshot after turn ``index``.
+
+        Starts from the nearest keyframe at or before the turn and replaces
+        its numeric values with that turn's array rows.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        base = max(k for k in self.keyframes if k <= index)
+        state = copy.deepcopy(self.keyframes[base])
+        state["event_log"] = list(self._event_log[: self.event_counts[index]])
+        if base == index:
+            return state
+        state["turn"] = int(self.turn_numbers[index])
+        state["overlays"] = self._row("overlays", index)
+        state["capital"] = self._row("capital", index)
+        variables = {
+            name: value
+            for name, value in state.get("variables", {}).items()
+            if not _is_number(value)
+        }
+        variables.update(self._row("variables", index))
+        state["variables"] = variables
+        return state
+
+    def final_state(self) -> Dict[str, Any]:
+        """Snapshot after the last recorded turn."""
+        return self.state_at(len(self) - 1)
+
+    def as_arrays(self, group: str) -> Dict[str, np.ndarray]:
+        """Per-turn series of one group ("overlays", "variables" or "capital")."""
+        values = self.values[group][: len(self)]
+        return {name: values[:, col] for name, col in self.columns[group].items()}
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialise every turn, equivalent to ``return_mode="full"``."""
+        return [self[i] for i in range(len(self))]
+
+    def nbytes(self) -> int:
+        """Memory held by the numeric arrays."""
+        return sum(values.nbytes for values in self.values.values())
@@ -8,9 +8,22 @@ compatibility with existing tests.
 
 import os
 import json
-from typing import Dict, Any, Optional
+import logging
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from engine.truth_store import (
+    TruthStore,
+    convert_json_truth,
+    is_fresh,
+    snapshots_to_matrix,
+    truth_cache_path,
+)
+
+logger = logging.getLogger(__name__)
+
 # Compatibility constants
 TRUTH_PATH = os.environ.get("PULSE_TRUTH_PATH", "data/historical_variables.json")
 
@@ -65,9 +78,15 @@ class RetrodictionLoader:
     compatibility with existing tests while the main functionality has been
     merged into simulation_engine/simulator_core.py.
 
+    Snapshots are read either from the JSON file or from its memory-mapped
+    array form (see engine/truth_store.py), which parallel retrodiction
+    workers share instead of each parsing and holding the whole JSON.
+
     Attributes:
         path (str): Path to the historical variables JSON file.
-        snapshots (Dict[str, Any]): Dictionary of loaded snapshots keyed by turn.
+        snapshots (Mapping[str, Any]): Loaded snapshots keyed by turn; a dict
+            for the JSON backend, a read-only view for the array backend.
+        store (Optional[TruthStore]): The memory-mapped store, if in use.
 
     Example:
         Basic initialization:
@@ -89,13 +108,17 @@ class RetrodictionLoader:
         True
     """
 
-    def __init__(self, path: Optional[str] = None) -> None:
+    def __init__(self, path: Optional[str] = None, backend: str = "auto") -> None:
         """
         Initialize the RetrodictionLoader.
 
         Args:
             path: Optional path to historical variables JSON file. If not provided,
                 uses the PULSE_TRUTH_PATH environment variable or default path.
+                A ``.npy`` path opens a converted truth store directly.
+            backend: "json" parses the JSON file; "array" memory-maps its
+                converted form, converting first if it is missing or stale;
+                "auto" uses the array form only if it is already up to date.
 
         Example:
             Default path initialization:
@@ -127,7 +150,23 @@ class RetrodictionLoader:
         self.path = path or os.environ.get(
             "PULSE_TRUTH_PATH", "data/historical_variables.json"
         )
+        if backend not in ("auto", "json", "array"):
+            raise ValueError(f"Unknown truth backend: {backend}")
         self.snapshots = {}
+        self.store: Optional[TruthStore] = None
+        try:
+            if self.path.endswith(".npy"):
+                self.store = TruthStore.open(self.path)
+            elif backend != "json" and Path(self.path).exists():
+                if is_fresh(self.path):
+                    self.store = TruthStore.open(truth_cache_path(self.path))
+                elif backend == "array":
+                    self.store = convert_json_truth(self.path)
+        except Exception as e:
+            logger.warning(f"Truth store unavailable for {self.path}: {e}")
+        if self.store is not None:
+            self.snapshots = self.store.snapshots()
+            return
         try:
             if Path(self.path).exists():
                 with open(self.path, "r") as f:
@@ -166,4 +205,64 @@ class RetrodictionLoader:
             >>> snapshot is None
             True
         """
+        if self.store is not None:
+            return self.store.get_snapshot(turn)
         return self.snapshots.get(str(turn))
+
+    def get_range(
+        self,
+        start_turn: Optional[int] = None,
+        stop_turn: Optional[int] = None,
+        variables: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Numeric truth values for turns in [start_turn, stop_turn).
+
+        Args:
+            start_turn: First turn (inclusive); None for the first available.
+            stop_turn: Last turn (exclusive); None for the last available.
+            variables: Optional variable subset; unknown names raise KeyError.
+
+        Returns:
+            (turn numbers, variable names, matrix with one row per turn and
+            NaN where a variable has no value).
+        """
+        if self.store is not None:
+            turns, values = self.store.slice(start_turn, stop_turn, variables)
+            names = list(variables) if variables is not None else self.store.variables
+            return turns, names, values
+        turns, names, values, _, _ = snapshots_to_matrix(self.snapshots)
+        turns = np.asarray(turns, dtype=np.int64)
+        lo = 0 if start_turn is None else np.searchsorted(turns, start_turn)
+        hi = len(turns) if stop_turn is None else np.searchsorted(turns, stop_turn)
+        values = values[lo:hi]
+        if variables is not None:
+            columns = {name: col for col, name in enumerate(names)}
+            missing = [name for name in variables if name not in columns]
+            if missing:
+                raise KeyError(f"Unknown truth variables: {missing}")
+            values = values[:, [columns[name] for name in variables]]
+            names = list(variables)
+        return turns[lo:hi], names, values
+
+
+def run_retrodiction_tests(
+    start_dates: Sequence[str],
+    days: int = 30,
+    max_workers: int = 4,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Run a retrodiction sweep over start-date windows.
+
+    Kept for callers of the former runner API; see
+    engine.retrodiction_scheduler.run_retrodiction_sweep for the arguments.
+
+    Returns:
+        Dict[str, Any]: The aggregated skill report.
+    """
+    from engine.retrodiction_scheduler import run_retrodiction_sweep
+
+    return run_retrodiction_sweep(
+        start_dates, days=days, max_workers=max_workers, **kwargs
+    )
@@ -183,7 +183,7 @@ SHADOW_MONITOR_CONFIG = {
     "enabled": True,
     "threshold_variance_explained": 0.35,  # Default 35%
     "window_steps": 10,  # Default window of 10 simulation steps
-    "critical_variables": ["var1", "var2"],  # List of variable names to monitor
+    "critical_variables": ["var1", "var2"],  # Variable names to monitor, or "*"
 }
 
 # --- Model registry for MLOps ---
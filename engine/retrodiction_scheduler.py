@@ -0,0 +1,467 @@
+"""
+retrodiction_scheduler.py
+
+Parallel historical retrodiction sweeps.
+
+A sweep runs one retrodiction simulation per start-date window against the
+historical truth data and scores each window against it. The scheduler:
+1. Converts the truth JSON once to its memory-mapped array form
+   (engine/truth_store.py) so every worker maps the same file
+2. Fans the windows out over a bounded process pool; a window that fails
+   only produces an error entry for itself
+3. Writes one JSON result file per completed window, so a re-run skips
+   windows that already finished
+4. Aggregates the per-window skill scores into a sweep report
+
+Usage:
+    scheduler = RetrodictionScheduler(max_workers=4)
+    report = scheduler.run(["2020-01-01", "2020-02-01"], days=30)
+
+Airflow (dags/retrodiction_dag.py) is a thin caller of run_retrodiction_sweep.
+"""
+
+import datetime as dt
+import json
+import logging
+import math
+import multiprocessing as mp
+import os
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from engine.historical_retrodiction_runner import TRUTH_PATH, RetrodictionLoader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_OUTPUT_DIR = "logs/retrodiction_runs"
+REPORT_FILENAME = "skill_report.json"
+
+WindowStart = Union[str, int]
+
+
+def window_id(start: WindowStart, days: int) -> str:
+    """File-safe identifier of a window, e.g. "2020-01-01_30d"."""
+    return f"{start}_{days}d".replace(os.sep, "-").replace(" ", "_")
+
+
+class WindowTruth:
+    """
+    Truth rows of one window, exposed to simulate_forward as a retrodiction
+    loader: ``get_snapshot_by_turn(i)`` is the truth i turns after the
+    window start, as a flat dict of numeric variables.
+    """
+
+    def __init__(self, start_turn: int, turns: np.ndarray, names, values):
+        self.names = list(names)
+        self.values = values
+        self.rows = {int(turn) - start_turn: row for row, turn in enumerate(turns)}
+
+    def get_snapshot_by_turn(self, turn: int) -> Optional[Dict[str, float]]:
+        row = self.rows.get(turn)
+        if row is None:
+            return None
+        return {
+            name: float(value)
+            for name, value in zip(self.names, self.values[row].tolist())
+            if value == value  # skip NaN
+        }
+
+    def series(self, name: str, length: int) -> np.ndarray:
+        """Truth of one variable for simulation turns 0..length-1 (NaN gaps)."""
+        out = np.full(length, np.nan)
+        col = self.names.index(name)
+        for turn, row in self.rows.items():
+            if 0 <= turn < length:
+                out[turn] = self.values[row, col]
+        return out
+
+
+def _timestamps(loader: RetrodictionLoader) -> Dict[int, str]:
+    if loader.store is not None:
+        extras = loader.store.extras
+        return {
+            int(turn): str(fields["timestamp"])
+            for turn, fields in extras.items()
+            if "timestamp" in fields
+        }
+    return {
+        int(turn): str(snapshot["timestamp"])
+        for turn, snapshot in loader.snapshots.items()
+        if isinstance(snapshot, dict) and "timestamp" in snapshot
+    }
+
+
+def resolve_start_turn(loader: RetrodictionLoader, start: WindowStart) -> int:
+    """
+    Truth turn at which a window starts.
+
+    An int is taken as a turn number; a date string selects the first turn
+    whose snapshot timestamp is on or after that date.
+    """
+    if isinstance(start, int):
+        return start
+    date = dt.date.fromisoformat(str(start)[:10]).isoformat()
+    turns = [
+        turn for turn, stamp in _timestamps(loader).items() if stamp[:10] >= date
+    ]
+    if not turns:
+        raise ValueError(f"No truth snapshots on or after {date}")
+    return min(turns)
+
+
+def _seed_state(state, snapshot: Dict[str, float]) -> None:
+    for name, value in snapshot.items():
+        if state.overlays.has_overlay(name):
+            setattr(state.overlays, name, value)
+        elif name in state.capital.as_dict():
+            setattr(state.capital, name, value)
+        else:
+            state.variables.data[name] = value
+
+
+def score_window(trajectory, truth: WindowTruth) -> Dict[str, Any]:
+    """
+    Skill of a simulated trajectory against the window's truth.
+
+    Per variable: mean absolute error, root mean squared error, mean bias
+    (simulated - truth), and the share of turn-to-turn moves whose direction
+    matches the truth together with the number of moves it was computed
+    over. Variables the simulation does not carry are skipped.
+    """
+    length = len(trajectory)
+    simulated = {
+        **trajectory.as_arrays("capital"),
+        **trajectory.as_arrays("variables"),
+        **trajectory.as_arrays("overlays"),
+    }
+    per_variable: Dict[str, Dict[str, Any]] = {}
+    for name in truth.names:
+        if name not in simulated:
+            continue
+        actual = truth.series(name, length)
+        predicted = simulated[name][:length]
+        mask = np.isfinite(actual) & np.isfinite(predicted)
+        if not mask.any():
+            continue
+        errors = predicted[mask] - actual[mask]
+        moves = np.isfinite(np.diff(actual)) & np.isfinite(np.diff(predicted))
+        hits = np.sign(np.diff(predicted))[moves] == np.sign(np.diff(actual))[moves]
+        per_variable[name] = {
+            "n": int(mask.sum()),
+            "mae": float(np.abs(errors).mean()),
+            "rmse": float(np.sqrt((errors**2).mean())),
+            "bias": float(errors.mean()),
+            "directional_accuracy": float(hits.mean()) if hits.size else None,
+            "moves": int(hits.size),
+        }
+    maes = [score["mae"] for score in per_variable.values()]
+    return {
+        "variables": per_variable,
+        "mean_mae": float(np.mean(maes)) if maes else None,
+    }
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".retro.", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def run_window(
+    start: WindowStart,
+    days: int,
+    truth_path: str,
+    output_dir: str,
+    injection_mode: str = "seed_then_free",
+    use_symbolism: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run and score one retrodiction window and write its result file.
+
+    Errors are returned as {"status": "error", ...} entries (and not written,
+    so the window is retried by the next sweep).
+    """
+    from engine.simulator_core import simulate_forward
+    from engine.worldstate import WorldState
+
+    wid = window_id(start, days)
+    result: Dict[str, Any] = {"window_id": wid, "start": start, "days": days}
+    try:
+        loader = RetrodictionLoader(truth_path)
+        start_turn = resolve_start_turn(loader, start)
+        turns, names, values = loader.get_range(start_turn, start_turn + days)
+        if len(turns) == 0:
+            raise ValueError(f"No truth snapshots in turns [{start_turn}, +{days})")
+        truth = WindowTruth(start_turn, turns, names, values)
+
+        state = WorldState(sim_id=f"retro_{wid}")
+        _seed_state(state, truth.get_snapshot_by_turn(0) or {})
+        trajectory = simulate_forward(
+            state,
+            turns=days,
+            use_symbolism=use_symbolism,
+            return_mode="compact",
+            retrodiction_mode=True,
+            retrodiction_loader=truth,
+            injection_mode=injection_mode,
+        )
+        result.update(
+            {
+                "status": "ok",
+                "start_turn": start_turn,
+                "truth_turns": len(turns),
+                "skill": score_window(trajectory, truth),
+                "final_overlays": trajectory[-1]["overlays"],
+            }
+        )
+        _write_json(os.path.join(output_dir, f"{wid}.json"), result)
+    except Exception as e:
+        logger.error(f"Retrodiction window {wid} failed: {e}")
+        result.update(
+            {
+                "status": "error",
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(),
+            }
+        )
+    return result
+
+
+def aggregate_skill(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine window results into a sweep report with per-variable skill
+    pooled over all completed windows (weighted by scored turns).
+    """
+    completed = [r for r in results if r.get("status") == "ok"]
+    pooled: Dict[str, Dict[str, float]] = {}
+    for result in completed:
+        for name, score in result["skill"]["variables"].items():
+            acc = pooled.setdefault(
+                name, {"n": 0, "abs": 0.0, "sq": 0.0, "hits": 0.0, "moves": 0}
+            )
+            n = score["n"]
+            acc["n"] += n
+            acc["abs"] += score["mae"] * n
+            acc["sq"] += score["rmse"] ** 2 * n
+            if score["directional_accuracy"] is not None:
+                # Result files written before "moves" was recorded assume
+                # every consecutive pair of the n scored turns was counted
+                moves = score.get("moves", n - 1)
+                acc["hits"] += score["directional_accuracy"] * moves
+                acc["moves"] += moves
+    variables = {
+        name: {
+            "n": int(acc["n"]),
+            "mae": acc["abs"] / acc["n"],
+            "rmse": math.sqrt(acc["sq"] / acc["n"]),
+            "directional_accuracy": (
+                acc["hits"] / acc["moves"] if acc["moves"] else None
+            ),
+        }
+        for name, acc in sorted(pooled.items())
+    }
+    window_maes = [
+        r["skill"]["mean_mae"] for r in completed if r["skill"]["mean_mae"] is not None
+    ]
+    return {
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "windows_total": len(results),
+        "windows_completed": len(completed),
+        "windows_failed": len(results) - len(completed),
+        "mean_window_mae": float(np.mean(window_maes)) if window_maes else None,
+        "variables": variables,
+        "windows": [_window_summary(r) for r in results],
+    }
+
+
+def _window_summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {
+        key: result[key]
+        for key in ("window_id", "start", "days", "status", "error")
+        if key in result
+    }
+    if result.get("status") == "ok":
+        summary["mean_mae"] = result["skill"]["mean_mae"]
+    return summary
+
+
+def _worker_context():
+    """
+    Multiprocessing context for window workers.
+
+    The Airflow worker calling the scheduler runs threads, so fork could
+    deadlock. forkserver children come from a single-threaded server that
+    has already imported this module; spawn is the fallback where
+    forkserver is unavailable.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["engine.retrodiction_scheduler"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+class RetrodictionScheduler:
+    """
+    Runs retrodiction windows on a bounded process pool, writes per-window
+    result files and an aggregated skill report.
+    """
+
+    def __init__(
+        self,
+        truth_path: Optional[str] = None,
+        output_dir: str = DEFAULT_OUTPUT_DIR,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        injection_mode: str = "seed_then_free",
+        resume: bool = True,
+        use_symbolism: bool = False,
+    ):
+        """
+        Args:
+            truth_path: Truth JSON (or converted .npy); defaults to TRUTH_PATH
+            output_dir: Directory for window result files and the report
+            max_workers: Maximum concurrent windows (1 runs in-process)
+            injection_mode: "seed_then_free" or "strict_injection"
+            resume: Reuse result files of windows that already completed
+            use_symbolism: Enable symbolic tag tracking in the simulations
+        """
+        self.truth_path = truth_path or TRUTH_PATH
+        self.output_dir = output_dir
+        self.max_workers = max(1, max_workers)
+        self.injection_mode = injection_mode
+        self.resume = resume
+        self.use_symbolism = use_symbolism
+
+    def _completed(self, wid: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.output_dir, f"{wid}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return result if result.get("status") == "ok" else None
+
+    def _prepare_truth(self) -> None:
+        # Convert once up front so workers map the array file instead of
+        # each converting or parsing the JSON.
+        if not self.truth_path.endswith(".npy") and os.path.exists(self.truth_path):
+            RetrodictionLoader(self.truth_path, backend="array")
+
+    def run(
+        self, starts: Sequence[WindowStart], days: int = DEFAULT_WINDOW_DAYS
+    ) -> Dict[str, Any]:
+        """
+        Run every window and write the skill report.
+
+        Args:
+            starts: Window start dates ("YYYY-MM-DD") or truth turn numbers
+            days: Turns simulated per window
+
+        Returns:
+            The aggregated report (also written to output_dir/skill_report.json)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        results: Dict[int, Dict[str, Any]] = {}
+        pending = []
+        for index, start in enumerate(starts):
+            previous = self.resume and self._completed(window_id(start, days))
+            if previous:
+                results[index] = previous
+            else:
+                pending.append((index, start))
+        logger.info(
+            f"Retrodiction sweep: {len(starts)} windows, {len(results)} already "
+            f"complete, {len(pending)} to run on {self.max_workers} workers"
+        )
+        self._prepare_truth()
+
+        args = (days, self.truth_path, self.output_dir, self.injection_mode)
+        if self.max_workers == 1 or len(pending) <= 1:
+            for index, start in pending:
+                results[index] = run_window(start, *args, self.use_symbolism)
+        elif pending:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(pending)),
+                mp_context=_worker_context(),
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        run_window, start, *args, self.use_symbolism
+                    ): (index, start)
+                    for index, start in pending
+                }
+                for future in as_completed(futures):
+                    index, start = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:  # worker process died
+                        results[index] = {
+                            "window_id": window_id(start, days),
+                            "start": start,
+                            "days": days,
+                            "status": "error",
+                            "error": f"{type(e).__name__}: {e}",
+                        }
+                    logger.info(
+                        f"Retrodiction window {results[index]['window_id']}: "
+                        f"{results[index]['status']}"
+                    )
+
+        report = aggregate_skill([results[i] for i in range(len(starts))])
+        _write_json(os.path.join(self.output_dir, REPORT_FILENAME), report)
+        return report
+
+
+def run_retrodiction_sweep(
+    start_dates: Sequence[WindowStart],
+    days: int = DEFAULT_WINDOW_DAYS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    truth_path: Optional[str] = None,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Convenience wrapper: RetrodictionScheduler(...).run(start_dates, days)."""
+    scheduler = RetrodictionScheduler(
+        truth_path=truth_path,
+        output_dir=output_dir,
+        max_workers=max_workers,
+        **kwargs,
+    )
+    return scheduler.run(start_dates, days)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a retrodiction sweep")
+    parser.add_argument("start_dates", nargs="+", help="Window start dates")
+    parser.add_argument("--days", type=int, default=DEFAULT_WINDOW_DAYS)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--truth", default=None, help="Truth JSON path")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    summary = run_retrodiction_sweep(
+        [int(s) if s.isdigit() else s for s in args.start_dates],
+        days=args.days,
+        max_workers=args.workers,
+        truth_path=args.truth,
+        output_dir=args.output_dir,
+    )
+    print(
+        f"{summary['windows_completed']}/{summary['windows_total']} windows "
+        f"completed; mean window MAE: {summary['mean_window_mae']}"
+    )
@@ -0,0 +1,392 @@
+"""
+simulation_checkpoint.py
+
+Binary checkpoint chains for long simulation and retrodiction runs.
+
+A checkpoint directory holds segment files. Each segment starts with a full
+record (WorldState snapshot, trust entries, pickled gravity fabric) followed
+by one delta record per turn holding only what changed: overlay, capital and
+variable values, new event log entries, trust entries and the fabric when it
+changed. A new segment starts every ``full_every`` turns and only the newest
+``keep_full`` segments are retained.
+
+Records are length-prefixed, zlib-compressed and CRC32-checked, so a run
+killed mid-write loses at most its last record; ``resume_checkpoint``
+restores the state, trust service and gravity fabric of any retained turn.
+
+Usage:
+    with CheckpointWriter("checkpoints/run1", full_every=50) as writer:
+        for i in range(turns):
+            simulate_turn(state)
+            writer.record(state, i)
+
+    state, next_turn = resume_checkpoint("checkpoints/run1")
+"""
+
+import copy
+import logging
+import os
+import pickle
+import re
+import struct
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from engine.worldstate import WorldState
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MAGIC = b"PCK1"
+CHECKPOINT_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sH")  # magic, version
+_RECORD = struct.Struct("<BIII")  # kind, turn index, payload length, crc32
+
+FULL_RECORD = 1
+DELTA_RECORD = 2
+
+_SEGMENT_NAME = re.compile(r"^segment_(\d+)\.pck$")
+
+GROUPS = ("overlays", "capital", "variables")
+_MISSING = object()
+
+
+def _segment_path(directory: str, start: int) -> str:
+    return os.path.join(directory, f"segment_{start:09d}.pck")
+
+
+def list_segments(directory: str) -> List[Tuple[int, str]]:
+    """(first turn index, path) of every segment in a directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    segments = []
+    for name in os.listdir(directory):
+        match = _SEGMENT_NAME.match(name)
+        if match:
+            segments.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def read_segment(path: str) -> Iterator[Tuple[int, int, Dict[str, Any], int]]:
+    """
+    Yield (kind, turn index, payload, end offset) for each valid record.
+
+    Reading stops at the first truncated or corrupt record, which is what a
+    run killed mid-write leaves behind.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _FILE_HEADER.size:
+        return
+    magic, version = _FILE_HEADER.unpack_from(data, 0)
+    if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+        logger.warning(f"Skipping {path}: not a checkpoint segment")
+        return
+    offset = _FILE_HEADER.size
+    while offset + _RECORD.size <= len(data):
+        kind, turn, length, crc = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        payload = data[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            logger.warning(f"Checkpoint {path} is truncated after turn {turn - 1}")
+            return
+        offset = start + length
+        yield kind, turn, pickle.loads(zlib.decompress(payload)), offset
+
+
+def _default_trust():
+    from analytics.trust_service import trust_service
+
+    return trust_service
+
+
+def _numeric_or_copy(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: v if isinstance(v, (int, float, str, bool)) else copy.deepcopy(v)
+        for k, v in values.items()
+    }
+
+
+class CheckpointWriter:
+    """
+    Writes a checkpoint chain: a full record every ``full_every`` turns and
+    a delta record for every other turn.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        full_every: int = 50,
+        keep_full: Optional[int] = 3,
+        trust: Optional[Any] = None,
+        start_turn: int = 0,
+        compress_level: int = 1,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            directory: Checkpoint directory (created if missing).
+            full_every: Turns between full snapshots.
+            keep_full: Number of full snapshots (segments) to retain; None keeps all.
+            trust: Trust service to checkpoint (default: the global trust_service);
+                False disables trust checkpointing.
+            start_turn: First turn index this writer records. Records at or
+                after it from an earlier run are discarded.
+            compress_level: zlib level for record payloads.
+            fsync: fsync after every record (survives OS crashes, slower).
+        """
+        if full_every < 1:
+            raise ValueError("full_every must be a positive integer")
+        self.directory = directory
+        self.full_every = full_every
+        self.keep_full = keep_full
+        if trust is None:
+            trust = _default_trust()
+        self.trust = None if trust is False else trust
+        self.compress_level = compress_level
+        self.fsync = fsync
+        self._file = None
+        self._segment_start: Optional[int] = None
+        self._previous: Optional[Dict[str, Any]] = None
+        self.bytes_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._truncate_from(start_turn)
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _truncate_from(self, turn: int) -> None:
+        """Drop records with turn index >= turn left by an earlier run."""
+        for start, path in list_segments(self.directory):
+            if start >= turn:
+                os.remove(path)
+                continue
+            keep = _FILE_HEADER.size
+            for _, record_turn, _, end in read_segment(path):
+                if record_turn >= turn:
+                    break
+                keep = end
+            if os.path.getsize(path) > keep:
+                with open(path, "r+b") as f:
+                    f.truncate(keep)
+
+    def _capture(self, state: WorldState) -> Dict[str, Any]:
+        fabric = getattr(state, "_gravity_fabric", None)
+        return {
+            "turn": state.turn,
+            "sim_id": state.sim_id,
+            "timestamp": state.timestamp,
+            "overlays": state.overlays.as_dict(),
+            "capital": state.capital.as_dict(),
+            "variables": _numeric_or_copy(state.variables.data),
+            "metadata": copy.deepcopy(state.metadata),
+            "event_count": len(state.event_log),
+            "trust": (
+                {key: (a, b, t) for key, a, b, t in self.trust.export_entries()}
+                if self.trust is not None
+                else {}
+            ),
+            "fabric": pickle.dumps(fabric, pickle.HIGHEST_PROTOCOL) if fabric else None,
+        }
+
+    def _delta(self, state: WorldState, current: Dict[str, Any]) -> Dict[str, Any]:
+        previous = self._previous
+        delta: Dict[str, Any] = {}
+        for field in ("turn", "sim_id", "timestamp"):
+            if current[field] != previous[field]:
+                delta[field] = current[field]
+        for group in GROUPS:
+            before, after = previous[group], current[group]
+            changed = {k: v for k, v in after.items() if before.get(k, _MISSING) != v}
+            removed = [k for k in before if k not in after]
+            if changed:
+                delta[group] = changed
+            if removed:
+                delta[group + "_removed"] = removed
+        if current["metadata"] != previous["metadata"]:
+            delta["metadata"] = current["metadata"]
+        if current["event_count"] >= previous["event_count"]:
+            new_events = state.event_log[previous["event_count"] :]
+            if new_events:
+                delta["events"] = list(new_events)
+        else:  # log was reset or trimmed
+            delta["event_log"] = list(state.event_log)
+        trust_changed = {
+            k: v for k, v in current["trust"].items() if previous["trust"].get(k) != v
+        }
+        if trust_changed:
+            delta["trust"] = trust_changed
+        trust_removed = [k for k in previous["trust"] if k not in current["trust"]]
+        if trust_removed:
+            delta["trust_removed"] = trust_removed
+        if current["fabric"] != previous["fabric"]:
+            delta["fabric"] = current["fabric"]
+        return delta
+
+    def _open_segment(self, turn_index: int) -> None:
+        self.close()
+        self._file = open(_segment_path(self.directory, turn_index), "wb")
+        self._file.write(_FILE_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION))
+        self._segment_start = turn_index
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        if self.keep_full is None:
+            return
+        segments = list_segments(self.directory)
+        for _, path in segments[: max(0, len(segments) - self.keep_full)]:
+            os.remove(path)
+
+    def record(self, state: WorldState, turn_index: int) -> int:
+        """
+        Checkpoint the state after turn ``turn_index``.
+
+        Returns:
+            Number of bytes written.
+        """
+        current = self._capture(state)
+        is_full = (
+            self._previous is None
+            or self._file is None
+            or turn_index - self._segment_start >= self.full_every
+        )
+        if is_full:
+            self._open_segment(turn_index)
+            payload = {
+                "state": state.snapshot(),
+                "trust": [(k, *v) for k, v in current["trust"].items()],
+                "fabric": current["fabric"],
+            }
+        else:
+            payload = self._delta(state, current)
+        self._previous = current
+
+        data = zlib.compress(
+            pickle.dumps(payload, pickle.HIGHEST_PROTOCOL), self.compress_level
+        )
+        kind = FULL_RECORD if is_full else DELTA_RECORD
+        self._file.write(_RECORD.pack(kind, turn_index, len(data), zlib.crc32(data)))
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        written = _RECORD.size + len(data)
+        self.bytes_written += written
+        return written
+
+
+class RestoredCheckpoint:
+    """State reconstructed from a checkpoint chain at one turn."""
+
+    def __init__(self, turn_index: int, state: Dict[str, Any], trust, fabric):
+        self.turn_index = turn_index
+        self.state_dict = state
+        self.trust_entries: List[Tuple[str, float, float, float]] = [
+            (k, *v) for k, v in trust.items()
+        ]
+        self.fabric_bytes: Optional[bytes] = fabric
+
+    def world_state(self) -> WorldState:
+        """WorldState with the gravity fabric (if any) re-attached."""
+        state = WorldState.from_dict(copy.deepcopy(self.state_dict))
+        if self.fabric_bytes:
+            state._gravity_fabric = pickle.loads(self.fabric_bytes)
+        return state
+
+
+def available_turns(directory: str) -> List[int]:
+    """Turn indices that can be restored from a checkpoint directory."""
+    return [
+        turn
+        for _, path in list_segments(directory)
+        for _, turn, _, _ in read_segment(path)
+    ]
+
+
+def load_checkpoint(
+    directory: str, turn_index: Optional[int] = None
+) -> Optional[RestoredCheckpoint]:
+    """
+    Rebuild the checkpointed state after a turn.
+
+    Args:
+        directory: Checkpoint directory.
+        turn_index: Turn to restore; the latest valid turn when None.
+
+    Returns:
+        The restored checkpoint, or None if the turn is not available.
+    """
+    segments = list_segments(directory)
+    if turn_index is not None:
+        segments = [seg for seg in segments if seg[0] <= turn_index][-1:]
+    for _, path in reversed(segments):
+        state = trust = fabric = None
+        restored_turn = None
+        for kind, turn, payload, _ in read_segment(path):
+            if turn_index is not None and turn > turn_index:
+                break
+            if kind == FULL_RECORD:
+                state = payload["state"]
+                trust = {k: tuple(v) for k, *v in payload["trust"]}
+                fabric = payload["fabric"]
+            elif state is not None:
+                _apply_delta(state, trust, payload)
+                fabric = payload.get("fabric", fabric)
+            restored_turn = turn
+        if state is not None and (turn_index is None or restored_turn == turn_index):
+            return RestoredCheckpoint(restored_turn, state, trust, fabric)
+    return None
+
+
+def _apply_delta(state: Dict[str, Any], trust: Dict[str, Tuple], delta) -> None:
+    for field in ("turn", "sim_id", "timestamp"):
+        if field in delta:
+            state[field] = delta[field]
+    for group in GROUPS:
+        values = state.setdefault(group, {})
+        values.update(delta.get(group, {}))
+        for key in delta.get(group + "_removed", ()):
+            values.pop(key, None)
+    if "metadata" in delta:
+        state["metadata"] = delta["metadata"]
+    if "event_log" in delta:
+        state["event_log"] = list(delta["event_log"])
+    state.setdefault("event_log", []).extend(delta.get("events", ()))
+    trust.update(delta.get("trust", {}))
+    for key in delta.get("trust_removed", ()):
+        trust.pop(key, None)
+
+
+def resume_checkpoint(
+    directory: str, turn_index: Optional[int] = None, trust: Optional[Any] = None
+) -> Optional[Tuple[WorldState, int]]:
+    """
+    Restore state, trust service and gravity fabric from a checkpoint chain.
+
+    Args:
+        directory: Checkpoint directory.
+        turn_index: Turn to restore; the latest valid turn when None.
+        trust: Trust service to restore into (default: the global
+            trust_service); False leaves trust untouched.
+
+    Returns:
+        (state, next turn index) to continue the run with
+        ``simulate_forward(state, turns, start_turn=next_turn, ...)``, or None
+        if there is nothing to resume from.
+    """
+    restored = load_checkpoint(directory, turn_index)
+    if restored is None:
+        return None
+    if trust is None:
+        trust = _default_trust()
+    if trust is not False:
+        trust.restore_entries(restored.trust_entries)
+    logger.info(f"Resumed checkpoint {directory} after turn {restored.turn_index}")
+    return restored.world_state(), restored.turn_index + 1
@@ -46,12 +46,14 @@ Author: Pulse AI Engine
 import logging  # Added
 from typing import (
     Dict,
+    Iterable,
     List,
     Any,
     Literal,
     Optional,
     Callable,
     TYPE_CHECKING,
+    Union,
 )  # Ensure Optional is imported if not already
 
 if TYPE_CHECKING:
@@ -86,6 +88,8 @@ module_logger = logging.getLogger(__name__)
 from datetime import datetime, timezone  # noqa E402
 import json  # noqa E402
 from engine.state_mutation import decay_overlay  # noqa E402
+from engine.compact_trajectory import CompactTrajectory  # noqa E402
+from engine.simulation_checkpoint import CheckpointWriter  # noqa E402
 from engine.rule_engine import run_rules  # noqa E402
 from trust_system.forecast_episode_logger import log_episode_event  # noqa E402
 
@@ -242,21 +246,23 @@ def simulate_turn(
     # --- Shadow Monitor: Capture initial variable state for critical variables ---
     pre_variables_critical: Dict[str, float] = {}
     if (
-        shadow_monitor_instance and shadow_monitor_instance.critical_variables
+        shadow_monitor_instance and shadow_monitor_instance.active
     ):  # Added block
         try:
             initial_vars_dict = _get_dict_from_vars(state.variables)
             if initial_vars_dict:
                 pre_variables_critical = {
                     var: float(initial_vars_dict.get(var, 0.0))
-                    for var in shadow_monitor_instance.critical_variables
+                    for var in shadow_monitor_instance.watched_variables(
+                        initial_vars_dict
+                    )
                 }
             else:
-                module_logger.debug(
+                logging.getLogger(__name__).debug(
                     "Shadow Monitor: Could not get initial_vars_dict for pre_variables_critical."
                 )
         except Exception as e:
-            module_logger.error(
+            logging.getLogger(__name__).error(
                 f"Shadow Monitor: Error capturing pre_variables_critical: {e}"
             )
 
@@ -329,7 +335,7 @@ def simulate_turn(
                 if (
                     not symbolic_vec_dict and symbolic_vec
                 ):  # If helper failed but symbolic_vec exists
-                    module_logger.warning(
+                    logging.getLogger(__name__).warning(
                         f"Could not convert symbolic_vec of type {
                             type(symbolic_vec)} to dict for shadow monitor.")
 
@@ -355,13 +361,15 @@ def simulate_turn(
             causal_deltas_monitor: Dict[str, float] = {}
             vars_before_gravity_critical: Dict[str, float] = {}
             if (
-                shadow_monitor_instance and shadow_monitor_instance.critical_variables
+                shadow_monitor_instance and shadow_monitor_instance.active
             ):  # Added block
                 try:
                     # sim_vars_dict is the state after causal rules, before gravity
                     vars_before_gravity_critical = {
                         var: float(sim_vars_dict.get(var, 0.0))
-                        for var in shadow_monitor_instance.critical_variables
+                        for var in shadow_monitor_instance.watched_variables(
+                            sim_vars_dict
+                        )
                     }
                     causal_deltas_monitor = {
                         var: vars_before_gravity_critical.get(var, 0.0)
@@ -369,7 +377,7 @@ def simulate_turn(
                         for var in shadow_monitor_instance.critical_variables
                     }
                 except Exception as e:
-                    module_logger.error(
+                    logging.getLogger(__name__).error(
                         f"Shadow Monitor: Error capturing vars_before_gravity_critical or calculating causal_deltas_monitor: {e}")
 
             # Get or create the gravity fabric with specified config if provided
@@ -513,8 +521,7 @@ def simulate_turn(
 
                 # --- Shadow Monitor: Record step and check trigger ---
                 if (
-                    shadow_monitor_instance
-                    and shadow_monitor_instance.critical_variables
+                    shadow_monitor_instance and shadow_monitor_instance.active
                 ):  # Added block
                     try:
                         # state.variables should now reflect corrected_vars
@@ -549,12 +556,12 @@ def simulate_turn(
                             shadow_monitor_instance.check_trigger()
                         )
                         if triggered:
-                            module_logger.warning(
+                            logging.getLogger(__name__).warning(
                                 f"ShadowModelMonitor TRIGGERED at turn {getattr(state, 'turn', -1)}. "
                                 f"Problematic variables: {problematic_vars}. Gravity influence exceeded threshold."
                             )
                     except Exception as e:
-                        module_logger.error(
+                        logging.getLogger(__name__).error(
                             f"Shadow Monitor: Error during record_step or check_trigger: {e}")
 
                 # Store pre-simulation values for next turn
@@ -717,12 +724,14 @@ def simulate_forward(
     state: WorldState,
     turns: int = 5,
     use_symbolism: bool = True,
-    return_mode: Literal["summary", "full"] = "summary",
+    return_mode: Literal["summary", "full", "compact"] = "summary",
     module_logger: Optional[Callable[[str], None]] = None,
     progress_callback: Optional[Callable[[int, int], None]] = None,
     learning_engine=None,
     checkpoint_every: Optional[int] = None,
     checkpoint_path: Optional[str] = None,
+    checkpoint_keep: Optional[int] = 3,
+    start_turn: int = 0,
     parallel: bool = False,
     retrodiction_mode: bool = False,
     retrodiction_loader: Optional[object] = None,
@@ -730,7 +739,9 @@ def simulate_forward(
     shadow_monitor_instance: Optional["_SMM_TypeForHint"] = None,
     gravity_enabled: bool = True,
     gravity_config: Optional[Any] = None,
-) -> List[Dict[str, Any]]:
+    keyframe_every: int = 10,
+    snapshot_turns: Optional[Iterable[int]] = None,
+) -> Union[List[Dict[str, Any]], CompactTrajectory]:
     """
     Runs multiple turns of forward simulation, supporting both forecasting and retrodiction.
 
@@ -738,12 +749,19 @@ def simulate_forward(
         state (WorldState): active sim state
         turns (int): number of steps (must be positive)
         use_symbolism (bool): enable tag/memory tracking
-        return_mode (str): summary/full return format
+        return_mode (str): summary/full/compact return format. "compact" returns a
+            CompactTrajectory: full-mode results backed by per-turn arrays and
+            periodic snapshots instead of a snapshot per turn
         module_logger (callable): optional module_logger for messages
         progress_callback (callable): optional progress reporter (step, total)
         learning_engine: optional learning engine for hooks
-        checkpoint_every: Optional interval for saving checkpoints
-        checkpoint_path: Optional path for saving checkpoints
+        checkpoint_every: Turns between full snapshots in the checkpoint chain
+            (default 50); every other turn is saved as a binary delta
+        checkpoint_path: Optional checkpoint directory for binary checkpoints
+            (see engine.simulation_checkpoint)
+        checkpoint_keep: Number of full snapshots to retain (None keeps all)
+        start_turn: First turn index to run, e.g. the next_turn returned by
+            resume_checkpoint() when continuing an interrupted run
         parallel: Whether to run simulation turns in parallel (not yet supported)
         retrodiction_mode (bool): if True, runs retrodiction with ground truth injection and comparison
         retrodiction_loader (optional): loader providing ground truth snapshots for retrodiction
@@ -751,16 +769,35 @@ def simulate_forward(
         shadow_monitor_instance: Optional ShadowModelMonitor instance
         gravity_enabled (bool): Whether gravity correction is enabled (default: True)
         gravity_config: Optional configuration for the gravity engine
+        keyframe_every (int): compact mode: keep a full snapshot every N turns
+        snapshot_turns: compact mode: turn indices that always keep a snapshot
 
     Returns:
-        List of Dict per turn
+        List of Dict per turn (a CompactTrajectory in compact mode)
     """
     if not isinstance(turns, int) or turns <= 0:
         raise ValueError("turns must be a positive integer")
+    if not 0 <= start_turn < turns:
+        raise ValueError("start_turn must be in [0, turns)")
     if parallel:
         raise NotImplementedError("Parallel execution is not yet supported")
     results = []
-    for i in range(turns):
+    trajectory = None
+    turn_mode = return_mode
+    if return_mode == "compact":
+        trajectory = CompactTrajectory(
+            turns - start_turn, keyframe_every, snapshot_turns
+        )
+        turn_mode = "summary"
+    checkpointer = None
+    if checkpoint_path:
+        checkpointer = CheckpointWriter(
+            checkpoint_path,
+            full_every=checkpoint_every or 50,
+            keep_full=checkpoint_keep,
+            start_turn=start_turn,
+        )
+    for i in range(start_turn, turns):
         # Retrodiction injection of ground truth variables if strict injection mode
         if (
             retrodiction_mode
@@ -845,7 +882,7 @@ def simulate_forward(
         turn_data = simulate_turn(
             state,
             use_symbolism=use_symbolism,
-            return_mode=return_mode,
+            return_mode=turn_mode,
             module_logger=module_logger,
             learning_engine=learning_engine,
             shadow_monitor_instance=shadow_monitor_instance,
@@ -895,9 +932,9 @@ def simulate_forward(
                     module_logger(
                         f"[RETRO] Compared simulated state to ground truth for turn {i}"
                     )
-                # 4 BayesianTrustTracker Hook: batch update after retrodiction
+                # 4 TrustService Hook: batch update after retrodiction
                 # comparison
-                from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+                from analytics.trust_service import trust_service
 
                 if ground_truth_snapshot and "comparison" in locals():
                     batch_results = [
@@ -908,22 +945,27 @@ def simulate_forward(
                         (k, diff == 0.0)
                         for k, diff in comparison["variable_diff"].items()
                     ]
-                    bayesian_trust_tracker.batch_update(batch_results)
+                    trust_service.batch_update(batch_results)
         results.append(turn_data)
-        # Checkpointing
-        if checkpoint_every and checkpoint_path and (i + 1) % checkpoint_every == 0:
+        if trajectory is not None:
+            turn_data["fired_rules"] = getattr(state, "last_fired_rules", [])
+            trajectory.record(state, turn_data)
+        # Checkpointing: full snapshot every checkpoint_every turns, deltas between
+        if checkpointer is not None:
             try:
-                snapshot = state.snapshot()
-                filepath = f"{checkpoint_path}_turn_{i + 1}.json"
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(snapshot, f)
-                if module_logger:
-                    module_logger(f"[SIM] Checkpoint saved to {filepath}")
+                checkpointer.record(state, i)
             except Exception as e:
                 if module_logger:
                     module_logger(f"[SIM] Checkpoint error: {e}")
         if progress_callback:
             progress_callback(i + 1, turns)
+    if checkpointer is not None:
+        checkpointer.close()
+        if module_logger:
+            module_logger(
+                f"[SIM] Checkpointed {turns - start_turn} turns to {checkpoint_path} "
+                f"({checkpointer.bytes_written} bytes)"
+            )
     # --- Batch trust enrichment (redundant if already done in simulate_turn, but ensures all are processed) ---
     from trust_system.trust_engine import TrustEngine
 
@@ -935,6 +977,9 @@ def simulate_forward(
                 module_logger(
                     "[TRUST] Warning: trust_label or confidence missing from simulation batch output."
                 )
+    if trajectory is not None:
+        trajectory.finalize(state, results)
+        return trajectory
     return results
 
 
@@ -1371,6 +1416,7 @@ def reverse_rule_engine(
     """
     from rules.reverse_rule_engine import (
         trace_causal_paths,
+        get_engine,
         get_fingerprints,
     )
     from trust_system.trust_engine import TrustEngine
@@ -1391,18 +1437,12 @@ def reverse_rule_engine(
     symbolic_tags = []
     trust_scores = []
     _engine = TrustEngine()
+    rules_by_id = get_engine(fingerprints).by_id
     for chain in rule_chains:
         tags = []
         trust = 0.0
         for rule_id in chain if isinstance(chain, list) else []:
-            rule = next(
-                (
-                    r
-                    for r in fingerprints
-                    if r.get("rule_id") == rule_id or r.get("id") == rule_id
-                ),
-                None,
-            )
+            rule = rules_by_id.get(rule_id) if isinstance(rule_id, str) else None
             if rule:
                 tags.extend(rule.get("symbolic_tags", []))
                 # Optionally, use trust/frequency from fingerprint
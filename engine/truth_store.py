@@ -0,0 +1,323 @@
+"""
+truth_store.py
+
+Memory-mapped historical truth data for retrodiction.
+
+Historical snapshots are stored as a turns x variables float64 matrix in a
+``.npy`` file (NaN where a variable has no value) with a JSON sidecar that
+holds the variable names, turn numbers and any non-numeric snapshot fields.
+The matrix is opened with ``mmap_mode="r"``, so every process reading the
+same file shares the operating system's page cache instead of parsing and
+holding its own copy of the JSON, and turn ranges or variable subsets can be
+sliced without touching the rest of the data.
+
+Usage:
+    store = convert_json_truth("data/historical_variables.json")
+    store.get_snapshot(3)
+    turns, values = store.slice(0, 100, variables=["spx_close"])
+"""
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRUTH_FORMAT_VERSION = 1
+
+# Process-wide cache so that loaders of the same file share one mapping
+_OPEN_STORES: Dict[Tuple[str, float], "TruthStore"] = {}
+
+
+def truth_cache_path(json_path: str) -> str:
+    """Default location of the array form of a JSON truth file."""
+    root, _ = os.path.splitext(json_path)
+    return root + ".truth.npy"
+
+
+def _sidecar_path(array_path: str) -> str:
+    return array_path[: -len(".npy")] + ".json"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".truth.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def snapshots_to_matrix(
+    snapshots: Mapping,
+) -> Tuple[List[int], List[str], np.ndarray, Dict[str, Dict[str, Any]], str]:
+    """
+    Split JSON-style snapshots into a numeric matrix and non-numeric extras.
+
+    Snapshots may be flat (``{variable: value}``) or nested
+    (``{"turn", "timestamp", "variables": {...}}``); numeric variables go into
+    the matrix and everything else into the extras.
+
+    Returns:
+        (sorted turns, variable names, turns x variables matrix, extras keyed
+        by str(turn), "flat" or "nested").
+    """
+    by_turn = {int(turn): snapshot for turn, snapshot in snapshots.items()}
+    turns = sorted(by_turn)
+    nested = any(
+        isinstance(snapshot, dict) and isinstance(snapshot.get("variables"), dict)
+        for snapshot in by_turn.values()
+    )
+    rows: List[Dict[str, Any]] = []
+    extras: Dict[str, Dict[str, Any]] = {}
+    variables: Dict[str, int] = {}
+    for turn in turns:
+        snapshot = by_turn[turn] or {}
+        values = snapshot.get("variables", {}) if nested else snapshot
+        numeric = {}
+        other = {}
+        for name, value in values.items():
+            if _is_number(value):
+                numeric[name] = value
+                variables.setdefault(name, len(variables))
+            else:
+                other[name] = value
+        if nested:
+            fields = {k: v for k, v in snapshot.items() if k != "variables"}
+            if other:
+                fields["variables"] = other
+            other = fields
+        if other:
+            extras[str(turn)] = other
+        rows.append(numeric)
+
+    matrix = np.full((len(turns), len(variables)), np.nan)
+    for row, numeric in enumerate(rows):
+        for name, value in numeric.items():
+            matrix[row, variables[name]] = value
+    return turns, list(variables), matrix, extras, "nested" if nested else "flat"
+
+
+def convert_json_truth(
+    json_path: str, array_path: Optional[str] = None
+) -> "TruthStore":
+    """
+    Convert a JSON truth file (``{"snapshots": {turn: snapshot}}``) to the
+    memory-mapped array format.
+
+    Args:
+        json_path: Source JSON file.
+        array_path: Destination ``.npy`` path (default: truth_cache_path()).
+
+    Returns:
+        The opened TruthStore.
+    """
+    array_path = array_path or truth_cache_path(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    snapshots = data.get("snapshots", {}) if isinstance(data, dict) else {}
+    turns, variables, matrix, extras, layout = snapshots_to_matrix(snapshots)
+
+    meta = {
+        "format_version": TRUTH_FORMAT_VERSION,
+        "source": os.path.abspath(json_path),
+        "layout": layout,
+        "variables": variables,
+        "turns": turns,
+        "extras": extras,
+    }
+    _atomic_write(array_path, lambda f: np.save(f, matrix))
+    _atomic_write(
+        _sidecar_path(array_path), lambda f: f.write(json.dumps(meta).encode("utf-8"))
+    )
+    logger.info(
+        f"Converted {json_path}: {len(turns)} turns x {len(variables)} variables "
+        f"-> {array_path}"
+    )
+    return TruthStore.open(array_path)
+
+
+def _read_meta(array_path: str) -> Dict[str, Any]:
+    with open(_sidecar_path(array_path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _check_shape(array_path: str, data: np.ndarray, meta: Dict[str, Any]) -> None:
+    """
+    Raise ValueError unless data has one row per sidecar turn and one column
+    per sidecar variable.
+
+    The matrix and sidecar are replaced one after the other, so an
+    interrupted conversion can leave a new matrix next to an old sidecar.
+    """
+    expected = (len(meta["turns"]), len(meta["variables"]))
+    if data.ndim != 2 or data.shape != expected:
+        raise ValueError(
+            f"Truth matrix {array_path} has shape {data.shape}, but its sidecar "
+            f"describes {expected[0]} turns x {expected[1]} variables"
+        )
+
+
+def is_fresh(json_path: str, array_path: Optional[str] = None) -> bool:
+    """
+    True if the array form of json_path exists, is not older than it and
+    matches its sidecar.
+    """
+    array_path = array_path or truth_cache_path(json_path)
+    try:
+        if os.path.getmtime(array_path) < os.path.getmtime(json_path):
+            return False
+        _check_shape(
+            array_path, np.load(array_path, mmap_mode="r"), _read_meta(array_path)
+        )
+    except (OSError, ValueError, KeyError):
+        return False
+    return True
+
+
+class TruthStore:
+    """Read-only, memory-mapped turns x variables truth matrix."""
+
+    def __init__(self, array_path: str):
+        self.path = array_path
+        meta = _read_meta(array_path)
+        if meta.get("format_version") != TRUTH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported truth store format in {array_path}")
+        self.data: np.ndarray = np.load(array_path, mmap_mode="r")
+        _check_shape(array_path, self.data, meta)
+        self.variables: List[str] = meta["variables"]
+        self.turns = np.asarray(meta["turns"], dtype=np.int64)
+        self.layout: str = meta.get("layout", "flat")
+        self.extras: Dict[str, Dict[str, Any]] = meta.get("extras", {})
+        self.columns = {name: col for col, name in enumerate(self.variables)}
+        self._rows = {int(turn): row for row, turn in enumerate(self.turns)}
+
+    @classmethod
+    def open(cls, array_path: str) -> "TruthStore":
+        """Open a store, reusing this process's mapping of an unchanged file."""
+        key = (os.path.abspath(array_path), os.path.getmtime(array_path))
+        store = _OPEN_STORES.get(key)
+        if store is None:
+            store = _OPEN_STORES[key] = cls(array_path)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def __contains__(self, turn: int) -> bool:
+        return turn in self._rows
+
+    def _columns(self, variables: Optional[Sequence[str]]) -> List[int]:
+        if variables is None:
+            return list(range(len(self.variables)))
+        missing = [name for name in variables if name not in self.columns]
+        if missing:
+            raise KeyError(f"Unknown truth variables: {missing}")
+        return [self.columns[name] for name in variables]
+
+    def get_snapshot(
+        self, turn: int, variables: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot of one turn in the layout of the source JSON, or None.
+
+        Args:
+            turn: Turn number.
+            variables: Optional subset of variables to include.
+        """
+        row = self._rows.get(turn)
+        if row is None:
+            return None
+        columns = self._columns(variables)
+        values = self.data[row, columns]
+        numeric = {
+            self.variables[col]: float(value)
+            for col, value in zip(columns, values.tolist())
+            if value == value  # skip NaN
+        }
+        extra = self.extras.get(str(turn), {})
+        if self.layout == "flat":
+            return {**extra, **numeric}
+        snapshot = {k: v for k, v in extra.items() if k != "variables"}
+        snapshot["variables"] = {**extra.get("variables", {}), **numeric}
+        return snapshot
+
+    def slice(
+        self,
+        start_turn: Optional[int] = None,
+        stop_turn: Optional[int] = None,
+        variables: Optional[Sequence[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Values for turns in [start_turn, stop_turn) and a variable subset.
+
+        Returns:
+            (turn numbers, matrix with one row per turn and one column per
+            requested variable). Without a variable subset the matrix is a
+            read-only view of the mapped file.
+        """
+        lo = 0 if start_turn is None else np.searchsorted(self.turns, start_turn)
+        hi = (
+            len(self.turns)
+            if stop_turn is None
+            else np.searchsorted(self.turns, stop_turn)
+        )
+        block = self.data[lo:hi]
+        if variables is not None:
+            block = block[:, self._columns(variables)]
+        return self.turns[lo:hi], block
+
+    def snapshots(self) -> "TruthSnapshots":
+        """Read-only mapping of str(turn) -> snapshot, built lazily."""
+        return TruthSnapshots(self)
+
+
+class TruthSnapshots(Mapping):
+    """Dict-like view of a TruthStore keyed like the JSON ``snapshots`` dict."""
+
+    def __init__(self, store: TruthStore):
+        self._store = store
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        try:
+            snapshot = self._store.get_snapshot(int(key))
+        except (TypeError, ValueError):
+            snapshot = None
+        if snapshot is None:
+            raise KeyError(key)
+        return snapshot
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(turn) for turn in self._store.turns.tolist())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert a JSON truth file to the memory-mapped array format"
+    )
+    parser.add_argument("json_path", help="Truth JSON with a 'snapshots' mapping")
+    parser.add_argument("--output", help="Destination .npy path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    converted = convert_json_truth(args.json_path, args.output)
+    print(
+        f"{converted.path}: {len(converted)} turns x "
+        f"{len(converted.variables)} variables"
+    )
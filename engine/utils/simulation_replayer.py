@@ -115,76 +115,6 @@ else:
         def run_turn(x, **kwargs) -> None:
             pass  # Dummy
 
-    # Original dummy class definitions are now inside the except block
-    class DummyVariables:
-        def __init__(self, data=None):
-            self.data = data if data is not None else {}
-
-        def as_dict(self):
-            return self.data
-
-        def get(self, key, default=None):
-            return self.data.get(key, default)
-
-    class DummySymbolicOverlays:
-        def __init__(self, data=None):
-            self.data = data if data is not None else {}
-
-        def as_dict(self):
-            return self.data
-
-    class DummyWorldState:
-        def __init__(
-            self,
-            turn=0,
-            timestamp=0.0,
-            variables=None,
-            overlays=None,
-            sim_id="dummy_sim",
-        ):
-            self.turn = turn
-            self.timestamp = timestamp
-            self.variables = variables if variables is not None else DummyVariables()
-            self.overlays = (
-                overlays if overlays is not None else DummySymbolicOverlays()
-            )
-            self.sim_id = sim_id
-            self.event_log: List[str] = []
-            self.metadata: Dict[str, Any] = {}
-
-        @classmethod
-        def from_dict(cls, data: Dict[str, Any]) -> "DummyWorldState":
-            return cls(
-                turn=data.get("turn", 0),
-                timestamp=float(data.get("timestamp", time.time())),
-                variables=DummyVariables(
-                    data.get("variables", {}).get("data", {})
-                ),  # Handle nested 'data' for Variables
-                overlays=DummySymbolicOverlays(data.get("overlays", {})),
-                sim_id=data.get("sim_id", "dummy_from_dict"),
-            )
-
-        def clone(self) -> "DummyWorldState":
-            return DummyWorldState.from_dict(self.snapshot())  # type: ignore
-
-        def snapshot(self) -> Dict[str, Any]:
-            return {
-                "turn": self.turn,
-                "timestamp": self.timestamp,
-                "variables": self.variables.as_dict(),
-                "overlays": self.overlays.as_dict(),
-                "sim_id": self.sim_id,
-                "event_log": self.event_log,
-                "metadata": self.metadata,
-            }
-
-    WorldState = DummyWorldState  # type: ignore
-    SymbolicOverlays = DummySymbolicOverlays  # type: ignore
-    Variables = DummyVariables  # type: ignore
-
-    def run_turn(x, **kwargs) -> None:  # Dummy
-        pass
-
 
 # Assuming PATHS is centrally managed, e.g., in a core.config or core.path_registry
 # For robustness, provide a default if PATHS isn't available.
@@ -202,6 +132,8 @@ except ImportError:
         pass
 
 
+from engine.utils.snapshot_archive import SnapshotArchive, pack_snapshots
+
 logger = logging.getLogger(__name__)
 
 
@@ -217,6 +149,12 @@ class ReplayerConfig:
     )  # Cast to str
     verbose: bool = True
     show_symbolic: bool = True  # For diagnostic mode: show overlay diffs
+    # Replay from a delta-encoded archive of the snapshot directory (packed
+    # or brought up to date on first use) instead of the JSON files; ignored
+    # in retrodiction mode
+    use_archive: bool = False
+    archive_path: Optional[str] = None  # Default: <snapshot_directory>.replay
+    start_turn: Optional[int] = None  # Start at the first snapshot >= this turn
     # decay_rate: float = 0.01 # Example: For retrodiction reruns, if
     # turn_engine uses it
 
@@ -249,6 +187,7 @@ class SimulationReplayer:
         self.snapshot_directory = snapshot_directory
         self.config = config if config else ReplayerConfig()
         self.replay_log_entries: List[Dict[str, Any]] = []
+        self._archive: Optional[SnapshotArchive] = None
 
         if not os.path.isdir(self.snapshot_directory):
             logger.error(f"Snapshot directory not found: {self.snapshot_directory}")
@@ -326,10 +265,85 @@ class SimulationReplayer:
                 "No significant differences detected or displayed based on config."
             )
 
+    def archive(self) -> SnapshotArchive:
+        """
+        Delta-encoded archive of the snapshot directory. It is packed on
+        first use and only the snapshot files added since are read later.
+        """
+        self._archive = pack_snapshots(
+            self.snapshot_directory, self.config.archive_path
+        )
+        return self._archive
+
+    def state_at(self, turn: int) -> "WorldState":
+        """
+        WorldState of the first snapshot with a turn >= turn, rebuilt from
+        the archive without replaying earlier snapshots.
+        """
+        archive = self._archive or self.archive()
+        return WorldState.from_dict(archive.state_at(turn))
+
+    def _turn_entry(
+        self, turn: int, filename: str, timestamp: Optional[float]
+    ) -> Dict[str, Any]:
+        """Starts the log entry of one replayed snapshot."""
+        if self.config.verbose:
+            when = datetime.fromtimestamp(timestamp).isoformat() if timestamp else "N/A"
+            logger.info(f"\n--- Turn {turn} (File: {filename}, Timestamp: {when}) ---")
+        return {"turn": turn, "snapshot_file": filename, "timestamp": timestamp}
+
+    def _record_samples(
+        self, log_entry: Dict[str, Any], variables: Dict, overlays: Dict
+    ) -> None:
+        """Audit mode: record the first few variables and overlays."""
+        log_entry["variables_sample"] = dict(list(variables.items())[:5])
+        log_entry["overlays_sample"] = dict(list(overlays.items())[:3])
+        if self.config.verbose:
+            logger.info(f"  Variables Sample: {log_entry['variables_sample']}")
+            logger.info(f"  Overlays Sample: {log_entry['overlays_sample']}")
+
+    def _record_diffs(
+        self, log_entry: Dict[str, Any], variable_diffs: Dict, overlay_diffs: Dict
+    ) -> None:
+        log_entry["variable_diffs"] = variable_diffs
+        log_entry["overlay_diffs"] = overlay_diffs
+        if self.config.verbose:
+            self._print_diffs(variable_diffs, overlay_diffs)
+
     def replay_simulation(self, replay_session_id: Optional[str] = None):
         """
         Replays the simulation from snapshots in the log_dir.
         """
+        # Retrodiction reruns need full WorldStates, so it always replays
+        # the JSON files
+        if self.config.use_archive and self.config.mode != "retrodiction":
+            replayed = self._replay_archive()
+        else:
+            replayed = self._replay_snapshot_files()
+        if not replayed:
+            return
+
+        if self.config.log_to_file:
+            self._save_replay_log(replay_session_id)
+
+        if replay_session_id:
+            log_learning_event(
+                "simulation_replay_session_completed",
+                {
+                    "replay_session_id": replay_session_id,
+                    "snapshot_directory": self.snapshot_directory,
+                    "mode": self.config.mode,
+                    "turns_replayed": len(self.replay_log_entries),
+                    "completion_timestamp": datetime.utcnow().isoformat(),
+                },
+            )
+
+        logger.info(
+            f"Replay completed. {len(self.replay_log_entries)} turns processed."
+        )
+
+    def _replay_snapshot_files(self) -> bool:
+        """Replays by loading every snapshot JSON file into a WorldState."""
         snapshot_files = sorted(
             [
                 f
@@ -340,14 +354,19 @@ class SimulationReplayer:
 
         if not snapshot_files:
             logger.warning(f"No snapshot files found in {self.snapshot_directory}")
-            return
-
-        if self.config.step_limit is not None:
-            snapshot_files = snapshot_files[: self.config.step_limit]
+            return False
 
         previous_state: Optional["WorldState"] = None  # Changed to string literal
+        # step_limit counts snapshot files from the first one replayed
+        started = 0 if self.config.start_turn is None else None
 
         for turn_index, filename in enumerate(snapshot_files):
+            if (
+                self.config.step_limit is not None
+                and started is not None
+                and turn_index - started >= self.config.step_limit
+            ):
+                break
             full_path = os.path.join(self.snapshot_directory, filename)
             current_state = self._load_snapshot(full_path)
 
@@ -356,44 +375,27 @@ class SimulationReplayer:
                     f"Skipping turn {turn_index} due to load error for file {filename}"
                 )
                 continue
+            if started is None:
+                if current_state.turn < self.config.start_turn:
+                    continue
+                started = turn_index
 
-            log_entry: Dict[str, Any] = {
-                "turn": current_state.turn,  # Use turn from WorldState
-                "snapshot_file": filename,
-                "timestamp": current_state.timestamp,  # Timestamp from WorldState
-            }
-
-            if self.config.verbose:
-                logger.info(
-                    f"\n--- Turn {
-                        current_state.turn} (File: {filename}, Timestamp: {
-                        datetime.fromtimestamp(
-                            current_state.timestamp).isoformat() if current_state.timestamp else 'N/A'}) ---")
+            log_entry = self._turn_entry(
+                current_state.turn, filename, current_state.timestamp
+            )
 
             if self.config.mode == "audit":
-                # Display basic info or selected variables
-                log_entry["variables_sample"] = (
-                    dict(list(current_state.variables.as_dict().items())[:5])
-                    if current_state.variables
-                    else {}
-                )
-                log_entry["overlays_sample"] = (
-                    dict(list(current_state.overlays.as_dict().items())[:3])
-                    if current_state.overlays
-                    else {}
+                variables, overlays = current_state.variables, current_state.overlays
+                self._record_samples(
+                    log_entry,
+                    variables.as_dict() if variables else {},
+                    overlays.as_dict() if overlays else {},
                 )
-                if self.config.verbose:
-                    logger.info(f"  Variables Sample: {log_entry['variables_sample']}")
-                    logger.info(f"  Overlays Sample: {log_entry['overlays_sample']}")
 
             elif self.config.mode == "diagnostic" and previous_state:
-                variable_diffs, overlay_diffs = self._diff_states(
-                    previous_state, current_state
+                self._record_diffs(
+                    log_entry, *self._diff_states(previous_state, current_state)
                 )
-                log_entry["variable_diffs"] = variable_diffs
-                log_entry["overlay_diffs"] = overlay_diffs
-                if self.config.verbose:
-                    self._print_diffs(variable_diffs, overlay_diffs)
 
             elif self.config.mode == "retrodiction" and previous_state:
                 # Example: Re-run logic. This part is highly dependent on `run_turn`'s signature
@@ -417,25 +419,55 @@ class SimulationReplayer:
 
             self.replay_log_entries.append(log_entry)
             previous_state = current_state
+        return True
 
-        if self.config.log_to_file:
-            self._save_replay_log(replay_session_id)
+    def _replay_archive(self) -> bool:
+        """
+        Replays from the snapshot archive: seeks to start_turn through the
+        nearest keyframe and streams one delta per snapshot, so snapshots
+        are never all in memory. Audit samples follow the archive's
+        variable order.
+        """
+        archive = self.archive()
+        if not len(archive):
+            logger.warning(f"No snapshot files found in {self.snapshot_directory}")
+            return False
+        start = 0
+        if self.config.start_turn is not None:
+            try:
+                start = archive.position(self.config.start_turn)
+            except KeyError as e:
+                logger.warning(str(e))
+                return False
+        stop = None
+        if self.config.step_limit is not None:
+            stop = start + self.config.step_limit
 
-        if replay_session_id:
-            log_learning_event(
-                "simulation_replay_session_completed",
-                {
-                    "replay_session_id": replay_session_id,
-                    "snapshot_directory": self.snapshot_directory,
-                    "mode": self.config.mode,
-                    "turns_replayed": len(self.replay_log_entries),
-                    "completion_timestamp": datetime.utcnow().isoformat(),
-                },
-            )
+        if self.config.mode == "audit":
+            for entry, snapshot in archive.iter_states(start, stop):
+                log_entry = self._turn_entry(
+                    entry["turn"], entry["file"], entry["timestamp"]
+                )
+                self._record_samples(
+                    log_entry, snapshot["variables"], snapshot["overlays"]
+                )
+                self.replay_log_entries.append(log_entry)
+            return True
 
-        logger.info(
-            f"Replay completed. {len(self.replay_log_entries)} turns processed."
+        first = archive.entries[start]
+        self.replay_log_entries.append(
+            self._turn_entry(first["turn"], first["file"], first["timestamp"])
         )
+        for entry, variable_diffs, overlay_diffs in archive.iter_diffs(
+            start, stop, show_symbolic=self.config.show_symbolic
+        ):
+            log_entry = self._turn_entry(
+                entry["turn"], entry["file"], entry["timestamp"]
+            )
+            if self.config.mode == "diagnostic":
+                self._record_diffs(log_entry, variable_diffs, overlay_diffs)
+            self.replay_log_entries.append(log_entry)
+        return True
 
     def _save_replay_log(self, replay_session_id: Optional[str] = None):
         """Saves the collected replay log to a file."""
@@ -0,0 +1,614 @@
+"""
+snapshot_archive.py
+
+Delta-encoded archives of WorldState snapshot directories for replay.
+
+A snapshot directory (worldstate_snapshot_turn_*.json) is packed into an
+archive directory holding:
+
+- keyframes.npy: the full numeric state (overlays, capital and numeric
+  variables) every ``keyframe_interval`` snapshots
+- change_cols.npy / change_vals.npy: for every snapshot, the columns that
+  changed since the previous one and their new values, delimited by the
+  ``change_ptr`` offsets in the index
+- keyframe_ints.npy / change_ints.npy: which of those values were ints, so
+  variables round-trip with their JSON type
+- keyframe_present.npy / change_present.npy: which columns hold a value;
+  a removed value is a change to "not present", so a variable whose value
+  is NaN is kept like any other number
+- index.json: column names, per-snapshot file / turn / timestamp, change
+  offsets, and the non-numeric fields (sim_id, event_log, metadata,
+  non-numeric variables) as per-snapshot deltas with their own keyframes
+
+Consecutive states are diffed with array operations while packing, one
+snapshot at a time. The arrays are memory-mapped, any snapshot can be
+rebuilt from its nearest keyframe without replaying from the start, and
+diffs are streamed lazily. Packing an existing archive only reads the
+snapshot files added since it was written.
+
+Overlays, capital and variables are read the way WorldState.from_dict
+reads them, so rebuilt snapshots load into the same WorldState.
+
+Usage:
+    archive = pack_snapshots("snapshots/")
+    archive.state_at(120)
+    for entry, variable_diffs, overlay_diffs in archive.iter_diffs():
+        ...
+"""
+
+import copy
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 2
+DEFAULT_KEYFRAME_INTERVAL = 32
+SNAPSHOT_PREFIX = "worldstate_snapshot_turn_"
+INDEX_FILENAME = "index.json"
+
+# Mirrors the core fields and defaults of engine.worldstate
+CORE_OVERLAYS = {
+    "hope": 0.5,
+    "despair": 0.5,
+    "rage": 0.5,
+    "fatigue": 0.5,
+    "trust": 0.5,
+}
+CORE_CAPITAL = {
+    "nvda": 0.0,
+    "msft": 0.0,
+    "ibit": 0.0,
+    "spy": 0.0,
+    "cash": 100000.0,
+}
+NUMERIC_GROUPS = ("overlays", "capital", "variables")
+
+
+def archive_path(snapshot_directory: str) -> str:
+    """Default archive location for a snapshot directory."""
+    return os.path.normpath(snapshot_directory) + ".replay"
+
+
+def snapshot_files(snapshot_directory: str) -> List[str]:
+    """Snapshot file names in replay order (sorted by name)."""
+    return sorted(
+        f
+        for f in os.listdir(snapshot_directory)
+        if f.endswith(".json") and f.startswith(SNAPSHOT_PREFIX)
+    )
+
+
+def _file_stamp(snapshot_directory: str, filename: str) -> List:
+    stat = os.stat(os.path.join(snapshot_directory, filename))
+    return [filename, stat.st_mtime_ns, stat.st_size]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".archive.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def split_snapshot(data: Dict[str, Any]) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """
+    Split a snapshot dict into numeric columns and other fields.
+
+    Keys are ``"<group>/<name>"`` for overlays, capital and variables and the
+    field name for top-level fields (turn and timestamp are kept in the
+    index instead).
+
+    Returns:
+        (numeric values, non-numeric values)
+    """
+    overlays = data.get("overlays") or {}
+    capital = data.get("capital") or {}
+    variables = data.get("variables") or {}
+    if isinstance(variables.get("data"), dict):
+        variables = variables["data"]
+
+    groups = {
+        "overlays": {
+            **{name: float(overlays.get(name, d)) for name, d in CORE_OVERLAYS.items()},
+            **{k: float(v) for k, v in overlays.get("_dynamic_overlays", {}).items()},
+        },
+        "capital": {
+            **{name: float(capital.get(name, d)) for name, d in CORE_CAPITAL.items()},
+            **{k: float(v) for k, v in capital.get("_dynamic_assets", {}).items()},
+        },
+        "variables": variables,
+    }
+    numeric: Dict[str, float] = {}
+    objects: Dict[str, Any] = {}
+    for group, values in groups.items():
+        for name, value in values.items():
+            key = f"{group}/{name}"
+            if _is_number(value):
+                numeric[key] = value
+            else:
+                objects[key] = value
+    if overlays.get("_metadata"):
+        objects["overlays/_metadata"] = overlays["_metadata"]
+    for field, value in data.items():
+        if field not in NUMERIC_GROUPS and field not in ("turn", "timestamp"):
+            objects[field] = value
+    return numeric, objects
+
+
+def _object_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes from old to new non-numeric fields; lists may be appended to."""
+    delta: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        previous = old.get(key)
+        if (
+            isinstance(value, list)
+            and isinstance(previous, list)
+            and previous
+            and value[: len(previous)] == previous
+        ):
+            delta.setdefault("append", {})[key] = value[len(previous) :]
+        else:
+            delta.setdefault("set", {})[key] = value
+    unset = [key for key in old if key not in new]
+    if unset:
+        delta["unset"] = unset
+    return delta
+
+
+def _apply_object_delta(objects: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    for key in delta.get("unset", ()):
+        objects.pop(key, None)
+    objects.update(copy.deepcopy(delta.get("set", {})))
+    for key, tail in delta.get("append", {}).items():
+        objects[key] = objects[key] + copy.deepcopy(tail)
+
+
+def _apply_changes(
+    row: np.ndarray,
+    ints: np.ndarray,
+    present: np.ndarray,
+    cols: np.ndarray,
+    vals: np.ndarray,
+    flags: np.ndarray,
+    present_flags: np.ndarray,
+) -> None:
+    """
+    row[cols] = vals, ints[cols] = flags and present[cols] = present_flags;
+    the last repeat wins.
+    """
+    if len(cols) == 0:
+        return
+    last, first_from_end = np.unique(cols[::-1], return_index=True)
+    row[last] = vals[::-1][first_from_end]
+    ints[last] = flags[::-1][first_from_end]
+    present[last] = present_flags[::-1][first_from_end]
+
+
+def _value(value: float, is_int: bool) -> Any:
+    return int(value) if is_int else float(value)
+
+
+class SnapshotArchive:
+    """Read-only, memory-mapped view of a packed snapshot archive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILENAME), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format_version") != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot archive format in {path}")
+        self.index = index
+        self.source: str = index["source"]
+        self.columns: List[str] = index["columns"]
+        self.entries: List[Dict[str, Any]] = index["entries"]
+        self.keyframe_interval: int = index["keyframe_interval"]
+        self.turns = np.asarray([e["turn"] for e in self.entries], dtype=np.int64)
+        self.change_ptr = np.asarray(index["change_ptr"], dtype=np.int64)
+        width = len(self.columns)
+        self.keyframes = self._load("keyframes.npy")[:, :width]
+        self.keyframe_ints = self._load("keyframe_ints.npy")[:, :width]
+        self.keyframe_present = self._load("keyframe_present.npy")[:, :width]
+        self.change_cols = self._load("change_cols.npy")
+        self.change_vals = self._load("change_vals.npy")
+        self.change_ints = self._load("change_ints.npy")
+        self.change_present = self._load("change_present.npy")
+        self._groups = [key.split("/", 1) for key in self.columns]
+        self._column_lookup = {key: col for col, key in enumerate(self.columns)}
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, name), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def position(self, turn: int) -> int:
+        """Position of the first snapshot with a turn >= turn."""
+        found = np.flatnonzero(self.turns >= turn)
+        if not len(found):
+            raise KeyError(f"No snapshot at or after turn {turn} in {self.path}")
+        return int(found[0])
+
+    # --- state reconstruction ---
+
+    def _changes(self, lo: int, hi: int) -> Tuple[np.ndarray, ...]:
+        """Changes recorded for positions [lo, hi)."""
+        a, b = self.change_ptr[lo], self.change_ptr[hi]
+        return (
+            self.change_cols[a:b],
+            self.change_vals[a:b],
+            self.change_ints[a:b],
+            self.change_present[a:b],
+        )
+
+    def _seek(
+        self, pos: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Numeric row, int flags, presence mask and other fields at a position."""
+        k = pos // self.keyframe_interval
+        first = k * self.keyframe_interval
+        row = np.array(self.keyframes[k], dtype=float)
+        ints = np.array(self.keyframe_ints[k], dtype=bool)
+        present = np.array(self.keyframe_present[k], dtype=bool)
+        _apply_changes(row, ints, present, *self._changes(first + 1, pos + 1))
+        objects = copy.deepcopy(self.index["object_keyframes"][k])
+        for delta in self.index["object_deltas"][first + 1 : pos + 1]:
+            _apply_object_delta(objects, delta)
+        return row, ints, present, objects
+
+    def _snapshot(
+        self,
+        pos: int,
+        row: np.ndarray,
+        ints: np.ndarray,
+        present: np.ndarray,
+        objects: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        entry = self.entries[pos]
+        grouped: Dict[str, Dict[str, Any]] = {group: {} for group in NUMERIC_GROUPS}
+        cols = np.flatnonzero(present)
+        for col, value, is_int in zip(
+            cols.tolist(), row[cols].tolist(), ints[cols].tolist()
+        ):
+            group, name = self._groups[col]
+            grouped[group][name] = _value(value, is_int)
+        snapshot: Dict[str, Any] = {}
+        for key, value in objects.items():
+            group, sep, name = key.partition("/")
+            if sep and group in grouped:
+                grouped[group][name] = copy.deepcopy(value)
+            else:
+                snapshot[key] = copy.deepcopy(value)
+        overlays, capital = grouped["overlays"], grouped["capital"]
+        metadata = overlays.pop("_metadata", None)
+        overlays = {
+            **{name: overlays.pop(name) for name in CORE_OVERLAYS if name in overlays},
+            "_dynamic_overlays": overlays,
+        }
+        if metadata is not None:
+            overlays["_metadata"] = metadata
+        capital = {
+            **{name: capital.pop(name) for name in CORE_CAPITAL if name in capital},
+            "_dynamic_assets": capital,
+        }
+        snapshot.update(
+            turn=entry["turn"],
+            overlays=overlays,
+            capital=capital,
+            variables=grouped["variables"],
+        )
+        if entry["timestamp"] is not None:
+            snapshot["timestamp"] = entry["timestamp"]
+        return snapshot
+
+    def state_at(
+        self, turn: Optional[int] = None, position: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Snapshot dict (WorldState.from_dict input) for a turn or position,
+        rebuilt from the nearest keyframe.
+        """
+        pos = self.position(turn) if position is None else position
+        return self._snapshot(pos, *self._seek(pos))
+
+    def iter_states(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Stream (entry, snapshot dict) for positions [start, stop), applying
+        one delta per step after seeking to start.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+        row, ints, present, objects = self._seek(start)
+        for pos in range(start, stop):
+            if pos > start:
+                _apply_changes(row, ints, present, *self._changes(pos, pos + 1))
+                _apply_object_delta(objects, self.index["object_deltas"][pos])
+            yield self.entries[pos], self._snapshot(pos, row, ints, present, objects)
+
+    def iter_diffs(
+        self, start: int = 0, stop: Optional[int] = None, show_symbolic: bool = True
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+        """
+        Stream (entry, variable_diffs, overlay_diffs) for each position in
+        (start, stop) relative to the previous one, in the format of
+        SimulationReplayer._diff_states ({name: {"old": .., "new": ..}}).
+        Only the changed columns of each step are touched.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start + 1 >= stop:
+            return
+        row, ints, present, objects = self._seek(start)
+        groups = ("variables", "overlays") if show_symbolic else ("variables",)
+        for pos in range(start + 1, stop):
+            changes = self._changes(pos, pos + 1)
+            cols = changes[0]
+            delta = self.index["object_deltas"][pos]
+            old_row, old_ints, old_present = row.copy(), ints.copy(), present.copy()
+            changed_objects = (
+                set(delta.get("set", ()))
+                | set(delta.get("append", ()))
+                | set(delta.get("unset", ()))
+            )
+            old_objects = {key: objects.get(key) for key in changed_objects}
+            _apply_changes(row, ints, present, *changes)
+            _apply_object_delta(objects, delta)
+
+            diffs: Dict[str, Dict[str, Any]] = {group: {} for group in groups}
+            numeric_keys = {self.columns[col]: col for col in cols.tolist()}
+            for key in list(numeric_keys) + sorted(changed_objects):
+                group, sep, name = key.partition("/")
+                if not sep or group not in diffs or name == "_metadata":
+                    continue
+                col = numeric_keys.get(key, self._column_lookup.get(key))
+                old = _resolve(
+                    col, old_row, old_ints, old_present, old_objects.get(key)
+                )
+                new = _resolve(col, row, ints, present, objects.get(key))
+                if not _same_value(old, new):
+                    diffs[group][name] = {"old": old, "new": new}
+            yield self.entries[pos], diffs["variables"], diffs.get("overlays", {})
+
+
+def _resolve(
+    col: Optional[int],
+    row: np.ndarray,
+    ints: np.ndarray,
+    present: np.ndarray,
+    fallback: Any,
+) -> Any:
+    """Numeric value of a column if present, else the non-numeric value."""
+    if col is not None and present[col]:
+        return _value(row[col], ints[col])
+    return fallback
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    # NaN != NaN, but an unchanged NaN value is not a diff
+    if isinstance(old, float) and isinstance(new, float):
+        return old == new or (np.isnan(old) and np.isnan(new))
+    return old == new
+
+
+def _empty_state() -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+    return np.zeros(0), np.zeros(0, dtype=bool), np.zeros(0, dtype=bool), {}
+
+
+def _open_if_valid(path: str) -> Optional[SnapshotArchive]:
+    try:
+        return SnapshotArchive(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.info(f"Rebuilding snapshot archive {path}: {e}")
+        return None
+
+
+def pack_snapshots(
+    snapshot_directory: str,
+    archive_dir: Optional[str] = None,
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+) -> SnapshotArchive:
+    """
+    Pack (or bring up to date) the archive of a snapshot directory.
+
+    If the archive already covers a prefix of the current snapshot files
+    (same names, sizes and modification times), only the new files are read
+    and appended; otherwise the archive is rebuilt.
+
+    Args:
+        snapshot_directory: Directory with worldstate_snapshot_turn_*.json.
+        archive_dir: Archive location (default: archive_path()).
+        keyframe_interval: Snapshots between full keyframes.
+
+    Returns:
+        The opened SnapshotArchive.
+    """
+    archive_dir = archive_dir or archive_path(snapshot_directory)
+    stamps = [
+        _file_stamp(snapshot_directory, f) for f in snapshot_files(snapshot_directory)
+    ]
+
+    existing = (
+        _open_if_valid(archive_dir)
+        if os.path.exists(os.path.join(archive_dir, INDEX_FILENAME))
+        else None
+    )
+    if existing is not None:
+        covered = existing.index["files"]
+        if (
+            covered == stamps[: len(covered)]
+            and existing.keyframe_interval == keyframe_interval
+        ):
+            if len(covered) == len(stamps):
+                return existing
+        else:
+            existing = None
+
+    if existing is not None:
+        index = copy.deepcopy(existing.index)
+        keyframes = [np.array(k, dtype=float) for k in existing.keyframes]
+        keyframe_ints = [np.array(k, dtype=bool) for k in existing.keyframe_ints]
+        keyframe_present = [
+            np.array(k, dtype=bool) for k in existing.keyframe_present
+        ]
+        change_cols = [np.array(existing.change_cols, dtype=np.int64)]
+        change_vals = [np.array(existing.change_vals, dtype=float)]
+        change_ints = [np.array(existing.change_ints, dtype=bool)]
+        change_present = [np.array(existing.change_present, dtype=bool)]
+        if len(existing):
+            row, ints, present, objects = existing._seek(len(existing) - 1)
+        else:
+            row, ints, present, objects = _empty_state()
+        new_stamps = stamps[len(index["files"]) :]
+    else:
+        index = {
+            "format_version": ARCHIVE_FORMAT_VERSION,
+            "source": os.path.abspath(snapshot_directory),
+            "keyframe_interval": keyframe_interval,
+            "columns": [],
+            "entries": [],
+            "files": [],
+            "change_ptr": [0],
+            "object_keyframes": [],
+            "object_deltas": [],
+        }
+        keyframes, keyframe_ints, keyframe_present = [], [], []
+        change_cols, change_vals, change_ints, change_present = [], [], [], []
+        row, ints, present, objects = _empty_state()
+        new_stamps = stamps
+
+    column_index = {key: col for col, key in enumerate(index["columns"])}
+    n_changes = index["change_ptr"][-1]
+
+    for stamp in new_stamps:
+        filename = stamp[0]
+        index["files"].append(stamp)
+        try:
+            with open(os.path.join(snapshot_directory, filename), "r") as f:
+                data = json.load(f)
+            numeric, current_objects = split_snapshot(data)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Skipping unreadable snapshot {filename}: {e}")
+            continue
+
+        for key in numeric:
+            if key not in column_index:
+                column_index[key] = len(index["columns"])
+                index["columns"].append(key)
+        width = len(index["columns"])
+        cols = np.fromiter(map(column_index.__getitem__, numeric), np.int64)
+        current = np.full(width, np.nan)
+        current[cols] = np.fromiter(numeric.values(), float, len(numeric))
+        current_ints = np.zeros(width, dtype=bool)
+        current_ints[cols] = [isinstance(v, int) for v in numeric.values()]
+        current_present = np.zeros(width, dtype=bool)
+        current_present[cols] = True
+
+        # Diff against the previous state (widened to the new columns)
+        previous = np.full(width, np.nan)
+        previous[: len(row)] = row
+        previous_ints = np.zeros(width, dtype=bool)
+        previous_ints[: len(ints)] = ints
+        previous_present = np.zeros(width, dtype=bool)
+        previous_present[: len(present)] = present
+        same_value = (previous == current) | (np.isnan(previous) & np.isnan(current))
+        same = (previous_present == current_present) & (
+            ~current_present | (same_value & (previous_ints == current_ints))
+        )
+        changed = np.flatnonzero(~same)
+
+        pos = len(index["entries"])
+        if pos % keyframe_interval == 0:
+            keyframes.append(current)
+            keyframe_ints.append(current_ints)
+            keyframe_present.append(current_present)
+            index["object_keyframes"].append(current_objects)
+        change_cols.append(changed)
+        change_vals.append(current[changed])
+        change_ints.append(current_ints[changed])
+        change_present.append(current_present[changed])
+        n_changes += len(changed)
+        index["change_ptr"].append(n_changes)
+        index["object_deltas"].append(_object_delta(objects, current_objects))
+        timestamp = data.get("timestamp")
+        index["entries"].append(
+            {
+                "file": filename,
+                "turn": data.get("turn", 0),
+                "timestamp": float(timestamp) if timestamp is not None else None,
+            }
+        )
+        row, ints, present = current, current_ints, current_present
+        objects = current_objects
+
+    width = len(index["columns"])
+    keyframe_matrix = np.full((len(keyframes), width), np.nan)
+    keyframe_int_matrix = np.zeros((len(keyframes), width), dtype=bool)
+    keyframe_present_matrix = np.zeros((len(keyframes), width), dtype=bool)
+    for k, (keyframe, flags, mask) in enumerate(
+        zip(keyframes, keyframe_ints, keyframe_present)
+    ):
+        keyframe_matrix[k, : len(keyframe)] = keyframe
+        keyframe_int_matrix[k, : len(flags)] = flags
+        keyframe_present_matrix[k, : len(mask)] = mask
+
+    os.makedirs(archive_dir, exist_ok=True)
+    for name, parts, dtype in (
+        ("keyframes.npy", [keyframe_matrix], float),
+        ("keyframe_ints.npy", [keyframe_int_matrix], bool),
+        ("keyframe_present.npy", [keyframe_present_matrix], bool),
+        ("change_cols.npy", change_cols, np.int64),
+        ("change_vals.npy", change_vals, float),
+        ("change_ints.npy", change_ints, bool),
+        ("change_present.npy", change_present, bool),
+    ):
+        array = np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+        _atomic_write(
+            os.path.join(archive_dir, name), lambda f, a=array: np.save(f, a)
+        )
+    # The index is written last; it is what marks the archive as up to date
+    _atomic_write(
+        os.path.join(archive_dir, INDEX_FILENAME),
+        lambda f: f.write(json.dumps(index).encode("utf-8")),
+    )
+    logger.info(
+        f"Packed {len(new_stamps)} snapshot files from {snapshot_directory}: "
+        f"{len(index['entries'])} snapshots x {width} columns -> {archive_dir}"
+    )
+    return SnapshotArchive(archive_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Pack a WorldState snapshot directory into a replay archive"
+    )
+    parser.add_argument("snapshot_directory", help="Directory of snapshot JSON files")
+    parser.add_argument("--output", help="Archive directory")
+    parser.add_argument(
+        "--keyframe-interval", type=int, default=DEFAULT_KEYFRAME_INTERVAL
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    packed = pack_snapshots(
+        args.snapshot_directory, args.output, args.keyframe_interval
+    )
+    print(f"{packed.path}: {len(packed)} snapshots x {len(packed.columns)} columns")
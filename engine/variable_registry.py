@@ -11,11 +11,15 @@ Pulse Version: v0.28
 from __future__ import annotations
 
 
+import atexit
 import json
 import os
-from typing import Dict, Any, Tuple, Set, List, Optional, Callable
+import tempfile
+import threading
+import weakref
+from typing import Dict, Any, Tuple, Set, List, Optional, Callable, Iterator
 from engine.path_registry import PATHS
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 
 # === Canonical Static Variable Dictionary ===
 VARIABLE_REGISTRY: Dict[str, Dict[str, Any]] = {
@@ -1872,6 +1876,36 @@ def get_variables_by_type(var_type: str) -> List[str]:
 # === Extended Runtime Accessor =========================================
 REGISTRY_PATH = PATHS.get("VARIABLE_REGISTRY", "configs/variable_registry.json")
 
+# Seconds a change may wait before it is written; changes made in the
+# meantime are written by the same flush
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Metadata fields with an inverted index (field -> value -> names)
+INDEXED_FIELDS = ("tags", "type", "source")
+
+_live_registries: "weakref.WeakSet[VariableRegistry]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_registries() -> None:
+    for live in list(_live_registries):
+        with suppress(Exception):
+            live.flush()
+
+
+def _index_keys(meta: Dict[str, Any]) -> Set[Tuple[str, Any]]:
+    keys = set()
+    for tag in meta.get("tags", None) or ():
+        with suppress(TypeError):
+            keys.add(("tags", tag))
+    for field in INDEXED_FIELDS[1:]:
+        value = meta.get(field)
+        if value is not None:
+            with suppress(TypeError):
+                hash(value)
+                keys.add((field, value))
+    return keys
+
 
 class VariableRegistry:
     """
@@ -1880,25 +1914,53 @@ class VariableRegistry:
     This class manages the:
     - Static variable definitions
     - Runtime tracking of values
-    - Variable search and metadata
+    - Variable search and metadata (tag/type/source indexes)
     - Forecasting capability
+
+    Registrations mark the registry dirty; the registry file is rewritten
+    once per ``flush_interval`` (or at ``flush()``, the end of a ``batch()``
+    block and interpreter exit) instead of on every change.
     """
 
     # Shared containers (class-level → every instance sees same data)
     _external_ingesters: List[Callable[[], Dict[str, float]]] = []
 
-    def __init__(self, path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        example_forecasts: bool = False,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            path: Registry JSON file (defaults to REGISTRY_PATH).
+            example_forecasts: Fill forecast values with random demo values.
+            flush_interval: Seconds to coalesce changes before writing; None
+                only writes on flush(), batch() exit and interpreter exit.
+        """
         self.path = path or REGISTRY_PATH
+        self.flush_interval = flush_interval
         self.variables: Dict[str, Dict[str, Any]] = VARIABLE_REGISTRY.copy()
         self._forecast_values = {}  # Store forecasts by variable name
         self._runtime_values = {}  # Store runtime values by variable name
         self._variable_tags = {}  # Store tags for variables
         self._initialized = False
 
+        self._lock = threading.RLock()
+        self._index: Dict[Tuple[str, Any], Dict[str, None]] = {}
+        self._indexed: Dict[str, Set[Tuple[str, Any]]] = {}
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.write_count = 0
+
         self._load()
         self._load_persisted_values()
-        self._generate_example_forecasts()
+        self._rebuild_index()
+        if example_forecasts:
+            self._generate_example_forecasts()
         self._initialized = True
+        _live_registries.add(self)
 
     # ── persistence ----------------------------------------------------
     def _load(self) -> None:
@@ -1909,9 +1971,91 @@ class VariableRegistry:
                     self.variables.update(updated)
 
     def _save(self) -> None:
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.variables, f, indent=2)
+        """Write the registry now (kept for callers that persist explicitly)."""
+        with self._lock:
+            self._dirty = True
+        self.flush()
+
+    def flush(self) -> bool:
+        """
+        Atomically write the registry if it has unsaved changes.
+
+        Returns:
+            True if the file was written.
+        """
+        with self._lock:
+            self._cancel_timer()
+            if not self._dirty:
+                return False
+            payload = json.dumps(self.variables, indent=2)
+            self._dirty = False
+
+        directory = os.path.dirname(self.path) or "."
+        tmp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".variable_registry.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self.write_count += 1
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator["VariableRegistry"]:
+        """Defer all writes inside the block to a single flush at its end."""
+        with self._lock:
+            self._batch_depth += 1
+            self._cancel_timer()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are changes not yet written to disk."""
+        return self._dirty
+
+    def _mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+            if (
+                self._batch_depth
+                or self.flush_interval is None
+                or self._flush_timer is not None
+            ):
+                return
+            self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _timed_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception as exc:  # noqa: BLE001
+            print(f"[VariableRegistry] Failed to save {self.path}: {exc}")
+
+    def _cancel_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
 
     def _load_persisted_values(self):
         """Load persisted values from disk if available."""
@@ -1941,6 +2085,36 @@ class VariableRegistry:
                 # If no range is defined, use the default value
                 self._forecast_values[var_name] = var_def.get("default", 0)
 
+    # ── indexes ---------------------------------------------------------
+    def _rebuild_index(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._indexed.clear()
+            for name, meta in self.variables.items():
+                self._reindex(name, meta)
+
+    def _reindex(self, name: str, meta: Optional[Dict[str, Any]]) -> None:
+        old_keys = self._indexed.get(name, set())
+        new_keys = _index_keys(meta) if isinstance(meta, dict) else set()
+        for key in old_keys - new_keys:
+            bucket = self._index.get(key)
+            if bucket is not None:
+                bucket.pop(name, None)
+                if not bucket:
+                    del self._index[key]
+        for key in new_keys - old_keys:
+            self._index.setdefault(key, {})[name] = None
+        if new_keys:
+            self._indexed[name] = new_keys
+        else:
+            self._indexed.pop(name, None)
+
+    def _lookup(self, field: str, value: Any) -> List[str]:
+        with self._lock:
+            with suppress(TypeError):
+                return list(self._index.get((field, value), ()))
+        return []
+
     # ── registration & lookup -----------------------------------------
     def register_variable(
         self,
@@ -1950,8 +2124,16 @@ class VariableRegistry:
     ) -> None:
         """Register or update a variable entry (back-compat: meta|metadata)."""
         meta = meta or metadata or {}
-        self.variables[name] = meta
-        self._save()
+        with self._lock:
+            self.variables[name] = meta
+            self._reindex(name, meta)
+        self._mark_dirty()
+
+    def register_variables(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Register or update many variables with a single write."""
+        with self.batch():
+            for name, meta in entries.items():
+                self.register_variable(name, meta)
 
     def get(self, name: str) -> Optional[Dict[str, Any]]:
         return self.variables.get(name)
@@ -1961,10 +2143,13 @@ class VariableRegistry:
         return list(self.variables.keys())
 
     def filter_by_tag(self, tag: str) -> List[str]:
-        return [k for k, v in self.variables.items() if tag in v.get("tags", [])]
+        return self._lookup("tags", tag)
 
     def filter_by_type(self, var_type: str) -> List[str]:
-        return [k for k, v in self.variables.items() if v.get("type") == var_type]
+        return self._lookup("type", var_type)
+
+    def filter_by_source(self, source: str) -> List[str]:
+        return self._lookup("source", source)
 
     def list_trust_ranked(self) -> List[str]:
         return sorted(
@@ -2030,11 +2215,7 @@ class VariableRegistry:
     def get_variable_names(self, variable_type=None):
         """Get all variable names, optionally filtered by type."""
         if variable_type:
-            return [
-                name
-                for name, def_dict in self.variables.items()
-                if def_dict.get("type") == variable_type
-            ]
+            return self.filter_by_type(variable_type)
         return list(self.variables.keys())
 
     def add_variable_tag(self, variable_name, tag):
@@ -4,37 +4,65 @@ AI Forecaster Module
 This module encapsulates an LSTM-based forecasting method.
 """
 
+from __future__ import annotations
+
 import logging
-import torch
-import torch.nn as nn
-import torch.optim as optim
 from typing import List, Dict, Optional, Any
 
+from utils.lazy_import import lazy_import
+
+torch = lazy_import("torch", "pip install torch")
+nn = lazy_import("torch.nn", "pip install torch")
+optim = lazy_import("torch.optim", "pip install torch")
+
 logger = logging.getLogger(__name__)
 
+_lstm_forecaster_class = None
 
-class LSTMForecaster(nn.Module):
-    def __init__(
-        self,
-        input_size: int,
-        hidden_size: int = 64,
-        num_layers: int = 2,
-        output_size: int = 1,
-    ):
-        super(LSTMForecaster, self).__init__()
-        self.lstm = nn.LSTM(input_size, hidden_size, num_layers, batch_first=True)
-        self.fc = nn.Linear(hidden_size, output_size)
 
-    def forward(self, x):
-        try:
-            out, _ = self.lstm(x)
-            out = out[:, -1, :]
-            out = self.fc(out)
-            return out
-        except Exception as e:
-            logger.error(f"Forward pass error: {e}")
-            # Return zero tensor with appropriate shape
-            return torch.zeros(x.size(0), 1, device=x.device)
+def _get_lstm_forecaster_class():
+    """
+    Define LSTMForecaster on first use so importing this module does not
+    load torch.
+    """
+    global _lstm_forecaster_class
+    if _lstm_forecaster_class is not None:
+        return _lstm_forecaster_class
+
+    class LSTMForecaster(nn.Module):
+        def __init__(
+            self,
+            input_size: int,
+            hidden_size: int = 64,
+            num_layers: int = 2,
+            output_size: int = 1,
+        ):
+            super(LSTMForecaster, self).__init__()
+            self.lstm = nn.LSTM(input_size, hidden_size, num_layers, batch_first=True)
+            self.fc = nn.Linear(hidden_size, output_size)
+
+        def forward(self, x):
+            try:
+                out, _ = self.lstm(x)
+                out = out[:, -1, :]
+                out = self.fc(out)
+                return out
+            except Exception as e:
+                logger.error(f"Forward pass error: {e}")
+                # Return zero tensor with appropriate shape
+                return torch.zeros(x.size(0), 1, device=x.device)
+
+    # Picklable as forecast_engine.ai_forecaster.LSTMForecaster (see __getattr__)
+    LSTMForecaster.__module__ = __name__
+    LSTMForecaster.__qualname__ = "LSTMForecaster"
+    _lstm_forecaster_class = LSTMForecaster
+    return LSTMForecaster
+
+
+def __getattr__(name: str):
+    if name == "LSTMForecaster":
+        return _get_lstm_forecaster_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 _model: Optional[LSTMForecaster] = None
@@ -61,7 +89,7 @@ def _initialize_model(input_size: int) -> bool:
             return False
 
         _input_size = input_size
-        _model = LSTMForecaster(input_size)
+        _model = _get_lstm_forecaster_class()(input_size)
         _criterion = nn.MSELoss()
         _optimizer = optim.Adam(_model.parameters(), lr=1e-3)
         logger.info(f"Model initialized with input_size={input_size}")
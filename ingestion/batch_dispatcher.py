@@ -0,0 +1,395 @@
+"""
+Micro-batched task dispatch for Pulse ingestion sources.
+
+Streaming and polling sources (Kafka, database polling) hand every signal to
+a MicroBatchDispatcher instead of sending one Celery task per signal. The
+dispatcher groups signals into batches bounded by size and age, sends each
+batch as a single task, and only then acknowledges the batch to the source
+(Kafka offset commit, DB processed-flag update), so a failed send is retried
+on the next flush and never lost.
+
+While sends keep failing, size- and age-triggered flushes back off
+exponentially, and at most max_pending items are held: further adds either
+block until a send succeeds (backpressure on the source) or drop the oldest
+pending item.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("pulse.batch_dispatcher")
+
+BATCH_TASK_NAME = "ingest_and_score_signal_batch"
+
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+
+class DispatcherFullError(RuntimeError):
+    """Raised when a blocking add could not make room within block_timeout."""
+
+
+class MicroBatchDispatcher:
+    """Group items into size/age bounded batches and dispatch each batch once."""
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Any]], Any],
+        max_batch_size: int = 100,
+        max_batch_age: float = 1.0,
+        on_commit: Optional[Callable[[List[Any]], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_pending: Optional[int] = None,
+        overflow: str = "block",
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        block_timeout: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            send_batch: Called with the list of payloads of one batch.
+            max_batch_size: Flush as soon as this many items are pending.
+            max_batch_age: Flush once the oldest pending item is this many seconds old.
+            on_commit: Called with the acks of a batch after it was sent.
+            clock: Monotonic time source (seconds).
+            max_pending: Most items held while sends fail (default 10 batches).
+            overflow: What add does once max_pending items are held: "block"
+                retries the send until it succeeds, "drop_oldest" discards the
+                oldest pending item (it is never acked).
+            retry_backoff: Delay after the first failed send before add/poll
+                try again; doubles per consecutive failure.
+            max_retry_backoff: Upper bound on the retry delay.
+            block_timeout: Longest a blocking add waits before raising
+                DispatcherFullError (None waits indefinitely).
+            sleep: Sleep function used while blocking.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if max_pending is None:
+            max_pending = 10 * max_batch_size
+        if max_pending < max_batch_size:
+            raise ValueError("max_pending must be at least max_batch_size")
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_age = max_batch_age
+        self.on_commit = on_commit
+        self.clock = clock
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.block_timeout = block_timeout
+        self.sleep = sleep
+
+        self._lock = threading.RLock()
+        self._payloads: List[Any] = []
+        self._acks: List[Any] = []
+        self._oldest: Optional[float] = None
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._started = clock()
+        self._stats = {
+            "received": 0,
+            "dispatched": 0,
+            "batches": 0,
+            "send_failures": 0,
+            "dropped": 0,
+            "commit_failures": 0,
+            "last_batch_size": 0,
+            "last_batch_latency": 0.0,
+            "max_batch_latency": 0.0,
+        }
+
+    def add(self, payload: Any, ack: Any = None) -> bool:
+        """
+        Queue one item for dispatch.
+
+        Args:
+            payload: Task payload sent as part of the batch.
+            ack: Source position passed to on_commit once the batch is sent.
+
+        Returns:
+            True if this call flushed a batch.
+
+        Raises:
+            DispatcherFullError: overflow is "block" and no send succeeded
+                within block_timeout.
+        """
+        with self._lock:
+            flushed = False
+            if len(self._payloads) >= self.max_pending:
+                flushed = self._make_room()
+            if not self._payloads:
+                self._oldest = self.clock()
+            self._payloads.append(payload)
+            self._acks.append(ack)
+            self._stats["received"] += 1
+            if len(self._payloads) >= self.max_batch_size:
+                return self._flush_when_due() or flushed
+        return flushed
+
+    def _make_room(self) -> bool:
+        """Apply the overflow policy; returns True if a batch was flushed."""
+        if self.overflow == "drop_oldest":
+            self._payloads.pop(0)
+            self._acks.pop(0)
+            self._stats["dropped"] += 1
+            return False
+
+        deadline = None
+        if self.block_timeout is not None:
+            deadline = self.clock() + self.block_timeout
+        while True:
+            wait = max(0.0, self._retry_at - self.clock())
+            if deadline is not None and self.clock() + wait > deadline:
+                raise DispatcherFullError(
+                    f"{len(self._payloads)} items pending and dispatch is failing"
+                )
+            if wait:
+                self.sleep(wait)
+            if self.flush():
+                return True
+
+    def _flush_when_due(self) -> bool:
+        """Flush unless a failed send is still backing off."""
+        if self.clock() < self._retry_at:
+            return False
+        return self.flush()
+
+    def pending_age(self) -> float:
+        """Age in seconds of the oldest pending item (0 when nothing is pending)."""
+        with self._lock:
+            if self._oldest is None:
+                return 0.0
+            return self.clock() - self._oldest
+
+    def poll(self) -> bool:
+        """Flush if the oldest pending item has reached max_batch_age."""
+        with self._lock:
+            if self._payloads and self.pending_age() >= self.max_batch_age:
+                return self._flush_when_due()
+        return False
+
+    def flush(self) -> bool:
+        """
+        Send everything pending in batches of at most max_batch_size,
+        committing each batch's acks after it was sent.
+
+        Unlike the flushes triggered by add and poll, an explicit flush is
+        attempted even while a previous failure is backing off.
+
+        Returns:
+            True if at least one batch was sent. On a send failure the unsent
+            items stay pending and sending stops.
+        """
+        with self._lock:
+            sent = False
+            while self._payloads:
+                if not self._send_next_batch():
+                    break
+                sent = True
+            return sent
+
+    def _send_next_batch(self) -> bool:
+        size = self.max_batch_size
+        payloads, acks = self._payloads[:size], self._acks[:size]
+        latency = self.pending_age()
+        try:
+            self.send_batch(payloads)
+        except Exception as e:
+            self._stats["send_failures"] += 1
+            self._consecutive_failures += 1
+            delay = min(
+                self.max_retry_backoff,
+                self.retry_backoff * 2 ** (self._consecutive_failures - 1),
+            )
+            self._retry_at = self.clock() + delay
+            logger.error(
+                f"Failed to dispatch batch of {len(payloads)}: {e}. "
+                f"Retrying in {delay:.2f}s"
+            )
+            return False
+
+        self._consecutive_failures, self._retry_at = 0, 0.0
+        del self._payloads[:size], self._acks[:size]
+        if not self._payloads:
+            self._oldest = None
+        self._stats["dispatched"] += len(payloads)
+        self._stats["batches"] += 1
+        self._stats["last_batch_size"] = len(payloads)
+        self._stats["last_batch_latency"] = latency
+        self._stats["max_batch_latency"] = max(
+            self._stats["max_batch_latency"], latency
+        )
+
+        if self.on_commit is not None:
+            try:
+                self.on_commit(acks)
+            except Exception as e:
+                # The batch is already dispatched; the source will
+                # redeliver from its last committed position
+                self._stats["commit_failures"] += 1
+                logger.error(f"Failed to commit batch of {len(acks)}: {e}")
+        return True
+
+    def clear(self) -> int:
+        """Drop everything pending without sending it; returns the number dropped."""
+        with self._lock:
+            dropped = len(self._payloads)
+            self._payloads, self._acks, self._oldest = [], [], None
+            return dropped
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Lag and throughput metrics.
+
+        Returns:
+            Dict with counters, ``pending`` (items not yet sent),
+            ``pending_age`` (lag of the oldest pending item, seconds),
+            ``retry_in`` (seconds until a failed send is retried), batch
+            latencies and ``throughput`` (dispatched items per second).
+        """
+        with self._lock:
+            elapsed = max(self.clock() - self._started, 1e-9)
+            metrics = dict(self._stats)
+            metrics["pending"] = len(self._payloads)
+            metrics["pending_age"] = self.pending_age()
+            metrics["retry_in"] = max(0.0, self._retry_at - self.clock())
+            metrics["throughput"] = self._stats["dispatched"] / elapsed
+            return metrics
+
+
+def celery_batch_sender(
+    app: Any = None, task_name: str = BATCH_TASK_NAME
+) -> Callable[[List[Any]], Any]:
+    """
+    Build a send_batch callable that submits one Celery task per batch.
+
+    Args:
+        app: Celery app (defaults to adapters.celery_app.celery_app).
+        task_name: Name of the batch task.
+    """
+    if app is None:
+        from adapters.celery_app import celery_app as app
+
+    def send(payloads: List[Any]) -> Any:
+        return app.send_task(task_name, args=[payloads])
+
+    return send
+
+
+# --- Kafka -------------------------------------------------------------------
+
+
+def next_offsets(messages: Iterable[Any]) -> Dict[Tuple[str, int], int]:
+    """
+    Offsets to commit for a batch of Kafka messages: last offset + 1 per
+    partition.
+    """
+    offsets: Dict[Tuple[str, int], int] = {}
+    for message in messages:
+        key = (message.topic, message.partition)
+        offsets[key] = max(offsets.get(key, 0), message.offset + 1)
+    return offsets
+
+
+def commit_kafka_offsets(consumer: Any, messages: List[Any]) -> None:
+    """Synchronously commit the offsets of a dispatched batch."""
+    from kafka import OffsetAndMetadata, TopicPartition
+
+    offsets = {}
+    for (topic, partition), offset in next_offsets(messages).items():
+        try:
+            position = OffsetAndMetadata(offset, None, -1)
+        except TypeError:  # kafka-python < 2.1
+            position = OffsetAndMetadata(offset, None)
+        offsets[TopicPartition(topic, partition)] = position
+    consumer.commit(offsets)
+
+
+def dispatch_kafka(
+    consumer: Any,
+    dispatcher: MicroBatchDispatcher,
+    stop_event: Optional[threading.Event] = None,
+    max_polls: Optional[int] = None,
+) -> None:
+    """
+    Drain a Kafka consumer into a dispatcher.
+
+    Messages are acked with themselves, so the dispatcher's on_commit
+    receives the Kafka messages of each sent batch.
+
+    Args:
+        consumer: KafkaConsumer (or anything with the same ``poll`` method).
+        dispatcher: Dispatcher receiving the message values.
+        stop_event: Stops the loop when set.
+        max_polls: Stop after this many polls (None runs until stopped).
+    """
+    polls = 0
+    timeout_ms = max(1, int(dispatcher.max_batch_age * 1000))
+    while not (stop_event is not None and stop_event.is_set()):
+        if max_polls is not None and polls >= max_polls:
+            break
+        polls += 1
+        records = consumer.poll(
+            timeout_ms=timeout_ms, max_records=dispatcher.max_batch_size
+        )
+        for messages in records.values():
+            for message in messages:
+                if not isinstance(message.value, dict):
+                    # Skipped; its offset is committed with the next batch
+                    # from the same partition
+                    logger.warning(f"Malformed message: {message.value}")
+                    continue
+                dispatcher.add(message.value, ack=message)
+        dispatcher.poll()
+    dispatcher.flush()
+
+
+# --- Database polling --------------------------------------------------------
+
+
+def row_to_signal(row: Any) -> Dict[str, Any]:
+    """Convert a ``(id, name, value, source, timestamp)`` row into a signal payload."""
+    return {
+        "name": row[1],
+        "value": row[2],
+        "source": row[3],
+        "timestamp": row[4],
+    }
+
+
+def mark_rows_processed(engine: Any, mark_query: str, row_ids: List[Any]) -> None:
+    """Mark a dispatched batch of rows processed in one transaction (executemany)."""
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        conn.execute(text(mark_query), [{"id": row_id} for row_id in row_ids])
+
+
+def dispatch_database_rows(
+    engine: Any, dispatcher: MicroBatchDispatcher, signal_query: str
+) -> int:
+    """
+    Dispatch all unprocessed rows returned by signal_query.
+
+    Rows are acked with their ids, so the dispatcher's on_commit receives the
+    ids of each sent batch (see mark_rows_processed).
+
+    Returns:
+        Number of rows read.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(signal_query)).fetchall()
+    for row in rows:
+        dispatcher.add(row_to_signal(row), ack=row[0])
+    if not dispatcher.flush() and dispatcher.clear():
+        # Unsent rows are still unprocessed and are read again on the next poll
+        logger.warning("Batch dispatch failed; rows will be retried on the next poll")
+    return len(rows)
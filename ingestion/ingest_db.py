@@ -5,10 +5,16 @@ Database polling ingestion for Pulse (production-ready)
 import os
 import time
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
 from adapters.celery_app import celery_app
 from analytics.metrics import start_metrics_server
+from ingestion.batch_dispatcher import (
+    MicroBatchDispatcher,
+    celery_batch_sender,
+    dispatch_database_rows,
+    mark_rows_processed,
+)
 import threading
 
 # Configurable via environment variables
@@ -21,6 +27,7 @@ SIGNAL_QUERY = os.getenv(
 MARK_PROCESSED_QUERY = os.getenv(
     "PULSE_DB_MARK_PROCESSED", "UPDATE signals SET processed=1 WHERE id=:id"
 )
+BATCH_SIZE = int(os.getenv("PULSE_INGEST_BATCH_SIZE", "100"))
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("pulse.ingest_db")
@@ -31,27 +38,22 @@ def poll_database():
     threading.Thread(target=start_metrics_server, daemon=True).start()
     engine = create_engine(DB_URL)
     logger.info(f"Polling database at {DB_URL} every {POLL_INTERVAL}s")
+    dispatcher = MicroBatchDispatcher(
+        celery_batch_sender(celery_app),
+        max_batch_size=BATCH_SIZE,
+        # Unsent rows stay unprocessed and are read again on the next poll
+        overflow="drop_oldest",
+        on_commit=lambda row_ids: mark_rows_processed(
+            engine, MARK_PROCESSED_QUERY, row_ids
+        ),
+    )
     while True:
         try:
-            with engine.connect() as conn:
-                result = conn.execute(text(SIGNAL_QUERY))
-                rows = result.fetchall()
-                for row in rows:
-                    try:
-                        # row: (id, name, value, source, timestamp)
-                        signal_data = {
-                            "name": row[1],
-                            "value": row[2],
-                            "source": row[3],
-                            "timestamp": row[4],
-                        }
-                        celery_app.send_task(
-                            "ingest_and_score_signal", args=[signal_data]
-                        )
-                        logger.info(f"Submitted to Celery from DB: {signal_data}")
-                        conn.execute(text(MARK_PROCESSED_QUERY), {"id": row[0]})
-                    except Exception as e:
-                        logger.error(f"Failed to submit DB row to Celery: {e}")
+            row_count = dispatch_database_rows(engine, dispatcher, SIGNAL_QUERY)
+            if row_count:
+                logger.info(
+                    f"Dispatched {row_count} DB rows. Metrics: {dispatcher.metrics()}"
+                )
             time.sleep(POLL_INTERVAL)
         except SQLAlchemyError as e:
             logger.error(f"Database error: {e}")
@@ -8,12 +8,20 @@ import logging
 from kafka import KafkaConsumer, errors as kafka_errors
 from adapters.celery_app import celery_app
 from analytics.metrics import start_metrics_server
+from ingestion.batch_dispatcher import (
+    MicroBatchDispatcher,
+    celery_batch_sender,
+    commit_kafka_offsets,
+    dispatch_kafka,
+)
 import threading
 
 # Configurable via environment variables or defaults
 KAFKA_TOPIC = os.getenv("PULSE_KAFKA_TOPIC", "pulse_signals")
 KAFKA_BOOTSTRAP = os.getenv("PULSE_KAFKA_BOOTSTRAP", "localhost:9092")
 KAFKA_GROUP = os.getenv("PULSE_KAFKA_GROUP", "pulse_ingest_group")
+BATCH_SIZE = int(os.getenv("PULSE_INGEST_BATCH_SIZE", "100"))
+BATCH_MAX_AGE = float(os.getenv("PULSE_INGEST_BATCH_MAX_AGE", "1.0"))
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("pulse.ingest_kafka")
@@ -29,8 +37,8 @@ def run_kafka_ingestion():
             group_id=KAFKA_GROUP,
             value_deserializer=lambda m: json.loads(m.decode("utf-8")),
             auto_offset_reset="latest",
-            enable_auto_commit=True,
-            consumer_timeout_ms=10000,
+            # Offsets are committed per dispatched batch
+            enable_auto_commit=False,
         )
         logger.info(f"Connected to Kafka topic '{KAFKA_TOPIC}' at {KAFKA_BOOTSTRAP}")
     except kafka_errors.NoBrokersAvailable:
@@ -40,18 +48,16 @@ def run_kafka_ingestion():
         logger.error(f"Kafka connection error: {e}")
         return
 
+    dispatcher = MicroBatchDispatcher(
+        celery_batch_sender(celery_app),
+        max_batch_size=BATCH_SIZE,
+        max_batch_age=BATCH_MAX_AGE,
+        on_commit=lambda messages: commit_kafka_offsets(consumer, messages),
+    )
+
     while True:
         try:
-            for message in consumer:
-                data = message.value
-                if not isinstance(data, dict):
-                    logger.warning(f"Malformed message: {data}")
-                    continue
-                try:
-                    celery_app.send_task("ingest_and_score_signal", args=[data])
-                    logger.info(f"Submitted to Celery from Kafka: {data}")
-                except Exception as e:
-                    logger.error(f"Failed to submit to Celery: {e}")
+            dispatch_kafka(consumer, dispatcher)
         except kafka_errors.KafkaError as e:
             logger.error(f"Kafka error: {e}. Reconnecting...")
             try:
@@ -63,7 +69,11 @@ def run_kafka_ingestion():
             time.sleep(5)
             return run_kafka_ingestion()
         except KeyboardInterrupt:
-            logger.info("Kafka ingestion stopped by user.")
+            dispatcher.flush()
+            logger.info(
+                "Kafka ingestion stopped by user. Dispatch metrics: "
+                f"{dispatcher.metrics()}"
+            )
             break
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
@@ -11,7 +11,7 @@ Date: 2025-04-27
 import os
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +43,26 @@ class IrisArchive:
         except Exception as e:
             logger.error("[IrisArchive] Failed to append signal: %s", e)
 
+    def append_signals(self, signal_records: List[Dict[str, Any]]) -> None:
+        """
+        Append a batch of signals to the archive with a single file open.
+
+        Args:
+            signal_records (List[Dict]): Processed signals, in arrival order.
+        """
+        if not signal_records:
+            return
+        try:
+            with open(ARCHIVE_FILE, "a", encoding="utf-8") as f:
+                f.write(
+                    "".join(json.dumps(record) + "\n" for record in signal_records)
+                )
+            logger.info(
+                "[IrisArchive] Appended %d signals to archive", len(signal_records)
+            )
+        except Exception as e:
+            logger.error("[IrisArchive] Failed to append signals: %s", e)
+
     def load_archive(self) -> list:
         """
         Load full historical signal archive (memory intensive for very large archives).
@@ -0,0 +1,331 @@
+"""
+Iris HTTP Client
+
+Shared HTTP access for ingestion plugins:
+- One pooled requests.Session per host (keep-alive connection reuse)
+- Transport-level retries with backoff for 429/5xx responses
+- On-disk conditional-response cache (ETag / Last-Modified)
+- Per-plugin request budgets and deadlines, set by IrisPluginManager
+
+Plugins call ``http_get`` instead of ``requests.get``; the return value is a
+regular ``requests.Response``. A 304 from the server is answered from the
+cache with status 200 and ``response.from_cache = True``.
+
+Author: Pulse Development Team
+Date: 2025-04-27
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = "data/iris_http_cache"
+DEFAULT_TIMEOUT = 15.0
+MAX_CACHE_ENTRIES = 2000
+
+
+class PluginBudgetExceeded(requests.RequestException):
+    """Raised when a plugin exceeds its request budget or deadline."""
+
+
+class _PluginContext:
+    def __init__(self, name: str, deadline: Optional[float], budget: Optional[int]):
+        self.name = name
+        self.deadline = deadline
+        self.budget = budget
+        self.requests = 0
+
+
+_plugin_context: contextvars.ContextVar[Optional[_PluginContext]] = (
+    contextvars.ContextVar("iris_plugin_context", default=None)
+)
+
+
+@contextmanager
+def plugin_scope(
+    name: str, timeout: Optional[float] = None, budget: Optional[int] = None
+) -> Iterator[_PluginContext]:
+    """
+    Limit the HTTP requests made by the current plugin run.
+
+    Args:
+        name (str): Plugin name, used in log messages.
+        timeout (float): Seconds from now after which requests are refused;
+            request timeouts are clamped to the time remaining.
+        budget (int): Maximum number of requests.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    context = _PluginContext(name, deadline, budget)
+    token = _plugin_context.set(context)
+    try:
+        yield context
+    finally:
+        _plugin_context.reset(token)
+
+
+class PooledHttpClient:
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        cache_dir: Optional[str] = None,
+        max_cache_entries: int = MAX_CACHE_ENTRIES,
+    ):
+        """
+        Initialize the pooled HTTP client.
+
+        Args:
+            pool_size (int): Connections kept alive per host.
+            max_retries (int): Transport retries for 429/5xx responses.
+            backoff_factor (float): Exponential backoff factor between retries.
+            cache_dir (str): Directory for the conditional-response cache
+                (None uses HTTP_CACHE_DIR).
+            max_cache_entries (int): Cached responses kept on disk; the least
+                recently used are evicted beyond this.
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.cache_dir = cache_dir or HTTP_CACHE_DIR
+        self.max_cache_entries = max_cache_entries
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "cache_stores": 0,
+            "cache_evictions": 0,
+        }
+
+    def _session_for(self, url: str) -> requests.Session:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                # Only retry throttling/server errors here; plugins already
+                # retry connection failures themselves
+                retry = Retry(
+                    total=self.max_retries,
+                    connect=0,
+                    read=0,
+                    backoff_factor=self.backoff_factor,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET", "HEAD"]),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry
+                )
+                session = requests.Session()
+                session.mount(host, adapter)
+                self._sessions[host] = session
+            return session
+
+    def _cache_paths(self, url: str, params: Optional[Dict[str, Any]]):
+        key_source = url
+        if params:
+            key_source += "?" + urlencode(sorted(params.items()), doseq=True)
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def _load_cache(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cache(
+        self, meta_path: str, body_path: str, response: requests.Response
+    ) -> None:
+        meta = {
+            "url": response.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, data, mode in (
+                (body_path, response.content, "wb"),
+                (meta_path, json.dumps(meta), "w"),
+            ):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            with self._lock:
+                self.stats["cache_stores"] += 1
+        except OSError as e:
+            logger.warning("[IrisHttp] Failed to cache %s: %s", response.url, e)
+            return
+        self._evict_cache()
+
+    def _evict_cache(self) -> None:
+        # Metadata mtimes track last use (hits touch them), so the oldest
+        # entries are the least recently used
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                metas = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".json")
+                ]
+        except OSError:
+            return
+        excess = len(metas) - self.max_cache_entries
+        if excess <= 0:
+            return
+        metas.sort()
+        for _, meta_path in metas[:excess]:
+            for path in (meta_path, meta_path[: -len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self.stats["cache_evictions"] += excess
+
+    def _cached_response(
+        self, meta: Dict[str, Any], body_path: str, request_url: str
+    ) -> Optional[requests.Response]:
+        try:
+            with open(body_path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.headers.update(meta.get("headers") or {})
+        response.encoding = meta.get("encoding")
+        response.url = meta.get("url") or request_url
+        response.from_cache = True
+        try:
+            os.utime(body_path[: -len(".body")] + ".json")
+        except OSError:
+            pass
+        return response
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        GET a URL through the pooled session for its host.
+
+        Args:
+            url (str): Request URL.
+            params (Dict): Query parameters.
+            headers (Dict): Extra request headers.
+            timeout (float): Request timeout in seconds.
+            use_cache (bool): Send conditional headers and serve 304s from cache.
+
+        Returns:
+            requests.Response: The response (from_cache=True when served from cache).
+        """
+        context = _plugin_context.get()
+        timeout = timeout or DEFAULT_TIMEOUT
+        if context is not None:
+            if context.budget is not None and context.requests >= context.budget:
+                raise PluginBudgetExceeded(
+                    f"{context.name} exceeded its budget of {context.budget} requests"
+                )
+            if context.deadline is not None:
+                remaining = context.deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PluginBudgetExceeded(f"{context.name} exceeded its deadline")
+                timeout = min(timeout, remaining)
+            context.requests += 1
+
+        request_headers = dict(headers or {})
+        meta = None
+        meta_path = body_path = None
+        if use_cache:
+            meta_path, body_path = self._cache_paths(url, params)
+            meta = self._load_cache(meta_path)
+            if meta:
+                if meta.get("etag"):
+                    request_headers.setdefault("If-None-Match", meta["etag"])
+                if meta.get("last_modified"):
+                    request_headers.setdefault(
+                        "If-Modified-Since", meta["last_modified"]
+                    )
+
+        with self._lock:
+            self.stats["requests"] += 1
+        response = self._session_for(url).get(
+            url, params=params, headers=request_headers, timeout=timeout, **kwargs
+        )
+
+        if use_cache:
+            if response.status_code == 304 and meta:
+                cached = self._cached_response(meta, body_path, url)
+                if cached is not None:
+                    with self._lock:
+                        self.stats["cache_hits"] += 1
+                    return cached
+                # The cached body is gone; fetch the full response again
+                logger.info("[IrisHttp] Cache body missing for %s; refetching", url)
+                with self._lock:
+                    self.stats["requests"] += 1
+                response = self._session_for(url).get(
+                    url, params=params, headers=headers, timeout=timeout, **kwargs
+                )
+            if response.status_code == 200 and (
+                response.headers.get("ETag") or response.headers.get("Last-Modified")
+            ):
+                self._store_cache(meta_path, body_path, response)
+        response.from_cache = False
+        return response
+
+    def close(self) -> None:
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_client: Optional[PooledHttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """Return the process-wide pooled HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PooledHttpClient()
+        return _client
+
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    """
+    GET through the shared pooled client.
+
+    Accepts the same keywords as PooledHttpClient.get.
+    """
+    return get_http_client().get(url, **kwargs)
@@ -9,20 +9,33 @@ Date: 2025-04-27
 """
 
 import logging
-from typing import Callable, List, Dict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import os
 import importlib
 import inspect
+import time
+
+from ingestion.iris_http import plugin_scope
 
 logger = logging.getLogger(__name__)
 
 
 class IrisPluginManager:
+    # Defaults for concurrent runs; a plugin class may override PLUGIN_TIMEOUT
+    # (seconds) and REQUEST_BUDGET (max HTTP requests per run)
+    MAX_WORKERS = 8
+    PLUGIN_TIMEOUT: Optional[float] = 120.0
+    REQUEST_BUDGET: Optional[int] = None
+    # Seconds between checks while some plugins are still queued
+    POLL_INTERVAL = 0.05
+
     def __init__(self):
         """
         Initialize the Iris Plugin Manager.
         """
         self.plugins: List[Callable[[], List[Dict]]] = []
+        self.last_run_stats: Dict[str, Dict] = {}
 
     def register_plugin(self, plugin_fn: Callable[[], List[Dict]]) -> None:
         """
@@ -34,23 +47,140 @@ class IrisPluginManager:
         self.plugins.append(plugin_fn)
         logger.info("[IrisPluginManager] Plugin registered: %s", plugin_fn.__name__)
 
-    def run_plugins(self) -> List[Dict]:
+    def _plugin_limits(
+        self, plugin: Callable, timeout: Optional[float]
+    ) -> Tuple[Optional[float], Optional[int]]:
+        owner = getattr(plugin, "__self__", None)
+        if timeout is None:
+            timeout = getattr(owner, "PLUGIN_TIMEOUT", self.PLUGIN_TIMEOUT)
+        budget = getattr(owner, "REQUEST_BUDGET", self.REQUEST_BUDGET)
+        return timeout, budget
+
+    def _run_one(
+        self,
+        plugin: Callable,
+        timeout: Optional[float],
+        budget: Optional[int],
+        started: Dict[int, float],
+        key: int,
+    ) -> List[Dict]:
+        # The timeout runs from here, not from submission, so plugins queued
+        # behind busy workers get their full time
+        started[key] = time.monotonic()
+        with plugin_scope(plugin.__name__, timeout=timeout, budget=budget):
+            return plugin() or []
+
+    def iter_plugin_results(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Run all registered plugins on a bounded thread pool and yield results
+        as each plugin completes.
+
+        A plugin that raises is logged and skipped. A plugin still running
+        after its timeout is abandoned: its HTTP calls through iris_http are
+        refused from then on, and any late result is discarded. The timeout
+        counts from when the plugin starts running, not from when it is queued.
+
+        Args:
+            max_workers (int): Pool size (default MAX_WORKERS).
+            timeout (float): Per-plugin timeout in seconds, overriding
+                PLUGIN_TIMEOUT for every plugin.
+
+        Yields:
+            Tuple[str, List[Dict]]: Plugin name and its signals.
         """
-        Execute all registered plugins and collect signals.
+        self.last_run_stats = {}
+        if not self.plugins:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.MAX_WORKERS,
+            thread_name_prefix="iris-plugin",
+        )
+        pending = {}
+        started: Dict[int, float] = {}
+        try:
+            for key, plugin in enumerate(self.plugins):
+                plugin_timeout, budget = self._plugin_limits(plugin, timeout)
+                future = executor.submit(
+                    self._run_one, plugin, plugin_timeout, budget, started, key
+                )
+                pending[future] = (plugin.__name__, key, plugin_timeout)
+
+            while pending:
+                now = time.monotonic()
+                deadlines = []
+                for _, key, plugin_timeout in pending.values():
+                    if not plugin_timeout:
+                        continue
+                    if key in started:
+                        deadlines.append(started[key] + plugin_timeout)
+                    else:
+                        # Not started yet; poll so its deadline is not missed
+                        deadlines.append(now + self.POLL_INTERVAL)
+                wait_for = max(0.0, min(deadlines) - now) if deadlines else None
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key, _ = pending.pop(future)
+                    elapsed = time.monotonic() - started.get(key, now)
+                    try:
+                        signals = future.result()
+                    except Exception as e:
+                        logger.error(
+                            "[IrisPluginManager] Plugin %s failed: %s", name, e
+                        )
+                        self.last_run_stats[name] = {
+                            "status": "failed",
+                            "seconds": elapsed,
+                        }
+                        continue
+                    self.last_run_stats[name] = {
+                        "status": "ok",
+                        "seconds": elapsed,
+                        "signals": len(signals),
+                    }
+                    yield name, signals
+
+                now = time.monotonic()
+                for future, (name, key, plugin_timeout) in list(pending.items()):
+                    if not plugin_timeout or key not in started:
+                        continue
+                    elapsed = now - started[key]
+                    if elapsed >= plugin_timeout and not future.done():
+                        pending.pop(future)
+                        logger.error(
+                            "[IrisPluginManager] Plugin %s timed out after %.1fs",
+                            name,
+                            elapsed,
+                        )
+                        self.last_run_stats[name] = {
+                            "status": "timeout",
+                            "seconds": elapsed,
+                        }
+        finally:
+            # Do not wait for abandoned plugins
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_plugins(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        Execute all registered plugins concurrently and collect signals.
+
+        Args:
+            max_workers (int): Pool size (default MAX_WORKERS).
+            timeout (float): Per-plugin timeout in seconds.
 
         Returns:
-            List[Dict]: Aggregated signals from all plugins.
+            List[Dict]: Aggregated signals from all plugins, in completion order.
         """
         aggregated_signals = []
-        for plugin in self.plugins:
-            try:
-                signals = plugin()
-                if signals:
-                    aggregated_signals.extend(signals)
-            except Exception as e:
-                logger.error(
-                    "[IrisPluginManager] Plugin %s failed: %s", plugin.__name__, e
-                )
+        for _, signals in self.iter_plugin_results(max_workers, timeout):
+            aggregated_signals.extend(signals)
         return aggregated_signals
 
     def list_plugins(self) -> List[str]:
@@ -33,7 +33,7 @@ import os
 import time
 from typing import Dict, List, Optional
 
-import requests
+from ingestion.iris_http import http_get
 
 logger = logging.getLogger(__name__)
 _REQUEST_TIMEOUT = float(os.getenv("IRIS_API_TIMEOUT", "10"))
@@ -49,7 +49,7 @@ def _safe_get(url: str, params: dict[str, str] | None = None) -> Optional[dict]:
     """HTTP GET with basic back‑off & JSON parsing. Returns **None** on failure."""
     for attempt in range(_MAX_RETRIES + 1):
         try:
-            resp = requests.get(url, params=params, timeout=_REQUEST_TIMEOUT)
+            resp = http_get(url, params=params, timeout=_REQUEST_TIMEOUT)
             resp.raise_for_status()
             return resp.json()
         except Exception as exc:  # noqa: BLE001 –– keep lightweight
@@ -15,7 +15,7 @@ import os
 import time
 from typing import Dict, List, Any, Optional
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -138,7 +138,7 @@ class AlphaVantagePlugin(IrisPluginManager):
 
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     self.BASE_URL, params=full_params, timeout=self.REQUEST_TIMEOUT
                 )
                 resp.raise_for_status()
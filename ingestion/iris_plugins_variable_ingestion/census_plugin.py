@@ -1,4 +1,5 @@
 import requests
+from ingestion.iris_http import http_get
 import logging
 from datetime import datetime
 from ingestion.iris_utils.ingestion_persistence import save_data_point_incremental
@@ -61,7 +62,7 @@ class CensusPlugin:
                 logging.info(
                     f"Fetching Census data from {url} with params {current_params}"
                 )
-                response = requests.get(url, params=current_params)
+                response = http_get(url, params=current_params)
                 response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
                 data = response.json()
 
@@ -14,6 +14,7 @@ from typing import Dict, List, Any, Optional
 import json
 
 import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -119,7 +120,7 @@ class CoinMarketCapPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     url, headers=headers, params=params, timeout=self.REQUEST_TIMEOUT
                 )
                 resp.raise_for_status()
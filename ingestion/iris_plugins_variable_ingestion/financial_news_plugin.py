@@ -15,6 +15,7 @@ import json
 import re
 
 import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -181,7 +182,7 @@ class FinancialNewsPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     self.ALPHAVANTAGE_BASE_URL,
                     params=params,
                     timeout=self.REQUEST_TIMEOUT,
@@ -253,7 +254,7 @@ class FinancialNewsPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     url, headers=headers, params=params, timeout=self.REQUEST_TIMEOUT
                 )
                 resp.raise_for_status()
@@ -1,4 +1,5 @@
 import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_utils.ingestion_persistence import save_data_point_incremental
 import os
 
@@ -30,7 +31,7 @@ class FREDPlugin:
         }
 
         try:
-            response = requests.get(BASE_URL, params=params)
+            response = http_get(BASE_URL, params=params)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             data = response.json()
             return data.get("observations")
@@ -16,7 +16,7 @@ from typing import Dict, List, Any, Optional, Union
 from urllib.parse import urlencode
 from collections import Counter, defaultdict
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -154,7 +154,7 @@ class GdeltPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(full_url, timeout=self.REQUEST_TIMEOUT)
+                resp = http_get(full_url, timeout=self.REQUEST_TIMEOUT)
                 resp.raise_for_status()
 
                 # Save successful response
@@ -11,7 +11,7 @@ import os
 import time
 from typing import Dict, List, Any, Optional, Tuple
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 
 logger = logging.getLogger(__name__)
@@ -162,7 +162,7 @@ class GithubPlugin(IrisPluginManager):
 
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     url, headers=headers, params=params, timeout=self.REQUEST_TIMEOUT
                 )
 
@@ -22,7 +22,7 @@ from collections import Counter
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse, parse_qs
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -171,7 +171,7 @@ class HealthmapPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(url, timeout=self.REQUEST_TIMEOUT)
+                resp = http_get(url, timeout=self.REQUEST_TIMEOUT)
                 resp.raise_for_status()
 
                 # Save successful response
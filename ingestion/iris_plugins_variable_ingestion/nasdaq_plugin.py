@@ -42,7 +42,7 @@ import os
 import random
 from typing import List, Dict, Any, Optional
 
-import requests  # lightweight fallback instead of nasdaq‑data‑link SDK
+from ingestion.iris_http import http_get
 
 from ingestion.utils.ingestion_persistence import (
     ensure_data_directory,
@@ -213,7 +213,7 @@ def _fetch_latest(code: str) -> Optional[Dict[str, Any]]:
     save_request_metadata(code, params, source_name=_SOURCE_NAME, url=url)
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_get(url, params=params, timeout=10)
 
         # Handle specific API errors
         if resp.status_code == 410:
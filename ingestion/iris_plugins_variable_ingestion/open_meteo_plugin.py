@@ -10,7 +10,7 @@ import logging
 import time
 from typing import Dict, List, Any, Optional
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 
 logger = logging.getLogger(__name__)
@@ -101,7 +101,7 @@ class OpenMeteoPlugin(IrisPluginManager):
         """Make a safe API request with retries and error handling."""
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
+                resp = http_get(url, params=params, timeout=self.REQUEST_TIMEOUT)
                 resp.raise_for_status()
                 return resp.json()
             except Exception as exc:
@@ -24,7 +24,7 @@ import logging
 import time
 from typing import List, Dict, Any
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -114,7 +114,7 @@ class OpenaqPlugin(IrisPluginManager):
         response_data = None
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                response = requests.get(
+                response = http_get(
                     _BASE_URL, params=params, timeout=self.REQUEST_TIMEOUT
                 )
                 response.raise_for_status()
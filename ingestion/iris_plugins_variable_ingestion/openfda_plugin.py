@@ -28,7 +28,7 @@ from typing import List, Dict, Any
 import re
 from collections import Counter
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.utils.ingestion_persistence import (
     ensure_data_directory,
@@ -165,7 +165,7 @@ class OpenfdaPlugin(IrisPluginManager):
         response_data = None
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                response = requests.get(
+                response = http_get(
                     url, params=params, timeout=self.REQUEST_TIMEOUT
                 )
                 response.raise_for_status()
@@ -11,6 +11,7 @@ import time
 from typing import Dict, List, Any, Optional
 
 import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 
 logger = logging.getLogger(__name__)
@@ -205,7 +206,7 @@ class RedditPlugin(IrisPluginManager):
 
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(
+                resp = http_get(
                     url, headers=headers, params=params, timeout=self.REQUEST_TIMEOUT
                 )
                 resp.raise_for_status()
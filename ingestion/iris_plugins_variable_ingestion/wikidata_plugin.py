@@ -29,7 +29,7 @@ import random
 from typing import List, Dict, Any, Optional
 import re
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.utils.ingestion_persistence import (
     ensure_data_directory,
@@ -317,7 +317,7 @@ class WikidataPlugin(IrisPluginManager):
         query_results = None
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                response = requests.get(
+                response = http_get(
                     _SPARQL_ENDPOINT,
                     params=params,
                     headers=headers,
@@ -16,6 +16,7 @@ from urllib.parse import urlencode
 import json
 
 import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 from ingestion.iris_utils.ingestion_persistence import (
     ensure_data_directory,
@@ -177,7 +178,7 @@ class WorldBankPlugin(IrisPluginManager):
         # Make request with retries
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                resp = requests.get(full_url, timeout=self.REQUEST_TIMEOUT)
+                resp = http_get(full_url, timeout=self.REQUEST_TIMEOUT)
                 resp.raise_for_status()
 
                 # Parse JSON response
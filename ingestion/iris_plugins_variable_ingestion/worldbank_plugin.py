@@ -10,7 +10,7 @@ import logging
 import time
 from typing import Dict, List, Any, Optional
 
-import requests
+from ingestion.iris_http import http_get
 from ingestion.iris_plugins import IrisPluginManager
 
 logger = logging.getLogger(__name__)
@@ -118,7 +118,7 @@ class WorldBankPlugin(IrisPluginManager):
                     **params,
                 }
 
-                resp = requests.get(
+                resp = http_get(
                     url, params=full_params, timeout=self.REQUEST_TIMEOUT
                 )
                 resp.raise_for_status()
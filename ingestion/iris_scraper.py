@@ -15,7 +15,7 @@ import os
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from ingestion.iris_trust import IrisTrustScorer
 from ingestion.iris_symbolism import IrisSymbolismTagger
@@ -50,7 +50,7 @@ class IrisScraper:
             timestamp = datetime.now(timezone.utc)
 
         recency_score = self.trust_engine.score_recency(timestamp)
-        anomaly_flag = self.trust_engine.detect_anomaly_zscore(value)
+        anomaly_flag = self.trust_engine.detect_anomaly_zscore(value, name)
         symbolic_tag = self.symbolism_engine.infer_symbolic_tag(name)
         sti = self.trust_engine.compute_signal_trust_index(recency_score, anomaly_flag)
 
@@ -69,29 +69,93 @@ class IrisScraper:
         self.archive.append_signal(signal_record)  # <-- NEW line
         return signal_record
 
+    def ingest_signals(
+        self, signals: List[Dict[str, Any]], use_isolation: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest a batch of signals: score them in one trust-engine call and
+        archive them with a single write.
+
+        Args:
+            signals (List[Dict]): Dicts with 'name', 'value' and optional
+                'source' and 'timestamp' (datetime or ISO string; naive values
+                are treated as UTC). Signals missing 'name' or 'value', or with
+                a non-numeric value or unparseable timestamp, are logged and
+                skipped.
+            use_isolation (bool): Also apply isolation-forest anomaly scoring.
+
+        Returns:
+            List[Dict]: Signal records, in input order.
+        """
+        valid = []
+        for sig in signals:
+            if sig.get("name") is None or sig.get("value") is None:
+                logger.error(
+                    "[IrisScraper] Signal missing required 'name' or 'value': %s",
+                    sig,
+                )
+                continue
+            try:
+                float(sig["value"])
+            except (TypeError, ValueError):
+                logger.error("[IrisScraper] Signal value is not numeric: %s", sig)
+                continue
+            timestamp = sig.get("timestamp") or datetime.now(timezone.utc)
+            try:
+                if isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp)
+                if not isinstance(timestamp, datetime):
+                    raise TypeError(type(timestamp).__name__)
+            except (TypeError, ValueError):
+                logger.error("[IrisScraper] Signal timestamp is invalid: %s", sig)
+                continue
+            if timestamp.tzinfo is None:
+                # Naive timestamps are taken to be UTC
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            valid.append(
+                {
+                    "name": sig["name"],
+                    "value": sig["value"],
+                    "source": sig.get("source", "plugin"),
+                    "timestamp": timestamp,
+                }
+            )
+
+        scores = self.trust_engine.score_signals(valid, use_isolation=use_isolation)
+        records = []
+        for sig, score in zip(valid, scores):
+            records.append(
+                {
+                    "name": sig["name"],
+                    "value": sig["value"],
+                    "source": sig["source"],
+                    "timestamp": sig["timestamp"].isoformat(),
+                    "symbolic_tag": self.symbolism_engine.infer_symbolic_tag(
+                        sig["name"]
+                    ),
+                    "recency_score": round(score["recency_score"], 3),
+                    "anomaly_flag": score["anomaly_flag"],
+                    "sti": score["sti"],
+                }
+            )
+
+        self.signal_log.extend(records)
+        self.archive.append_signals(records)
+        return records
+
     def batch_ingest_from_plugins(self) -> None:
         """
-        Ingest signals from all registered plugins.
+        Ingest signals from all registered plugins. Plugins run concurrently
+        and each plugin's signals are ingested as one batch as soon as it
+        completes.
         """
-        plugin_signals = self.plugin_manager.run_plugins()
-        for sig in plugin_signals:
+        for name, plugin_signals in self.plugin_manager.iter_plugin_results():
             try:
-                name = sig.get("name")
-                value = sig.get("value")
-                if name is None or value is None:
-                    logger.error(
-                        "[IrisScraper] Signal missing required 'name' or 'value': %s",
-                        sig,
-                    )
-                    continue
-                self.ingest_signal(
-                    name=name,
-                    value=value,
-                    source=sig.get("source", "plugin"),
-                    timestamp=sig.get("timestamp"),
-                )
+                self.ingest_signals(plugin_signals)
             except Exception as e:
-                logger.error("[IrisScraper] Failed to ingest plugin signal: %s", e)
+                logger.error(
+                    "[IrisScraper] Failed to ingest signals from %s: %s", name, e
+                )
 
     def export_signal_log(self) -> str:
         """
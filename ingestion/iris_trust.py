@@ -6,23 +6,122 @@ Handles signal trust scoring:
 - Anomaly detection (Isolation Forest + Z-Score)
 - Signal Trust Index (STI) calculation
 
+Anomaly state is kept per signal name: a sliding Welford window gives O(1)
+z-scores, and each signal's Isolation Forest is refit every
+``refit_interval`` observations instead of on every value, then scored in
+batch.
+
 Author: Pulse Development Team
 Date: 2025-04-27
 """
 
+import math
+import threading
 import numpy as np
+from collections import deque
 from datetime import datetime, timezone
-from sklearn.ensemble import IsolationForest
-from typing import List
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence
+from utils.lazy_import import lazy_import
+
+sklearn_ensemble = lazy_import("sklearn.ensemble")
+
+DEFAULT_SIGNAL = "__default__"
+
+
+class WelfordWindow:
+    """
+    Sliding window with running mean and sum of squared deviations
+    (Welford's algorithm with removal). Add and evict are O(1).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.size:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        n = len(self.values)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        n = len(self.values)
+        if n == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the window."""
+        n = len(self.values)
+        return math.sqrt(self._m2 / n) if n else 0.0
+
+    def zscore(self, value: float) -> float:
+        return (value - self.mean) / (self.std + 1e-6)  # Avoid division by zero
+
+
+class _IsolationState:
+    """Per-signal isolation model, refit periodically on a bounded history."""
+
+    def __init__(self, history_size: int):
+        self.history: Deque[float] = deque(maxlen=history_size)
+        self.model: Optional["sklearn_ensemble.IsolationForest"] = None
+        self.since_fit = 0
 
 
 class IrisTrustScorer:
-    def __init__(self):
+    def __init__(
+        self,
+        zscore_window_size: int = 50,
+        zscore_min_samples: int = 10,
+        zscore_threshold: float = 3.0,
+        isolation_history_size: int = 500,
+        isolation_min_samples: int = 20,
+        refit_interval: int = 100,
+        contamination: float = 0.1,
+    ):
         """
         Initialize the Iris Trust Engine.
+
+        Args:
+            zscore_window_size (int): Values kept per signal for z-scores.
+            zscore_min_samples (int): Values needed before z-score flags anomalies.
+            zscore_threshold (float): Absolute z-score above which a value is anomalous.
+            isolation_history_size (int): Values kept per signal to fit the
+                isolation model.
+            isolation_min_samples (int): Values needed before the first isolation fit.
+            refit_interval (int): New values per signal between isolation refits.
+            contamination (float): Isolation Forest contamination.
         """
-        self.zscore_window: List[float] = []
-        self.anomaly_model = IsolationForest(contamination=0.1, random_state=42)
+        self.zscore_window_size = zscore_window_size
+        self.zscore_min_samples = zscore_min_samples
+        self.zscore_threshold = zscore_threshold
+        self.isolation_history_size = isolation_history_size
+        self.isolation_min_samples = isolation_min_samples
+        self.refit_interval = refit_interval
+        self.contamination = contamination
+
+        self._zscore_windows: Dict[str, WelfordWindow] = {}
+        self._isolation: Dict[str, _IsolationState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def zscore_window(self) -> List[float]:
+        """Values in the default (unnamed) signal's z-score window."""
+        window = self._zscore_windows.get(DEFAULT_SIGNAL)
+        return list(window.values) if window else []
 
     def score_recency(self, timestamp: datetime) -> float:
         """
@@ -39,44 +138,100 @@ class IrisTrustScorer:
         max_age = 7 * 24 * 3600  # 7 days
         return max(0.0, min(1.0, 1.0 - delta_seconds / max_age))
 
-    def detect_anomaly_isolation(self, value: float) -> bool:
+    def _fit_isolation(self, state: _IsolationState) -> None:
+        model = sklearn_ensemble.IsolationForest(
+            contamination=self.contamination, random_state=42
+        )
+        model.fit(np.fromiter(state.history, dtype=float).reshape(-1, 1))
+        state.model = model
+        state.since_fit = 0
+
+    def detect_anomaly_isolation_batch(
+        self, values: Sequence[float], name: str = DEFAULT_SIGNAL
+    ) -> List[bool]:
         """
-        Detect anomalies using Isolation Forest on recent window.
+        Detect anomalies for several values of one signal with a single
+        Isolation Forest prediction. The model is refit at most once per call,
+        when ``refit_interval`` new values have arrived since the last fit.
 
         Args:
-            value (float): New signal value.
+            values (Sequence[float]): New signal values, oldest first.
+            name (str): Signal name.
 
         Returns:
-            bool: True if anomalous.
+            List[bool]: True for each anomalous value.
         """
+        if len(values) == 0:
+            return []
         try:
-            window = np.array(self.zscore_window[-100:] + [value]).reshape(-1, 1)
-            self.anomaly_model.fit(window)
-            prediction = self.anomaly_model.predict([[value]])
-            return prediction[0] == -1
+            with self._lock:
+                state = self._isolation.get(name)
+                if state is None:
+                    state = self._isolation[name] = _IsolationState(
+                        self.isolation_history_size
+                    )
+                state.history.extend(values)
+                state.since_fit += len(values)
+                if len(state.history) >= self.isolation_min_samples and (
+                    state.model is None or state.since_fit >= self.refit_interval
+                ):
+                    self._fit_isolation(state)
+                model = state.model
+            if model is None:
+                return [False] * len(values)
+            predictions = model.predict(np.asarray(values, dtype=float).reshape(-1, 1))
+            return [bool(p == -1) for p in predictions]
         except Exception:
-            return False  # Fail safe: no anomaly
+            return [False] * len(values)  # Fail safe: no anomaly
 
-    def detect_anomaly_zscore(self, value: float) -> bool:
+    def detect_anomaly_isolation(
+        self, value: float, name: str = DEFAULT_SIGNAL
+    ) -> bool:
         """
-        Detect anomalies using z-score threshold.
+        Detect anomalies using the signal's periodically refit Isolation Forest.
 
         Args:
             value (float): New signal value.
+            name (str): Signal name.
 
         Returns:
             bool: True if anomalous.
         """
-        self.zscore_window.append(value)
-        if len(self.zscore_window) < 10:
-            return False
-        if len(self.zscore_window) > 50:
-            self.zscore_window = self.zscore_window[-50:]
+        return self.detect_anomaly_isolation_batch([value], name)[0]
 
-        mean = np.mean(self.zscore_window)
-        std = np.std(self.zscore_window) + 1e-6  # Avoid division by zero
-        z = (value - mean) / std
-        return bool(abs(z) > 3.0)
+    def detect_anomaly_zscore(self, value: float, name: str = DEFAULT_SIGNAL) -> bool:
+        """
+        Detect anomalies using z-score threshold over the signal's recent window.
+
+        Args:
+            value (float): New signal value.
+            name (str): Signal name.
+
+        Returns:
+            bool: True if anomalous.
+        """
+        with self._lock:
+            window = self._zscore_windows.get(name)
+            if window is None:
+                window = self._zscore_windows[name] = WelfordWindow(
+                    self.zscore_window_size
+                )
+            window.add(float(value))
+            if len(window) < self.zscore_min_samples:
+                return False
+            return bool(abs(window.zscore(value)) > self.zscore_threshold)
+
+    def detect_anomaly_zscore_batch(
+        self, values: Iterable[float], names: Iterable[str]
+    ) -> List[bool]:
+        """
+        Z-score anomaly flags for a batch of (possibly different) signals,
+        processed in order.
+        """
+        return [
+            self.detect_anomaly_zscore(value, name)
+            for value, name in zip(values, names)
+        ]
 
     def compute_signal_trust_index(
         self, recency_score: float, anomaly_flag: bool
@@ -96,3 +251,47 @@ class IrisTrustScorer:
         anomaly_penalty = -0.2 if anomaly_flag else 0.0
         sti = base + recency_boost + anomaly_penalty
         return round(max(0.0, min(1.0, sti)), 3)
+
+    def score_signals(
+        self, signals: Sequence[Dict[str, Any]], use_isolation: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a batch of signals in one call.
+
+        Args:
+            signals (Sequence[Dict]): Dicts with 'name', 'value' and 'timestamp'
+                (timezone-aware datetime).
+            use_isolation (bool): Also flag values the signal's isolation model
+                marks as outliers.
+
+        Returns:
+            List[Dict]: 'recency_score', 'anomaly_flag' and 'sti' per signal,
+            in input order.
+        """
+        names = [sig["name"] for sig in signals]
+        values = [float(sig["value"]) for sig in signals]
+        flags = self.detect_anomaly_zscore_batch(values, names)
+
+        if use_isolation:
+            # One prediction per signal name over all of its values in the batch
+            positions: Dict[str, List[int]] = {}
+            for i, name in enumerate(names):
+                positions.setdefault(name, []).append(i)
+            for name, idx in positions.items():
+                isolation_flags = self.detect_anomaly_isolation_batch(
+                    [values[i] for i in idx], name
+                )
+                for i, flag in zip(idx, isolation_flags):
+                    flags[i] = flags[i] or flag
+
+        results = []
+        for sig, flag in zip(signals, flags):
+            recency = self.score_recency(sig["timestamp"])
+            results.append(
+                {
+                    "recency_score": recency,
+                    "anomaly_flag": flag,
+                    "sti": self.compute_signal_trust_index(recency, flag),
+                }
+            )
+        return results
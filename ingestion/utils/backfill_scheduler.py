@@ -0,0 +1,561 @@
+"""ingestion.utils.backfill_scheduler
+===================================
+
+Concurrent historical backfill for variables in the historical timeline
+catalog.
+
+Instead of fetching variables one at a time with a fixed sleep between
+calls, the scheduler:
+1. Splits each variable's date range into chunks
+2. Runs chunks for many variables on a thread pool
+3. Paces requests with one token bucket per provider (FRED, YahooFinance),
+   halving a provider's rate on 429 responses and recovering it gradually
+4. Records completed chunks in a JSON progress ledger so an interrupted
+   backfill resumes where it stopped
+
+Usage:
+------
+```python
+from ingestion.utils.backfill_scheduler import BackfillScheduler
+from ingestion.utils.historical_data_retriever import get_priority_variables
+
+scheduler = BackfillScheduler(max_workers=8, chunk_days=365)
+results = scheduler.run(get_priority_variables(1), years=10)
+```
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ingestion.utils.historical_data_retriever import (
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BASE_DELAY,
+    DEFAULT_YEARS,
+    NoDataError,
+    analyze_data,
+    fetch_variable_series,
+    get_date_range,
+)
+from ingestion.utils.ingestion_persistence import save_processed_data
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CHUNK_DAYS = 365
+DEFAULT_LEDGER_PATH = "data/historical_timeline/backfill_ledger.json"
+DEFAULT_CHUNK_DIR = "data/historical_timeline/backfill_chunks"
+DEFAULT_MAX_RATE_LIMITED_ATTEMPTS = 20
+# The ledger is flushed after this many updates or seconds, whichever first
+DEFAULT_LEDGER_FLUSH_EVERY = 50
+DEFAULT_LEDGER_FLUSH_INTERVAL = 5.0
+
+# Sustained requests per second and burst size for each provider
+DEFAULT_PROVIDER_LIMITS: Dict[str, Tuple[float, int]] = {
+    "FRED": (2.0, 5),  # FRED allows 120 requests per minute
+    "YahooFinance": (1.0, 2),
+    "default": (1.0, 1),
+}
+
+
+class RateLimitedError(Exception):
+    """Raised by a fetcher when the provider answered 429 Too Many Requests."""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception from a provider client indicates a 429 response."""
+    if isinstance(error, RateLimitedError):
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "too many requests" in message or "rate limit" in message
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with adaptive rate.
+
+    ``acquire`` blocks until a token is available. ``backoff`` halves the
+    refill rate (down to ``min_rate``) and pauses the bucket; each
+    ``record_success`` restores a fraction of the base rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        min_rate: Optional[float] = None,
+        recovery: float = 0.1,
+    ):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.recovery = recovery
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - max(self.updated, self.blocked_until))
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(now, self.updated)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if necessary.
+
+        Returns:
+            True if a token was taken, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(
+                    self.blocked_until - now, (1 - self.tokens) / self.rate, 0.001
+                )
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def backoff(self, pause: Optional[float] = None) -> None:
+        """Halve the rate and pause the bucket after a 429."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            pause = pause if pause is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.rate = min(
+                self.base_rate, self.rate + self.recovery * self.base_rate
+            )
+
+
+class ProgressLedger:
+    """
+    Persistent record of completed backfill chunks.
+
+    Stored as JSON: {variable_name: {"<start>/<end>": {"status", "points",
+    "path", "completed_at"}}}. Updates are batched in memory and written
+    atomically every flush_every updates or flush_interval seconds; call
+    flush() to persist the rest. A lost batch only means those chunks are
+    fetched again on the next run.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LEDGER_PATH,
+        flush_every: int = DEFAULT_LEDGER_FLUSH_EVERY,
+        flush_interval: float = DEFAULT_LEDGER_FLUSH_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read backfill ledger {self.path}: {e}")
+
+    @staticmethod
+    def chunk_key(start: dt.datetime, end: dt.datetime) -> str:
+        return f"{start.date().isoformat()}/{end.date().isoformat()}"
+
+    def get(self, variable: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(variable, {}).get(key)
+
+    def is_done(self, variable: str, key: str) -> bool:
+        entry = self.get(variable, key)
+        return bool(entry and entry.get("status") == "done")
+
+    def mark(self, variable: str, key: str, **fields: Any) -> None:
+        with self._lock:
+            entry = self.entries.setdefault(variable, {}).setdefault(key, {})
+            entry.update(fields)
+            entry["updated_at"] = dt.datetime.now().isoformat()
+            self._dirty += 1
+            if (
+                self._dirty >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._save_locked()
+
+    def reset(self, variable: Optional[str] = None) -> None:
+        with self._lock:
+            if variable is None:
+                self.entries = {}
+            else:
+                self.entries.pop(variable, None)
+            self._save_locked()
+
+    def flush(self) -> None:
+        """Write pending updates to disk, if any."""
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+
+
+_CHUNK_EPOCH = dt.datetime(1970, 1, 1)
+
+
+def split_date_range(
+    start_date: dt.datetime, end_date: dt.datetime, chunk_days: int
+) -> List[Tuple[dt.datetime, dt.datetime]]:
+    """
+    Split [start_date, end_date] into consecutive, non-overlapping chunks of
+    at most chunk_days days.
+
+    Chunks are aligned to fixed chunk_days boundaries counted from 1970-01-01,
+    so runs started on different days share ledger keys for every chunk except
+    the one containing end_date. The first chunk may start before start_date.
+    """
+    chunks = []
+    start_day = dt.datetime.combine(start_date.date(), dt.time())
+    offset = (start_day - _CHUNK_EPOCH).days % chunk_days
+    chunk_start = start_day - dt.timedelta(days=offset)
+    while chunk_start <= end_date:
+        chunk_end = min(end_date, chunk_start + dt.timedelta(days=chunk_days - 1))
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + dt.timedelta(days=1)
+    return chunks
+
+
+class BackfillScheduler:
+    """
+    Runs chunked historical retrieval for many variables concurrently, paced
+    by per-provider token buckets and resumable through a progress ledger.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        chunk_days: int = DEFAULT_CHUNK_DAYS,
+        provider_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        ledger_path: str = DEFAULT_LEDGER_PATH,
+        chunk_dir: str = DEFAULT_CHUNK_DIR,
+        max_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_rate_limited_attempts: int = DEFAULT_MAX_RATE_LIMITED_ATTEMPTS,
+        fetcher: Optional[
+            Callable[[Dict[str, Any], dt.datetime, dt.datetime], pd.Series]
+        ] = None,
+        save_results: bool = True,
+    ):
+        """
+        Args:
+            max_workers: Number of chunks fetched concurrently
+            chunk_days: Days per chunk
+            provider_limits: {provider: (requests_per_second, burst)}; merged
+                over DEFAULT_PROVIDER_LIMITS
+            ledger_path: Progress ledger file
+            chunk_dir: Directory for completed chunk data
+            max_attempts: Attempts per chunk for non-rate-limit errors
+            base_delay: Base delay for exponential backoff between attempts
+            max_rate_limited_attempts: 429 responses tolerated per chunk before
+                it is marked failed
+            fetcher: Function (variable_info, start, end) -> pd.Series;
+                defaults to fetch_variable_series. NoDataError from it marks
+                the chunk done with 0 points
+            save_results: Save processed data for completed variables
+        """
+        self.max_workers = max_workers
+        self.chunk_days = chunk_days
+        self.provider_limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+        self.ledger = ProgressLedger(ledger_path)
+        self.chunk_dir = Path(chunk_dir)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_rate_limited_attempts = max_rate_limited_attempts
+        self.fetcher = fetcher or (
+            lambda info, start, end: fetch_variable_series(
+                info, start, end, max_attempts=1
+            )
+        )
+        self.save_results = save_results
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self.stats = {"chunks_fetched": 0, "chunks_skipped": 0, "rate_limited": 0}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def provider_for(variable_info: Dict[str, Any]) -> str:
+        params = variable_info.get("required_parameters", {})
+        return params.get("source") or variable_info.get("source", "default")
+
+    def bucket_for(self, provider: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate, burst = self.provider_limits.get(
+                    provider, self.provider_limits["default"]
+                )
+                bucket = self._buckets[provider] = TokenBucket(rate, burst)
+            return bucket
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _chunk_path(self, variable: str, key: str) -> Path:
+        return self.chunk_dir / variable / (key.replace("/", "_") + ".json")
+
+    def _fetch_chunk(
+        self, variable_info: Dict[str, Any], start: dt.datetime, end: dt.datetime
+    ) -> int:
+        """Fetch one chunk with rate limiting and retries; returns its point count."""
+        variable = variable_info["variable_name"]
+        key = ProgressLedger.chunk_key(start, end)
+        bucket = self.bucket_for(self.provider_for(variable_info))
+        failures = 0
+        rate_limited = 0
+
+        while True:
+            bucket.acquire()
+            try:
+                series = self.fetcher(variable_info, start, end)
+            except NoDataError:
+                # Normal for short tail chunks, weekends, monthly or quarterly
+                # series and ranges before the series starts
+                series = pd.Series(dtype=float)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    # Rate limits do not count against max_attempts; the bucket
+                    # slows the whole provider down instead, up to a separate cap
+                    self._count("rate_limited")
+                    rate_limited += 1
+                    if rate_limited >= self.max_rate_limited_attempts:
+                        self.ledger.mark(variable, key, status="failed", error=str(e))
+                        raise
+                    bucket.backoff()
+                    logger.warning(f"Rate limited fetching {variable} {key}: {e}")
+                    continue
+                failures += 1
+                if failures >= self.max_attempts:
+                    self.ledger.mark(variable, key, status="failed", error=str(e))
+                    raise
+                delay = self.base_delay * (2 ** (failures - 1)) + random.uniform(0, 1)
+                logger.warning(
+                    f"Attempt {failures} for {variable} {key} failed: {e}. "
+                    f"Retrying in {delay:.2f} seconds..."
+                )
+                time.sleep(delay)
+                continue
+
+            bucket.record_success()
+            break
+
+        values = series_to_values(series)
+        path = self._chunk_path(variable, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(values, f)
+        self.ledger.mark(
+            variable,
+            key,
+            status="done",
+            points=len(values),
+            path=str(path),
+            completed_at=dt.datetime.now().isoformat(),
+        )
+        self._count("chunks_fetched")
+        return len(values)
+
+    def _load_chunk_values(self, variable: str, key: str) -> List[Dict[str, Any]]:
+        entry = self.ledger.get(variable, key) or {}
+        path = Path(entry.get("path") or self._chunk_path(variable, key))
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _finalize(
+        self,
+        variable_info: Dict[str, Any],
+        chunks: List[Tuple[dt.datetime, dt.datetime]],
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+    ) -> Dict[str, Any]:
+        """Merge a variable's chunks, analyze and save them."""
+        variable = variable_info["variable_name"]
+        by_date: Dict[str, float] = {}
+        for chunk_start, chunk_end in chunks:
+            key = ProgressLedger.chunk_key(chunk_start, chunk_end)
+            for point in self._load_chunk_values(variable, key):
+                by_date[point["date"]] = point["value"]
+        dates = sorted(by_date)
+        index = pd.to_datetime(dates, utc=True).tz_localize(None)
+        series = pd.Series([by_date[d] for d in dates], index=index, dtype=float)
+        # Aligned chunks can extend before the requested start
+        in_range = (index >= pd.Timestamp(start_date.date())) & (
+            index <= pd.Timestamp(end_date)
+        )
+        series = series[in_range]
+        values = [
+            {"date": d, "value": by_date[d]}
+            for d, keep in zip(dates, in_range)
+            if keep
+        ]
+
+        stats = analyze_data(variable, series, start_date, end_date)
+        processed_data = {
+            "variable_name": variable,
+            "source": variable_info["source"],
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "values": values,
+        }
+        if self.save_results:
+            save_processed_data(
+                variable,
+                processed_data,
+                source_name=variable_info["source"],
+                base_dir="data/historical_timeline",
+                metadata={
+                    "retrieval_stats": {
+                        "data_point_count": stats.data_point_count,
+                        "min_value": stats.min_value,
+                        "max_value": stats.max_value,
+                        "mean_value": stats.mean_value,
+                        "median_value": stats.median_value,
+                        "completeness_pct": stats.completeness_pct,
+                        "gaps_count": len(stats.gaps),
+                        "anomalies_count": len(stats.anomalies),
+                    },
+                    "backfill_chunks": len(chunks),
+                },
+            )
+        logger.info(
+            f"Backfilled {variable}: {stats.data_point_count} points, "
+            f"completeness {stats.completeness_pct:.2f}%"
+        )
+        return {
+            "variable_info": variable_info,
+            "data": processed_data,
+            "stats": vars(stats),
+        }
+
+    def run(
+        self,
+        variables: List[Dict[str, Any]],
+        years: int = DEFAULT_YEARS,
+        end_date: Optional[dt.datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Backfill all variables, resuming from the ledger.
+
+        Args:
+            variables: Variable entries from the catalog
+            years: Number of years to look back from end_date
+            end_date: End date for data retrieval (defaults to today)
+
+        Returns:
+            Dictionary mapping variable names to retrieval results. Variables
+            with a failed chunk map to {"variable_info", "error"}.
+        """
+        start_date, end_date = get_date_range(years, end_date)
+        chunks = split_date_range(start_date, end_date, self.chunk_days)
+
+        remaining: Dict[str, int] = {}
+        errors: Dict[str, str] = {}
+        info_by_name = {info["variable_name"]: info for info in variables}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def finish(variable: str) -> None:
+            info = info_by_name[variable]
+            if variable in errors:
+                results[variable] = {"variable_info": info, "error": errors[variable]}
+                return
+            try:
+                results[variable] = self._finalize(info, chunks, start_date, end_date)
+            except Exception as e:
+                logger.error(f"Failed to assemble backfill for {variable}: {e}")
+                results[variable] = {"variable_info": info, "error": str(e)}
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="backfill"
+            ) as executor:
+                futures = {}
+                for info in variables:
+                    variable = info["variable_name"]
+                    remaining[variable] = 0
+                    for chunk_start, chunk_end in chunks:
+                        key = ProgressLedger.chunk_key(chunk_start, chunk_end)
+                        if self.ledger.is_done(variable, key):
+                            self._count("chunks_skipped")
+                            continue
+                        remaining[variable] += 1
+                        future = executor.submit(
+                            self._fetch_chunk, info, chunk_start, chunk_end
+                        )
+                        futures[future] = variable
+
+                # Each variable is finalised as soon as its last chunk lands,
+                # while chunks of other variables are still being fetched
+                for variable, count in remaining.items():
+                    if count == 0:
+                        finish(variable)
+                for future in as_completed(futures):
+                    variable = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Backfill chunk failed for {variable}: {e}")
+                        errors.setdefault(variable, str(e))
+                    remaining[variable] -= 1
+                    if remaining[variable] == 0:
+                        finish(variable)
+        finally:
+            # Also reached on KeyboardInterrupt, so an interrupted run keeps
+            # the chunks it already completed
+            self.ledger.flush()
+
+        return results
+
+
+def series_to_values(series: pd.Series) -> List[Dict[str, Any]]:
+    """Convert a date-indexed Series to [{"date", "value"}], dropping NaNs."""
+    values = []
+    for date_idx, value in series.dropna().items():
+        date_str = (
+            date_idx.isoformat() if hasattr(date_idx, "isoformat") else str(date_idx)
+        )
+        values.append({"date": date_str, "value": float(value)})
+    return values
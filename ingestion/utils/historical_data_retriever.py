@@ -8,6 +8,7 @@ This module provides functionality to:
 1. Retrieve historical data for specific variables or all priority 1 variables
 2. Customize the date range for data retrieval
 3. Handle API rate limits with exponential backoff and retries
+   (or, for bulk backfills, per-provider token buckets via run_backfill)
 4. Verify data quality and completeness
 5. Store retrieved data using the ingestion_persistence module
 
@@ -54,7 +55,11 @@ from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 import requests
 import yfinance as yf
-from fredapi import Fred
+
+try:
+    from fredapi import Fred
+except ImportError:
+    Fred = None
 
 from ingestion.utils.ingestion_persistence import (
     ensure_data_directory,
@@ -80,7 +85,11 @@ HISTORICAL_DATA_BASE_DIR = "data/historical_timeline/historical_data"
 
 # Initialize FRED client
 FRED_KEY = os.getenv("FRED_API_KEY", "")
-_FRED = Fred(api_key=FRED_KEY) if FRED_KEY else None
+_FRED = Fred(api_key=FRED_KEY) if FRED_KEY and Fred is not None else None
+
+
+class NoDataError(ValueError):
+    """Raised when a source returns no data points for the requested range."""
 
 
 @dataclass
@@ -149,6 +158,8 @@ def fetch_fred_data(
     series_id: str, start_date: dt.datetime, end_date: dt.datetime
 ) -> pd.Series:
     """Fetch data from FRED with retries and backoff."""
+    if Fred is None:
+        raise ImportError("fredapi is not installed; FRED series are unavailable")
     if _FRED is None:
         raise ValueError(
             "FRED API key not set. Set the FRED_API_KEY environment variable."
@@ -161,7 +172,7 @@ def fetch_fred_data(
     data = _FRED.get_series(series_id, start_date, end_date)
 
     if data is None or data.empty:
-        raise ValueError(f"No data returned for FRED series {series_id}")
+        raise NoDataError(f"No data returned for FRED series {series_id}")
 
     return data
 
@@ -185,11 +196,55 @@ def fetch_yahoo_finance_data(
     )
 
     if data is None or data.empty:
-        raise ValueError(f"No data returned for Yahoo Finance ticker {ticker}")
+        raise NoDataError(f"No data returned for Yahoo Finance ticker {ticker}")
 
     return data
 
 
+def fetch_variable_series(
+    variable_info: Dict[str, Any],
+    start_date: dt.datetime,
+    end_date: dt.datetime,
+    max_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+) -> pd.Series:
+    """
+    Fetch a variable's values for a date range as a date-indexed Series,
+    applying the catalog transform (FRED) or taking close prices (Yahoo Finance).
+
+    Args:
+        variable_info: Dictionary containing variable information from the catalog
+        start_date: Start of the range
+        end_date: End of the range
+        max_attempts: Attempts passed to the retrying fetcher
+
+    Returns:
+        pandas Series of values
+    """
+    required_parameters = variable_info.get("required_parameters", {})
+    source_type = required_parameters.get("source")
+    api_endpoint = variable_info["api_endpoint"]
+
+    if source_type == "FRED":
+        data = fetch_fred_data(
+            api_endpoint, start_date, end_date, max_attempts=max_attempts
+        )
+        transform = required_parameters.get("transform")
+        if transform and transform.startswith("divide by"):
+            data = data / float(transform.split("divide by ")[1])
+        return data
+
+    if source_type == "YahooFinance":
+        data = fetch_yahoo_finance_data(
+            api_endpoint, start_date, end_date, max_attempts=max_attempts
+        )["Close"]
+        # Newer yfinance versions return one column per ticker
+        if isinstance(data, pd.DataFrame):
+            data = data.iloc[:, 0]
+        return data
+
+    raise ValueError(f"Unsupported source type: {source_type}")
+
+
 def get_date_range(
     years: int = DEFAULT_YEARS, end_date: Optional[dt.datetime] = None
 ) -> Tuple[dt.datetime, dt.datetime]:
@@ -574,6 +629,8 @@ def retrieve_priority_variables(
     years: int = DEFAULT_YEARS,
     end_date: Optional[dt.datetime] = None,
     rate_limit_delay: float = DEFAULT_RATE_LIMIT_DELAY,
+    max_workers: int = 1,
+    chunk_days: Optional[int] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Retrieve historical data for all variables with the specified priority.
@@ -583,6 +640,10 @@ def retrieve_priority_variables(
         years: Number of years to look back from end_date
         end_date: End date for data retrieval (defaults to today)
         rate_limit_delay: Delay between API calls to respect rate limits
+            (sequential mode only)
+        max_workers: With more than one worker, run a concurrent, resumable
+            backfill via BackfillScheduler (token-bucket rate limiting)
+        chunk_days: Days per backfill chunk (concurrent mode only)
 
     Returns:
         Dictionary mapping variable names to their retrieved data
@@ -593,6 +654,15 @@ def retrieve_priority_variables(
         logger.warning(f"No variables found with priority {priority}")
         return {}
 
+    if max_workers > 1:
+        return run_backfill(
+            priority_vars,
+            years=years,
+            end_date=end_date,
+            max_workers=max_workers,
+            chunk_days=chunk_days,
+        )
+
     results = {}
 
     for var_info in priority_vars:
@@ -614,6 +684,27 @@ def retrieve_priority_variables(
     return results
 
 
+def run_backfill(
+    variables: List[Dict[str, Any]],
+    years: int = DEFAULT_YEARS,
+    end_date: Optional[dt.datetime] = None,
+    max_workers: int = 8,
+    chunk_days: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Retrieve variables concurrently with the resumable BackfillScheduler."""
+    from ingestion.utils.backfill_scheduler import (
+        DEFAULT_CHUNK_DAYS,
+        BackfillScheduler,
+    )
+
+    scheduler = BackfillScheduler(
+        max_workers=max_workers, chunk_days=chunk_days or DEFAULT_CHUNK_DAYS
+    )
+    results = scheduler.run(variables, years=years, end_date=end_date)
+    logger.info(f"Backfill stats: {scheduler.stats}")
+    return results
+
+
 def create_verification_report(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Create a verification report for the retrieved data.
@@ -734,6 +825,21 @@ def main():
         "--end-date", type=str, help="End date for data retrieval (format: YYYY-MM-DD)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent workers for --priority/--all; above 1 runs a resumable "
+        "chunked backfill with per-provider rate limits (default: 1)",
+    )
+
+    parser.add_argument(
+        "--chunk-days",
+        type=int,
+        default=None,
+        help="Days per backfill chunk when --workers > 1 (default: 365)",
+    )
+
     args = parser.parse_args()
 
     # Parse end date if provided
@@ -780,6 +886,19 @@ def main():
                 years=args.years,
                 end_date=end_date,
                 rate_limit_delay=args.delay,
+                max_workers=args.workers,
+                chunk_days=args.chunk_days,
+            )
+
+        elif args.all and args.workers > 1:
+            # Concurrent, resumable backfill of the whole catalog
+            catalog = load_variable_catalog()
+            results = run_backfill(
+                catalog["variables"],
+                years=args.years,
+                end_date=end_date,
+                max_workers=args.workers,
+                chunk_days=args.chunk_days,
             )
 
         elif args.all:
@@ -1,4 +1,4 @@
-"""ingestion.iris_utils.historical_data_verification
+"""ingestion.utils.historical_data_verification
 =============================================
 
 A module for comprehensive verification and quality assurance of historical data.
@@ -17,7 +17,7 @@ and adds more sophisticated data quality assessment methods:
 Usage:
 ------
 ```python
-from ingestion.iris_utils.historical_data_verification import (
+from ingestion.utils.historical_data_verification import (
     perform_quality_check,
     detect_anomalies,
     cross_validate_sources,
@@ -53,6 +53,9 @@ from __future__ import annotations
 import datetime as dt
 import json
 import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -61,10 +64,9 @@ from typing import Any, Dict, List, Optional, Union
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from scipy import stats
 from scipy.signal import find_peaks
 
-from ingestion.iris_utils.historical_data_retriever import (
+from ingestion.utils.historical_data_retriever import (
     load_variable_catalog,
     get_priority_variables,
     HISTORICAL_DATA_BASE_DIR,
@@ -390,6 +392,43 @@ def load_multi_source_data(variable_name: str) -> Dict[str, pd.Series]:
     return source_data
 
 
+def _series_label(series: pd.Series) -> str:
+    return str(series.name) if series.name is not None else "unknown"
+
+
+def _as_datetime_index(series: pd.Series) -> Optional[pd.DatetimeIndex]:
+    if isinstance(series.index, pd.DatetimeIndex):
+        return series.index
+    try:
+        return pd.DatetimeIndex(series.index)
+    except Exception:
+        return None
+
+
+def prepare_series(series: pd.Series) -> pd.Series:
+    """
+    Convert a series once into the form every verification check expects:
+    float values on a sorted DatetimeIndex. perform_quality_check calls this
+    before running the individual checks so none of them re-sorts or
+    re-converts the data.
+
+    Args:
+        series: Time series data
+
+    Returns:
+        Sorted float Series with a DatetimeIndex
+    """
+    index = _as_datetime_index(series)
+    prepared = pd.Series(
+        np.asarray(series.values, dtype=float),
+        index=index if index is not None else series.index,
+        name=series.name,
+    )
+    if not prepared.index.is_monotonic_increasing:
+        prepared = prepared.sort_index()
+    return prepared
+
+
 def detect_gaps(
     series: pd.Series,
     freq: str = "D",
@@ -411,21 +450,17 @@ def detect_gaps(
     if len(series) < 2:
         return []
 
+    index = _as_datetime_index(series)
+
     # Determine the expected frequency if not provided
     if expected_frequency:
         freq = expected_frequency
     else:
         # Try to infer the frequency
-        # Ensure we have a DatetimeIndex for frequency inference
-        if isinstance(series.index, pd.DatetimeIndex):
-            inferred_freq = pd.infer_freq(series.index)
-        else:
-            # Try to convert to DatetimeIndex
-            try:
-                dt_index = pd.DatetimeIndex(series.index)
-                inferred_freq = pd.infer_freq(dt_index)
-            except Exception:
-                inferred_freq = None
+        try:
+            inferred_freq = pd.infer_freq(index) if index is not None else None
+        except Exception:
+            inferred_freq = None
         if inferred_freq:
             freq = inferred_freq
     # Create a complete date range with the expected frequency
@@ -435,27 +470,12 @@ def detect_gaps(
         freq = "D"
 
         try:
-            # Attempt to determine frequency
-            # Calculate most common interval between timestamps
-            sorted_series = series.sort_index()
-
-            # Calculate intervals between consecutive timestamps
-            intervals = []
-            for i in range(1, len(sorted_series.index)):
-                # Convert to timestamps and calculate difference in seconds
-                try:
-                    t1 = pd.Timestamp(sorted_series.index[i - 1])
-                    t2 = pd.Timestamp(sorted_series.index[i])
-                    intervals.append((t2 - t1).total_seconds())
-                except Exception as e:
-                    logger.warning(f"Error calculating interval: {e}")
-                    continue
-
-            if intervals:
-                # Find the most common interval
-                from collections import Counter
-
-                interval_seconds = Counter(intervals).most_common(1)[0][0]
+            # Most common interval between consecutive timestamps, in seconds
+            sorted_index = index.sort_values()
+            intervals = (sorted_index[1:] - sorted_index[:-1]).total_seconds()
+            if len(intervals):
+                unique_intervals, counts = np.unique(intervals, return_counts=True)
+                interval_seconds = unique_intervals[np.argmax(counts)]
 
                 if (
                     abs(interval_seconds - 86400) < 60
@@ -483,55 +503,41 @@ def detect_gaps(
     )
 
     # Find missing dates
-    existing_dates = set(series.index)
-    missing_dates = [date for date in full_date_range if date not in existing_dates]
+    missing_dates = full_date_range[~full_date_range.isin(series.index)]
 
-    if not missing_dates:
+    if len(missing_dates) == 0:
         return []
 
-    # Group consecutive missing dates into gaps
+    # Group consecutive missing dates into gaps; allow for some flexibility
+    # (up to 2 days between missing dates stays in the same gap)
+    breaks = (
+        np.flatnonzero(
+            (missing_dates[1:] - missing_dates[:-1]) > pd.Timedelta(days=2)
+        )
+        + 1
+    )
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(missing_dates)]))
+
+    variable_name = _series_label(series)
     gaps = []
-    current_gap_start = missing_dates[0]
-    current_gap_dates = [current_gap_start]
-
-    for i in range(1, len(missing_dates)):
-        # Check if this date is consecutive with the previous one
-        if missing_dates[i] - missing_dates[i - 1] <= pd.Timedelta(
-            days=2
-        ):  # Allow for some flexibility
-            current_gap_dates.append(missing_dates[i])
-        else:
-            # End of a gap, start a new one
-            if len(current_gap_dates) >= min_gap_size:
-                gap = TimeSeriesGap(
-                    variable_name=(
-                        str(series.name) if series.name is not None else "unknown"
-                    ),
-                    start_time=current_gap_dates[0],
-                    end_time=current_gap_dates[-1],
-                    gap_duration=current_gap_dates[-1] - current_gap_dates[0],
-                    expected_points=len(current_gap_dates),
-                    severity=len(current_gap_dates) / len(full_date_range),
-                    context={"frequency": freq},
-                )
-                gaps.append(gap)
-
-            # Start a new gap
-            current_gap_start = missing_dates[i]
-            current_gap_dates = [current_gap_start]
-
-    # Don't forget the last gap
-    if len(current_gap_dates) >= min_gap_size:
-        gap = TimeSeriesGap(
-            variable_name=str(series.name) if series.name is not None else "unknown",
-            start_time=current_gap_dates[0],
-            end_time=current_gap_dates[-1],
-            gap_duration=current_gap_dates[-1] - current_gap_dates[0],
-            expected_points=len(current_gap_dates),
-            severity=len(current_gap_dates) / len(full_date_range),
-            context={"frequency": freq},
+    for start, end in zip(starts, ends):
+        size = int(end - start)
+        if size < min_gap_size:
+            continue
+        gap_start = missing_dates[start]
+        gap_end = missing_dates[end - 1]
+        gaps.append(
+            TimeSeriesGap(
+                variable_name=variable_name,
+                start_time=gap_start,
+                end_time=gap_end,
+                gap_duration=gap_end - gap_start,
+                expected_points=size,
+                severity=size / len(full_date_range),
+                context={"frequency": freq},
+            )
         )
-        gaps.append(gap)
 
     return gaps
 
@@ -546,6 +552,9 @@ def detect_anomalies(
     """
     Detect anomalies in time series data using the specified method.
 
+    Every check is computed as a vectorized mask over the values; Anomaly
+    objects are only built for the flagged points.
+
     Args:
         series: Time series data
         method: Method to use for anomaly detection (zscore, iqr, isolation_forest, lof, dbscan)
@@ -566,7 +575,17 @@ def detect_anomalies(
             method = AnomalyDetectionMethod.ZSCORE
 
     anomalies = []
-    series_values = series.values
+    variable_name = _series_label(series)
+    timestamps = series.index
+    values_array = np.asarray(series.values, dtype=float)
+    valid = ~np.isnan(values_array)
+
+    def as_datetime(timestamp):
+        return (
+            pd.Timestamp(timestamp).to_pydatetime()
+            if not isinstance(timestamp, dt.datetime)
+            else timestamp
+        )
 
     # Basic validation against expected ranges
     expected_range = DEFAULT_VARIABLE_RANGES.get(
@@ -574,40 +593,28 @@ def detect_anomalies(
     )
     range_min, range_max = expected_range
 
-    for idx, (timestamp, value) in enumerate(series.items()):
-        # Skip NaN values
-        if pd.isna(value):
-            continue
-
-        # Check if value is outside expected range
-        if value < range_min or value > range_max:
-            deviation = min(abs(value - range_min), abs(value - range_max))
-            severity = min(1.0, deviation / max(abs(range_min), abs(range_max)))
-
-            anomalies.append(
-                Anomaly(
-                    variable_name=(
-                        str(series.name) if series.name is not None else "unknown"
-                    ),
-                    timestamp=(
-                        pd.Timestamp(timestamp).to_pydatetime()
-                        if not isinstance(timestamp, dt.datetime)
-                        else timestamp
-                    ),
-                    value=value,
-                    expected_value=None,
-                    deviation=deviation,
-                    method="range_check",
-                    severity=severity,
-                    context={"range_min": range_min, "range_max": range_max},
-                )
+    out_of_range = valid & ((values_array < range_min) | (values_array > range_max))
+    for idx in np.flatnonzero(out_of_range):
+        value = values_array[idx]
+        deviation = min(abs(value - range_min), abs(value - range_max))
+        severity = min(1.0, deviation / max(abs(range_min), abs(range_max)))
+
+        anomalies.append(
+            Anomaly(
+                variable_name=variable_name,
+                timestamp=as_datetime(timestamps[idx]),
+                value=value,
+                expected_value=None,
+                deviation=deviation,
+                method="range_check",
+                severity=severity,
+                context={"range_min": range_min, "range_max": range_max},
             )
+        )
 
     # Apply the selected method for more sophisticated anomaly detection
     if method == AnomalyDetectionMethod.ZSCORE:
         # Z-score method (global)
-        # Convert to numpy array to ensure compatibility
-        values_array = np.asarray(series_values)
         mean_val = np.mean(values_array)
         std_val = np.std(values_array)
 
@@ -617,85 +624,66 @@ def detect_anomalies(
             )
             return anomalies
 
-        # Calculate z-scores using numpy operations
         z_scores = np.abs((values_array - mean_val) / std_val)
 
-        for idx, (timestamp, value) in enumerate(series.items()):
-            # Skip NaN values
-            if pd.isna(value):
-                continue
-
+        for idx in np.flatnonzero(valid & (z_scores > threshold)):
+            value = values_array[idx]
             z_score = z_scores[idx]
-            if z_score > threshold:
-                deviation = abs(value - mean_val)
-
-                anomalies.append(
-                    Anomaly(
-                        variable_name=(
-                            str(series.name) if series.name is not None else "unknown"
-                        ),
-                        timestamp=pd.Timestamp(timestamp).to_pydatetime(),
-                        value=value,
-                        expected_value=mean_val,
-                        deviation=deviation,
-                        method="zscore",
-                        severity=min(1.0, (z_score - threshold) / threshold),
-                        context={
-                            "z_score": z_score,
-                            "threshold": threshold,
-                            "global_mean": mean_val,
-                            "global_std": std_val,
-                        },
-                    )
+            anomalies.append(
+                Anomaly(
+                    variable_name=variable_name,
+                    timestamp=pd.Timestamp(timestamps[idx]).to_pydatetime(),
+                    value=value,
+                    expected_value=mean_val,
+                    deviation=abs(value - mean_val),
+                    method="zscore",
+                    severity=min(1.0, (z_score - threshold) / threshold),
+                    context={
+                        "z_score": z_score,
+                        "threshold": threshold,
+                        "global_mean": mean_val,
+                        "global_std": std_val,
+                    },
                 )
+            )
 
     elif method == AnomalyDetectionMethod.IQR:
         # Interquartile Range method
-        # Convert to numpy array for percentile calculation
-        values_array = np.asarray(series_values)
-        q1 = np.percentile(values_array, 25)
-        q3 = np.percentile(values_array, 75)
+        q1, q3 = np.percentile(values_array, [25, 75])
         iqr = q3 - q1
 
         lower_bound = q1 - threshold * iqr
         upper_bound = q3 + threshold * iqr
 
-        for idx, (timestamp, value) in enumerate(series.items()):
-            # Skip NaN values
-            if pd.isna(value):
-                continue
+        outside = valid & ((values_array < lower_bound) | (values_array > upper_bound))
+        for idx in np.flatnonzero(outside):
+            value = values_array[idx]
+            deviation = min(abs(value - lower_bound), abs(value - upper_bound))
 
-            if value < lower_bound or value > upper_bound:
-                deviation = min(abs(value - lower_bound), abs(value - upper_bound))
-
-                anomalies.append(
-                    Anomaly(
-                        variable_name=(
-                            str(series.name) if series.name is not None else "unknown"
-                        ),
-                        timestamp=pd.Timestamp(timestamp).to_pydatetime(),
-                        value=value,
-                        expected_value=(q1 + q3) / 2,  # Median as expected value
-                        deviation=deviation,
-                        method="iqr",
-                        severity=min(1.0, deviation / iqr),
-                        context={
-                            "q1": q1,
-                            "q3": q3,
-                            "iqr": iqr,
-                            "lower_bound": lower_bound,
-                            "upper_bound": upper_bound,
-                        },
-                    )
+            anomalies.append(
+                Anomaly(
+                    variable_name=variable_name,
+                    timestamp=pd.Timestamp(timestamps[idx]).to_pydatetime(),
+                    value=value,
+                    expected_value=(q1 + q3) / 2,  # Median as expected value
+                    deviation=deviation,
+                    method="iqr",
+                    severity=min(1.0, deviation / iqr),
+                    context={
+                        "q1": q1,
+                        "q3": q3,
+                        "iqr": iqr,
+                        "lower_bound": lower_bound,
+                        "upper_bound": upper_bound,
+                    },
                 )
+            )
 
     elif method == AnomalyDetectionMethod.ISOLATION_FOREST:
         try:
             from sklearn.ensemble import IsolationForest
 
-            # Prepare the data
-            # Convert to numpy array for reshape operation
-            X = np.asarray(series_values).reshape(-1, 1)
+            X = values_array.reshape(-1, 1)
 
             # Train isolation forest
             model = IsolationForest(contamination=0.05, random_state=42)
@@ -703,36 +691,22 @@ def detect_anomalies(
             anomaly_scores = model.decision_function(X)
 
             # Anomalies are marked as -1
-            for idx, (timestamp, value) in enumerate(series.items()):
-                # Skip NaN values
-                if pd.isna(value):
-                    continue
+            for idx in np.flatnonzero(valid & (predictions == -1)):
+                # Convert score to severity (scores close to -1 are more anomalous)
+                score = anomaly_scores[idx]
 
-                if predictions[idx] == -1:
-                    # Convert score to severity (scores close to -1 are more anomalous)
-                    score = anomaly_scores[idx]
-                    severity = min(1.0, abs(score))
-
-                    anomalies.append(
-                        Anomaly(
-                            variable_name=(
-                                str(series.name)
-                                if series.name is not None
-                                else "unknown"
-                            ),
-                            timestamp=(
-                                pd.Timestamp(timestamp).to_pydatetime()
-                                if not isinstance(timestamp, dt.datetime)
-                                else timestamp
-                            ),
-                            value=value,
-                            expected_value=None,
-                            deviation=0.0,  # Isolation Forest doesn't provide this
-                            method="isolation_forest",
-                            severity=severity,
-                            context={"anomaly_score": score},
-                        )
+                anomalies.append(
+                    Anomaly(
+                        variable_name=variable_name,
+                        timestamp=as_datetime(timestamps[idx]),
+                        value=values_array[idx],
+                        expected_value=None,
+                        deviation=0.0,  # Isolation Forest doesn't provide this
+                        method="isolation_forest",
+                        severity=min(1.0, abs(score)),
+                        context={"anomaly_score": score},
                     )
+                )
         except ImportError:
             logger.warning("scikit-learn not installed, falling back to Z-score method")
             return detect_anomalies(
@@ -750,52 +724,43 @@ def detect_anomalies(
 
     # Contextual anomalies (if window size provided)
     if window_size and len(series) > window_size:
-        rolling_mean = series.rolling(window=window_size, center=True).mean()
-        rolling_std = series.rolling(window=window_size, center=True).std()
-
-        for idx, (timestamp, value) in enumerate(series.items()):
-            # Skip NaN values or values without enough context
-            if (
-                pd.isna(value)
-                or pd.isna(rolling_mean[idx])
-                or pd.isna(rolling_std[idx])
-            ):
-                continue
-
-            # If standard deviation is zero, skip this point
-            if rolling_std[idx] == 0:
-                continue
-
-            # Calculate local z-score
-            local_z = abs((value - rolling_mean[idx]) / rolling_std[idx])
-
-            if local_z > threshold:
-                deviation = abs(value - rolling_mean[idx])
+        values_series = pd.Series(values_array)
+        rolling_mean = values_series.rolling(window=window_size, center=True).mean()
+        rolling_std = values_series.rolling(window=window_size, center=True).std()
+        rolling_mean = rolling_mean.to_numpy()
+        rolling_std = rolling_std.to_numpy()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local_z = np.abs((values_array - rolling_mean) / rolling_std)
+        # NaN values, points without enough context and zero local std are skipped
+        contextual = (
+            valid
+            & ~np.isnan(rolling_mean)
+            & ~np.isnan(rolling_std)
+            & (rolling_std != 0)
+            & (local_z > threshold)
+        )
 
-                anomalies.append(
-                    Anomaly(
-                        variable_name=(
-                            str(series.name) if series.name is not None else "unknown"
-                        ),
-                        timestamp=(
-                            pd.Timestamp(timestamp).to_pydatetime()
-                            if not isinstance(timestamp, dt.datetime)
-                            else timestamp
-                        ),
-                        value=value,
-                        expected_value=rolling_mean[idx],
-                        deviation=deviation,
-                        method="contextual_zscore",
-                        severity=min(1.0, (local_z - threshold) / threshold),
-                        context={
-                            "local_z_score": local_z,
-                            "threshold": threshold,
-                            "window_size": window_size,
-                            "local_mean": rolling_mean[idx],
-                            "local_std": rolling_std[idx],
-                        },
-                    )
+        for idx in np.flatnonzero(contextual):
+            value = values_array[idx]
+            anomalies.append(
+                Anomaly(
+                    variable_name=variable_name,
+                    timestamp=as_datetime(timestamps[idx]),
+                    value=value,
+                    expected_value=rolling_mean[idx],
+                    deviation=abs(value - rolling_mean[idx]),
+                    method="contextual_zscore",
+                    severity=min(1.0, (local_z[idx] - threshold) / threshold),
+                    context={
+                        "local_z_score": local_z[idx],
+                        "threshold": threshold,
+                        "window_size": window_size,
+                        "local_mean": rolling_mean[idx],
+                        "local_std": rolling_std[idx],
+                    },
                 )
+            )
 
     # Deduplicate anomalies (same timestamp)
     unique_anomalies = {}
@@ -828,26 +793,16 @@ def detect_trend_breaks(
 
     trend_breaks = []
 
-    # Calculate rolling trends (slopes)
-    x = np.arange(window_size)
-    slopes = []
-
-    for i in range(len(series) - window_size + 1):
-        window = series.iloc[i: i + window_size].values
-
-        # Skip if there are NaN values
-        # Convert to numpy array for np.isnan
-        window_array = np.asarray(window)
-        if np.isnan(window_array).any():
-            slopes.append(np.nan)
-            continue
-
-        # Linear regression to get slope
-        slope, _, _, _, _ = stats.linregress(x, window)
-        slopes.append(slope)
+    # Least-squares slope of every rolling window in one matrix product.
+    # Windows containing NaN get a NaN slope.
+    x = np.arange(window_size, dtype=float)
+    x_centered = x - x.mean()
+    windows = np.lib.stride_tricks.sliding_window_view(
+        np.asarray(series.values, dtype=float), window_size
+    )
+    slopes = windows @ x_centered / (x_centered @ x_centered)
 
-    # Convert to numpy array and calculate changes in slope
-    slopes = np.array(slopes)
+    # Calculate changes in slope
     slope_changes = np.abs(np.diff(slopes))
 
     # Find points where the slope changes significantly
@@ -863,6 +818,8 @@ def detect_trend_breaks(
     # Find peaks in z-scores (points where slope changes dramatically)
     peak_indices, _ = find_peaks(z_scores, height=threshold)
 
+    variable_name = _series_label(series)
+
     # Convert peak indices to TrendBreak objects
     for idx in peak_indices:
         # The actual break point is at the end of the first window
@@ -874,14 +831,8 @@ def detect_trend_breaks(
 
             trend_breaks.append(
                 TrendBreak(
-                    variable_name=(
-                        str(series.name) if series.name is not None else "unknown"
-                    ),
-                    timestamp=(
-                        pd.Timestamp(series.index[break_idx]).to_pydatetime()
-                        if break_idx < len(series.index)
-                        else dt.datetime.now()
-                    ),
+                    variable_name=variable_name,
+                    timestamp=pd.Timestamp(series.index[break_idx]).to_pydatetime(),
                     before_trend=float(before_trend),
                     after_trend=float(after_trend),
                     change_magnitude=float(change_magnitude),
@@ -903,6 +854,10 @@ def detect_seasonality(
     """
     Detect seasonal patterns in time series data.
 
+    The autocorrelation function is computed once with an FFT up to the
+    largest testable period, and partial autocorrelations are derived from it
+    with the Durbin-Levinson recursion.
+
     Args:
         series: Time series data
         periods: List of periods to check for seasonality (e.g., [7, 30, 365] for daily, monthly, yearly)
@@ -916,15 +871,11 @@ def detect_seasonality(
     # If no periods specified, try to determine from the data
     if periods is None:
         # Infer frequency
-        # Convert index to DatetimeIndex if necessary
-        if isinstance(series.index, pd.DatetimeIndex):
-            inferred_freq = pd.infer_freq(series.index)
-        else:
-            try:
-                dt_index = pd.DatetimeIndex(series.index)
-                inferred_freq = pd.infer_freq(dt_index)
-            except Exception:
-                inferred_freq = None
+        index = _as_datetime_index(series)
+        try:
+            inferred_freq = pd.infer_freq(index) if index is not None else None
+        except Exception:
+            inferred_freq = None
 
         if inferred_freq == "D":  # Daily data
             periods = [7, 30, 90, 365]  # Day of week, monthly, quarterly, yearly
@@ -939,54 +890,107 @@ def detect_seasonality(
     results = {"has_seasonality": False}
 
     # Handle special case where data is constant
-    # Convert to numpy array for np.std
-    values_array = np.asarray(series.values)
+    values_array = np.asarray(series.values, dtype=float)
     if np.std(values_array) == 0:
         return results
 
-    # Test each period for seasonality
-    for period in periods:
-        if len(series) < period * 2:
-            continue  # Not enough data for this period
+    # Only periods with at least two full cycles of data can be tested
+    testable = [period for period in periods if len(series) >= period * 2]
+    if not testable:
+        return results
 
-        # Calculate autocorrelation at the specified lag
-        acf = calculate_autocorrelation(series, period)
+    clean = values_array[~np.isnan(values_array)]
+    max_lag = max(testable)
+    acf = autocorrelation_function(clean, max_lag)
+    pacf = partial_autocorrelation_function(acf, max_lag)
 
-        # Calculate partial autocorrelation
-        pacf = calculate_partial_autocorrelation(series, period)
+    for period in testable:
+        period_acf = float(acf[period]) if period < len(clean) else 0.0
+        period_pacf = float(pacf[period]) if period < len(clean) else 0.0
 
-        # Determine if there's significant seasonality
         # A high positive ACF at the seasonal lag indicates seasonality
-        is_seasonal = acf > 0.3  # Arbitrary threshold
+        is_seasonal = period_acf > 0.3  # Arbitrary threshold
 
         # Create a nested dictionary for period results
         period_key = f"period_{period}"
         results[period_key] = {
-            "autocorrelation": acf,
-            "partial_autocorrelation": pacf,
+            "autocorrelation": period_acf,
+            "partial_autocorrelation": period_pacf,
             "is_seasonal": is_seasonal,
         }
 
         if is_seasonal:
             results["has_seasonality"] = True
-            # Update strongest_period based on autocorrelation strength
+            # Keep the period with the strongest autocorrelation
+            strongest = results.get("strongest_period")
             if (
-                "strongest_period" not in results
-                or not results.get("strongest_period")
-                or (
-                    period_key in results
-                    and "strongest_period" in results
-                    and acf
-                    > results[f"period_{results['strongest_period']}"][
-                        "autocorrelation"
-                    ]
-                )
+                not strongest
+                or period_acf > results[f"period_{strongest}"]["autocorrelation"]
             ):
                 results["strongest_period"] = period
 
     return results
 
 
+def autocorrelation_function(values: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Autocorrelation for lags 0..max_lag in one FFT.
+
+    Uses the same normalisation as calculate_autocorrelation: the lag-k sum
+    of centred products divided by (n - k) * variance. Lags >= n are 0.
+
+    Args:
+        values: 1-D array without NaN values
+        max_lag: Largest lag to return
+
+    Returns:
+        Array of length max_lag + 1
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    acf = np.zeros(max_lag + 1)
+    var = np.var(values) if n else 0.0
+    if n == 0 or var == 0:
+        return acf
+
+    centered = values - values.mean()
+    nfft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centered, nfft)
+    sums = np.fft.irfft(spectrum * np.conj(spectrum), nfft)
+
+    lags = min(max_lag, n - 1)
+    acf[: lags + 1] = sums[: lags + 1] / ((n - np.arange(lags + 1)) * var)
+    return acf
+
+
+def partial_autocorrelation_function(acf: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Partial autocorrelation for lags 0..max_lag from an autocorrelation array
+    (Durbin-Levinson recursion).
+
+    Args:
+        acf: Autocorrelations for lags 0..max_lag
+        max_lag: Largest lag to return
+
+    Returns:
+        Array of length max_lag + 1 (index 0 is 1.0)
+    """
+    pacf = np.zeros(max_lag + 1)
+    pacf[0] = 1.0
+    if max_lag < 1:
+        return pacf
+
+    phi = np.zeros(max_lag + 1)
+    phi[1] = pacf[1] = acf[1]
+    for k in range(2, max_lag + 1):
+        previous = phi[1:k]
+        den = 1.0 - previous @ acf[1:k]
+        phi_kk = (acf[k] - previous @ acf[k - 1 : 0 : -1]) / den if den != 0 else 0.0
+        phi[1:k] = previous - phi_kk * previous[::-1]
+        phi[k] = pacf[k] = phi_kk
+    return pacf
+
+
 def calculate_autocorrelation(series: pd.Series, lag: int) -> float:
     """
     Calculate autocorrelation at a specific lag.
@@ -998,32 +1002,20 @@ def calculate_autocorrelation(series: pd.Series, lag: int) -> float:
     Returns:
         Autocorrelation value
     """
-    # Remove NaN values
-    clean_series = series.dropna()
+    data = np.asarray(series.dropna().values, dtype=float)
+    n = len(data)
 
-    if len(clean_series) <= lag:
+    if n <= lag:
         return 0.0
 
-    # Calculate autocorrelation
-    n = len(clean_series)
-    data = clean_series.values
-
-    # Convert data to float
-    data = data.astype(float)
-
     # Calculate mean and variance
-    mean = np.mean(data)
     var = np.var(data)
 
     if var == 0:
         return 0.0
 
-    # Calculate autocorrelation
-    acf = 0
-    for i in range(n - lag):
-        acf += (data[i] - mean) * (data[i + lag] - mean)
-
-    acf /= (n - lag) * var
+    centered = data - np.mean(data)
+    acf = centered[: n - lag] @ centered[lag:] / ((n - lag) * var)
 
     return float(acf)
 
@@ -1039,14 +1031,14 @@ def calculate_partial_autocorrelation(series: pd.Series, lag: int) -> float:
     Returns:
         Partial autocorrelation value
     """
-    try:
-        from statsmodels.tsa.stattools import pacf
+    # Remove NaN values
+    clean_series = series.dropna()
 
-        # Remove NaN values
-        clean_series = series.dropna()
+    if len(clean_series) <= lag:
+        return 0.0
 
-        if len(clean_series) <= lag:
-            return 0.0
+    try:
+        from statsmodels.tsa.stattools import pacf
 
         # Calculate partial autocorrelation
         pacf_values = pacf(clean_series.values, nlags=lag, method="ols")
@@ -1056,43 +1048,9 @@ def calculate_partial_autocorrelation(series: pd.Series, lag: int) -> float:
     except ImportError:
         logger.warning("statsmodels not installed, using simplified PACF calculation")
 
-        # Simplified PACF calculation through correlation adjustments
-        if lag <= 1:
-            return calculate_autocorrelation(series, lag)
-
-        # For lag > 1, use recursive calculation (Durbin-Levinson)
-        clean_series = series.dropna()
-
-        if len(clean_series) <= lag:
-            return 0.0
-
-        # Base case
-        phi = np.zeros(lag + 1)
-        phi[1] = calculate_autocorrelation(clean_series, 1)
-
-        # Recursion
-        for k in range(2, lag + 1):
-            # Calculate ACF at lag k
-            r_k = calculate_autocorrelation(clean_series, k)
-
-            # Calculate the numerator
-            num = r_k
-            for j in range(1, k):
-                num -= phi[j] * calculate_autocorrelation(clean_series, k - j)
-
-            # Calculate the denominator
-            den = 1
-            for j in range(1, k):
-                den -= phi[j] * calculate_autocorrelation(clean_series, j)
-
-            # Calculate new phi
-            phi[k] = num / den if den != 0 else 0
-
-            # Update previous phi values
-            for j in range(1, k):
-                phi[j] = phi[j] - phi[k] * phi[k - j]
-
-        return phi[lag]
+        # Durbin-Levinson recursion over the FFT autocorrelation function
+        acf = autocorrelation_function(clean_series.values, lag)
+        return float(partial_autocorrelation_function(acf, lag)[lag])
 
 
 def perform_quality_check(
@@ -1127,6 +1085,9 @@ def perform_quality_check(
         else:
             series = load_processed_data(variable_name)
 
+        # Sort and convert once; every check below works on the prepared series
+        series = prepare_series(series)
+
         # Initialize quality score
         quality_score = DataQualityScore(variable_name=variable_name)
 
@@ -1251,18 +1212,9 @@ def perform_quality_check(
         # Based on the regularity of the time intervals
 
         if len(series) > 1:
-            # Calculate intervals between timestamps
-            intervals = series.index[1:] - series.index[:-1]
-            # Convert interval index to appropriate type for calculating seconds
-            interval_seconds = np.array(
-                [
-                    (
-                        interval.total_seconds()
-                        if hasattr(interval, "total_seconds")
-                        else pd.Timedelta(interval).total_seconds()
-                    )
-                    for interval in intervals
-                ]
+            # Calculate intervals between timestamps, in seconds
+            interval_seconds = np.asarray(
+                (series.index[1:] - series.index[:-1]).total_seconds()
             )
 
             # Check if intervals are consistent
@@ -1690,8 +1642,76 @@ def analyze_gaps(
         }
 
 
+def _worker_context():
+    """
+    Multiprocessing context for quality check workers.
+
+    fork is avoided because the parent may be running threads; forkserver
+    children come from a server that has already imported this module, and
+    spawn is the fallback where forkserver is unavailable.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["ingestion.utils.historical_data_verification"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def _quality_check_worker(args) -> QualityCheckResult:
+    variable_name, kwargs = args
+    return perform_quality_check(variable_name, **kwargs)
+
+
+def perform_quality_checks(
+    variable_names: List[str], max_workers: Optional[int] = None, **kwargs
+) -> Dict[str, QualityCheckResult]:
+    """
+    Perform quality checks for several variables in parallel.
+
+    Each variable is loaded and checked in its own worker process, so
+    independent variables no longer wait on each other.
+
+    Args:
+        variable_names: Names of the variables to check
+        max_workers: Number of worker processes (None uses the CPU count,
+            1 runs the checks in this process)
+        **kwargs: Passed through to perform_quality_check
+
+    Returns:
+        Dictionary mapping variable names to QualityCheckResult objects,
+        in the order of variable_names. In parallel runs a variable whose
+        check fails is logged and left out, without losing the others.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(variable_names)))
+
+    if max_workers == 1:
+        return {
+            name: perform_quality_check(name, **kwargs) for name in variable_names
+        }
+
+    completed: Dict[str, QualityCheckResult] = {}
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=_worker_context()
+    ) as executor:
+        futures = {
+            executor.submit(_quality_check_worker, (name, kwargs)): name
+            for name in variable_names
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                completed[name] = future.result()
+            except Exception as e:
+                logger.error(f"Quality check failed for {name}: {e}")
+    return {name: completed[name] for name in variable_names if name in completed}
+
+
 def generate_quality_report(
-    variable_names: Optional[List[str]] = None, priority: Optional[int] = None
+    variable_names: Optional[List[str]] = None,
+    priority: Optional[int] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Generate a comprehensive quality report for multiple variables.
@@ -1699,6 +1719,8 @@ def generate_quality_report(
     Args:
         variable_names: List of variable names to include in the report
         priority: Priority level to filter variables by
+        max_workers: Number of worker processes for the quality checks
+            (None uses the CPU count, 1 runs them sequentially)
 
     Returns:
         Dictionary with the quality report
@@ -1723,11 +1745,21 @@ def generate_quality_report(
     variables_with_anomalies = 0
     variables_with_trend_breaks = 0
 
-    # Perform quality check for each variable
+    # Perform the quality checks for all variables in parallel
+    logger.info(f"Generating quality report for {len(variable_names)} variables")
+    try:
+        check_results = perform_quality_checks(variable_names, max_workers=max_workers)
+    except Exception as e:
+        logger.error(f"Parallel quality checks failed, running sequentially: {e}")
+        check_results = perform_quality_checks(variable_names, max_workers=1)
+
     for var_name in variable_names:
         try:
-            logger.info(f"Generating quality report for {var_name}")
-            result = perform_quality_check(var_name)
+            result = check_results.get(var_name)
+            if result is None:
+                # Its parallel check failed; rerun it here so the entry
+                # carries either a result or the actual error
+                result = perform_quality_check(var_name)
 
             results.append(result.to_dict())
 
@@ -14,25 +14,32 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import os
-import sys
-import yfinance as yf
-from fredapi import Fred
 
 from engine.variable_registry import registry
+from utils.lazy_import import lazy_import
+
+yf = lazy_import("yfinance", "pip install yfinance")
+fredapi = lazy_import("fredapi", "pip install fredapi")
 
-print(f"[DEBUG] Python executable: {sys.executable}")
-print(f"[DEBUG] sys.path: {sys.path}")
 # Register YOUR FRED_KEY as env var; skip if not present.
-_FRED = Fred(api_key=os.getenv("FRED_KEY", "")) if "FRED_KEY" in os.environ else None
+_FRED = None
 _NOW = datetime.now(timezone.utc)
 _30D_AGO = _NOW - timedelta(days=30)
 
 
+def _fred_client():
+    global _FRED
+    if _FRED is None and "FRED_KEY" in os.environ:
+        _FRED = fredapi.Fred(api_key=os.getenv("FRED_KEY", ""))
+    return _FRED
+
+
 def _fred_series(series_id: str) -> float | None:
-    if _FRED is None:
-        return None
     try:
-        data = _FRED.get_series(series_id)
+        fred = _fred_client()
+        if fred is None:
+            return None
+        data = fred.get_series(series_id)
         return float(data.dropna().iloc[-1])
     except Exception:  # noqa: BLE001
         return None
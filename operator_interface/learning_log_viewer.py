@@ -12,7 +12,7 @@ import os
 from typing import List, Dict, Optional, Any
 from collections import defaultdict
 from engine.path_registry import PATHS
-from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+from analytics.trust_service import trust_service
 
 LOG_PATH = PATHS.get("LEARNING_LOG", "logs/pulse_learning_log.jsonl")
 
@@ -115,8 +115,8 @@ def render_event_digest(events: List[Dict[str, Any]]) -> None:
 
 
 def display_variable_trust(variable_id):
-    trust = bayesian_trust_tracker.get_trust(variable_id)
-    conf_int = bayesian_trust_tracker.get_confidence_interval(variable_id)
+    trust = trust_service.get_trust(variable_id)
+    conf_int = trust_service.get_confidence_interval(variable_id)
     print(
         f"Variable {variable_id}: Trust={
             trust:.3f}, 95% CI=({
@@ -125,8 +125,8 @@ def display_variable_trust(variable_id):
 
 
 def display_rule_trust(rule_id):
-    trust = bayesian_trust_tracker.get_trust(rule_id)
-    conf_int = bayesian_trust_tracker.get_confidence_interval(rule_id)
+    trust = trust_service.get_trust(rule_id)
+    conf_int = trust_service.get_confidence_interval(rule_id)
     print(
         f"Rule {rule_id}: Trust={
             trust:.3f}, 95% CI=({
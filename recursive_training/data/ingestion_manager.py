@@ -33,7 +33,7 @@ except ImportError:
     pass  # PULSE_CONFIG_AVAILABLE remains False
 
 try:
-    from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+    from analytics.trust_service import trust_service
 
     BAYESIAN_TRUST_AVAILABLE = True
 except ImportError:
@@ -591,9 +591,9 @@ class RecursiveDataIngestionManager:
                     for rule_id, rule in active_rules.items():
                         trust_score = 0.5  # Default value
                         if BAYESIAN_TRUST_AVAILABLE and callable(
-                            getattr(bayesian_trust_tracker, "get_trust", None)
+                            getattr(trust_service, "get_trust", None)
                         ):
-                            trust_score = bayesian_trust_tracker.get_trust(rule_id)
+                            trust_score = trust_service.get_trust(rule_id)
 
                         rule_data.append(
                             {
@@ -618,9 +618,9 @@ class RecursiveDataIngestionManager:
                     for rule_id, rule in symbolic_rules.items():
                         trust_score = 0.5  # Default value
                         if BAYESIAN_TRUST_AVAILABLE and callable(
-                            getattr(bayesian_trust_tracker, "get_trust", None)
+                            getattr(trust_service, "get_trust", None)
                         ):
-                            trust_score = bayesian_trust_tracker.get_trust(rule_id)
+                            trust_score = trust_service.get_trust(rule_id)
 
                         rule_data.append(
                             {
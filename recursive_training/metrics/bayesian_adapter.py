@@ -14,15 +14,15 @@ from typing import Any, Dict, List, Optional
 from typing import TypeVar, cast
 from recursive_training.metrics.metrics_store import get_metrics_store
 
-# Try to import Pulse's Bayesian trust tracker with graceful fallback
+# Try to import Pulse's shared trust service with graceful fallback
 try:
-    from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+    from analytics.trust_service import trust_service
 
     TRUST_TRACKER_AVAILABLE = True
 except ImportError:
     TRUST_TRACKER_AVAILABLE = False
     # Define a placeholder for type checking
-    bayesian_trust_tracker = None
+    trust_service = None
 
 # Define a generic trust tracker type for type hints
 TrustTrackerType = TypeVar("TrustTrackerType")
@@ -71,8 +71,8 @@ class BayesianAdapter:
             )
             self.trust_tracker: Any = FallbackTrustTracker()
         else:
-            # Initialize with the imported trust tracker
-            self.trust_tracker: Any = cast(Any, bayesian_trust_tracker)
+            # Share the process-wide trust service with the simulator and rules
+            self.trust_tracker: Any = cast(Any, trust_service)
 
         # Configure trust calculation settings
         self.error_weight = self.config.get("error_weight", 0.7)
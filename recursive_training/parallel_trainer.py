@@ -6,7 +6,7 @@ retrodiction training workloads across multiple CPU cores for improved performan
 """
 
 from analytics.trust_update_buffer import get_trust_update_buffer, TrustUpdateBuffer
-from analytics.optimized_trust_tracker import optimized_bayesian_trust_tracker
+from analytics.trust_service import TrustService, trust_service
 from recursive_training.metrics.async_metrics_collector import (
     get_async_metrics_collector,
     AsyncMetricsCollector,
@@ -193,7 +193,14 @@ def _dask_process_batch_task(
     current_async_metrics = get_async_metrics_collector(
         config=async_metrics_reinit_config
     )
-    current_trust_buffer = get_trust_update_buffer(config=trust_buffer_reinit_config)
+    # Trust learned in this task is recorded in a task-local service and
+    # returned as additive deltas, so the coordinator can merge them without
+    # losing or overwriting updates from other workers.
+    trust_buffer_config = trust_buffer_reinit_config or {}
+    current_trust_service = TrustService(
+        buffer_threshold=trust_buffer_config.get("trust_flush_threshold", 256),
+        track_deltas=True,
+    )
 
     loaded_data: Dict[str, list] = {}
     start_str = batch.start_time.isoformat()
@@ -287,7 +294,7 @@ def _dask_process_batch_task(
             "updates": 100,
         }
 
-    current_trust_buffer.add_updates_batch(trust_updates_list_task)
+    current_trust_service.buffer_updates(trust_updates_list_task)
 
     total_dp_retro_task = sum(
         len(var_data_item_task) for var_data_item_task in data_for_batch_task.values()
@@ -326,6 +333,7 @@ def _dask_process_batch_task(
         "metrics": results_retro_task.get("metrics", {}),
         "rules_generated": results_retro_task.get("rules_generated", []),
         "trust_updates": results_retro_task.get("trust_updates", {}),
+        "trust_deltas": current_trust_service.export_deltas(),
     }
     worker_logger.info(
         f"Dask Worker: Finished processing batch {batch.batch_id} in {pt_val_task:.2f}s"
@@ -336,8 +344,6 @@ def _dask_process_batch_task(
         current_data_store.close()
     if hasattr(current_async_metrics, "shutdown"):
         current_async_metrics.shutdown()
-    if hasattr(current_trust_buffer, "flush_all"):
-        current_trust_buffer.flush_all()  # Or similar cleanup
 
     return batch.batch_id, final_results_task
 
@@ -647,6 +653,9 @@ class ParallelTrainingCoordinator:
                 batch_item_comp.processed = True
                 batch_item_comp.processing_time = data_comp.get("processing_time", 0.0)
                 batch_item_comp.results = data_comp
+                trust_deltas = data_comp.get("trust_deltas")
+                if trust_deltas:
+                    trust_service.merge_deltas(trust_deltas)
                 self.logger.info(
                     f"Batch {batch_id_comp} completed. Processing time: {
                         data_comp.get(
@@ -748,9 +757,7 @@ class ParallelTrainingCoordinator:
         ts_map_sum = {}
         if all_v_sum:
             try:
-                ts_map_sum = optimized_bayesian_trust_tracker.get_trust_batch(
-                    list(all_v_sum)
-                )
+                ts_map_sum = trust_service.get_trust_batch(list(all_v_sum))
             except Exception as e_ts:
                 self.logger.error(f"Error getting trust scores: {e_ts}")
         dur_sum = (
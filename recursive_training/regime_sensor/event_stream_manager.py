@@ -4,9 +4,11 @@ Handles the ingestion of external events such as news headlines, corporate annou
 and other time-series data that can indicate regime shifts.
 """
 
+import itertools
 import json
 import logging
 import os
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable, Union
@@ -154,6 +156,11 @@ class EventStreamManager:
     """
     Manages multiple event streams, handles event ingestion, filtering, and distribution.
     Supports both real-time and batch processing of events.
+
+    The processor thread drains up to ``batch_size`` events per wakeup and
+    dispatches them to per-event and batch handlers. Stored events are appended
+    as JSON lines to rolling segment files, and ``event_history`` is an LRU
+    capped at ``history_limit`` entries.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -164,20 +171,42 @@ class EventStreamManager:
             config: Configuration parameters for the manager
         """
         self.config = config or {}
-        self.event_queue = queue.PriorityQueue()  # Priority queue for events
-        self.event_handlers = {}  # Map event types to handlers
+        self.max_queue_size = self.config.get("max_queue_size", 10000)
+        # Priority queue of (-priority, sequence, enqueue_time, event)
+        self.event_queue = queue.PriorityQueue(maxsize=self.max_queue_size)
+        self.event_handlers = {}  # Map event types to per-event handlers
+        self.batch_handlers = {}  # Map event types to batch handlers
         self.filters = {}  # Filters to apply to incoming events
         self.sources = {}  # Configured event sources
-        self.event_history = {}  # History of processed events
+        self.event_history: "OrderedDict[str, Event]" = OrderedDict()
+        self._history_lock = threading.Lock()
         self.running = False
         self.processing_thread = None
-        self.max_queue_size = self.config.get("max_queue_size", 10000)
         self.stop_event = threading.Event()
         self.lock = threading.Lock()
+        self._sequence = itertools.count()
+
+        # Batching config
+        self.batch_size = self.config.get("batch_size", 100)
+        self.poll_timeout = self.config.get("poll_timeout", 0.1)
+        # Seconds to block when the queue is full before dropping (0 = drop)
+        self.enqueue_timeout = self.config.get("enqueue_timeout", 0.0)
+        self.history_limit = self.config.get("history_limit", 10000)
 
         # Event storage config
         self.storage_enabled = self.config.get("storage_enabled", True)
         self.storage_path = self.config.get("storage_path", "data/event_streams")
+        self.segment_max_events = self.config.get("segment_max_events", 10000)
+        self._segment_lock = threading.Lock()
+        self._segment_file = None
+        self._segment_path: Optional[str] = None
+        self._segment_count = 0
+        self._segment_index = 0
+
+        # Throughput/latency counters
+        self._metrics_lock = threading.Lock()
+        self.metrics: Dict[str, float] = {}
+        self.reset_metrics()
 
         # Initialize storage directory if enabled
         if self.storage_enabled:
@@ -201,6 +230,23 @@ class EventStreamManager:
             self.event_handlers[event_type].append(handler)
             logger.debug(f"Registered handler for {event_type.value}")
 
+    def register_batch_handler(
+        self, event_type: EventType, handler: Callable[[List[Event]], None]
+    ):
+        """
+        Register a handler that receives all events of a type from one drained
+        batch in a single call.
+
+        Args:
+            event_type: Type of event to handle (CUSTOM receives every event)
+            handler: Function to call with the list of events
+        """
+        with self.lock:
+            if event_type not in self.batch_handlers:
+                self.batch_handlers[event_type] = []
+            self.batch_handlers[event_type].append(handler)
+            logger.debug(f"Registered batch handler for {event_type.value}")
+
     def add_filter(self, filter_name: str, filter_func: Callable[[Event], bool]):
         """
         Add a filter function to apply to incoming events.
@@ -237,6 +283,27 @@ class EventStreamManager:
             self.sources[source_name] = source_config
             logger.info(f"Configured event source: {source_name}")
 
+    def _passes_filters(self, event: Event) -> bool:
+        return all(filter_func(event) for filter_func in self.filters.values())
+
+    def _enqueue(self, event: Event) -> bool:
+        """Put an event on the priority queue, returning False if it was dropped."""
+        # Negative priority so higher priority events are processed first; the
+        # sequence number keeps FIFO order within a priority and avoids
+        # comparing Event objects on ties.
+        item = (-event.priority.value, next(self._sequence), time.time(), event)
+        try:
+            if self.enqueue_timeout > 0:
+                self.event_queue.put(item, timeout=self.enqueue_timeout)
+            else:
+                self.event_queue.put_nowait(item)
+        except queue.Full:
+            logger.warning(f"Event queue full, dropping event: {event}")
+            self._count("events_dropped")
+            return False
+        self._count("events_ingested")
+        return True
+
     def ingest_event(self, event: Event):
         """
         Ingest a single event into the processing queue.
@@ -244,64 +311,112 @@ class EventStreamManager:
         Args:
             event: Event to ingest
         """
-        # Apply filters to determine if event should be processed
-        should_process = all(
-            filter_func(event) for filter_func in self.filters.values()
-        )
-
-        if should_process:
-            # Add to priority queue with priority as the first element of the tuple
-            try:
-                if self.event_queue.qsize() < self.max_queue_size:
-                    # Use negative priority value to make higher priority events
-                    # processed first
-                    self.event_queue.put((-event.priority.value, time.time(), event))
-                    logger.debug(f"Ingested event: {event}")
-
-                    # Store event if storage is enabled
-                    if self.storage_enabled:
-                        self._store_event(event)
-                else:
-                    logger.warning(f"Event queue full, dropping event: {event}")
-            except Exception as e:
-                logger.error(f"Error ingesting event: {e}")
+        try:
+            if self._passes_filters(event) and self._enqueue(event):
+                logger.debug(f"Ingested event: {event}")
+                if self.storage_enabled:
+                    self._store_events([event])
+        except Exception as e:
+            logger.error(f"Error ingesting event: {e}")
 
     def ingest_events_batch(self, events: List[Event]):
         """
-        Ingest a batch of events.
+        Ingest a batch of events. Accepted events are stored with a single
+        segment append.
 
         Args:
             events: List of events to ingest
         """
+        accepted = []
         for event in events:
-            self.ingest_event(event)
+            try:
+                if self._passes_filters(event) and self._enqueue(event):
+                    accepted.append(event)
+            except Exception as e:
+                logger.error(f"Error ingesting event: {e}")
+
+        if accepted and self.storage_enabled:
+            self._store_events(accepted)
+
+        logger.info(f"Ingested batch of {len(accepted)}/{len(events)} events")
 
-        logger.info(f"Ingested batch of {len(events)} events")
+    def _open_segment(self):
+        """Open a new segment file. Caller must hold _segment_lock."""
+        if self._segment_file:
+            self._segment_file.close()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self._segment_index += 1
+        name = f"events-{stamp}-{self._segment_index:05d}.jsonl"
+        self._segment_path = os.path.join(self.storage_path, name)
+        self._segment_file = open(self._segment_path, "a", encoding="utf-8")
+        self._segment_count = 0
 
-    def _store_event(self, event: Event):
+    def _store_events(self, events: List[Event]):
         """
-        Store an event to disk.
+        Append events as JSON lines to the current segment file, rolling to a
+        new segment once ``segment_max_events`` is reached.
 
         Args:
-            event: Event to store
+            events: Events to store
         """
         try:
-            # Create date-based directory structure
-            date_str = event.timestamp.strftime("%Y-%m-%d")
-            event_type_str = event.event_type.value
-            source_str = event.source.replace("/", "_")
+            with self._segment_lock:
+                for event in events:
+                    if (
+                        self._segment_file is None
+                        or self._segment_count >= self.segment_max_events
+                    ):
+                        self._open_segment()
+                    self._segment_file.write(
+                        json.dumps(event.to_dict(), separators=(",", ":")) + "\n"
+                    )
+                    self._segment_count += 1
+                self._segment_file.flush()
+        except Exception as e:
+            logger.error(f"Error storing events: {e}")
 
-            directory = os.path.join(
-                self.storage_path, date_str, event_type_str, source_str
-            )
-            os.makedirs(directory, exist_ok=True)
+    def close_segment(self):
+        """Flush and close the current segment file."""
+        with self._segment_lock:
+            if self._segment_file:
+                self._segment_file.close()
+                self._segment_file = None
 
-            # Store event as JSON file
-            file_path = os.path.join(directory, f"{event.event_id}.json")
-            with open(file_path, "w") as f:
-                json.dump(event.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.error(f"Error storing event: {e}")
+    def load_stored_events(self) -> List[Event]:
+        """
+        Read back every event stored in the segment files, oldest first.
+
+        Returns:
+            List of stored events
+        """
+        with self._segment_lock:
+            if self._segment_file:
+                self._segment_file.flush()
+            if not os.path.isdir(self.storage_path):
+                return []
+            segments = sorted(
+                name
+                for name in os.listdir(self.storage_path)
+                if name.startswith("events-") and name.endswith(".jsonl")
+            )
+            events = []
+            for name in segments:
+                with open(
+                    os.path.join(self.storage_path, name), "r", encoding="utf-8"
+                ) as f:
+                    events.extend(
+                        Event.from_dict(json.loads(line)) for line in f if line.strip()
+                    )
+        return events
+
+    def _remember(self, event: Event):
+        """Add an event to the LRU history, evicting the oldest if full."""
+        with self._history_lock:
+            self.event_history[event.event_id] = event
+            self.event_history.move_to_end(event.event_id)
+            while len(self.event_history) > self.history_limit:
+                self.event_history.popitem(last=False)
+                self._count("history_evictions")
 
     def _process_event(self, event: Event):
         """
@@ -310,54 +425,186 @@ class EventStreamManager:
         Args:
             event: Event to process
         """
-        try:
-            # Get handlers for this event type
-            handlers = self.event_handlers.get(event.event_type, [])
+        self._process_batch([event])
 
-            # Also process with general handlers (EventType.CUSTOM)
-            general_handlers = self.event_handlers.get(EventType.CUSTOM, [])
-            all_handlers = handlers + general_handlers
+    def _process_batch(self, events: List[Event]):
+        """
+        Dispatch a drained batch: per-event handlers run in priority order,
+        then each batch handler is called once with its events.
 
-            if all_handlers:
-                for handler in all_handlers:
-                    handler(event)
+        Args:
+            events: Events to process
+        """
+        grouped = defaultdict(list)
+        for event in events:
+            grouped[event.event_type].append(event)
+
+        # General batch handlers (EventType.CUSTOM) see the whole batch once
+        general_batch_handlers = self.batch_handlers.get(EventType.CUSTOM, [])
+
+        for event_type, typed_events in grouped.items():
+            handlers = self.event_handlers.get(event_type, [])
+            batch_handlers = []
+            if event_type != EventType.CUSTOM:
+                # Also process with general handlers (EventType.CUSTOM)
+                handlers = handlers + self.event_handlers.get(EventType.CUSTOM, [])
+                batch_handlers = self.batch_handlers.get(event_type, [])
+
+            all_handlers = handlers + batch_handlers + general_batch_handlers
+            if not all_handlers:
+                logger.warning(f"No handlers for event type: {event_type}")
+                continue
+
+            for event in typed_events:
+                for handler in handlers:
+                    try:
+                        handler(event)
+                    except Exception as e:
+                        self._count("handler_errors")
+                        logger.error(f"Error processing event {event}: {e}")
+
+            for handler in batch_handlers:
+                try:
+                    handler(typed_events)
+                except Exception as e:
+                    self._count("handler_errors")
+                    logger.error(f"Error in batch handler for {event_type}: {e}")
 
-                # Record processing in event history
-                processing_record = {
-                    "timestamp": datetime.now().isoformat(),
-                    "handlers": [handler.__name__ for handler in all_handlers],
-                }
-                event.processing_history.append(processing_record)
-                event.processed = True
+            names = [getattr(h, "__name__", repr(h)) for h in all_handlers]
+            for event in typed_events:
+                self._mark_processed(event, names)
 
-                # Store in event history
-                self.event_history[event.event_id] = event
+        for handler in general_batch_handlers:
+            try:
+                handler(events)
+            except Exception as e:
+                self._count("handler_errors")
+                logger.error(f"Error in general batch handler: {e}")
 
-                logger.debug(f"Processed event: {event}")
-            else:
-                logger.warning(f"No handlers for event type: {event.event_type}")
-        except Exception as e:
-            logger.error(f"Error processing event: {e}")
+    def _mark_processed(self, event: Event, handler_names: List[str]):
+        event.processing_history.append(
+            {"timestamp": datetime.now().isoformat(), "handlers": handler_names}
+        )
+        event.processed = True
+        self._remember(event)
+        logger.debug(f"Processed event: {event}")
+
+    def _drain_batch(self) -> List[tuple]:
+        """
+        Block for the first queued item (up to poll_timeout), then take up to
+        batch_size - 1 more without waiting.
+        """
+        try:
+            items = [self.event_queue.get(timeout=self.poll_timeout)]
+        except queue.Empty:
+            return []
+        while len(items) < self.batch_size:
+            try:
+                items.append(self.event_queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def process_pending(self) -> int:
+        """
+        Synchronously process everything currently queued, in batches.
+        Useful for tests and for flushing before shutdown.
+
+        Returns:
+            Number of events processed
+        """
+        total = 0
+        while True:
+            items = []
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.event_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not items:
+                return total
+            self._run_batch(items)
+            total += len(items)
+
+    def _run_batch(self, items: List[tuple]):
+        started = time.time()
+        try:
+            self._process_batch([item[3] for item in items])
+        finally:
+            finished = time.time()
+            with self._metrics_lock:
+                self.metrics["batches_processed"] += 1
+                self.metrics["events_processed"] += len(items)
+                self.metrics["max_batch_size"] = max(
+                    self.metrics["max_batch_size"], len(items)
+                )
+                self.metrics["processing_seconds"] += finished - started
+                for item in items:
+                    latency = finished - item[2]
+                    self.metrics["total_latency_seconds"] += latency
+                    self.metrics["max_latency_seconds"] = max(
+                        self.metrics["max_latency_seconds"], latency
+                    )
+            for _ in items:
+                self.event_queue.task_done()
 
     def _event_processor_loop(self):
-        """Background thread for processing events from the queue."""
+        """Background thread for processing events from the queue in batches."""
         logger.info("Event processor thread started")
 
         while not self.stop_event.is_set():
             try:
-                # Get an event from the queue with timeout to allow checking stop_event
-                try:
-                    _, _, event = self.event_queue.get(timeout=0.1)
-                    self._process_event(event)
-                    self.event_queue.task_done()
-                except queue.Empty:
-                    continue  # No events in queue, try again
+                items = self._drain_batch()
+                if items:
+                    self._run_batch(items)
             except Exception as e:
                 logger.error(f"Error in event processor loop: {e}")
                 time.sleep(1)  # Avoid tight loop in case of recurring errors
 
         logger.info("Event processor thread stopped")
 
+    def _count(self, name: str, amount: float = 1):
+        with self._metrics_lock:
+            self.metrics[name] += amount
+
+    def reset_metrics(self):
+        """Reset throughput/latency counters."""
+        with self._metrics_lock:
+            self.metrics = {
+                "events_ingested": 0,
+                "events_dropped": 0,
+                "events_processed": 0,
+                "batches_processed": 0,
+                "handler_errors": 0,
+                "history_evictions": 0,
+                "max_batch_size": 0,
+                "processing_seconds": 0.0,
+                "total_latency_seconds": 0.0,
+                "max_latency_seconds": 0.0,
+            }
+            self._metrics_started = time.time()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get throughput and latency counters for the pipeline.
+
+        Returns:
+            Dictionary of counters plus derived averages and rates
+        """
+        with self._metrics_lock:
+            metrics: Dict[str, Any] = dict(self.metrics)
+            elapsed = max(time.time() - self._metrics_started, 1e-9)
+        processed = metrics["events_processed"]
+        batches = metrics["batches_processed"]
+        metrics["queue_size"] = self.event_queue.qsize()
+        metrics["history_size"] = len(self.event_history)
+        metrics["avg_batch_size"] = processed / batches if batches else 0.0
+        metrics["avg_latency_seconds"] = (
+            metrics["total_latency_seconds"] / processed if processed else 0.0
+        )
+        metrics["throughput_events_per_sec"] = processed / elapsed
+        return metrics
+
     def start(self):
         """Start the event processing thread."""
         with self.lock:
@@ -380,6 +627,7 @@ class EventStreamManager:
                     self.processing_thread.join(timeout=5.0)
                 self.running = False
                 logger.info("EventStreamManager stopped")
+        self.close_segment()
 
     def get_event_by_id(self, event_id: str) -> Optional[Event]:
         """
@@ -391,7 +639,11 @@ class EventStreamManager:
         Returns:
             Event if found, None otherwise
         """
-        return self.event_history.get(event_id)
+        with self._history_lock:
+            event = self.event_history.get(event_id)
+            if event is not None:
+                self.event_history.move_to_end(event_id)
+        return event
 
     def create_mock_news_event(
         self, headline: str, source: str = "mock_source"
@@ -41,6 +41,12 @@ class RetrodictionSystemIntegrator:
     Integrates the regime-sensor fusion components with retrodiction training
     and counterfactual simulation. Provides a unified interface for these components
     to work together.
+
+    Snapshots are handled concurrently by the RetrodictionTrigger worker pool.
+    Within one snapshot, the scenarios for a regime are answered by a single
+    vectorised run_batch_scenarios call rather than fanned out to threads.
+    The snapshot handler is a bound method of this integrator, so the trigger
+    must use worker_mode="thread".
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -76,15 +82,16 @@ class RetrodictionSystemIntegrator:
 
     def _connect_components(self):
         """Set up connections and handlers between components."""
-        # Connect event manager to regime detector
-        self.event_manager.register_event_handler(
-            EventType.NEWS, self.regime_detector.process_event
+        # Connect event manager to regime detector; batch handlers let the
+        # detector run one regime check per drained batch instead of per event
+        self.event_manager.register_batch_handler(
+            EventType.NEWS, self.regime_detector.process_events_batch
         )
-        self.event_manager.register_event_handler(
-            EventType.MARKET_MOVEMENT, self.regime_detector.process_event
+        self.event_manager.register_batch_handler(
+            EventType.MARKET_MOVEMENT, self.regime_detector.process_events_batch
         )
-        self.event_manager.register_event_handler(
-            EventType.ECONOMIC_INDICATOR, self.regime_detector.process_event
+        self.event_manager.register_batch_handler(
+            EventType.ECONOMIC_INDICATOR, self.regime_detector.process_events_batch
         )
 
         # Connect regime detector to retrodiction trigger
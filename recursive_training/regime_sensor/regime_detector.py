@@ -5,7 +5,9 @@ economic cycles, or other significant shifts that should trigger retrodiction mo
 """
 
 import logging
+from collections import deque
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Dict, List, Optional, Any, Callable, Tuple
 import threading
 import json
@@ -13,6 +15,10 @@ import os
 from enum import Enum
 
 from recursive_training.regime_sensor.event_stream_manager import Event, EventType
+from recursive_training.regime_sensor.rolling_stats import (
+    KeywordIndex,
+    RollingStatistics,
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -105,10 +111,62 @@ class RegimeChangeEvent:
         }
 
 
+# Keyword groups used by the news sentiment detector
+NEWS_KEYWORD_GROUPS: Dict[str, List[str]] = {
+    "crisis": [
+        "crisis",
+        "crash",
+        "collapse",
+        "plummet",
+        "disaster",
+        "fear",
+        "panic",
+    ],
+    "recession": [
+        "recession",
+        "contraction",
+        "downturn",
+        "slowdown",
+        "layoffs",
+        "unemployment",
+    ],
+    "expansion": [
+        "growth",
+        "expansion",
+        "bull",
+        "recovery",
+        "positive",
+        "upswing",
+        "boom",
+    ],
+    "inflation": [
+        "inflation",
+        "price increases",
+        "rising prices",
+        "cpi",
+        "cost of living",
+    ],
+    "monetary": [
+        "fed",
+        "central bank",
+        "interest rate",
+        "rate hike",
+        "rate cut",
+        "monetary policy",
+    ],
+    "tightening": ["hike", "raise"],
+    "easing": ["cut", "lower"],
+}
+
+
 class RegimeDetector:
     """
     Detects regime changes by analyzing event streams and market data.
     Implements various detection algorithms and can trigger retrodiction snapshots.
+
+    Market data feeds a RollingStatistics engine and events feed a KeywordIndex,
+    both updated incrementally, so a regime check costs the same regardless of
+    buffer size and can run on every tick.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -124,8 +182,12 @@ class RegimeDetector:
         self.change_history = []
         self.handlers = []
         self.market_data = {}
-        self.event_buffer = []
         self.max_buffer_size = self.config.get("max_buffer_size", 1000)
+        self.event_buffer: deque = deque(maxlen=self.max_buffer_size)
+        self.rolling_stats = RollingStatistics(self.config.get("rolling_stats_config"))
+        self.keyword_index = KeywordIndex(
+            NEWS_KEYWORD_GROUPS, window_size=self.config.get("news_window", 50)
+        )
         self.min_confidence = self.config.get("min_confidence", 0.7)
         self.lock = threading.Lock()
 
@@ -188,10 +250,9 @@ class RegimeDetector:
             event: Event to process
         """
         with self.lock:
-            # Add to buffer and trim if needed
+            # Bounded deque drops the oldest event once full
             self.event_buffer.append(event)
-            if len(self.event_buffer) > self.max_buffer_size:
-                self.event_buffer = self.event_buffer[-self.max_buffer_size:]
+            self.keyword_index.add(event)
 
             # Run detection methods
             self._check_for_regime_change()
@@ -206,8 +267,7 @@ class RegimeDetector:
         with self.lock:
             # Add all events to buffer
             self.event_buffer.extend(events)
-            if len(self.event_buffer) > self.max_buffer_size:
-                self.event_buffer = self.event_buffer[-self.max_buffer_size:]
+            self.keyword_index.extend(events)
 
             # Run detection methods
             self._check_for_regime_change()
@@ -221,6 +281,7 @@ class RegimeDetector:
         """
         with self.lock:
             self.market_data.update(market_data)
+            self.rolling_stats.update(market_data)
 
             # Run detection methods after market data update
             self._check_for_regime_change()
@@ -322,6 +383,13 @@ class RegimeDetector:
         # Add to history
         self.change_history.append(regime_change)
 
+        # A CUSUM alarm stays raised until reset; clear it once it has
+        # produced this change so it cannot re-trigger on later updates
+        if indicators.get("volatility_cusum_alarm"):
+            volatility_stats = self.rolling_stats.get("volatility")
+            if volatility_stats:
+                volatility_stats.reset_cusum()
+
         # Store if enabled
         if self.storage_enabled:
             self._store_regime_change(regime_change)
@@ -362,6 +430,25 @@ class RegimeDetector:
         """Get the history of regime changes."""
         return self.change_history.copy()
 
+    def get_indicator_stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get rolling statistics (mean, std, z-score, EWMA, CUSUM) for an indicator.
+
+        Args:
+            name: Market data key
+
+        Returns:
+            Dictionary of statistics, or None if the indicator has not been seen
+        """
+        stats = self.rolling_stats.get(name)
+        return stats.snapshot() if stats else None
+
+    def _recent_events(self, count: int, event_types: List[EventType]) -> List[Event]:
+        """Events of the given types among the last ``count`` buffered events."""
+        recent = list(islice(reversed(self.event_buffer), count))
+        recent.reverse()
+        return [event for event in recent if event.event_type in event_types]
+
     # The following are placeholder detection methods.
     # In a production system, these would implement sophisticated algorithms.
 
@@ -374,9 +461,6 @@ class RegimeDetector:
         Returns:
             Tuple of (regime_type, confidence, supporting_events, market_indicators) or None
         """
-        # This is a placeholder implementation. A real implementation would use
-        # statistical measures of volatility and appropriate thresholds.
-
         # Check if we have volatility data
         if "volatility" not in self.market_data:
             return None
@@ -384,23 +468,39 @@ class RegimeDetector:
         volatility = self.market_data["volatility"]
         vix = self.market_data.get("vix", None)
 
-        # Simple threshold-based detection
-        if volatility > 30:  # Simple threshold
-            confidence = min(
-                1.0, volatility / 50.0
-            )  # Higher volatility = higher confidence
+        # Absolute level check
+        confidence = 0.0
+        if volatility > self.config.get("volatility_threshold", 30):
+            # Higher volatility = higher confidence
+            confidence = min(1.0, volatility / 50.0)
 
+        # Statistical checks against the rolling window: a z-score spike or
+        # a sustained upward CUSUM shift flags a shock even below the level
+        volatility_stats = self.rolling_stats.get("volatility")
+        if (
+            volatility_stats
+            and volatility_stats.count
+            >= self.config.get("volatility_min_samples", 10)
+        ):
+            zscore_threshold = self.config.get("volatility_zscore_threshold", 3.0)
+            if volatility_stats.zscore >= zscore_threshold:
+                confidence = max(
+                    confidence,
+                    min(1.0, 0.5 + 0.25 * volatility_stats.zscore / zscore_threshold),
+                )
+            if volatility_stats.cusum_alarm == "up":
+                confidence = max(confidence, 0.75)
+
+        if confidence > 0:
             # Collect supporting events
-            supporting_events = [
-                event
-                for event in self.event_buffer[-20:]  # Look at recent events
-                if event.event_type
-                in [
+            supporting_events = self._recent_events(
+                20,
+                [
                     EventType.MARKET_MOVEMENT,
                     EventType.NEWS,
                     EventType.ECONOMIC_INDICATOR,
-                ]
-            ]
+                ],
+            )
 
             # Market indicators
             indicators = {
@@ -408,6 +508,10 @@ class RegimeDetector:
                 "vix": vix,
                 "detection_method": "volatility_spike",
             }
+            if volatility_stats:
+                indicators["volatility_zscore"] = volatility_stats.zscore
+                indicators["volatility_ewma"] = volatility_stats.ewma
+                indicators["volatility_cusum_alarm"] = volatility_stats.cusum_alarm
 
             return (
                 RegimeType.VOLATILITY_SHOCK,
@@ -441,12 +545,9 @@ class RegimeDetector:
             # Confidence based on how far above the 200-day SMA the 50-day SMA is
             confidence = min(1.0, (sma_50 - sma_200) / (sma_200 * 0.05))
 
-            supporting_events = [
-                event
-                for event in self.event_buffer[-30:]
-                if event.event_type
-                in [EventType.MARKET_MOVEMENT, EventType.CORPORATE_ANNOUNCEMENT]
-            ]
+            supporting_events = self._recent_events(
+                30, [EventType.MARKET_MOVEMENT, EventType.CORPORATE_ANNOUNCEMENT]
+            )
 
             indicators = {
                 "price": price,
@@ -463,12 +564,9 @@ class RegimeDetector:
             # Confidence based on how far below the 200-day SMA the 50-day SMA is
             confidence = min(1.0, (sma_200 - sma_50) / (sma_200 * 0.05))
 
-            supporting_events = [
-                event
-                for event in self.event_buffer[-30:]
-                if event.event_type
-                in [EventType.MARKET_MOVEMENT, EventType.CORPORATE_ANNOUNCEMENT]
-            ]
+            supporting_events = self._recent_events(
+                30, [EventType.MARKET_MOVEMENT, EventType.CORPORATE_ANNOUNCEMENT]
+            )
 
             indicators = {
                 "price": price,
@@ -491,189 +589,56 @@ class RegimeDetector:
         Returns:
             Tuple of (regime_type, confidence, supporting_events, market_indicators) or None
         """
-        # Check if we have enough news events
-        news_events = [
-            event
-            for event in self.event_buffer[-50:]  # Look at recent events
-            if event.event_type == EventType.NEWS
-        ]
+        # Counts come from the incrementally maintained keyword index, which
+        # covers the news among the last ``news_window`` buffered events
+        index = self.keyword_index
+        news_total = index.news_count
 
-        if len(news_events) < 10:
+        if news_total < 10:
             return None
 
-        # In a real implementation, we would perform sentiment analysis on the news content
-        # For this placeholder, we'll use a simple keyword-based approach
-
-        # Crisis keywords
-        crisis_keywords = [
-            "crisis",
-            "crash",
-            "collapse",
-            "plummet",
-            "disaster",
-            "fear",
-            "panic",
-        ]
-        recession_keywords = [
-            "recession",
-            "contraction",
-            "downturn",
-            "slowdown",
-            "layoffs",
-            "unemployment",
-        ]
-        expansion_keywords = [
-            "growth",
-            "expansion",
-            "bull",
-            "recovery",
-            "positive",
-            "upswing",
-            "boom",
-        ]
-        inflation_keywords = [
-            "inflation",
-            "price increases",
-            "rising prices",
-            "cpi",
-            "cost of living",
-        ]
-        monetary_keywords = [
-            "fed",
-            "central bank",
-            "interest rate",
-            "rate hike",
-            "rate cut",
-            "monetary policy",
-        ]
-
-        # Count keyword occurrences
-        crisis_count = sum(
-            1
-            for event in news_events
-            if any(keyword in event.content.lower() for keyword in crisis_keywords)
-        )
-        recession_count = sum(
-            1
-            for event in news_events
-            if any(keyword in event.content.lower() for keyword in recession_keywords)
-        )
-        expansion_count = sum(
-            1
-            for event in news_events
-            if any(keyword in event.content.lower() for keyword in expansion_keywords)
-        )
-        inflation_count = sum(
-            1
-            for event in news_events
-            if any(keyword in event.content.lower() for keyword in inflation_keywords)
-        )
-        monetary_count = sum(
-            1
-            for event in news_events
-            if any(keyword in event.content.lower() for keyword in monetary_keywords)
-        )
-
         # Determine dominant theme
+        theme_groups = {
+            RegimeType.GEOPOLITICAL_CRISIS: "crisis",
+            RegimeType.RECESSION: "recession",
+            RegimeType.EXPANSION: "expansion",
+            RegimeType.INFLATION: "inflation",
+        }
         counts = {
-            RegimeType.GEOPOLITICAL_CRISIS: crisis_count,
-            RegimeType.RECESSION: recession_count,
-            RegimeType.EXPANSION: expansion_count,
-            RegimeType.INFLATION: inflation_count,
+            regime: index.count(group) for regime, group in theme_groups.items()
         }
 
         # Add monetary policy regimes based on keywords
+        monetary_count = index.count("monetary")
         if monetary_count > 5:
-            tightening_count = sum(
-                1
-                for event in news_events
-                if "hike" in event.content.lower() or "raise" in event.content.lower()
-            )
-            easing_count = sum(
-                1
-                for event in news_events
-                if "cut" in event.content.lower() or "lower" in event.content.lower()
-            )
-
-            if tightening_count > easing_count:
+            if index.count("tightening") > index.count("easing"):
                 counts[RegimeType.MONETARY_TIGHTENING] = monetary_count
+                theme_groups[RegimeType.MONETARY_TIGHTENING] = "monetary"
             else:
                 counts[RegimeType.MONETARY_EASING] = monetary_count
+                theme_groups[RegimeType.MONETARY_EASING] = "monetary"
 
         # Find the regime with the highest count
-        if counts:
-            max_regime = max(counts.items(), key=lambda x: x[1])
-            regime_type, count = max_regime
-
-            # Calculate confidence based on the proportion of events with this theme
-            confidence = min(
-                1.0, count / len(news_events) * 2
-            )  # Scale up to make it more sensitive
-
-            # Only consider a regime change if count and confidence are high enough
-            if count >= 5 and confidence >= 0.3 and regime_type != self.current_regime:
-                # Find supporting events
-                supporting_events = []
-
-                # Different approach based on regime type
-                if regime_type == RegimeType.GEOPOLITICAL_CRISIS:
-                    supporting_events = [
-                        event
-                        for event in news_events
-                        if any(
-                            keyword in event.content.lower()
-                            for keyword in crisis_keywords
-                        )
-                    ]
-                elif regime_type == RegimeType.RECESSION:
-                    supporting_events = [
-                        event
-                        for event in news_events
-                        if any(
-                            keyword in event.content.lower()
-                            for keyword in recession_keywords
-                        )
-                    ]
-                elif regime_type == RegimeType.EXPANSION:
-                    supporting_events = [
-                        event
-                        for event in news_events
-                        if any(
-                            keyword in event.content.lower()
-                            for keyword in expansion_keywords
-                        )
-                    ]
-                elif regime_type == RegimeType.INFLATION:
-                    supporting_events = [
-                        event
-                        for event in news_events
-                        if any(
-                            keyword in event.content.lower()
-                            for keyword in inflation_keywords
-                        )
-                    ]
-                elif regime_type in [
-                    RegimeType.MONETARY_TIGHTENING,
-                    RegimeType.MONETARY_EASING,
-                ]:
-                    supporting_events = [
-                        event
-                        for event in news_events
-                        if any(
-                            keyword in event.content.lower()
-                            for keyword in monetary_keywords
-                        )
-                    ]
-
-                # Include market data if available
-                indicators = {
-                    "news_sentiment_score": confidence,
-                    "relevant_keyword_count": count,
-                    "total_news_count": len(news_events),
-                    "detection_method": "news_sentiment",
-                }
-
-                return regime_type, confidence, supporting_events, indicators
+        regime_type, count = max(counts.items(), key=lambda x: x[1])
+
+        # Calculate confidence based on the proportion of events with this theme
+        confidence = min(
+            1.0, count / news_total * 2
+        )  # Scale up to make it more sensitive
+
+        # Only consider a regime change if count and confidence are high enough
+        if count >= 5 and confidence >= 0.3 and regime_type != self.current_regime:
+            supporting_events = index.events_matching([theme_groups[regime_type]])
+
+            # Include market data if available
+            indicators = {
+                "news_sentiment_score": confidence,
+                "relevant_keyword_count": count,
+                "total_news_count": news_total,
+                "detection_method": "news_sentiment",
+            }
+
+            return regime_type, confidence, supporting_events, indicators
 
         return None
 
@@ -707,11 +672,9 @@ class RegimeDetector:
         if gdp_growth < 0 and unemployment > 5.5:
             confidence = min(1.0, (abs(gdp_growth) * 0.2 + (unemployment - 5.5) * 0.1))
 
-            supporting_events = [
-                event
-                for event in self.event_buffer[-40:]
-                if event.event_type == EventType.ECONOMIC_INDICATOR
-            ]
+            supporting_events = self._recent_events(
+                40, [EventType.ECONOMIC_INDICATOR]
+            )
 
             indicators = {
                 "gdp_growth": gdp_growth,
@@ -727,11 +690,9 @@ class RegimeDetector:
         elif inflation > 4.0:
             confidence = min(1.0, (inflation - 4.0) * 0.25)
 
-            supporting_events = [
-                event
-                for event in self.event_buffer[-40:]
-                if event.event_type == EventType.ECONOMIC_INDICATOR
-            ]
+            supporting_events = self._recent_events(
+                40, [EventType.ECONOMIC_INDICATOR]
+            )
 
             indicators = {
                 "gdp_growth": gdp_growth,
@@ -747,11 +708,9 @@ class RegimeDetector:
         elif gdp_growth > 2.5 and unemployment < 5.0:
             confidence = min(1.0, (gdp_growth - 2.5) * 0.2 + (5.0 - unemployment) * 0.1)
 
-            supporting_events = [
-                event
-                for event in self.event_buffer[-40:]
-                if event.event_type == EventType.ECONOMIC_INDICATOR
-            ]
+            supporting_events = self._recent_events(
+                40, [EventType.ECONOMIC_INDICATOR]
+            )
 
             indicators = {
                 "gdp_growth": gdp_growth,
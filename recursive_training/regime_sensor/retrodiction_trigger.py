@@ -3,11 +3,14 @@ Retrodiction Trigger module for connecting regime change events to retrodiction
 Provides mechanisms to trigger "retrodiction snapshots" based on detected regime changes.
 """
 
+import itertools
 import logging
 import os
 import json
+import multiprocessing as mp
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable, Tuple
 from enum import Enum
@@ -83,10 +86,19 @@ class RetrodictionSnapshot:
         self.time_range = time_range
         self.metadata = metadata or {}
         self.processed = False
+        self.cancelled = False
         self.processing_start: Optional[datetime] = None
         self.processing_end: Optional[datetime] = None
         self.results = {}
 
+    def signature(self) -> Tuple[Any, ...]:
+        """
+        Key identifying near-identical snapshots: same cause, same regime (if
+        any) and same variable set. Used for deduplication.
+        """
+        regime = self.regime_change.new_regime.value if self.regime_change else None
+        return (self.cause.value, regime, tuple(sorted(self.variables)))
+
     def __str__(self):
         return (
             f"RetrodictionSnapshot({self.snapshot_id}, {self.cause.value}, "
@@ -103,6 +115,7 @@ class RetrodictionSnapshot:
             "variables": self.variables,
             "metadata": self.metadata,
             "processed": self.processed,
+            "cancelled": self.cancelled,
             "processing_start": (
                 self.processing_start.isoformat() if self.processing_start else None
             ),
@@ -169,6 +182,7 @@ class RetrodictionSnapshot:
 
         # Set additional fields
         snapshot.processed = data.get("processed", False)
+        snapshot.cancelled = data.get("cancelled", False)
 
         if "processing_start" in data and data["processing_start"]:
             try:
@@ -191,10 +205,52 @@ class RetrodictionSnapshot:
         return snapshot
 
 
+def _run_handlers_in_process(
+    handlers: List[Callable[[RetrodictionSnapshot], None]],
+    snapshot: RetrodictionSnapshot,
+) -> Dict[str, Any]:
+    """
+    Run snapshot handlers inside a worker process and return the results they
+    attached to the snapshot. Top-level so it can be pickled.
+    """
+    for handler in handlers:
+        try:
+            handler(snapshot)
+        except Exception as e:
+            logger.error(f"Error in snapshot handler: {e}")
+    return snapshot.results
+
+
+def _worker_context():
+    """
+    Multiprocessing context for "process" worker mode.
+
+    The trigger's own threads are running when the pool starts processes,
+    so fork could deadlock. forkserver children come from a single-threaded
+    server that has already imported this module; spawn is the fallback
+    where forkserver is unavailable.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(
+            ["recursive_training.regime_sensor.retrodiction_trigger"]
+        )
+        return ctx
+    return mp.get_context("spawn")
+
+
 class RetrodictionTrigger:
     """
     Manages the triggering of retrodiction snapshots based on various events.
     Connects regime changes to retrodiction evaluation and handles scheduling.
+
+    Snapshots are executed by a pool of ``worker_count`` workers that always
+    take the highest ``TriggerPriority`` pending snapshot. In ``"process"``
+    worker mode handlers run in a process pool and must be picklable by
+    reference (module-level functions). Near-
+    identical snapshots (same ``signature()``) within ``dedup_window_seconds``
+    are dropped, and a new snapshot cancels pending lower-priority snapshots
+    whose variables it covers.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -209,9 +265,32 @@ class RetrodictionTrigger:
         self.snapshot_history = []
         self.handlers = []
         self.running = False
-        self.processing_thread = None
+        self.processing_thread = None  # Scheduler thread
+        self.worker_threads: List[threading.Thread] = []
         self.lock = threading.Lock()
         self.stop_event = threading.Event()
+        self._sequence = itertools.count()
+
+        # Worker pool config
+        self.worker_count = max(1, self.config.get("worker_count", 2))
+        self.worker_mode = self.config.get("worker_mode", "thread")
+        if self.worker_mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker_mode: {self.worker_mode}")
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.dedup_window = self.config.get("dedup_window_seconds", 300)
+        self.cancel_superseded = self.config.get("cancel_superseded", True)
+
+        # Pending (queued, not started) snapshots and dedup bookkeeping
+        self._pending: Dict[str, RetrodictionSnapshot] = {}
+        self._recent: Dict[Tuple[Any, ...], Tuple[float, RetrodictionSnapshot]] = {}
+        self._active = 0
+        self._idle = threading.Condition(self.lock)
+        self.stats = {
+            "enqueued": 0,
+            "processed": 0,
+            "deduplicated": 0,
+            "cancelled": 0,
+        }
 
         # Load configuration
         self.auto_trigger_enabled = self.config.get("auto_trigger_enabled", True)
@@ -326,7 +405,8 @@ class RetrodictionTrigger:
             metadata: Additional metadata
 
         Returns:
-            The created RetrodictionSnapshot
+            The queued RetrodictionSnapshot, or the equivalent snapshot it was
+            deduplicated into
         """
         logger.info("Manually triggering retrodiction snapshot")
 
@@ -361,23 +441,57 @@ class RetrodictionTrigger:
             metadata=metadata or {"manual_trigger": True},
         )
 
-        # Queue the snapshot
-        self._enqueue_snapshot(snapshot)
-
-        return snapshot
+        # Queue the snapshot; an equivalent pending snapshot may be returned instead
+        return self._enqueue_snapshot(snapshot)
 
-    def _enqueue_snapshot(self, snapshot: RetrodictionSnapshot):
+    def _enqueue_snapshot(
+        self, snapshot: RetrodictionSnapshot
+    ) -> RetrodictionSnapshot:
         """
-        Add a snapshot to the processing queue.
+        Add a snapshot to the processing queue, unless a near-identical
+        snapshot was queued within the dedup window.
 
         Args:
             snapshot: The snapshot to queue
+
+        Returns:
+            The snapshot that will be processed (the given one, or the
+            existing equivalent it was deduplicated into)
         """
         with self.lock:
+            now = time.time()
+            signature = snapshot.signature()
+            recent = self._recent.get(signature)
+            # A cancelled snapshot never runs, so it cannot absorb a re-trigger
+            if (
+                recent
+                and now - recent[0] <= self.dedup_window
+                and not recent[1].cancelled
+            ):
+                existing = recent[1]
+                if (
+                    existing.snapshot_id in self._pending
+                    and snapshot.priority.value > existing.priority.value
+                ):
+                    # Escalate: replace the pending copy with the urgent one
+                    self._cancel_locked(existing, superseded_by=snapshot.snapshot_id)
+                else:
+                    self.stats["deduplicated"] += 1
+                    logger.info(f"Deduplicated {snapshot} into {existing}")
+                    return existing
+
+            if self.cancel_superseded:
+                self._cancel_superseded_locked(snapshot)
+
             # Add to priority queue with priority as the first element of the tuple
             # Use negative priority value to make higher priority snapshots processed
-            # first
-            self.snapshot_queue.put((-snapshot.priority.value, time.time(), snapshot))
+            # first; the sequence keeps FIFO order within a priority
+            self.snapshot_queue.put(
+                (-snapshot.priority.value, next(self._sequence), snapshot)
+            )
+            self._pending[snapshot.snapshot_id] = snapshot
+            self._recent[signature] = (now, snapshot)
+            self.stats["enqueued"] += 1
             logger.debug(f"Enqueued snapshot: {snapshot}")
 
             # Add to history
@@ -387,6 +501,63 @@ class RetrodictionTrigger:
             if self.storage_enabled:
                 self._store_snapshot(snapshot)
 
+            self._prune_recent_locked(now)
+            return snapshot
+
+    def _cancel_superseded_locked(self, snapshot: RetrodictionSnapshot):
+        """
+        Cancel pending lower-priority snapshots whose variables are covered by
+        the new snapshot. An empty variable list means "default variables"
+        and is only covered by another empty list. Caller must hold the lock.
+        """
+        covered = set(snapshot.variables)
+        for pending in list(self._pending.values()):
+            if pending.priority.value >= snapshot.priority.value:
+                continue
+            variables = set(pending.variables)
+            if (variables or not covered) and variables.issubset(covered):
+                self._cancel_locked(pending, superseded_by=snapshot.snapshot_id)
+
+    def _cancel_locked(
+        self, snapshot: RetrodictionSnapshot, superseded_by: Optional[str] = None
+    ):
+        # Cancelled entries stay in the queue and are skipped when popped
+        snapshot.cancelled = True
+        if superseded_by:
+            snapshot.metadata["superseded_by"] = superseded_by
+        self._pending.pop(snapshot.snapshot_id, None)
+        self.stats["cancelled"] += 1
+        logger.info(f"Cancelled snapshot: {snapshot}")
+        if self.storage_enabled:
+            self._store_snapshot(snapshot)
+        self._idle.notify_all()
+
+    def _prune_recent_locked(self, now: float):
+        expired = [
+            signature
+            for signature, (enqueued_at, _) in self._recent.items()
+            if now - enqueued_at > self.dedup_window
+        ]
+        for signature in expired:
+            del self._recent[signature]
+
+    def cancel_snapshot(self, snapshot_id: str) -> bool:
+        """
+        Cancel a snapshot that has not started processing.
+
+        Args:
+            snapshot_id: ID of the snapshot to cancel
+
+        Returns:
+            True if the snapshot was pending and is now cancelled
+        """
+        with self.lock:
+            snapshot = self._pending.get(snapshot_id)
+            if snapshot is None:
+                return False
+            self._cancel_locked(snapshot)
+            return True
+
     def _store_snapshot(self, snapshot: RetrodictionSnapshot):
         """
         Store a snapshot to disk.
@@ -419,11 +590,16 @@ class RetrodictionTrigger:
             snapshot.processing_start = datetime.now()
 
             # Call all registered handlers
-            for handler in self.handlers:
-                try:
-                    handler(snapshot)
-                except Exception as e:
-                    logger.error(f"Error in snapshot handler: {e}")
+            if self.process_pool is not None:
+                snapshot.results = self.process_pool.submit(
+                    _run_handlers_in_process, list(self.handlers), snapshot
+                ).result()
+            else:
+                for handler in self.handlers:
+                    try:
+                        handler(snapshot)
+                    except Exception as e:
+                        logger.error(f"Error in snapshot handler: {e}")
 
             # Update processing status
             snapshot.processed = True
@@ -437,28 +613,106 @@ class RetrodictionTrigger:
         except Exception as e:
             logger.error(f"Error processing snapshot: {e}")
 
-    def _snapshot_processor_loop(self):
-        """Background thread for processing snapshots from the queue."""
-        logger.info("Snapshot processor thread started")
+    def _next_snapshot(self, timeout: float) -> Optional[RetrodictionSnapshot]:
+        """
+        Pop the highest-priority pending snapshot, skipping cancelled ones,
+        and mark it active.
+        """
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                _, _, snapshot = self.snapshot_queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            self.snapshot_queue.task_done()
+            with self.lock:
+                if snapshot.cancelled:
+                    continue
+                self._pending.pop(snapshot.snapshot_id, None)
+                self._active += 1
+                return snapshot
 
+    def _worker_loop(self):
+        """Worker thread: process snapshots in priority order until stopped."""
         while not self.stop_event.is_set():
             try:
-                # Check if it's time for a scheduled snapshot
-                self._check_scheduled_snapshot()
-
-                # Get a snapshot from the queue with timeout to allow checking
-                # stop_event
+                snapshot = self._next_snapshot(timeout=0.5)
+                if snapshot is None:
+                    continue
                 try:
-                    _, _, snapshot = self.snapshot_queue.get(timeout=1.0)
                     self._process_snapshot(snapshot)
-                    self.snapshot_queue.task_done()
-                except queue.Empty:
-                    continue  # No snapshots in queue, try again
+                finally:
+                    with self.lock:
+                        self._active -= 1
+                        self.stats["processed"] += 1
+                        self._idle.notify_all()
             except Exception as e:
-                logger.error(f"Error in snapshot processor loop: {e}")
+                logger.error(f"Error in snapshot worker loop: {e}")
                 time.sleep(1)  # Avoid tight loop in case of recurring errors
 
-        logger.info("Snapshot processor thread stopped")
+    def _snapshot_processor_loop(self):
+        """Background thread that creates scheduled snapshots."""
+        logger.info("Snapshot scheduler thread started")
+
+        while not self.stop_event.is_set():
+            try:
+                # Check if it's time for a scheduled snapshot
+                self._check_scheduled_snapshot()
+            except Exception as e:
+                logger.error(f"Error in snapshot scheduler loop: {e}")
+            self.stop_event.wait(1.0)
+
+        logger.info("Snapshot scheduler thread stopped")
+
+    def process_pending(self) -> int:
+        """
+        Synchronously process every queued snapshot in priority order on the
+        calling thread. Useful for tests and one-shot runs.
+
+        Returns:
+            Number of snapshots processed
+        """
+        count = 0
+        while True:
+            snapshot = self._next_snapshot(timeout=0.01)
+            if snapshot is None:
+                return count
+            try:
+                self._process_snapshot(snapshot)
+            finally:
+                with self.lock:
+                    self._active -= 1
+                    self.stats["processed"] += 1
+                    self._idle.notify_all()
+            count += 1
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until no snapshots are pending or running.
+
+        Returns:
+            True if idle, False if the timeout expired first
+        """
+        with self.lock:
+            return self._idle.wait_for(
+                lambda: not self._pending and self._active == 0, timeout=timeout
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get counters for enqueued, processed, deduplicated and cancelled
+        snapshots.
+        """
+        with self.lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            stats["pending"] = len(self._pending)
+            stats["active"] = self._active
+            stats["worker_count"] = self.worker_count
+            stats["worker_mode"] = self.worker_mode
+        return stats
 
     def _check_scheduled_snapshot(self):
         """Check if it's time to create a scheduled snapshot."""
@@ -512,27 +766,50 @@ class RetrodictionTrigger:
             self._enqueue_snapshot(snapshot)
 
     def start(self):
-        """Start the snapshot processing thread."""
+        """Start the scheduler thread and the snapshot worker pool."""
         with self.lock:
             if not self.running:
                 self.stop_event.clear()
+                if self.worker_mode == "process":
+                    self.process_pool = ProcessPoolExecutor(
+                        max_workers=self.worker_count, mp_context=_worker_context()
+                    )
                 self.processing_thread = threading.Thread(
                     target=self._snapshot_processor_loop
                 )
                 self.processing_thread.daemon = True
                 self.processing_thread.start()
+                self.worker_threads = []
+                for i in range(self.worker_count):
+                    worker = threading.Thread(
+                        target=self._worker_loop, name=f"retrodiction-worker-{i}"
+                    )
+                    worker.daemon = True
+                    worker.start()
+                    self.worker_threads.append(worker)
                 self.running = True
-                logger.info("RetrodictionTrigger started")
+                logger.info(
+                    f"RetrodictionTrigger started with {self.worker_count} "
+                    f"{self.worker_mode} workers"
+                )
 
     def stop(self):
-        """Stop the snapshot processing thread."""
+        """Stop the scheduler thread and the worker pool."""
+        with self.lock:
+            if not self.running:
+                return
+            self.stop_event.set()
+        if self.processing_thread:
+            self.processing_thread.join(timeout=5.0)
+        for worker in self.worker_threads:
+            worker.join(timeout=5.0)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True, cancel_futures=True)
+            self.process_pool = None
         with self.lock:
-            if self.running:
-                self.stop_event.set()
-                if self.processing_thread:
-                    self.processing_thread.join(timeout=5.0)
-                self.running = False
-                logger.info("RetrodictionTrigger stopped")
+            self.worker_threads = []
+            self.running = False
+        logger.info("RetrodictionTrigger stopped")
 
     def get_snapshot_history(self) -> List[RetrodictionSnapshot]:
         """Get the history of snapshots."""
@@ -0,0 +1,272 @@
+"""
+Rolling-window statistics for regime detection.
+Provides O(1) incremental statistics per market indicator (windowed mean and
+variance, EWMA, two-sided CUSUM) and an incrementally maintained keyword-count
+index over the most recent events, so detection methods can query current
+state instead of rescanning buffers on every check.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from recursive_training.regime_sensor.event_stream_manager import Event, EventType
+
+
+class RollingWindow:
+    """
+    Fixed-size window with running sum and sum of squares.
+    Push and evict are O(1); mean/variance are read in O(1).
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("window size must be at least 1")
+        self.size = size
+        self.values: Deque[float] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def push(self, value: float) -> Optional[float]:
+        """
+        Add a value, evicting the oldest if the window is full.
+
+        Returns:
+            The evicted value, or None
+        """
+        evicted = None
+        if len(self.values) == self.size:
+            evicted = self.values.popleft()
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+        self.values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self.values) if self.values else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the window (0.0 for fewer than two values)."""
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        # Clamp tiny negative values caused by floating-point cancellation
+        return max(0.0, (self._sum_sq - self._sum * self._sum / n) / (n - 1))
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def zscore(self, value: float) -> float:
+        std = self.std
+        return (value - self.mean) / std if std > 0 else 0.0
+
+
+class IndicatorStats:
+    """
+    Incremental statistics for a single market indicator: rolling window,
+    exponentially weighted moving average and a two-sided CUSUM change
+    detector measured against the rolling mean.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 50,
+        ewma_alpha: float = 0.1,
+        cusum_drift: float = 0.5,
+        cusum_threshold: float = 5.0,
+    ):
+        """
+        Args:
+            window_size: Number of observations in the rolling window
+            ewma_alpha: Smoothing factor for the EWMA (0-1]
+            cusum_drift: Allowed slack, in standard deviations, before CUSUM accumulates
+            cusum_threshold: CUSUM alarm level, in standard deviations
+        """
+        self.window = RollingWindow(window_size)
+        self.ewma_alpha = ewma_alpha
+        self.cusum_drift = cusum_drift
+        self.cusum_threshold = cusum_threshold
+        self.last: Optional[float] = None
+        self.ewma: Optional[float] = None
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+        self.count = 0
+
+    def update(self, value: float) -> None:
+        """Add an observation and update all statistics in O(1)."""
+        # CUSUM is measured against the window as it was before this value
+        if len(self.window) >= 2:
+            std = self.window.std or 1.0
+            deviation = (value - self.window.mean) / std
+            self.cusum_pos = max(0.0, self.cusum_pos + deviation - self.cusum_drift)
+            self.cusum_neg = max(0.0, self.cusum_neg - deviation - self.cusum_drift)
+
+        self.window.push(value)
+        self.ewma = (
+            value
+            if self.ewma is None
+            else self.ewma_alpha * value + (1 - self.ewma_alpha) * self.ewma
+        )
+        self.last = value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.window.mean
+
+    @property
+    def variance(self) -> float:
+        return self.window.variance
+
+    @property
+    def std(self) -> float:
+        return self.window.std
+
+    @property
+    def zscore(self) -> float:
+        """Z-score of the latest value against the current window."""
+        return self.window.zscore(self.last) if self.last is not None else 0.0
+
+    @property
+    def cusum_alarm(self) -> Optional[str]:
+        """'up' or 'down' if the CUSUM has crossed its threshold, else None."""
+        if self.cusum_pos > self.cusum_threshold:
+            return "up"
+        if self.cusum_neg > self.cusum_threshold:
+            return "down"
+        return None
+
+    def reset_cusum(self) -> None:
+        """Clear both CUSUM sums, e.g. after their alarm has been acted on."""
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current statistics as a plain dict."""
+        return {
+            "last": self.last,
+            "mean": self.mean,
+            "std": self.std,
+            "zscore": self.zscore,
+            "ewma": self.ewma,
+            "cusum_pos": self.cusum_pos,
+            "cusum_neg": self.cusum_neg,
+            "cusum_alarm": self.cusum_alarm,
+            "count": self.count,
+        }
+
+
+class RollingStatistics:
+    """
+    Collection of IndicatorStats keyed by indicator name, created on first use.
+    Non-numeric market data values are ignored.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.indicators: Dict[str, IndicatorStats] = {}
+
+    def _new_stats(self) -> IndicatorStats:
+        return IndicatorStats(
+            window_size=self.config.get("window_size", 50),
+            ewma_alpha=self.config.get("ewma_alpha", 0.1),
+            cusum_drift=self.config.get("cusum_drift", 0.5),
+            cusum_threshold=self.config.get("cusum_threshold", 5.0),
+        )
+
+    def update(self, market_data: Dict[str, Any]) -> None:
+        """Push every numeric value in market_data to its indicator."""
+        for name, value in market_data.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            stats = self.indicators.get(name)
+            if stats is None:
+                stats = self.indicators[name] = self._new_stats()
+            stats.update(float(value))
+
+    def get(self, name: str) -> Optional[IndicatorStats]:
+        return self.indicators.get(name)
+
+    def snapshot(
+        self, names: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        names = self.indicators.keys() if names is None else names
+        return {
+            name: self.indicators[name].snapshot()
+            for name in names
+            if name in self.indicators
+        }
+
+
+class KeywordIndex:
+    """
+    Keyword-group counts over the news events among the last ``window_size``
+    events of any type. Each event's content is scanned once when it enters
+    the window; counts are decremented when it leaves.
+    """
+
+    def __init__(self, keyword_groups: Dict[str, List[str]], window_size: int = 50):
+        self.keyword_groups = {
+            group: [keyword.lower() for keyword in keywords]
+            for group, keywords in keyword_groups.items()
+        }
+        self.window_size = window_size
+        # (event, matched groups) for every event in the window
+        self._window: Deque[Tuple[Event, Tuple[str, ...]]] = deque()
+        self.counts: Dict[str, int] = {group: 0 for group in self.keyword_groups}
+        self.news_count = 0
+
+    def _match(self, event: Event) -> Tuple[str, ...]:
+        if event.event_type != EventType.NEWS:
+            return ()
+        content = event.content.lower()
+        return tuple(
+            group
+            for group, keywords in self.keyword_groups.items()
+            if any(keyword in content for keyword in keywords)
+        )
+
+    def add(self, event: Event) -> None:
+        """Add an event to the window, evicting the oldest if full."""
+        if len(self._window) == self.window_size:
+            old_event, old_groups = self._window.popleft()
+            if old_event.event_type == EventType.NEWS:
+                self.news_count -= 1
+            for group in old_groups:
+                self.counts[group] -= 1
+
+        groups = self._match(event)
+        self._window.append((event, groups))
+        if event.event_type == EventType.NEWS:
+            self.news_count += 1
+        for group in groups:
+            self.counts[group] += 1
+
+    def extend(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.add(event)
+
+    def count(self, group: str) -> int:
+        return self.counts.get(group, 0)
+
+    def events_matching(self, groups: Iterable[str]) -> List[Event]:
+        """News events in the window matching any of the given groups."""
+        wanted = set(groups)
+        return [
+            event
+            for event, matched in self._window
+            if wanted.intersection(matched)
+        ]
+
+    def news_events(self) -> List[Event]:
+        return [
+            event for event, _ in self._window if event.event_type == EventType.NEWS
+        ]
@@ -9,35 +9,242 @@ Responsibilities:
 - Use centralized matching logic from rule_matching_utils
 
 All matching logic should be imported from rule_matching_utils.
+ReverseRuleEngine scores candidates with the compiled fingerprint matrix
+from rule_matching_utils and searches chains best-first under an
+expansion budget.
 """
 
 from rules.rule_matching_utils import (
     get_all_rule_fingerprints,
+    get_matcher,
     match_rule_by_delta,
     fuzzy_match_rule_by_delta,
 )
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import itertools
 import logging
 
+import numpy as np
+
 logger = logging.getLogger("reverse_rule_engine")
 
+# Residual changes at or below this magnitude count as explained
+RESIDUAL_TOLERANCE = 1e-3
+DEFAULT_BEAM_WIDTH = 20
+DEFAULT_MAX_EXPANSIONS = 5000
+DEFAULT_MAX_CHAINS = 50
+DEFAULT_MAX_CACHED_CANDIDATES = 4096
+
 
 def get_fingerprints():
     return get_all_rule_fingerprints()
 
 
+def _prior(rule: Dict) -> float:
+    return rule.get("trust", 0) + rule.get("frequency", 0)
+
+
 def rank_rules_by_trust(matches: List[tuple], fingerprints: List[Dict]) -> List[tuple]:
     """
     Rank matched rules by trust/frequency if available.
     """
+    trust = {}
+    for fp in fingerprints:
+        trust.setdefault(fp.get("rule_id"), _prior(fp))
+    return sorted(matches, key=lambda x: trust.get(x[0], 0), reverse=True)
+
+
+class ReverseRuleEngine:
+    """
+    Indexed reverse inference over a fixed set of rule fingerprints.
+
+    Candidates are scored with the compiled rule x key matrix of
+    rule_matching_utils.FingerprintMatcher, restricted to the rules that
+    share a key with the delta, and memoized per residual delta in a bounded
+    LRU (the engine is long-lived through get_engine). Chains are
+    searched best-first: a chain's score is the product of its match scores,
+    which can only fall as it grows, so complete chains come out in score
+    order and the search stops after max_chains chains or max_expansions
+    nodes.
+    """
 
-    def get_trust(rule_id):
-        for fp in fingerprints:
-            if fp.get("rule_id") == rule_id:
-                return fp.get("trust", 0) + fp.get("frequency", 0)
-        return 0
+    def __init__(
+        self,
+        fingerprints: Optional[List[Dict]] = None,
+        max_cached_candidates: int = DEFAULT_MAX_CACHED_CANDIDATES,
+    ):
+        if fingerprints is None:
+            fingerprints = get_fingerprints()
+        self.fingerprints = fingerprints
+        self.matcher = get_matcher(fingerprints)
+        self.rules = self.matcher.rules
+        self.rule_ids = self.matcher.rule_ids
+        self.by_id: Dict[str, Dict] = {}
+        for rule_id, rule in zip(self.rule_ids, self.rules):
+            if rule_id:
+                self.by_id.setdefault(rule_id, rule)
+        self.named = np.array([bool(rule_id) for rule_id in self.rule_ids])
+        self.priors = np.array([_prior(rule) for rule in self.rules], dtype=float)
+        self.max_cached_candidates = max_cached_candidates
+        self._candidates: "OrderedDict[Tuple, List[Tuple[int, float]]]" = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _delta_key(delta: Dict[str, float]) -> Tuple:
+        return tuple(sorted((k, round(v, 9)) for k, v in delta.items()))
 
-    return sorted(matches, key=lambda x: get_trust(x[0]), reverse=True)
+    def candidates(
+        self,
+        delta: Dict[str, float],
+        min_match: float = 0.5,
+        fuzzy: bool = False,
+        tol: float = 0.05,
+        confidence_threshold: float = 0.0,
+    ) -> List[Tuple[int, float]]:
+        """
+        Rules matching a delta as (rule index, score), best first (ties by
+        trust/frequency). Same criteria as match_rule_by_delta and
+        fuzzy_match_rule_by_delta.
+        """
+        memo_key = (
+            self._delta_key(delta), min_match, fuzzy, tol, confidence_threshold
+        )
+        cached = self._candidates.get(memo_key)
+        if cached is not None:
+            self._candidates.move_to_end(memo_key)
+            return cached
+
+        if fuzzy:
+            # Every rule is a candidate; keys a rule does not affect count as 0
+            max_diff = self.matcher.fuzzy_max_diffs([delta])[0]
+            rows = np.arange(len(self.rules))
+            scores = 1 - max_diff
+            keep = (max_diff <= tol) & (scores >= confidence_threshold)
+        else:
+            rows = self.matcher.rules_for_keys(list(delta))
+            scores = self.matcher.exact_scores([delta], rows)[0]
+            keep = scores >= min_match
+        keep &= self.named[rows]
+        rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((-self.priors[rows], -scores))
+        result = list(zip(rows[order].tolist(), scores[order].tolist()))
+        if self.max_cached_candidates > 0:
+            self._candidates[memo_key] = result
+            while len(self._candidates) > self.max_cached_candidates:
+                self._candidates.popitem(last=False)
+        return result
+
+    def residual(self, delta: Dict[str, float], row: int) -> Dict[str, float]:
+        """Delta left after subtracting one rule's effects."""
+        effects = self.rules[row].get("effects", {})
+        residual = {}
+        for k, v in delta.items():
+            v = v - effects.get(k, 0.0)
+            if abs(v) > RESIDUAL_TOLERANCE:
+                residual[k] = v
+        return residual
+
+    def search(
+        self,
+        delta: Dict[str, float],
+        max_depth: int = 3,
+        min_match: float = 0.5,
+        fuzzy: bool = False,
+        tol: float = 0.05,
+        confidence_threshold: float = 0.0,
+        beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+        max_chains: int = DEFAULT_MAX_CHAINS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Best-first search for rule chains that fully explain a delta.
+
+        Args:
+            delta: Observed overlay/variable changes.
+            max_depth: Maximum chain length.
+            min_match: Minimum match ratio for exact matching.
+            fuzzy: Use fuzzy matching (absolute tolerance tol).
+            tol: Fuzzy matching tolerance.
+            confidence_threshold: Minimum fuzzy confidence.
+            beam_width: Candidates expanded per node (None for all).
+            max_expansions: Maximum number of nodes expanded.
+            max_chains: Stop after this many complete chains.
+
+        Returns:
+            Chains ranked by score, each {"chain": [rule_id, ...], "score":
+            product of match scores, "trust": summed trust/frequency}.
+            Permutations of the same rules are reported once.
+        """
+        if max_depth <= 0 or not delta:
+            return []
+        counter = itertools.count()
+        # (-score, -trust, depth, tiebreak, rows, residual)
+        frontier = [(-1.0, 0.0, 0, next(counter), (), dict(delta))]
+        seen = set()
+        chains: List[Dict[str, Any]] = []
+        expansions = 0
+        while frontier and len(chains) < max_chains:
+            neg_score, neg_trust, depth, _, rows, residual = heapq.heappop(frontier)
+            if not residual:
+                chains.append(
+                    {
+                        "chain": [self.rule_ids[row] for row in rows],
+                        "score": float(-neg_score),
+                        "trust": float(-neg_trust),
+                    }
+                )
+                continue
+            if depth >= max_depth:
+                continue
+            if expansions >= max_expansions:
+                logger.debug(f"Reverse search stopped after {expansions} expansions")
+                break
+            expansions += 1
+            matches = self.candidates(
+                residual, min_match, fuzzy, tol, confidence_threshold
+            )
+            for row, score in matches[:beam_width]:
+                child = tuple(sorted(rows + (row,)))
+                if child in seen:
+                    continue
+                seen.add(child)
+                heapq.heappush(
+                    frontier,
+                    (
+                        neg_score * score,
+                        neg_trust - self.priors[row],
+                        depth + 1,
+                        next(counter),
+                        rows + (row,),
+                        self.residual(residual, row),
+                    ),
+                )
+        chains.sort(key=lambda c: (-c["score"], -c["trust"], len(c["chain"])))
+        return chains
+
+
+_ENGINE_CACHE: Dict[str, Any] = {"fingerprints": None, "size": -1, "engine": None}
+
+
+def get_engine(fingerprints: Optional[List[Dict]] = None) -> ReverseRuleEngine:
+    """
+    ReverseRuleEngine for a fingerprint list, reused while the same list
+    object (with the same length) is passed again.
+    """
+    if fingerprints is None:
+        fingerprints = get_fingerprints()
+    cache = _ENGINE_CACHE
+    stale = cache["fingerprints"] is not fingerprints
+    if stale or cache["size"] != len(fingerprints):
+        cache.update(
+            fingerprints=fingerprints,
+            size=len(fingerprints),
+            engine=ReverseRuleEngine(fingerprints),
+        )
+    return cache["engine"]
 
 
 def suggest_new_rule_if_no_match(
@@ -63,21 +270,27 @@ def trace_causal_paths(
     path: Optional[List[str]] = None,
     fuzzy: bool = False,
     confidence_threshold: float = 0.0,
+    beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+    max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+    max_chains: int = DEFAULT_MAX_CHAINS,
 ) -> List[List[str]]:
     """
     Given a delta, return possible rule chains (as lists of rule_ids) that could explain it.
-    Recursively subtracts effects and searches for multi-step chains.
-    Supports fuzzy matching if enabled.
-    Ranks by trust/frequency if available. Suggests new rule if no match.
+    Subtracts rule effects and searches multi-step chains best-first (see
+    ReverseRuleEngine.search). Supports fuzzy matching if enabled.
+    Ranks by match score, then trust/frequency. Suggests new rule if no match.
 
     Args:
         delta: Observed overlay/variable changes.
         fingerprints: List of rule fingerprints.
-        max_depth: Max depth for recursive search.
+        max_depth: Max chain length.
         min_match: Minimum match ratio for candidate rules.
-        path: Internal use for recursion.
+        path: Rule ids prepended to every chain.
         fuzzy: Use fuzzy key matching.
         confidence_threshold: Minimum confidence score for rule matches.
+        beam_width: Candidates expanded per search node (None for all).
+        max_expansions: Search node budget.
+        max_chains: Maximum number of chains returned.
 
     Returns:
         List of rule_id chains (each a list of rule_ids).
@@ -88,34 +301,18 @@ def trace_causal_paths(
         path = []
     if max_depth <= 0 or not delta:
         return []
-    if fuzzy:
-        matches = fuzzy_match_rule_by_delta(
-            delta, fingerprints, confidence_threshold=confidence_threshold
-        )
-    else:
-        matches = match_rule_by_delta(delta, fingerprints, min_match=min_match)
-    matches = rank_rules_by_trust(matches, fingerprints)
-    chains = []
-    for rule_id, *_ in matches:
-        rule = next((r for r in fingerprints if r["rule_id"] == rule_id), None)
-        if not rule:
-            continue
-        new_delta = {k: delta[k] - rule["effects"].get(k, 0.0) for k in delta}
-        new_delta = {k: v for k, v in new_delta.items() if abs(v) > 1e-3}
-        if not new_delta:
-            chains.append(path + [rule_id])
-        else:
-            subchains = trace_causal_paths(
-                new_delta,
-                fingerprints,
-                max_depth - 1,
-                min_match,
-                path + [rule_id],
-                fuzzy=fuzzy,
-                confidence_threshold=confidence_threshold,
-            )
-            chains.extend(subchains)
-    if not chains and delta:
+    ranked = get_engine(fingerprints).search(
+        delta,
+        max_depth=max_depth,
+        min_match=min_match,
+        fuzzy=fuzzy,
+        confidence_threshold=confidence_threshold,
+        beam_width=beam_width,
+        max_expansions=max_expansions,
+        max_chains=max_chains,
+    )
+    chains = [path + result["chain"] for result in ranked]
+    if not chains:
         # No match found, suggest new rule
         suggestion = suggest_new_rule_if_no_match(delta, fingerprints)
         if suggestion:
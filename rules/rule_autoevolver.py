@@ -15,6 +15,7 @@ import json
 import logging
 import os
 from typing import Dict, List, Optional
+from rules.rule_coherence_checker import RuleCoherenceIndex
 from rules.rule_registry import RuleRegistry
 from engine.rule_mutation_engine import propose_rule_mutations
 from engine.simulation_drift_detector import run_simulation_drift_analysis
@@ -27,6 +28,7 @@ logger = logging.getLogger("rule_autoevolver")
 
 _registry = RuleRegistry()
 _registry.load_all_rules()
+_coherence: Dict = {"rules": None, "index": None}
 
 
 def log_action(log_path: str, entry: dict):
@@ -70,6 +72,33 @@ def detect_drifted_rules(prev_trace: str, curr_trace: str) -> Dict:
         return {}
 
 
+def check_rule_coherence(rule_id: str) -> Dict[str, List]:
+    """
+    Re-check one registry rule (new or just mutated) for coherence issues.
+    The coherence index is built once per loaded rule list and updated rule
+    by rule, so this does not rescan the registry.
+    """
+    if _coherence["rules"] is not _registry.rules:
+        _coherence["index"] = RuleCoherenceIndex(
+            {r.get("rule_id", r.get("id")): r for r in _registry.rules}
+        )
+        _coherence["rules"] = _registry.rules
+    index = _coherence["index"]
+    if rule_id in index:
+        return index.update_rule(rule_id)
+    for rule in _registry.rules:
+        if rule.get("rule_id", rule.get("id")) == rule_id:
+            return index.add_rule(rule_id, rule)
+    raise KeyError(f"Rule not found: {rule_id}")
+
+
+def _log_coherence_issues(rule_id: str) -> None:
+    issues = check_rule_coherence(rule_id)
+    found = {name: found for name, found in issues.items() if found}
+    if found:
+        logger.warning(f"Coherence issues for {rule_id}: {found}")
+
+
 def propose_mutation(rule_id: str, dry_run: bool = False) -> Optional[Dict]:
     """
     Suggest mutation for a rule (threshold, effects, tags).
@@ -88,6 +117,7 @@ def propose_mutation(rule_id: str, dry_run: bool = False) -> Optional[Dict]:
         )
         if not dry_run:
             rules[rule_id].update(mutation[0])
+            _log_coherence_issues(rule_id)
         return mutation[0]
     return None
 
@@ -119,6 +149,7 @@ def promote_from_candidate(verbose: bool = False) -> List[str]:
         if rule.get("enabled", False):
             _registry.promote_candidate(rule.get("rule_id", rule.get("id")))
             promoted.append(rule.get("rule_id", rule.get("id")))
+            _log_coherence_issues(rule.get("rule_id", rule.get("id")))
             log_action(
                 MUTATION_LOG_PATH,
                 {
@@ -12,14 +12,15 @@ All validation logic should be added here for consistency.
 """
 
 import json
-from typing import List, Dict, Tuple
+from bisect import bisect_left, bisect_right
+from typing import Any, List, Dict, Optional, Tuple
 
 # Use centralized get_all_rule_fingerprints for all rule access
 
 
 def get_all_rule_fingerprints_dict() -> dict:
     """Retrieve all rule fingerprints as a dict keyed by rule_id."""
-    from engine.rules.rule_matching_utils import get_all_rule_fingerprints
+    from rules.rule_matching_utils import get_all_rule_fingerprints
 
     return {
         r.get("rule_id", r.get("id", str(i))): r
@@ -44,69 +45,311 @@ def validate_rule_schema(rules: Dict[str, Dict]) -> List[str]:
     return errors
 
 
+# Effect value prefixes that mark an opposing (bidirectional) effect
+OPPOSITE_MARKERS = ("+-", "-+")
+
+
+def _marker(value) -> Optional[str]:
+    """Opposite-effect marker of a symbolic effect value, if any."""
+    if isinstance(value, str) and value[:2] in OPPOSITE_MARKERS:
+        return value[:2]
+    return None
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class _RuleEntry:
+    """What a rule was indexed under, so it can be unindexed after mutation."""
+
+    __slots__ = ("trigger", "effect_sig", "dup_sig", "effects", "key_pos", "rule_id")
+
+    def __init__(self, rule: Dict):
+        effect = rule.get("effect")
+        self.trigger = str(rule.get("trigger"))
+        self.effect_sig = _canonical(effect)
+        self.dup_sig = _canonical({"trigger": rule.get("trigger"), "effect": effect})
+        self.effects = dict(effect) if isinstance(effect, dict) else {}
+        self.key_pos = {key: pos for pos, key in enumerate(self.effects)}
+        self.rule_id = rule.get("rule_id") or rule.get("id")
+
+
+class RuleCoherenceIndex:
+    """
+    Incremental coherence index over a {rule_id: rule} mapping.
+
+    Rules are bucketed by trigger (and effect within a trigger), by the
+    canonical hash of trigger + effect, and by effect key (with the rules
+    carrying an opposite-effect marker kept per key). Full reports only
+    visit rules that share a bucket, and add_rule / update_rule /
+    remove_rule re-index a single rule, so check_rule can validate a
+    candidate or a mutated rule without rescanning the registry.
+
+    Reports match detect_conflicting_triggers, detect_opposite_effects and
+    detect_duplicate_rules on the same mapping, including their order.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Dict]] = None):
+        self.rules: Dict[str, Dict] = {}
+        self._entries: Dict[str, _RuleEntry] = {}
+        self._order: Dict[str, int] = {}
+        self._next = 0
+        # trigger -> effect signature -> rule ids
+        self._triggers: Dict[str, Dict[str, Dict[str, None]]] = {}
+        # canonical trigger + effect -> rule ids
+        self._duplicates: Dict[str, Dict[str, None]] = {}
+        # effect key -> {rule id: value}, and marker -> rule ids per key
+        self._effects: Dict[str, Dict[str, Any]] = {}
+        self._marked: Dict[str, Dict[str, Dict[str, None]]] = {}
+        # rule_id field -> rule ids, for duplicate-id schema errors
+        self._rule_ids: Dict[str, Dict[str, None]] = {}
+        for rid, rule in (rules or {}).items():
+            self._index(rid, rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __contains__(self, rid) -> bool:
+        return rid in self.rules
+
+    # --- maintenance ---
+
+    def _index(self, rid: str, rule: Dict) -> None:
+        if rid not in self._order:
+            self._order[rid] = self._next
+            self._next += 1
+        entry = _RuleEntry(rule)
+        self.rules[rid] = rule
+        self._entries[rid] = entry
+        groups = self._triggers.setdefault(entry.trigger, {})
+        groups.setdefault(entry.effect_sig, {})[rid] = None
+        self._duplicates.setdefault(entry.dup_sig, {})[rid] = None
+        for key, value in entry.effects.items():
+            self._effects.setdefault(key, {})[rid] = value
+            marker = _marker(value)
+            if marker:
+                self._marked.setdefault(key, {}).setdefault(marker, {})[rid] = None
+        if entry.rule_id:
+            self._rule_ids.setdefault(entry.rule_id, {})[rid] = None
+
+    def _unindex(self, rid: str) -> None:
+        entry = self._entries.pop(rid)
+        groups = self._triggers[entry.trigger]
+        _discard(groups, entry.effect_sig, rid)
+        if not groups:
+            del self._triggers[entry.trigger]
+        _discard(self._duplicates, entry.dup_sig, rid)
+        for key, value in entry.effects.items():
+            _discard(self._effects, key, rid)
+            marker = _marker(value)
+            if marker:
+                _discard(self._marked[key], marker, rid)
+                if not self._marked[key]:
+                    del self._marked[key]
+        if entry.rule_id:
+            _discard(self._rule_ids, entry.rule_id, rid)
+
+    def add_rule(self, rid: str, rule: Optional[Dict] = None) -> Dict[str, List]:
+        """
+        Index a new rule, or re-index rid after it was replaced or mutated
+        in place (pass rule=None to re-read the stored rule). A re-indexed
+        rule keeps its original position.
+
+        Returns:
+            check_rule(rid): the issues involving this rule.
+        """
+        if rule is None:
+            rule = self.rules[rid]
+        if rid in self._entries:
+            self._unindex(rid)
+        self._index(rid, rule)
+        return self.check_rule(rid)
+
+    update_rule = add_rule
+
+    def remove_rule(self, rid: str) -> None:
+        """Drop a rule from the index."""
+        self._unindex(rid)
+        del self.rules[rid]
+        del self._order[rid]
+
+    # --- pair enumeration ---
+
+    def _trigger_pairs(self, trigger: str, rid: Optional[str] = None) -> List:
+        """(earlier, later) pairs with the same trigger and different effects."""
+        groups = self._triggers[trigger]
+        if rid is not None:
+            own = self._entries[rid].effect_sig
+            crossed = [
+                ([rid], group) for sig, group in groups.items() if sig != own
+            ]
+        else:
+            listed = list(groups.values())
+            crossed = [
+                (group, other)
+                for i, group in enumerate(listed)
+                for other in listed[i + 1 :]
+            ]
+        pairs = []
+        for group, other in crossed:
+            for a in group:
+                for b in other:
+                    pairs.append((a, b) if self._order[a] < self._order[b] else (b, a))
+        return pairs
+
+    def _opposite_pairs(self, key: str, rid: Optional[str] = None) -> set:
+        """(id1, id2) pairs with id1 < id2 whose effects on key are opposite."""
+        bucket = self._effects.get(key, {})
+        marked = self._marked.get(key, {})
+        pairs = set()
+        if rid is not None:
+            value = bucket[rid]
+            lead, tail = _marker(value) == "+-", _marker(value) == "-+"
+            for other, other_value in bucket.items():
+                if other == rid or other_value == value:
+                    continue
+                first, second = (rid, other) if rid < other else (other, rid)
+                if (
+                    (lead and rid == first)
+                    or (tail and rid == second)
+                    or (other == first and other in marked.get("+-", ()))
+                    or (other == second and other in marked.get("-+", ()))
+                ):
+                    pairs.add((first, second))
+            return pairs
+        ordered = sorted(bucket)
+        for first in marked.get("+-", ()):
+            value = bucket[first]
+            for second in ordered[bisect_right(ordered, first) :]:
+                if bucket[second] != value:
+                    pairs.add((first, second))
+        for second in marked.get("-+", ()):
+            value = bucket[second]
+            for first in ordered[: bisect_left(ordered, second)]:
+                if bucket[first] != value:
+                    pairs.add((first, second))
+        return pairs
+
+    def _duplicate_pairs(self, sig: str, rid: Optional[str] = None) -> List:
+        bucket = self._duplicates[sig]
+        if len(bucket) < 2:
+            return []
+        first = min(bucket, key=self._order.__getitem__)
+        if rid is not None and rid != first:
+            return [(first, rid)]
+        return [(first, other) for other in bucket if other != first]
+
+    # --- reports ---
+
+    def conflicting_triggers(self) -> List[Tuple[str, str, str]]:
+        """Rules with the same trigger but different effects."""
+        pairs = [
+            pair
+            for trigger, groups in self._triggers.items()
+            if len(groups) > 1
+            for pair in self._trigger_pairs(trigger)
+        ]
+        return [
+            (a, b, "Same trigger, different effects")
+            for a, b in sorted(pairs, key=self._later_first)
+        ]
+
+    def opposite_effects(self) -> List[Tuple[str, str, str]]:
+        """Rules that produce opposite effects on the same variable."""
+        found = [
+            (first, second, key)
+            for key in self._marked
+            for first, second in self._opposite_pairs(key)
+        ]
+        found.sort(key=self._opposite_order)
+        return [(a, b, f"Opposite effect on {key}") for a, b, key in found]
+
+    def duplicate_rules(self) -> List[Tuple[str, str]]:
+        """Rules with identical trigger and effect."""
+        pairs = [
+            pair
+            for sig, bucket in self._duplicates.items()
+            if len(bucket) > 1
+            for pair in self._duplicate_pairs(sig)
+        ]
+        return sorted(pairs, key=lambda pair: self._order[pair[1]])
+
+    def report(self) -> Dict:
+        """Full coherence report, as returned by scan_rule_coherence."""
+        return {
+            "schema_errors": validate_rule_schema(self.rules),
+            "conflicting_triggers": self.conflicting_triggers(),
+            "opposite_effects": self.opposite_effects(),
+            "duplicate_rules": self.duplicate_rules(),
+            "total_rules": len(self.rules),
+        }
+
+    def check_rule(self, rid: str) -> Dict[str, List]:
+        """
+        Coherence issues involving a single indexed rule. Only the buckets
+        the rule belongs to are visited.
+        """
+        entry = self._entries[rid]
+        schema_errors = validate_rule_schema({rid: self.rules[rid]})
+        if entry.rule_id and len(self._rule_ids[entry.rule_id]) > 1:
+            schema_errors.append(f"Duplicate rule id: {entry.rule_id}")
+        triggers = sorted(
+            self._trigger_pairs(entry.trigger, rid), key=self._later_first
+        )
+        opposite = sorted(
+            (
+                (first, second, key)
+                for key in entry.effects
+                for first, second in self._opposite_pairs(key, rid)
+            ),
+            key=self._opposite_order,
+        )
+        return {
+            "schema_errors": schema_errors,
+            "conflicting_triggers": [
+                (a, b, "Same trigger, different effects") for a, b in triggers
+            ],
+            "opposite_effects": [
+                (a, b, f"Opposite effect on {key}") for a, b, key in opposite
+            ],
+            "duplicate_rules": self._duplicate_pairs(entry.dup_sig, rid),
+        }
+
+    def _later_first(self, pair: Tuple[str, str]) -> Tuple[int, int]:
+        return self._order[pair[1]], self._order[pair[0]]
+
+    def _opposite_order(self, item: Tuple[str, str, str]) -> Tuple[int, int, int]:
+        first, second, key = item
+        return self._order[first], self._order[second], self._entries[
+            first
+        ].key_pos[key]
+
+
+def _discard(buckets: Dict[str, Dict[str, None]], key: str, rid: str) -> None:
+    bucket = buckets[key]
+    bucket.pop(rid, None)
+    if not bucket:
+        del buckets[key]
+
+
 def detect_conflicting_triggers(rules: Dict[str, Dict]) -> List[Tuple[str, str, str]]:
     """Detect rules with conflicting symbolic triggers on the same input."""
-    conflicts = []
-    trigger_map = {}
-    for rid, rule in rules.items():
-        trig = str(rule.get("trigger"))
-        if trig not in trigger_map:
-            trigger_map[trig] = [rid]
-        else:
-            conflicts.extend(
-                (existing, rid, "Same trigger, different effects")
-                for existing in trigger_map[trig]
-                if rule.get("effect") != rules[existing].get("effect")
-            )
-            trigger_map[trig].append(rid)
-    return conflicts
+    return RuleCoherenceIndex(rules).conflicting_triggers()
 
 
 def detect_opposite_effects(rules: Dict[str, Dict]) -> List[Tuple[str, str, str]]:
     """Detect rules that produce opposite effects on same variable."""
-    conflicts = []
-    for id1, r1 in rules.items():
-        for id2, r2 in rules.items():
-            if id1 >= id2:
-                continue
-            eff1 = r1.get("effect", {})
-            eff2 = r2.get("effect", {})
-            for k in eff1:
-                if (
-                    k in eff2
-                    and eff1[k] != eff2[k]
-                    and (eff1[k].startswith("+-") or eff2[k].startswith("-+"))
-                ):
-                    conflicts.append((id1, id2, f"Opposite effect on {k}"))
-    return conflicts
+    return RuleCoherenceIndex(rules).opposite_effects()
 
 
 def detect_duplicate_rules(rules: Dict[str, Dict]) -> List[Tuple[str, str]]:
     """Detect rules that are structurally identical."""
-    seen = {}
-    dups = []
-    for rid, rule in rules.items():
-        sig = json.dumps(
-            {"trigger": rule.get("trigger"), "effect": rule.get("effect")},
-            sort_keys=True,
-        )
-        if sig in seen:
-            dups.extend([(seen[sig], rid)])
-        else:
-            seen[sig] = rid
-    return dups
+    return RuleCoherenceIndex(rules).duplicate_rules()
 
 
 def scan_rule_coherence() -> Dict:
-    rules = get_all_rule_fingerprints_dict()
-    result = {
-        "schema_errors": validate_rule_schema(rules),
-        "conflicting_triggers": detect_conflicting_triggers(rules),
-        "opposite_effects": detect_opposite_effects(rules),
-        "duplicate_rules": detect_duplicate_rules(rules),
-        "total_rules": len(rules),
-    }
-    return result
+    return RuleCoherenceIndex(get_all_rule_fingerprints_dict()).report()
 
 
 if __name__ == "__main__":
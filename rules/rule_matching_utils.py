@@ -11,17 +11,224 @@ Responsibilities:
 All rule-related modules should import matching and validation logic from here.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from rules.rule_registry import RuleRegistry
 from rules.rule_coherence_checker import validate_rule_schema
 
 _registry = RuleRegistry()
 _registry.load_all_rules()
 
+# Exact matching tolerance for an effect value
+EXACT_TOLERANCE = 1e-3
+
+_fingerprint_cache: Dict[str, Any] = {"signature": None, "fingerprints": []}
+_matcher_cache: Dict[str, Any] = {
+    "registry": (None, None),  # (signature, matcher)
+    "explicit": (None, None),  # ((list, len, first, last), matcher)
+}
+
+
+def _registry_signature() -> Tuple:
+    rules = _registry.rules
+    return (id(rules), len(rules), getattr(_registry, "version", 0))
+
 
 def get_all_rule_fingerprints() -> List[Dict]:
-    """Return all rule fingerprints from the unified registry."""
-    return [r for r in _registry.rules if r.get("effects") or r.get("effect")]
+    """
+    Return all rule fingerprints from the unified registry.
+
+    The filtered list is cached until the registry changes and is shared
+    between callers, so treat it as read-only.
+    """
+    signature = _registry_signature()
+    if _fingerprint_cache["signature"] != signature:
+        _fingerprint_cache["fingerprints"] = [
+            r for r in _registry.rules if r.get("effects") or r.get("effect")
+        ]
+        _fingerprint_cache["signature"] = signature
+    return _fingerprint_cache["fingerprints"]
+
+
+class FingerprintMatcher:
+    """
+    Rule effects compiled into a sparse rule x key matrix.
+
+    The matrix is stored column-major (for each key, the rules that affect
+    it and their effect values), so scoring a delta only touches the
+    columns of its own keys and every rule is scored with array operations.
+    Matching follows match_rule_by_delta and fuzzy_match_rule_by_delta
+    exactly, including result order; rules whose effects are not a dict
+    are skipped.
+    """
+
+    def __init__(self, fingerprints: Sequence[Dict]):
+        self.rules: List[Dict] = [
+            rule for rule in fingerprints if isinstance(rule.get("effects", {}), dict)
+        ]
+        self.rule_ids = [rule.get("rule_id") or rule.get("id") for rule in self.rules]
+        self.fuzzy_ids = [rule.get("rule_id", "unknown") for rule in self.rules]
+        self.n_effects = np.array(
+            [max(len(rule.get("effects", {})), 1) for rule in self.rules], dtype=float
+        )
+
+        entries: Dict[str, List[Tuple[int, float]]] = {}
+        for row, rule in enumerate(self.rules):
+            for key, value in rule.get("effects", {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entries.setdefault(key, []).append((row, float(value)))
+        self.keys = sorted(entries)
+        self.key_index = {key: col for col, key in enumerate(self.keys)}
+        counts = [len(entries[key]) for key in self.keys]
+        self._col_ptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        flat = [entry for key in self.keys for entry in entries[key]]
+        self._rows = np.array([row for row, _ in flat], dtype=np.int64)
+        self._vals = np.array([value for _, value in flat], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def rules_for_keys(self, keys: Sequence[str]) -> np.ndarray:
+        """Indices of the rules that affect at least one of keys."""
+        parts = [
+            self._rows[self._col_ptr[col] : self._col_ptr[col + 1]]
+            for col in (self.key_index.get(key) for key in keys)
+            if col is not None
+        ]
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(parts))
+
+    def _column(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Rules affecting key and their effect values."""
+        col = self.key_index.get(key)
+        if col is None:
+            return self._rows[:0], self._vals[:0]
+        span = slice(self._col_ptr[col], self._col_ptr[col + 1])
+        return self._rows[span], self._vals[span]
+
+    def exact_scores(
+        self,
+        deltas: Sequence[Dict[str, float]],
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Exact match ratios, shape (deltas, rules): the share of a rule's
+        effects that the delta reproduces within EXACT_TOLERANCE. NaN where
+        the rule shares no key with the delta.
+
+        Only the stored (delta key, rule) entries are visited, so the cost is
+        proportional to the non-zeros in the deltas' columns.
+
+        Args:
+            deltas: Deltas to score.
+            rows: Optional subset of rule indices (columns of the result).
+        """
+        n_rules = len(self.rules)
+        cells, hits = [], []
+        for i, delta in enumerate(deltas):
+            for key, value in delta.items():
+                rule_rows, effects = self._column(key)
+                cells.append(i * n_rules + rule_rows)
+                hits.append(np.abs(effects - value) < EXACT_TOLERANCE)
+        size = len(deltas) * n_rules
+        cells = np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64)
+        shared = np.bincount(cells, minlength=size).reshape(len(deltas), n_rules)
+        counts = np.bincount(
+            cells,
+            weights=np.concatenate(hits) if hits else None,
+            minlength=size,
+        ).reshape(len(deltas), n_rules)
+        scores = np.where(shared > 0, counts / self.n_effects, np.nan)
+        return scores if rows is None else scores[:, rows]
+
+    def fuzzy_max_diffs(self, deltas: Sequence[Dict[str, float]]) -> np.ndarray:
+        """
+        Largest absolute difference between each delta and each rule's
+        effects over the delta's keys (missing effects count as 0), shape
+        (deltas, rules).
+        """
+        n_rules = len(self.rules)
+        diffs = np.zeros((len(deltas), n_rules))
+        for i, delta in enumerate(deltas):
+            row = diffs[i]
+            # Keys a rule affects: |delta - effect|
+            for key, value in delta.items():
+                rule_rows, effects = self._column(key)
+                np.maximum.at(row, rule_rows, np.abs(effects - value))
+            # Keys a rule does not affect: the largest |delta| among them,
+            # found by walking the keys in order of decreasing magnitude
+            ranked = sorted(delta.items(), key=lambda item: -abs(item[1]))
+            floor = np.zeros(n_rules)
+            pending = np.ones(n_rules, dtype=bool)
+            for key, value in ranked:
+                affected = np.zeros(n_rules, dtype=bool)
+                affected[self._column(key)[0]] = True
+                floor[pending & ~affected] = abs(value)
+                pending &= affected
+                if not pending.any():
+                    break
+            np.maximum(row, floor, out=row)
+        return diffs
+
+    def match_batch(
+        self, deltas: Sequence[Dict[str, float]], min_match: float = 0.5
+    ) -> List[List[Tuple[str, float]]]:
+        """match_rule_by_delta for several deltas at once."""
+        rows = self.rules_for_keys(sorted({key for delta in deltas for key in delta}))
+        results = []
+        for scores in self.exact_scores(deltas, rows):
+            keep = np.flatnonzero(scores >= min_match)
+            order = keep[np.argsort(-scores[keep], kind="stable")]
+            results.append([(self.rule_ids[rows[k]], float(scores[k])) for k in order])
+        return results
+
+    def fuzzy_match_batch(
+        self,
+        deltas: Sequence[Dict[str, float]],
+        tol: float = 0.05,
+        min_conf: float = 0.0,
+        confidence_threshold: float = 0.0,
+    ) -> List[List[Tuple[str, float]]]:
+        """fuzzy_match_rule_by_delta for several deltas at once."""
+        results = []
+        for max_diff in self.fuzzy_max_diffs(deltas):
+            confidence = 1 - max_diff
+            keep = np.flatnonzero(
+                (max_diff <= tol)
+                & (confidence >= min_conf)
+                & (confidence >= confidence_threshold)
+            )
+            order = keep[np.argsort(-confidence[keep], kind="stable")]
+            results.append([(self.fuzzy_ids[r], float(confidence[r])) for r in order])
+        return results
+
+
+def get_matcher(fingerprints: Optional[Sequence[Dict]] = None) -> FingerprintMatcher:
+    """
+    FingerprintMatcher for the registry fingerprints (rebuilt when the
+    registry changes) or for an explicit list (reused while the same,
+    unchanged-length list is passed again).
+    """
+    if fingerprints is None:
+        signature = _registry_signature()
+        cached_signature, matcher = _matcher_cache["registry"]
+        if matcher is None or cached_signature != signature:
+            matcher = FingerprintMatcher(get_all_rule_fingerprints())
+            _matcher_cache["registry"] = (signature, matcher)
+        return matcher
+    key = (
+        len(fingerprints),
+        id(fingerprints[0]) if fingerprints else None,
+        id(fingerprints[-1]) if fingerprints else None,
+    )
+    cached_key, matcher = _matcher_cache["explicit"]
+    if matcher is None or cached_key[0] is not fingerprints or cached_key[1:] != key:
+        matcher = FingerprintMatcher(fingerprints)
+        _matcher_cache["explicit"] = ((fingerprints, *key), matcher)
+    return matcher
 
 
 def validate_fingerprint_schema(fingerprints: list) -> list:
@@ -41,24 +248,7 @@ def match_rule_by_delta(
     Given a delta (dict of overlay/variable changes), return ranked candidate rule IDs.
     Supports partial/approximate matching.
     """
-    if fingerprints is None:
-        fingerprints = get_all_rule_fingerprints()
-    results = []
-    for rule in fingerprints:
-        effects = rule.get("effects", {})
-        # Check if effects is a dictionary before trying to use it as one
-        if not isinstance(effects, dict):
-            continue
-
-        match_keys = set(delta) & set(effects)
-        if not match_keys:
-            continue
-        score = sum(abs(effects[k] - delta[k]) < 1e-3 for k in match_keys) / max(
-            len(effects), 1
-        )
-        if score >= min_match:
-            results.append((rule.get("rule_id") or rule.get("id"), score))
-    return sorted(results, key=lambda x: -x[1])
+    return get_matcher(fingerprints).match_batch([delta], min_match)[0]
 
 
 def fuzzy_match_rule_by_delta(
@@ -72,16 +262,6 @@ def fuzzy_match_rule_by_delta(
     Fuzzy match: allow numeric differences up to tol (absolute).
     Returns list of (rule_id, confidence_score) above min_conf and confidence_threshold.
     """
-    if fingerprints is None:
-        fingerprints = get_all_rule_fingerprints()
-    matches = []
-    for rule in fingerprints:
-        diffs = [
-            abs(delta.get(k, 0) - rule.get("effects", {}).get(k, 0)) for k in delta
-        ]
-        max_diff = max(diffs) if diffs else 0
-        if all(d <= tol for d in diffs):
-            confidence = 1 - max_diff
-            if confidence >= min_conf and confidence >= confidence_threshold:
-                matches.append((rule.get("rule_id", "unknown"), confidence))
-    return sorted(matches, key=lambda x: -x[1])
+    return get_matcher(fingerprints).fuzzy_match_batch(
+        [delta], tol, min_conf, confidence_threshold
+    )[0]
@@ -37,6 +37,8 @@ class RuleRegistry:
         self.static_rules = []
         self.fingerprint_rules = []
         self.candidate_rules = []
+        # Bumped whenever the rule set changes, so matchers can be rebuilt
+        self.version = 0
 
     def load_static_rules(self):
         try:
@@ -70,6 +72,7 @@ class RuleRegistry:
         self.load_fingerprint_rules()
         self.load_candidate_rules()
         self.rules = self.static_rules + self.fingerprint_rules + self.candidate_rules
+        self.version += 1
 
     def get_rules_by_type(self, rule_type: str):
         return [r for r in self.rules if r.get("type") == rule_type]
@@ -93,6 +96,7 @@ class RuleRegistry:
             if field not in rule:
                 raise ValueError(f"Rule missing required field: {field}")
         self.rules.append(rule)
+        self.version += 1
         print(f"[RuleRegistry] Rule added: {rule.get('id') or rule.get('rule_id')}")
 
     def promote_candidate(self, rule_id: str):
@@ -102,6 +106,7 @@ class RuleRegistry:
                 rule["enabled"] = True
                 self.rules.append(rule)
                 self.candidate_rules.remove(rule)
+                self.version += 1
                 print(f"[RuleRegistry] Candidate promoted: {rule_id}")
                 return
         print(f"[RuleRegistry] Candidate rule not found: {rule_id}")
@@ -10,10 +10,24 @@ This module ensures the symbolic system adds minimal overhead,
 especially during training/retrodiction operations.
 """
 
+import dataclasses
 import functools
+import sys
+import threading
 import time
 import logging
-from typing import Any, Tuple, Callable, ParamSpec, TypeVar, Dict, Optional, cast
+from collections import OrderedDict
+from typing import (
+    Any,
+    Tuple,
+    Callable,
+    Hashable,
+    ParamSpec,
+    TypeVar,
+    Dict,
+    Optional,
+    cast,
+)
 from engine.pulse_config import ENABLE_SYMBOLIC_SYSTEM
 
 P = ParamSpec("P")
@@ -23,83 +37,274 @@ R = TypeVar("R", bound=object)
 
 logger = logging.getLogger(__name__)
 
+# Nesting depth after which objects are keyed by identity
+_MAX_KEY_DEPTH = 32
+
+
+class _Tag:
+    """Marks the container type of a frozen value so that e.g. a list and a
+    tuple with the same items give different keys."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<{self.name}>"
+
+
+_DICT, _LIST, _SET, _OBJECT, _ARRAY = (
+    _Tag(name) for name in ("dict", "list", "set", "object", "array")
+)
+_DATACLASS_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _dataclass_fields(cls: type) -> Tuple[str, ...]:
+    names = _DATACLASS_FIELDS.get(cls)
+    if names is None:
+        names = _DATACLASS_FIELDS[cls] = tuple(f.name for f in dataclasses.fields(cls))
+    return names
+
+
+def _item_key(item: Tuple[Any, Any]) -> Any:
+    return item[0]
+
+
+def _sorted_items(obj: Dict[Any, Any]) -> list:
+    try:
+        return sorted(obj.items(), key=_item_key)
+    except TypeError:  # mixed key types
+        return sorted(obj.items(), key=lambda item: repr(item[0]))
+
+
+def freeze(obj: Any, _depth: int = 0) -> Hashable:
+    """
+    Convert a value into a hashable structural key.
+
+    Dicts (in any insertion order), lists, tuples, sets, dataclasses and
+    numpy arrays map to nested tuples of their contents, so equal values give
+    equal keys and keys compare by content: unlike ``str(args)``, different
+    values never collide. Other unhashable objects, and hashable objects
+    without value equality (e.g. the instance of a cached method), are keyed
+    by identity. As with functools.lru_cache, ``1`` and ``1.0`` are equal.
+
+    Flat containers of hashable values take a fast path that stays in C.
+    """
+    kind = type(obj)
+    if kind is str or kind is float or kind is int or obj is None or kind is bool:
+        return obj
+    if _depth >= _MAX_KEY_DEPTH:
+        return (_OBJECT, id(obj))
+    if isinstance(obj, dict):
+        items = tuple(_sorted_items(obj))
+        try:
+            hash(items)
+        except TypeError:
+            items = tuple((k, freeze(v, _depth + 1)) for k, v in items)
+        return (_DICT, items)
+    if isinstance(obj, (list, tuple)):
+        items = tuple(obj)
+        try:
+            hash(items)
+        except TypeError:
+            items = tuple(freeze(v, _depth + 1) for v in items)
+        return (_LIST, items) if isinstance(obj, list) else items
+    if isinstance(obj, (set, frozenset)):
+        try:
+            return (_SET, frozenset(obj))
+        except TypeError:
+            return (_SET, frozenset(freeze(v, _depth + 1) for v in obj))
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return (kind,) + tuple(
+            freeze(getattr(obj, name), _depth + 1) for name in _dataclass_fields(kind)
+        )
+    if hasattr(obj, "dtype") and hasattr(obj, "tobytes") and hasattr(obj, "shape"):
+        # numpy arrays and scalars
+        return (_ARRAY, str(obj.dtype), obj.shape, obj.tobytes())
+    try:
+        hash(obj)
+    except TypeError:
+        return (_OBJECT, id(obj))
+    return obj
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value, 64)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in value)
+    return size
+
 
 class SymbolicCache:
-    """Cache for symbolic computations to avoid redundant processing"""
+    """
+    LRU cache for symbolic computations to avoid redundant processing.
+
+    Entries live in an OrderedDict in recency order, so lookups, inserts and
+    evictions are O(1). Entries can expire after a TTL, the total estimated
+    size is bounded by max_bytes, and statistics are kept per namespace
+    (one namespace per cached_symbolic function).
+    """
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: int = 300):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: Optional[float] = 300,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize the cache with size and time-to-live limits.
 
         Args:
             max_size: Maximum number of entries in cache
-            ttl_seconds: Time-to-live in seconds for cache entries
+            ttl_seconds: Default time-to-live in seconds (None never expires)
+            max_bytes: Maximum estimated size of all cached values
+            clock: Time source for expiry
         """
-        self.cache: Dict[str, Any] = {}  # Key -> Value
-        self.timestamps: Dict[str, float] = {}  # Key -> Timestamp
+        # Key -> (value, expires_at, size, namespace), least recently used first
+        self.cache: "OrderedDict[Hashable, Tuple[Any, float, int, str]]" = (
+            OrderedDict()
+        )
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
         self.hits = 0
         self.misses = 0
-
-    def get(self, key: str) -> Tuple[bool, Any]:
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.RLock()
+
+    def _namespace_stats(self, namespace: str) -> Dict[str, int]:
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces[namespace] = {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "expirations": 0,
+            }
+        return stats
+
+    def _remove(self, key: Hashable, reason: str) -> None:
+        _, _, size, namespace = self.cache.pop(key)
+        self.bytes -= size
+        if reason == "eviction":
+            self.evictions += 1
+            self._namespace_stats(namespace)["evictions"] += 1
+        elif reason == "expiration":
+            self.expirations += 1
+            self._namespace_stats(namespace)["expirations"] += 1
+
+    def get(self, key: Hashable, namespace: str = "") -> Tuple[bool, Any]:
         """
         Get a value from cache if it exists and is not expired.
 
         Args:
             key: Cache key
+            namespace: Statistics bucket (e.g. the cached function)
 
         Returns:
             Tuple of (found, value)
         """
-        if key not in self.cache:
-            self.misses += 1
-            return False, None
-
-        # Check if the entry has expired
-        if time.time() - self.timestamps[key] > self.ttl_seconds:
-            del self.cache[key]
-            del self.timestamps[key]
-            self.misses += 1
-            return False, None
-
-        self.hits += 1
-        return True, self.cache[key]
-
-    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                stats["misses"] += 1
+                return False, None
+
+            # Check if the entry has expired
+            if entry[1] <= self.clock():
+                self._remove(key, "expiration")
+                self.misses += 1
+                stats["misses"] += 1
+                return False, None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            stats["hits"] += 1
+            return True, entry[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        namespace: str = "",
+    ) -> None:
         """
-        Store a value in the cache.
+        Store a value in the cache, evicting least recently used entries.
 
         Args:
             key: Cache key
             value: Value to store
+            ttl_seconds: Overrides the default time-to-live
+            namespace: Statistics bucket (e.g. the cached function)
         """
-        # If cache is full, remove oldest entry
-        if len(self.cache) >= self.max_size:
-            # Use lambda instead of .get method for better type compatibility
-            oldest_key = min(self.timestamps, key=lambda k: self.timestamps[k])
-            del self.cache[oldest_key]
-            del self.timestamps[oldest_key]
-
-        self.cache[key] = value
-        self.timestamps[key] = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = float("inf") if ttl is None else self.clock() + ttl
+        size = estimate_size(value)
+        with self._lock:
+            if key in self.cache:
+                self._remove(key, "replace")
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything and still not fit
+            self.cache[key] = (value, expires_at, size, namespace)
+            self.bytes += size
+            while len(self.cache) > self.max_size or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self.cache)), "eviction")
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries; returns the number removed."""
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, entry in self.cache.items() if entry[1] <= now]
+            for key in expired:
+                self._remove(key, "expiration")
+            return len(expired)
 
     def clear(self) -> None:
         """Clear the cache"""
-        self.cache = {}
-        self.timestamps = {}
+        with self._lock:
+            self.cache.clear()
+            self.bytes = 0
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total = self.hits + self.misses
-        hit_rate = self.hits / total if total > 0 else 0
-
-        return {
-            "size": len(self.cache),
-            "hit_rate": hit_rate,
-            "hits": self.hits,
-            "misses": self.misses,
-        }
+        with self._lock:
+            total = self.hits + self.misses
+            hit_rate = self.hits / total if total > 0 else 0
+
+            return {
+                "size": len(self.cache),
+                "bytes": self.bytes,
+                "hit_rate": hit_rate,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "functions": {
+                    name: dict(stats) for name, stats in self._namespaces.items()
+                },
+            }
 
 
 # Create a singleton cache instance
@@ -113,19 +318,30 @@ def get_symbolic_cache() -> SymbolicCache:
 
 
 def cached_symbolic(
-    ttl_seconds: int = 60,
+    ttl_seconds: Optional[float] = 60,
+    key: Optional[Callable[..., Any]] = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Decorator for caching symbolic computation results.
 
+    Keys are structural keys of the arguments (see freeze).
+    The wrapper exposes ``cache_stats()`` with the hit/miss/eviction counts
+    of the decorated function.
+
     Args:
-        ttl_seconds: Time-to-live in seconds for cache entries
+        ttl_seconds: Time-to-live in seconds for cache entries (None uses
+            the cache default)
+        key: Optional function of the call arguments returning what the
+            result depends on; hashing e.g. ``state.overlays`` instead of a
+            whole WorldState keeps lookups cheaper than recomputation
 
     Returns:
         Decorated function with caching
     """
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             # Only use cache if symbolic system is enabled
@@ -133,21 +349,28 @@ def cached_symbolic(
                 return func(*args, **kwargs)
 
             # Generate cache key from function name and arguments
-            key_parts = [func.__name__]
-            key_parts.extend(str(arg) for arg in args)
-            key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
-            cache_key = ":".join(key_parts)
+            if key is not None:
+                cache_key = (namespace, freeze(key(*args, **kwargs)))
+            else:
+                cache_key = (namespace, freeze(args), freeze(kwargs))
 
             # Try to get from cache
-            found, cached_result = _symbolic_cache.get(cache_key)
+            found, cached_result = _symbolic_cache.get(cache_key, namespace)
             if found:
                 return cast(R, cached_result)
 
             # Compute and cache result
             result = func(*args, **kwargs)
-            _symbolic_cache.set(cache_key, result)
+            _symbolic_cache.set(cache_key, result, ttl_seconds, namespace)
             return result
 
+        def cache_stats() -> Dict[str, int]:
+            stats = _symbolic_cache.get_stats()["functions"]
+            return stats.get(
+                namespace, {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+            )
+
+        wrapper.cache_stats = cache_stats  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
@@ -138,7 +138,7 @@ def apply_overlay_interactions(state: WorldState) -> None:
     return None
 
 
-@cached_symbolic(ttl_seconds=300)
+@cached_symbolic(ttl_seconds=300, key=lambda state: state.overlays.as_dict())
 def get_overlay_summary(state: WorldState) -> Dict[str, Dict[str, float]]:
     """
     Generate a summary of the current overlay state with
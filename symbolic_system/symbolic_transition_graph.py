@@ -13,11 +13,15 @@ Author: Pulse AI Engine
 Version: v1.0.0
 """
 
+from __future__ import annotations
+
 from typing import List, Dict
-import networkx as nx
-import matplotlib.pyplot as plt
 from collections import Counter
 from symbolic_system.symbolic_flip_classifier import extract_transitions
+from utils.lazy_import import lazy_import
+
+nx = lazy_import("networkx")
+plt = lazy_import("matplotlib.pyplot")
 
 
 def build_symbolic_graph(forecasts: List[Dict]) -> nx.DiGraph:
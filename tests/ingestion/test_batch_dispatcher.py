@@ -0,0 +1,244 @@
+"""
+Tests for micro-batched ingestion dispatch, using an in-memory broker,
+an in-memory Kafka consumer and SQLite.
+"""
+
+from collections import namedtuple
+
+import pytest
+
+from ingestion.batch_dispatcher import (
+    DispatcherFullError,
+    MicroBatchDispatcher,
+    dispatch_database_rows,
+    dispatch_kafka,
+    mark_rows_processed,
+    next_offsets,
+)
+
+Message = namedtuple("Message", "topic partition offset value")
+
+
+class InMemoryBroker:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def send(self, payloads):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("broker unavailable")
+        self.batches.append(list(payloads))
+
+
+class InMemoryConsumer:
+    def __init__(self, polls):
+        self.polls = list(polls)
+
+    def poll(self, timeout_ms, max_records):
+        return self.polls.pop(0) if self.polls else {}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_flushes_by_size_and_age():
+    broker = InMemoryBroker()
+    clock = FakeClock()
+    dispatcher = MicroBatchDispatcher(
+        broker.send, max_batch_size=3, max_batch_age=2.0, clock=clock
+    )
+
+    for i in range(4):
+        dispatcher.add({"i": i})
+    assert broker.batches == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+
+    clock.now = 1.0
+    assert not dispatcher.poll()
+    clock.now = 2.5
+    assert dispatcher.poll()
+    assert broker.batches[-1] == [{"i": 3}]
+
+    metrics = dispatcher.metrics()
+    assert metrics["batches"] == 2 and metrics["dispatched"] == 4
+    assert metrics["pending"] == 0
+    assert metrics["max_batch_latency"] == pytest.approx(2.5)
+    assert metrics["throughput"] == pytest.approx(4 / 2.5)
+
+
+def test_failed_send_keeps_items_and_skips_commit():
+    broker = InMemoryBroker(fail_times=1)
+    committed = []
+    dispatcher = MicroBatchDispatcher(
+        broker.send, max_batch_size=10, on_commit=committed.extend
+    )
+    dispatcher.add({"a": 1}, ack=1)
+
+    assert not dispatcher.flush()
+    assert committed == [] and dispatcher.metrics()["pending"] == 1
+    assert dispatcher.flush()
+    assert committed == [1] and broker.batches == [[{"a": 1}]]
+    assert dispatcher.metrics()["send_failures"] == 1
+
+
+class CountingBroker(InMemoryBroker):
+    def __init__(self, fail_times=0):
+        super().__init__(fail_times)
+        self.attempts = 0
+
+    def send(self, payloads):
+        self.attempts += 1
+        super().send(payloads)
+
+
+def test_persistent_send_failure_backs_off_and_blocks():
+    broker = CountingBroker(fail_times=10**6)
+    clock = FakeClock()
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    dispatcher = MicroBatchDispatcher(
+        broker.send,
+        max_batch_size=2,
+        max_pending=6,
+        retry_backoff=1.0,
+        max_retry_backoff=4.0,
+        block_timeout=10.0,
+        clock=clock,
+        sleep=sleep,
+    )
+    for i in range(6):
+        dispatcher.add({"i": i})
+    # Only the first full batch tried to send; later adds wait for the backoff
+    assert broker.attempts == 1
+    assert dispatcher.metrics()["retry_in"] == pytest.approx(1.0)
+
+    with pytest.raises(DispatcherFullError):
+        dispatcher.add({"i": 6})
+    assert slept == [1.0, 2.0, 4.0]
+    metrics = dispatcher.metrics()
+    assert metrics["pending"] == 6 and metrics["send_failures"] == 4
+
+    # Once the broker recovers, the blocked add goes through
+    broker.fail_times = 0
+    clock.now += 4.0
+    assert dispatcher.add({"i": 6}, ack=6)
+    # The backlog drains in max_batch_size batches
+    assert broker.batches == [[{"i": i}, {"i": i + 1}] for i in range(0, 6, 2)]
+    metrics = dispatcher.metrics()
+    assert metrics["pending"] == 1 and metrics["retry_in"] == 0.0
+
+
+def test_drop_oldest_caps_pending_while_send_fails():
+    broker = CountingBroker(fail_times=10**6)
+    clock = FakeClock()
+    committed = []
+    dispatcher = MicroBatchDispatcher(
+        broker.send,
+        max_batch_size=2,
+        max_batch_age=1.0,
+        max_pending=4,
+        overflow="drop_oldest",
+        retry_backoff=5.0,
+        on_commit=committed.extend,
+        clock=clock,
+    )
+    for i in range(10):
+        dispatcher.add({"i": i}, ack=i)
+    assert broker.attempts == 1
+    metrics = dispatcher.metrics()
+    assert metrics["pending"] == 4 and metrics["dropped"] == 6
+
+    broker.fail_times = 0
+    clock.now = 2.0
+    assert not dispatcher.poll()  # still backing off
+    clock.now = 5.0
+    assert dispatcher.poll()
+    assert committed == [6, 7, 8, 9]
+
+
+def test_kafka_offsets_committed_per_batch():
+    broker = InMemoryBroker()
+    commits = []
+    consumer = InMemoryConsumer(
+        [
+            {
+                ("t", 0): [
+                    Message("t", 0, i, {"name": "s", "value": i}) for i in range(5)
+                ],
+                ("t", 1): [
+                    Message("t", 1, 7, "not-a-dict"),
+                    Message("t", 1, 8, {"name": "s", "value": 8}),
+                ],
+            }
+        ]
+    )
+    dispatcher = MicroBatchDispatcher(
+        broker.send,
+        max_batch_size=4,
+        on_commit=lambda messages: commits.append(next_offsets(messages)),
+    )
+
+    dispatch_kafka(consumer, dispatcher, max_polls=2)
+
+    assert [len(batch) for batch in broker.batches] == [4, 2]
+    assert commits == [{("t", 0): 4}, {("t", 0): 5, ("t", 1): 9}]
+
+
+def test_database_rows_marked_processed_per_batch(tmp_path):
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'signals.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text(
+                "CREATE TABLE signals (id INTEGER PRIMARY KEY, name TEXT, value REAL, "
+                "source TEXT, timestamp TEXT, processed INTEGER DEFAULT 0)"
+            )
+        )
+        conn.execute(
+            sqlalchemy.text(
+                "INSERT INTO signals (id, name, value, source, timestamp) "
+                "VALUES (:id, 'sig', :id, 'db', '2025-01-01')"
+            ),
+            [{"id": i} for i in range(1, 8)],
+        )
+
+    query = (
+        "SELECT id, name, value, source, timestamp FROM signals "
+        "WHERE processed=0 ORDER BY id ASC"
+    )
+    mark = "UPDATE signals SET processed=1 WHERE id=:id"
+    broker = InMemoryBroker(fail_times=100)
+    dispatcher = MicroBatchDispatcher(
+        broker.send,
+        max_batch_size=3,
+        on_commit=lambda ids: mark_rows_processed(engine, mark, ids),
+    )
+
+    # Broker down: nothing is marked and nothing stays buffered
+    assert dispatch_database_rows(engine, dispatcher, query) == 7
+    assert dispatcher.metrics()["pending"] == 0
+    unprocessed = "SELECT COUNT(*) FROM signals WHERE processed=0"
+    with engine.connect() as conn:
+        assert conn.execute(sqlalchemy.text(unprocessed)).scalar() == 7
+
+    broker.fail_times = 0
+    assert dispatch_database_rows(engine, dispatcher, query) == 7
+    assert [len(batch) for batch in broker.batches] == [3, 3, 1]
+    assert broker.batches[0][0] == {
+        "name": "sig",
+        "value": 1.0,
+        "source": "db",
+        "timestamp": "2025-01-01",
+    }
+    with engine.connect() as conn:
+        assert conn.execute(sqlalchemy.text(unprocessed)).scalar() == 0
+    assert dispatch_database_rows(engine, dispatcher, query) == 0
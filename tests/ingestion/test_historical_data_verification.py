@@ -0,0 +1,146 @@
+"""
+Tests for the vectorized historical data verification checks.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion.utils import historical_data_verification as hdv
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2020-01-01", periods=400, freq="D")
+    values = 50 + np.sin(np.arange(400) * 2 * np.pi / 7) + rng.normal(0, 0.1, 400)
+    values[[120, 300]] = 80.0
+    return pd.Series(values, index=index, name="test_var")
+
+
+def test_detect_gaps_groups_missing_runs(series):
+    drop = list(range(10, 15)) + [40, 42] + list(range(200, 230))
+    gappy = series.drop(series.index[drop])
+
+    gaps = hdv.detect_gaps(gappy, freq="D")
+
+    assert [gap.expected_points for gap in gaps] == [5, 2, 30]
+    assert gaps[1].start_time == series.index[40]
+    assert gaps[1].end_time == series.index[42]
+    assert [gap.expected_points for gap in hdv.detect_gaps(gappy, freq="auto")] == [
+        5,
+        2,
+        30,
+    ]
+
+
+def test_detect_anomalies_flags_spikes(series):
+    for method in ("zscore", "iqr"):
+        anomalies = hdv.detect_anomalies(series, method=method)
+        assert {a.timestamp for a in anomalies} == {
+            series.index[120].to_pydatetime(),
+            series.index[300].to_pydatetime(),
+        }
+
+    contextual = hdv.detect_anomalies(series, threshold=3.0, window_size=15)
+    assert series.index[120].to_pydatetime() in {a.timestamp for a in contextual}
+
+
+def test_trend_break_slopes_match_linregress():
+    from scipy.stats import linregress
+
+    values = np.concatenate([np.arange(100) * 0.1, 10 - np.arange(100) * 0.5])
+    series = pd.Series(values, index=pd.date_range("2021-01-01", periods=200))
+
+    breaks = hdv.detect_trend_breaks(series, window_size=20, threshold=2.0)
+
+    assert breaks
+    x = np.arange(20)
+    for trend_break in breaks:
+        start = series.index.get_loc(trend_break.timestamp) - 20
+        assert trend_break.before_trend == pytest.approx(
+            linregress(x, values[start : start + 20]).slope
+        )
+        assert trend_break.after_trend == pytest.approx(
+            linregress(x, values[start + 1 : start + 21]).slope
+        )
+
+
+def test_autocorrelation_function_matches_per_lag(series):
+    acf = hdv.autocorrelation_function(series.values, 30)
+    for lag in (1, 7, 14, 30):
+        assert acf[lag] == pytest.approx(
+            hdv.calculate_autocorrelation(series, lag), abs=1e-9
+        )
+
+    pacf = hdv.partial_autocorrelation_function(acf, 5)
+    toeplitz = np.array([[acf[abs(i - j)] for j in range(5)] for i in range(5)])
+    assert pacf[5] == pytest.approx(np.linalg.solve(toeplitz, acf[1:6])[-1])
+
+    seasonality = hdv.detect_seasonality(series.clip(upper=52), periods=[7, 30])
+    assert seasonality["has_seasonality"]
+    assert seasonality["strongest_period"] == 7
+
+
+def test_partial_autocorrelation_recovers_ar2_coefficients():
+    phi1, phi2 = 0.6, -0.3
+    # Theoretical AR(2) autocorrelations from the Yule-Walker equations
+    acf = np.empty(6)
+    acf[0], acf[1] = 1.0, phi1 / (1 - phi2)
+    for k in range(2, 6):
+        acf[k] = phi1 * acf[k - 1] + phi2 * acf[k - 2]
+
+    pacf = hdv.partial_autocorrelation_function(acf, 5)
+    assert pacf[1] == pytest.approx(acf[1])
+    assert pacf[2] == pytest.approx(phi2)
+    assert pacf[3:] == pytest.approx([0.0, 0.0, 0.0], abs=1e-12)
+
+    rng = np.random.default_rng(11)
+    noise = rng.normal(size=20000)
+    values = np.zeros_like(noise)
+    for t in range(2, len(values)):
+        values[t] = phi1 * values[t - 1] + phi2 * values[t - 2] + noise[t]
+    simulated = pd.Series(values)
+    assert hdv.calculate_partial_autocorrelation(simulated, 2) == pytest.approx(
+        phi2, abs=0.03
+    )
+    assert hdv.calculate_partial_autocorrelation(simulated, 3) == pytest.approx(
+        0.0, abs=0.03
+    )
+
+
+def test_perform_quality_checks_preserves_order(series, monkeypatch):
+    monkeypatch.setattr(hdv, "load_processed_data", lambda name: series)
+
+    sequential = hdv.perform_quality_checks(["a", "b"], max_workers=1)
+    assert list(sequential) == ["a", "b"]
+    assert sequential["a"].quality_score.completeness == pytest.approx(1.0)
+    assert len(sequential["a"].anomalies) == 2
+
+    single = hdv.perform_quality_check("a", _series=series.sample(frac=1.0))
+    assert single.statistics["start_date"] == series.index[0].isoformat()
+    assert single.quality_score.time_continuity == pytest.approx(1.0)
+
+
+def test_perform_quality_checks_keeps_results_when_one_check_fails(
+    series, monkeypatch
+):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def worker(args):
+        if args[0] == "bad":
+            raise RuntimeError("worker died")
+        return hdv.perform_quality_check(args[0], _series=series)
+
+    # Threads stand in for the process pool so the failing worker is patchable
+    monkeypatch.setattr(
+        hdv,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+    monkeypatch.setattr(hdv, "_quality_check_worker", worker)
+
+    results = hdv.perform_quality_checks(["a", "bad", "b"], max_workers=3)
+
+    assert list(results) == ["a", "b"]
+    assert results["b"].quality_score.completeness == pytest.approx(1.0)
@@ -0,0 +1,174 @@
+"""
+Tests for concurrent IrisPluginManager runs and the pooled iris_http client,
+against a local mock HTTP server.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ingestion.iris_http import PluginBudgetExceeded, PooledHttpClient, plugin_scope
+from ingestion.iris_plugins import IrisPluginManager
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = {"full": 0, "not_modified": 0}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(float(self.path.split("=")[-1]))
+        if self.path.startswith("/etag"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                _Handler.hits["not_modified"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            _Handler.hits["full"] += 1
+        body = b'{"value": 1.5}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = PooledHttpClient(cache_dir=str(tmp_path / "cache"))
+    yield client
+    client.close()
+
+
+def test_conditional_cache_serves_304_from_disk(server, client):
+    _Handler.hits.update(full=0, not_modified=0)
+    first = client.get(f"{server}/etag", params={"q": "x"})
+    second = client.get(f"{server}/etag", params={"q": "x"})
+
+    assert first.json() == second.json() == {"value": 1.5}
+    assert not first.from_cache and second.from_cache
+    assert _Handler.hits == {"full": 1, "not_modified": 1}
+    assert client.stats["cache_hits"] == 1
+
+
+def test_304_with_missing_body_refetches(server, client):
+    _Handler.hits.update(full=0, not_modified=0)
+    client.get(f"{server}/etag", params={"q": "gone"})
+    _, body_path = client._cache_paths(f"{server}/etag", {"q": "gone"})
+    os.remove(body_path)
+
+    response = client.get(f"{server}/etag", params={"q": "gone"})
+
+    assert response.status_code == 200 and not response.from_cache
+    assert response.json() == {"value": 1.5}
+    assert _Handler.hits == {"full": 2, "not_modified": 1}
+    assert os.path.exists(body_path)
+
+
+def test_cache_evicts_least_recently_used(server, tmp_path):
+    client = PooledHttpClient(cache_dir=str(tmp_path / "cache"), max_cache_entries=2)
+    try:
+        for q in ("a", "b", "c"):
+            client.get(f"{server}/etag", params={"q": q})
+            time.sleep(0.02)
+        cached = {
+            q: os.path.exists(client._cache_paths(f"{server}/etag", {"q": q})[0])
+            for q in ("a", "b", "c")
+        }
+    finally:
+        client.close()
+
+    assert cached == {"a": False, "b": True, "c": True}
+    assert client.stats["cache_evictions"] == 1
+
+
+def test_plugin_scope_enforces_budget(server, client):
+    with plugin_scope("budgeted", budget=1):
+        client.get(f"{server}/plain", use_cache=False)
+        with pytest.raises(PluginBudgetExceeded):
+            client.get(f"{server}/plain", use_cache=False)
+
+
+def test_plugins_run_concurrently(server, client):
+    manager = IrisPluginManager()
+
+    def make_plugin(i):
+        def plugin():
+            value = client.get(f"{server}/slow?d=0.5", use_cache=False).json()["value"]
+            return [{"name": f"sig_{i}", "value": value}]
+
+        plugin.__name__ = f"plugin_{i}"
+        return plugin
+
+    for i in range(4):
+        manager.register_plugin(make_plugin(i))
+
+    started = time.monotonic()
+    signals = manager.run_plugins(max_workers=4)
+    elapsed = time.monotonic() - started
+
+    assert sorted(s["name"] for s in signals) == [f"sig_{i}" for i in range(4)]
+    assert elapsed < 1.5  # sequential would take >= 2s
+
+
+def test_slow_plugin_times_out_without_blocking_others(server, client):
+    manager = IrisPluginManager()
+
+    def fast_plugin():
+        return [{"name": "fast", "value": 1.0}]
+
+    def slow_plugin():
+        client.get(f"{server}/slow?d=2", use_cache=False)
+        return [{"name": "slow", "value": 2.0}]
+
+    def broken_plugin():
+        raise RuntimeError("boom")
+
+    for plugin in (slow_plugin, fast_plugin, broken_plugin):
+        manager.register_plugin(plugin)
+
+    started = time.monotonic()
+    results = list(manager.iter_plugin_results(timeout=0.5))
+    elapsed = time.monotonic() - started
+
+    assert results == [("fast_plugin", [{"name": "fast", "value": 1.0}])]
+    assert elapsed < 1.5
+    assert manager.last_run_stats["slow_plugin"]["status"] == "timeout"
+    assert manager.last_run_stats["broken_plugin"]["status"] == "failed"
+
+
+def test_timeout_counts_from_plugin_start_not_submission():
+    manager = IrisPluginManager()
+
+    def make_plugin(i):
+        def plugin():
+            time.sleep(0.3)
+            return [{"name": f"sig_{i}", "value": 1.0}]
+
+        plugin.__name__ = f"plugin_{i}"
+        return plugin
+
+    for i in range(4):
+        manager.register_plugin(make_plugin(i))
+
+    # One worker: the last plugin is queued for ~0.9s, well past its timeout
+    results = list(manager.iter_plugin_results(max_workers=1, timeout=0.6))
+
+    assert len(results) == 4
+    assert all(stats["status"] == "ok" for stats in manager.last_run_stats.values())
@@ -0,0 +1,110 @@
+"""
+Tests for streaming anomaly scoring in IrisTrustScorer and batch ingestion in IrisScraper.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from ingestion.iris_trust import IrisTrustScorer, WelfordWindow
+
+
+def test_welford_window_matches_numpy():
+    window = WelfordWindow(5)
+    values = [3.0, 1.5, 4.0, 10.0, -2.0, 7.5, 0.25, 6.0]
+    for i, value in enumerate(values):
+        window.add(value)
+        expected = values[max(0, i - 4) : i + 1]
+        assert window.mean == pytest.approx(np.mean(expected))
+        assert window.std == pytest.approx(np.std(expected))
+
+
+def test_zscore_windows_are_per_signal():
+    scorer = IrisTrustScorer()
+    for i in range(20):
+        assert not scorer.detect_anomaly_zscore(1.0 + 0.01 * (i % 3), "a")
+        assert not scorer.detect_anomaly_zscore(1000.0 + (i % 3), "b")
+    # A value normal for "b" is anomalous for "a"
+    assert scorer.detect_anomaly_zscore(1000.0, "a")
+    assert not scorer.detect_anomaly_zscore(1001.0, "b")
+
+
+def test_isolation_model_refits_periodically():
+    scorer = IrisTrustScorer(isolation_min_samples=20, refit_interval=50)
+    rng = np.random.default_rng(0)
+    assert scorer.detect_anomaly_isolation_batch(list(rng.normal(size=10)), "x") == [
+        False
+    ] * 10
+
+    scorer.detect_anomaly_isolation_batch(list(rng.normal(size=20)), "x")
+    model = scorer._isolation["x"].model
+    assert model is not None
+
+    scorer.detect_anomaly_isolation_batch(list(rng.normal(size=10)), "x")
+    assert scorer._isolation["x"].model is model  # not refit yet
+    flags = scorer.detect_anomaly_isolation_batch([0.0, 50.0], "x")
+    assert flags == [False, True]
+
+
+def test_score_signals_batch():
+    scorer = IrisTrustScorer()
+    now = datetime.now(timezone.utc)
+    signals = [{"name": "s", "value": 1.0, "timestamp": now} for _ in range(15)]
+    signals.append({"name": "s", "value": 100.0, "timestamp": now})
+    results = scorer.score_signals(signals)
+    assert len(results) == 16
+    assert results[-1]["anomaly_flag"] and results[-1]["sti"] == pytest.approx(0.7)
+    assert not results[0]["anomaly_flag"] and results[0]["sti"] == pytest.approx(0.9)
+
+
+def test_scraper_ingest_signals_batch(tmp_path, monkeypatch):
+    from ingestion import iris_archive, iris_scraper
+
+    monkeypatch.setattr(iris_archive, "ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        iris_archive, "ARCHIVE_FILE", str(tmp_path / "signals_archive.jsonl")
+    )
+    monkeypatch.setattr(iris_scraper, "SIGNAL_LOG_DIR", str(tmp_path))
+    scraper = iris_scraper.IrisScraper()
+
+    records = scraper.ingest_signals(
+        [
+            {"name": "hope_index", "value": 0.8, "source": "p"},
+            {"name": "missing_value"},
+            {"name": "bad", "value": "n/a"},
+            {"name": "rage_level", "value": 0.3},
+        ]
+    )
+    assert [r["name"] for r in records] == ["hope_index", "rage_level"]
+    assert records[1]["source"] == "plugin"
+    assert scraper.archive.count_signals() == 2
+    assert len(scraper.signal_log) == 2
+
+
+def test_scraper_normalises_timestamps_before_scoring(tmp_path, monkeypatch):
+    from ingestion import iris_archive, iris_scraper
+
+    monkeypatch.setattr(iris_archive, "ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        iris_archive, "ARCHIVE_FILE", str(tmp_path / "signals_archive.jsonl")
+    )
+    monkeypatch.setattr(iris_scraper, "SIGNAL_LOG_DIR", str(tmp_path))
+    scraper = iris_scraper.IrisScraper()
+
+    now = datetime.now(timezone.utc)
+    records = scraper.ingest_signals(
+        [
+            {"name": "hope_index", "value": 0.8, "timestamp": now},
+            {"name": "rage_level", "value": 0.3, "timestamp": now.isoformat()},
+            {"name": "fatigue", "value": 0.5, "timestamp": "2024-01-01T00:00:00"},
+            {"name": "bad_time", "value": 0.1, "timestamp": "yesterday"},
+        ]
+    )
+    assert [r["name"] for r in records] == ["hope_index", "rage_level", "fatigue"]
+    assert records[1]["timestamp"] == now.isoformat()
+    assert records[2]["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert records[1]["recency_score"] == pytest.approx(1.0, abs=1e-3)
+    # The skipped signal never reached the trust engine's z-score windows
+    assert "bad_time" not in scraper.trust_engine._zscore_windows
+    assert scraper.archive.count_signals() == 3
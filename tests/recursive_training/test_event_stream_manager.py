@@ -0,0 +1,147 @@
+"""
+Tests for the batched EventStreamManager pipeline.
+"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from recursive_training.regime_sensor.event_stream_manager import (
+    Event,
+    EventPriority,
+    EventStreamManager,
+    EventType,
+)
+
+
+def make_event(i, event_type=EventType.NEWS, priority=EventPriority.MEDIUM):
+    return Event(
+        event_id=f"evt_{i}",
+        source="test",
+        event_type=event_type,
+        timestamp=datetime(2024, 1, 1),
+        content=f"headline {i}",
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return EventStreamManager(
+        {
+            "storage_path": str(tmp_path / "events"),
+            "batch_size": 4,
+            "history_limit": 5,
+            "segment_max_events": 3,
+            "max_queue_size": 50,
+        }
+    )
+
+
+def test_batch_handlers_receive_drained_batches(manager):
+    batches = []
+    per_event = []
+    manager.register_batch_handler(EventType.NEWS, batches.append)
+    manager.register_event_handler(EventType.NEWS, per_event.append)
+
+    manager.ingest_events_batch([make_event(i) for i in range(10)])
+    assert manager.process_pending() == 10
+
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert len(per_event) == 10
+    assert all(e.processed for e in per_event)
+
+
+def test_priority_order_with_equal_timestamps(manager):
+    seen = []
+    manager.register_event_handler(EventType.NEWS, seen.append)
+    events = [make_event(i) for i in range(3)]
+    events.append(make_event(99, priority=EventPriority.CRITICAL))
+    manager.ingest_events_batch(events)
+    manager.process_pending()
+    assert [e.event_id for e in seen] == ["evt_99", "evt_0", "evt_1", "evt_2"]
+
+
+def test_general_batch_handler_sees_every_event_once(manager):
+    general = []
+    manager.register_batch_handler(EventType.CUSTOM, general.append)
+    manager.ingest_events_batch(
+        [
+            make_event(0),
+            make_event(1, EventType.CUSTOM),
+            make_event(2, EventType.REGULATORY),
+        ]
+    )
+    manager.process_pending()
+    assert len(general) == 1
+    assert sorted(e.event_id for e in general[0]) == ["evt_0", "evt_1", "evt_2"]
+
+
+def test_history_is_capped_lru(manager):
+    manager.register_event_handler(EventType.NEWS, lambda e: None)
+    manager.ingest_events_batch([make_event(i) for i in range(5)])
+    manager.process_pending()
+    # Touch the oldest entry so it survives eviction
+    assert manager.get_event_by_id("evt_0") is not None
+
+    manager.ingest_events_batch([make_event(i) for i in range(5, 8)])
+    manager.process_pending()
+
+    assert len(manager.event_history) == 5
+    assert manager.get_event_by_id("evt_0") is not None
+    assert manager.get_event_by_id("evt_1") is None
+    assert manager.get_metrics()["history_evictions"] == 3
+
+
+def test_events_append_to_rolling_segments(manager):
+    manager.ingest_events_batch([make_event(i) for i in range(7)])
+    manager.close_segment()
+
+    segments = [n for n in os.listdir(manager.storage_path) if n.endswith(".jsonl")]
+    assert len(segments) == 3
+    stored = manager.load_stored_events()
+    assert sorted(e.event_id for e in stored) == sorted(f"evt_{i}" for i in range(7))
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    manager = EventStreamManager(
+        {"storage_enabled": False, "max_queue_size": 2, "storage_path": str(tmp_path)}
+    )
+    manager.ingest_events_batch([make_event(i) for i in range(5)])
+    metrics = manager.get_metrics()
+    assert metrics["events_ingested"] == 2
+    assert metrics["events_dropped"] == 3
+
+
+def test_handler_errors_do_not_stop_batch(manager):
+    def broken(event):
+        raise ValueError("boom")
+
+    seen = []
+    manager.register_event_handler(EventType.NEWS, broken)
+    manager.register_batch_handler(EventType.NEWS, seen.extend)
+    manager.ingest_events_batch([make_event(i) for i in range(3)])
+    manager.process_pending()
+    assert len(seen) == 3
+    assert manager.get_metrics()["handler_errors"] == 3
+
+
+def test_background_thread_reports_throughput(manager):
+    seen = []
+    manager.register_batch_handler(EventType.NEWS, seen.extend)
+    manager.start()
+    try:
+        manager.ingest_events_batch([make_event(i) for i in range(20)])
+        deadline = time.time() + 5
+        while len(seen) < 20 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        manager.stop()
+
+    metrics = manager.get_metrics()
+    assert metrics["events_processed"] == 20
+    assert metrics["max_batch_size"] <= 4
+    assert metrics["avg_latency_seconds"] >= 0.0
+    assert metrics["throughput_events_per_sec"] > 0
@@ -0,0 +1,135 @@
+"""
+Tests for the RetrodictionTrigger worker pool, deduplication and cancellation.
+"""
+
+import os
+import threading
+
+import pytest
+
+from recursive_training.regime_sensor.retrodiction_trigger import (
+    RetrodictionSnapshot,
+    RetrodictionTrigger,
+    TriggerPriority,
+)
+
+
+def record_worker_pid(snapshot):
+    # Top-level so it can be pickled into "process" worker mode
+    snapshot.results["pid"] = os.getpid()
+
+
+@pytest.fixture
+def trigger():
+    return RetrodictionTrigger(
+        {
+            "storage_enabled": False,
+            "auto_trigger_enabled": False,
+            "worker_count": 3,
+            "dedup_window_seconds": 60,
+        }
+    )
+
+
+def test_pending_snapshots_processed_by_priority(trigger):
+    order = []
+    trigger.register_handler(lambda s: order.append(s.snapshot_id))
+    low = trigger.trigger_manual_snapshot(["a"], priority=TriggerPriority.LOW)
+    mid = trigger.trigger_manual_snapshot(["b"], priority=TriggerPriority.MEDIUM)
+    crit = trigger.trigger_manual_snapshot(["c"], priority=TriggerPriority.CRITICAL)
+
+    assert trigger.process_pending() == 3
+    assert order == [crit.snapshot_id, mid.snapshot_id, low.snapshot_id]
+    assert all(s.processed for s in (low, mid, crit))
+
+
+def test_identical_snapshots_are_deduplicated(trigger):
+    first = trigger.trigger_manual_snapshot(["x", "y"])
+    second = trigger.trigger_manual_snapshot(["y", "x"])
+    assert second is first
+    assert trigger.get_stats()["deduplicated"] == 1
+    assert trigger.process_pending() == 1
+
+
+def test_higher_priority_supersedes_pending(trigger):
+    seen = []
+    trigger.register_handler(lambda s: seen.append(s.snapshot_id))
+    narrow = trigger.trigger_manual_snapshot(["x"], priority=TriggerPriority.LOW)
+    same = trigger.trigger_manual_snapshot(["x", "y"], priority=TriggerPriority.LOW)
+    urgent = trigger.trigger_manual_snapshot(
+        ["x", "y"], priority=TriggerPriority.CRITICAL
+    )
+
+    assert urgent is not same
+    assert narrow.cancelled and same.cancelled
+    assert narrow.metadata["superseded_by"] == urgent.snapshot_id
+    assert trigger.process_pending() == 1
+    assert seen == [urgent.snapshot_id]
+    assert trigger.get_stats()["cancelled"] == 2
+
+
+def test_cancel_snapshot(trigger):
+    snapshot = trigger.trigger_manual_snapshot(["z"])
+    assert trigger.cancel_snapshot(snapshot.snapshot_id)
+    assert not trigger.cancel_snapshot(snapshot.snapshot_id)
+    assert trigger.process_pending() == 0
+    assert RetrodictionSnapshot.from_dict(snapshot.to_dict()).cancelled
+
+
+def test_retrigger_after_cancel_is_queued(trigger):
+    seen = []
+    trigger.register_handler(lambda s: seen.append(s.snapshot_id))
+    cancelled = trigger.trigger_manual_snapshot(["z"])
+    trigger.cancel_snapshot(cancelled.snapshot_id)
+
+    again = trigger.trigger_manual_snapshot(["z"])
+
+    assert again is not cancelled and not again.cancelled
+    assert trigger.get_stats()["deduplicated"] == 0
+    assert trigger.process_pending() == 1
+    assert seen == [again.snapshot_id]
+
+
+def test_worker_pool_runs_snapshots_concurrently(trigger):
+    barrier = threading.Barrier(3, timeout=5)
+    trigger.register_handler(lambda s: barrier.wait())
+    trigger.start()
+    try:
+        for i in range(3):
+            trigger.trigger_manual_snapshot([f"v{i}"])
+        assert trigger.wait_until_idle(timeout=5)
+    finally:
+        trigger.stop()
+
+    stats = trigger.get_stats()
+    assert stats["processed"] == 3
+    assert stats["pending"] == 0 and stats["active"] == 0
+    assert not barrier.broken
+
+
+def test_invalid_worker_mode():
+    with pytest.raises(ValueError):
+        RetrodictionTrigger({"storage_enabled": False, "worker_mode": "fibers"})
+
+
+def test_process_worker_mode_runs_handlers_in_worker_processes():
+    trigger = RetrodictionTrigger(
+        {
+            "storage_enabled": False,
+            "auto_trigger_enabled": False,
+            "worker_count": 2,
+            "worker_mode": "process",
+        }
+    )
+    trigger.register_handler(record_worker_pid)
+    trigger.start()
+    try:
+        snapshots = [trigger.trigger_manual_snapshot([f"p{i}"]) for i in range(2)]
+        assert trigger.wait_until_idle(timeout=30)
+    finally:
+        trigger.stop()
+
+    assert all(s.processed for s in snapshots)
+    pids = {s.results["pid"] for s in snapshots}
+    assert pids and os.getpid() not in pids
+    assert trigger.process_pool is None
@@ -0,0 +1,128 @@
+"""
+Tests for the regime sensor rolling statistics and their use in RegimeDetector.
+"""
+
+import statistics
+from datetime import datetime
+
+import pytest
+
+from recursive_training.regime_sensor.event_stream_manager import Event, EventType
+from recursive_training.regime_sensor.regime_detector import (
+    RegimeDetector,
+    RegimeType,
+)
+from recursive_training.regime_sensor.rolling_stats import (
+    IndicatorStats,
+    KeywordIndex,
+    RollingWindow,
+)
+
+
+def news(i, content, event_type=EventType.NEWS):
+    return Event(
+        event_id=f"n{i}",
+        source="test",
+        event_type=event_type,
+        timestamp=datetime(2024, 1, 1),
+        content=content,
+    )
+
+
+def test_rolling_window_matches_statistics_module():
+    window = RollingWindow(5)
+    values = [3.0, 1.5, 4.0, 10.0, -2.0, 7.5, 0.25, 6.0]
+    for i, value in enumerate(values):
+        window.push(value)
+        expected = values[max(0, i - 4) : i + 1]
+        assert window.mean == pytest.approx(statistics.mean(expected))
+        if len(expected) > 1:
+            assert window.variance == pytest.approx(statistics.variance(expected))
+    assert len(window) == 5
+
+
+def test_indicator_stats_ewma_and_cusum_alarm():
+    stats = IndicatorStats(window_size=20, ewma_alpha=0.5, cusum_threshold=3.0)
+    for value in [10.0, 10.5, 9.5, 10.2, 9.8] * 4:
+        stats.update(value)
+    assert stats.cusum_alarm is None
+
+    stats.update(20.0)
+    assert stats.cusum_alarm == "up"
+    assert stats.zscore > 2
+    assert stats.ewma == pytest.approx(0.5 * 20.0 + 0.5 * 9.8, rel=0.05)
+
+
+def test_keyword_index_counts_follow_window():
+    index = KeywordIndex({"crash": ["crash"], "boom": ["boom"]}, window_size=3)
+    index.add(news(1, "Market crash"))
+    index.add(news(2, "Another CRASH"))
+    index.add(news(3, "rates", event_type=EventType.ECONOMIC_INDICATOR))
+    assert index.count("crash") == 2
+    assert index.news_count == 2
+
+    index.add(news(4, "Boom times"))
+    assert index.count("crash") == 1
+    assert index.count("boom") == 1
+    assert [e.event_id for e in index.events_matching(["crash"])] == ["n2"]
+
+
+def test_detector_news_shift_uses_keyword_index(tmp_path):
+    detector = RegimeDetector({"storage_enabled": False, "news_window": 50})
+    changes = []
+    detector.register_change_handler(changes.append)
+
+    events = [news(i, f"Recession deepens as layoffs spread {i}") for i in range(8)]
+    events += [news(100 + i, "Quiet session") for i in range(4)]
+    detector.process_events_batch(events)
+
+    assert changes and changes[-1].new_regime == RegimeType.RECESSION
+    assert changes[-1].market_indicators["total_news_count"] == 12
+    assert len(changes[-1].supporting_evidence) == 8
+
+
+def test_detector_buffer_is_bounded_and_indicator_stats_available():
+    detector = RegimeDetector({"storage_enabled": False, "max_buffer_size": 5})
+    detector.process_events_batch([news(i, "Quiet") for i in range(12)])
+    assert len(detector.event_buffer) == 5
+
+    for value in [12.0, 13.0, 12.5, 35.0]:
+        detector.update_market_data({"volatility": value, "label": "x"})
+    stats = detector.get_indicator_stats("volatility")
+    assert stats["count"] == 4
+    assert stats["last"] == 35.0
+    assert detector.get_indicator_stats("label") is None
+    assert detector.get_current_regime() == RegimeType.VOLATILITY_SHOCK
+    last_change = detector.get_regime_history()[-1]
+    assert "volatility_zscore" in last_change.market_indicators
+
+
+def test_detector_flags_statistical_volatility_spike_below_level():
+    detector = RegimeDetector({"storage_enabled": False})
+    for value in [15.0, 15.5, 14.5, 15.2, 14.8] * 4:
+        detector.update_market_data({"volatility": value})
+    assert detector.get_current_regime() == RegimeType.EXPANSION
+
+    # Well below the absolute level of 30, but far outside the rolling window
+    detector.update_market_data({"volatility": 24.0})
+    assert detector.get_current_regime() == RegimeType.VOLATILITY_SHOCK
+    indicators = detector.get_regime_history()[-1].market_indicators
+    assert indicators["volatility_zscore"] >= 3.0
+    assert indicators["volatility_cusum_alarm"] == "up"
+
+
+def test_cusum_alarm_clears_after_regime_change():
+    detector = RegimeDetector({"storage_enabled": False})
+    for value in [15.0, 15.5, 14.5, 15.2, 14.8] * 4:
+        detector.update_market_data({"volatility": value})
+    detector.update_market_data({"volatility": 24.0})
+    assert detector.get_current_regime() == RegimeType.VOLATILITY_SHOCK
+    assert detector.get_indicator_stats("volatility")["cusum_alarm"] is None
+
+    # Another regime takes over; normal volatility must not re-raise the shock
+    detector.current_regime = RegimeType.EXPANSION
+    for value in [15.0, 15.2, 14.9]:
+        detector.update_market_data({"volatility": value})
+    assert detector.get_indicator_stats("volatility")["cusum_alarm"] is None
+    assert detector.get_current_regime() == RegimeType.EXPANSION
+    assert len(detector.get_regime_history()) == 1
@@ -0,0 +1,240 @@
+"""
+Tests for the concurrent, resumable historical backfill scheduler.
+"""
+
+import datetime as dt
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from ingestion.utils.backfill_scheduler import (
+    BackfillScheduler,
+    ProgressLedger,
+    RateLimitedError,
+    TokenBucket,
+    split_date_range,
+)
+from ingestion.utils.historical_data_retriever import NoDataError
+
+END = dt.datetime(2024, 12, 31)
+
+
+def variable(name, source="FRED"):
+    return {
+        "variable_name": name,
+        "source": "historical_ingestion_plugin",
+        "api_endpoint": name.upper(),
+        "required_parameters": {"source": source},
+    }
+
+
+def daily_series(start, end):
+    index = pd.date_range(start.date(), end.date(), freq="D")
+    return pd.Series(range(len(index)), index=index, dtype=float)
+
+
+def monthly_series(info, start, end):
+    index = pd.date_range(start.date(), end.date(), freq="MS")
+    if index.empty:
+        # Mirrors fetch_fred_data for a window with no observations
+        raise NoDataError("No data returned for FRED series")
+    return pd.Series(range(len(index)), index=index, dtype=float)
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    def factory(fetcher, **kwargs):
+        return BackfillScheduler(
+            ledger_path=str(tmp_path / "ledger.json"),
+            chunk_dir=str(tmp_path / "chunks"),
+            fetcher=fetcher,
+            save_results=False,
+            base_delay=0.0,
+            provider_limits={"FRED": (1000.0, 1000)},
+            **kwargs,
+        )
+
+    return factory
+
+
+def test_split_date_range_is_aligned_and_contiguous():
+    start = dt.datetime(2020, 3, 15)
+    chunks = split_date_range(start, END, 100)
+    assert chunks[0][0] <= start < chunks[0][1]
+    assert chunks[-1][1] == END
+    for (_, prev_end), (next_start, _) in zip(chunks, chunks[1:]):
+        assert next_start - prev_end == dt.timedelta(days=1)
+    # Same boundaries regardless of where the range starts
+    later = split_date_range(dt.datetime(2020, 4, 1), END, 100)
+    assert later[1:] == chunks[1:]
+
+
+def test_token_bucket_paces_and_backs_off():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.15
+
+    bucket.backoff()
+    assert bucket.rate == 10.0
+    assert not bucket.acquire(timeout=0.01)
+    for _ in range(10):
+        bucket.record_success()
+    assert bucket.rate == 20.0
+
+
+def test_backfill_runs_variables_concurrently(make_scheduler):
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def fetcher(info, start, end):
+        with lock:
+            active.append(1)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        return daily_series(start, end)
+
+    scheduler = make_scheduler(fetcher, max_workers=6, chunk_days=365)
+    results = scheduler.run([variable(f"v{i}") for i in range(4)], years=2, end_date=END)
+
+    assert peak[0] > 1
+    assert set(results) == {"v0", "v1", "v2", "v3"}
+    values = results["v0"]["data"]["values"]
+    assert values[-1]["date"].startswith("2024-12-31")
+    assert results["v0"]["stats"]["data_point_count"] == len(values)
+
+
+def test_backfill_resumes_from_ledger(make_scheduler):
+    calls = []
+    fail_on = {"v1"}
+
+    def fetcher(info, start, end):
+        calls.append((info["variable_name"], start))
+        if info["variable_name"] in fail_on:
+            raise ValueError("boom")
+        return daily_series(start, end)
+
+    scheduler = make_scheduler(fetcher, max_workers=4, chunk_days=180, max_attempts=1)
+    first = scheduler.run([variable("v0"), variable("v1")], years=1, end_date=END)
+    assert "error" in first["v1"] and "stats" in first["v0"]
+    v0_calls = sum(1 for name, _ in calls if name == "v0")
+
+    fail_on.clear()
+    calls.clear()
+    resumed = make_scheduler(fetcher, max_workers=4, chunk_days=180)
+    second = resumed.run([variable("v0"), variable("v1")], years=1, end_date=END)
+
+    assert {name for name, _ in calls} == {"v1"}
+    assert resumed.stats["chunks_skipped"] == v0_calls
+    assert second["v0"]["data"]["values"] == first["v0"]["data"]["values"]
+    assert "stats" in second["v1"]
+
+
+def test_ledger_batches_writes_until_flush(tmp_path):
+    path = tmp_path / "ledger.json"
+    ledger = ProgressLedger(str(path), flush_every=3, flush_interval=3600)
+
+    ledger.mark("v0", "a", status="done")
+    ledger.mark("v0", "b", status="done")
+    assert not path.exists()
+
+    ledger.mark("v0", "c", status="done")
+    assert ProgressLedger(str(path)).is_done("v0", "c")
+
+    ledger.mark("v0", "d", status="done")
+    assert not ProgressLedger(str(path)).is_done("v0", "d")
+    ledger.flush()
+    assert ProgressLedger(str(path)).is_done("v0", "d")
+
+
+def test_interrupted_run_flushes_ledger(make_scheduler):
+    def fetcher(info, start, end):
+        if info["variable_name"] == "stop":
+            raise KeyboardInterrupt
+        return daily_series(start, end)
+
+    scheduler = make_scheduler(fetcher, max_workers=1, chunk_days=180)
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.run([variable("v0"), variable("stop")], years=1, end_date=END)
+
+    resumed = make_scheduler(fetcher, max_workers=1, chunk_days=180)
+    assert resumed.ledger.entries["v0"]
+    assert all(e["status"] == "done" for e in resumed.ledger.entries["v0"].values())
+
+
+def test_rate_limited_chunks_retry_without_failing(make_scheduler):
+    attempts = {"n": 0}
+
+    def fetcher(info, start, end):
+        attempts["n"] += 1
+        if attempts["n"] <= 2:
+            raise RateLimitedError("429 Too Many Requests")
+        return daily_series(start, end)
+
+    scheduler = make_scheduler(fetcher, max_workers=1, chunk_days=400, max_attempts=1)
+    results = scheduler.run([variable("v0")], years=1, end_date=END)
+
+    assert "stats" in results["v0"]
+    assert scheduler.stats["rate_limited"] == 2
+    assert scheduler.bucket_for("FRED").rate < 1000.0
+
+
+def test_persistent_rate_limiting_fails_the_chunk(make_scheduler):
+    def fetcher(info, start, end):
+        raise RateLimitedError("429 Too Many Requests")
+
+    scheduler = make_scheduler(
+        fetcher, max_workers=1, chunk_days=400, max_rate_limited_attempts=3
+    )
+    scheduler.bucket_for("FRED").min_rate = 1000.0
+    results = scheduler.run([variable("v0")], years=1, end_date=END)
+
+    statuses = [entry["status"] for entry in scheduler.ledger.entries["v0"].values()]
+    assert "429" in results["v0"]["error"]
+    assert statuses and set(statuses) == {"failed"}
+    assert scheduler.stats["rate_limited"] == 3 * len(statuses)
+
+
+def test_variables_are_finalised_as_they_complete(make_scheduler):
+    v0_finalised = threading.Event()
+
+    def fetcher(info, start, end):
+        if info["variable_name"] == "v1":
+            # v1 is still in flight until v0 has been finalised
+            v0_finalised.wait(timeout=2.0)
+        return daily_series(start, end)
+
+    scheduler = make_scheduler(fetcher, max_workers=2, chunk_days=400)
+    finalize = scheduler._finalize
+    order = []
+
+    def tracking_finalize(info, *args):
+        order.append((info["variable_name"], v0_finalised.is_set()))
+        if info["variable_name"] == "v0":
+            v0_finalised.set()
+        return finalize(info, *args)
+
+    scheduler._finalize = tracking_finalize
+    results = scheduler.run([variable("v0"), variable("v1")], years=1, end_date=END)
+
+    assert order == [("v0", False), ("v1", True)]
+    assert "stats" in results["v0"] and "stats" in results["v1"]
+
+
+def test_empty_chunks_of_a_monthly_series_count_as_done(make_scheduler):
+    # 20-day chunks: roughly a third of them contain no month start
+    scheduler = make_scheduler(monthly_series, max_workers=4, chunk_days=20)
+    results = scheduler.run([variable("m0")], years=1, end_date=END)
+
+    entries = scheduler.ledger.entries["m0"].values()
+    assert {entry["status"] for entry in entries} == {"done"}
+    assert any(entry["points"] == 0 for entry in entries)
+    values = results["m0"]["data"]["values"]
+    assert [v["date"][:7] for v in values][-1] == "2024-12"
+    assert len(values) == 12
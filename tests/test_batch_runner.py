@@ -0,0 +1,88 @@
+"""
+Tests for parallel batch execution: worker crash/timeout isolation,
+streaming export and resume.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from engine import batch_runner
+
+
+def fake_run_single_config(cfg, index, *args, **kwargs):
+    if cfg.get("crash"):
+        os._exit(3)
+    if cfg.get("hang"):
+        time.sleep(60)
+    if cfg.get("raise"):
+        raise RuntimeError("boom")
+    return {"status": "ok", "pid": os.getpid(), "config": cfg, "batch_index": index}
+
+
+@pytest.fixture
+def fake_runner(monkeypatch):
+    monkeypatch.setattr(batch_runner, "run_single_config", fake_run_single_config)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_parallel_batch_isolates_crashes_and_timeouts(fake_runner, tmp_path):
+    export_path = str(tmp_path / "batch.jsonl")
+    configs = [{"n": k} for k in range(6)]
+    configs[1] = {"crash": True}
+    configs[4] = {"hang": True}
+
+    start = time.monotonic()
+    results = batch_runner.run_batch_from_config(
+        configs, export_path=export_path, max_workers=2, timeout=2.0
+    )
+
+    assert time.monotonic() - start < 30
+    assert [r["batch_index"] for r in results] == list(range(6))
+    assert results[1]["error"]["type"] == "WorkerCrashed"
+    assert results[4]["error"]["type"] == "TimeoutError"
+    ok = [r for k, r in enumerate(results) if k not in (1, 4)]
+    assert all(r["status"] == "ok" for r in ok)
+    assert os.getpid() not in {r["pid"] for r in ok}
+
+    streamed = read_jsonl(export_path)
+    assert sorted(r["batch_index"] for r in streamed) == list(range(6))
+
+
+def test_resume_skips_completed_configs(monkeypatch, tmp_path):
+    export_path = tmp_path / "batch.jsonl"
+    done = {"status": "ok", "config": {"n": 0}, "batch_index": 0}
+    failed = {"config": {"n": 1}, "batch_index": 1, "error": {"type": "X"}}
+    export_path.write_text(
+        json.dumps(done) + "\n" + json.dumps(failed) + "\n" + '{"trunc'
+    )
+    calls = []
+
+    def run(cfg, index, *args, **kwargs):
+        calls.append(cfg)
+        return {"status": "ok", "config": cfg, "batch_index": index}
+
+    monkeypatch.setattr(batch_runner, "run_single_config", run)
+    configs = [{"n": 2}, {"n": 1}, {"n": 0}]
+    results = batch_runner.run_batch_from_config(
+        configs, export_path=str(export_path), resume=True
+    )
+
+    assert calls == [{"n": 2}, {"n": 1}]
+    assert [r["config"] for r in results] == configs
+    assert results[2]["batch_index"] == 2
+    assert sorted(r["config"]["n"] for r in read_jsonl(export_path)) == [0, 1, 2]
+
+
+def test_serial_errors_are_recorded_per_config(tmp_path):
+    results = batch_runner.run_batch_from_config(
+        [{"turns": "not a number"}], export_path=str(tmp_path / "out.jsonl")
+    )
+    assert results[0]["batch_index"] == 0 and "error" in results[0]
+    assert read_jsonl(tmp_path / "out.jsonl")[0]["error"] == results[0]["error"]
@@ -16,6 +16,7 @@ from adapters.celery_app import (
     autopilot_disengage_task,
     retrodiction_run_task,
     ingest_and_score_signal,
+    ingest_and_score_signal_batch,
     health_check,
 )
 
@@ -278,6 +279,27 @@ class TestIngestAndScoreSignal:
 
         assert result is None
 
+    @patch("adapters.celery_app._realtime_update")
+    @patch("adapters.celery_app.scraper")
+    def test_ingest_and_score_signal_batch(self, mock_scraper, mock_update):
+        """Test batch ingestion skips failing signals and updates the model once."""
+        mock_scraper.ingest_signal.side_effect = [
+            {"name": "a", "value": 1.0, "source": "kafka"},
+            Exception("Test error"),
+            {"name": "c", "value": 3.0, "source": "kafka"},
+        ]
+
+        signals = [
+            {"name": "a", "value": 1.0, "source": "kafka"},
+            {"name": "b", "value": 2.0, "source": "kafka"},
+            {"name": "c", "value": 3.0, "source": "kafka"},
+        ]
+        results = ingest_and_score_signal_batch(signals)
+
+        assert [r["name"] if r else None for r in results] == ["a", None, "c"]
+        assert mock_scraper.ingest_signal.call_count == 3
+        mock_update.assert_called_once_with([0.0, 0.0])
+
     @patch("adapters.celery_app.scraper")
     @patch("adapters.celery_app.logging.getLogger")
     def test_ingest_and_score_signal_exception_handling(
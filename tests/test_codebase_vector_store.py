@@ -0,0 +1,168 @@
+"""
+Tests for the codebase vector store: batched search, incremental updates by
+document id and persistence. Uses the offline hashing embedder.
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from adapters.vector_store.codebase_vector_store import (
+    CodebaseVectorStore,
+    HashingEmbedder,
+    NumpyIndex,
+)
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self, dimension=64):
+        super().__init__(dimension)
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return super().encode(texts)
+
+
+def doc(name, text, path="pkg/module.py"):
+    return {
+        "text": text,
+        "metadata": {"file_path": path, "type": "def", "name": name},
+    }
+
+
+@pytest.fixture
+def documents():
+    return [
+        doc("load_prices", "def load_prices(symbol): fetch historical market prices"),
+        doc("run_simulation", "def run_simulation(state): advance the world state"),
+        doc("score_forecast", "def score_forecast(forecast): compute trust score"),
+    ]
+
+
+def test_hashing_embedder_is_deterministic_and_normalised():
+    embedder = HashingEmbedder(dimension=32)
+    vectors = embedder.encode(["alpha beta", "alpha beta", ""])
+    assert vectors.shape == (3, 32) and vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors[0], vectors[1])
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+    assert not vectors[2].any()
+
+
+def test_search_batch_matches_single_searches(documents):
+    store = CodebaseVectorStore(embedder=CountingEmbedder())
+    store.add_documents(documents)
+    queries = ["historical prices", "world state simulation", "trust score"]
+
+    batch = store.search_batch(queries, k=2)
+
+    assert [hits[0]["metadata"]["name"] for hits in batch] == [
+        "load_prices",
+        "run_simulation",
+        "score_forecast",
+    ]
+    assert batch == [store.search(query, k=2) for query in queries]
+    assert batch[0][0]["score"] <= batch[0][1]["score"]
+    assert store.search_batch([]) == []
+    assert CodebaseVectorStore(embedder=HashingEmbedder()).search("x") == []
+
+
+def test_sync_only_embeds_changed_documents(documents):
+    embedder = CountingEmbedder()
+    store = CodebaseVectorStore(embedder=embedder)
+    assert store.sync_documents(documents)["embedded"] == 3
+
+    embedder.encoded.clear()
+    changed = [
+        documents[0],
+        doc("run_simulation", "def run_simulation(state, steps): advance many steps"),
+        doc("new_helper", "def new_helper(): ..."),
+    ]
+    stats = store.sync_documents(changed)
+
+    assert stats == {
+        "added": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "embedded": 2,
+        "removed": 1,
+    }
+    assert sorted(embedder.encoded) == sorted(d["text"] for d in changed[1:])
+    assert len(store) == store.index.ntotal == 3
+    hits = store.search("many steps", k=3)
+    assert hits[0]["text"] == changed[1]["text"]
+    assert "score_forecast" not in {h["metadata"]["name"] for h in hits}
+
+    assert store.remove_documents(["pkg/module.py::def:new_helper", "missing"]) == 1
+    assert store.index.ntotal == 2
+
+
+def test_save_and_load_round_trip(tmp_path, documents):
+    store = CodebaseVectorStore(embedder=HashingEmbedder(dimension=64))
+    store.add_documents(documents)
+    store.save(str(tmp_path))
+
+    embedder = CountingEmbedder()
+    loaded = CodebaseVectorStore.load(str(tmp_path), embedder=embedder)
+    assert loaded.search_batch(["trust score"]) == store.search_batch(["trust score"])
+    assert loaded.sync_documents(documents)["embedded"] == 0
+    assert embedder.encoded == ["trust score"]
+
+    loaded.add_documents([doc("extra", "def extra(): pass")])
+    assert len({d["doc_id"] for d in loaded.documents.values()}) == 4
+
+    with pytest.raises(ValueError):
+        CodebaseVectorStore.load(str(tmp_path), embedder=HashingEmbedder(dimension=32))
+
+
+def test_interrupted_save_keeps_previous_store(tmp_path, documents, monkeypatch):
+    store = CodebaseVectorStore(embedder=HashingEmbedder(dimension=64))
+    store.add_documents(documents[:2])
+    store.save(str(tmp_path))
+    store.add_documents(documents[2:])
+    store.save(str(tmp_path))
+    assert len(list(tmp_path.glob("vectors*.npy"))) == 1
+
+    store.remove_documents(["pkg/module.py::def:load_prices"])
+
+    def crash(obj, f):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pickle, "dump", crash)
+    with pytest.raises(OSError):
+        store.save(str(tmp_path))
+
+    loaded = CodebaseVectorStore.load(
+        str(tmp_path), embedder=HashingEmbedder(dimension=64)
+    )
+    assert len(loaded) == len(documents)
+
+
+def test_load_rejects_mismatched_files(tmp_path, documents):
+    store = CodebaseVectorStore(embedder=HashingEmbedder(dimension=64))
+    store.add_documents(documents)
+    store.save(str(tmp_path))
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    np.save(tmp_path / manifest["files"]["ids"], np.arange(1))
+
+    with pytest.raises(ValueError):
+        CodebaseVectorStore.load(str(tmp_path), embedder=HashingEmbedder(dimension=64))
+
+
+def test_numpy_index_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype("float32")
+    queries = rng.normal(size=(5, 8)).astype("float32")
+    index = NumpyIndex(8)
+    index.add_with_ids(vectors, np.arange(100, 150))
+    assert index.remove_ids(np.array([100, 101])) == 2
+
+    distances, labels = index.search(queries, 4)
+    brute = ((queries[:, None, :] - vectors[None, 2:, :]) ** 2).sum(axis=2)
+    np.testing.assert_array_equal(labels, np.argsort(brute, axis=1)[:, :4] + 102)
+    np.testing.assert_allclose(distances, np.sort(brute, axis=1)[:, :4], rtol=1e-4)
+
+    _, padded = index.search(queries[:1], 60)
+    assert (padded[0, 48:] == -1).all()
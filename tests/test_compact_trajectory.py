@@ -0,0 +1,77 @@
+"""
+Tests for compact simulate_forward results: array-backed turns, keyframes
+and reconstruction of intermediate states.
+"""
+
+import logging
+
+import pytest
+
+from engine.compact_trajectory import CompactTrajectory
+from engine.simulator_core import simulate_forward
+from engine.worldstate import WorldState
+
+
+def make_state():
+    state = WorldState(sim_id="compact")
+    state.overlays.hope = 0.7
+    state.variables.data.update({"energy_cost": 1.0, "regime": "calm"})
+    return state
+
+
+def comparable(snapshot):
+    snapshot = dict(snapshot)
+    snapshot["event_log"] = len(snapshot["event_log"])  # entries carry wall time
+    snapshot.pop("timestamp")
+    return snapshot
+
+
+def test_compact_matches_full_mode():
+    logging.disable(logging.WARNING)
+    try:
+        full = simulate_forward(make_state(), turns=23, return_mode="full")
+        compact = simulate_forward(
+            make_state(), turns=23, return_mode="compact", keyframe_every=5
+        )
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert isinstance(compact, CompactTrajectory) and len(compact) == 23
+    assert sorted(compact.keyframes) == [0, 5, 10, 15, 20, 22]
+    for i in [0, 3, 5, 14, 22, -1]:
+        assert comparable(compact[i]["full_state"]) == comparable(full[i]["full_state"])
+        assert compact[i]["overlays"] == pytest.approx(full[i]["overlays"])
+        assert compact[i]["trust_label"] == full[i]["trust_label"]
+    assert compact.final_state()["variables"]["regime"] == "calm"
+    assert len(compact.as_arrays("overlays")["hope"]) == 23
+
+
+def test_reconstruction_from_keyframes():
+    trajectory = CompactTrajectory(turns=2, keyframe_every=3, snapshot_turns=[4])
+    state = make_state()
+    for turn in range(7):
+        state.turn = turn
+        state.overlays.hope = 0.1 * turn
+        state.variables.data["energy_cost"] = float(turn)
+        state.variables.data[f"v{turn}"] = turn  # new columns appear over time
+        state.log_event(f"turn {turn}")
+        trajectory.record(state, {"turn": turn, "overlays": {}})
+    trajectory.finalize(state)
+
+    assert sorted(trajectory.keyframes) == [0, 3, 4, 6]
+    assert "event_log" not in trajectory.keyframes[3]
+    middle = trajectory.state_at(2)
+    assert middle["turn"] == 2
+    assert middle["overlays"]["hope"] == pytest.approx(0.2)
+    assert middle["variables"] == {
+        "energy_cost": 2.0,
+        "regime": "calm",
+        "v0": 0,
+        "v1": 1,
+        "v2": 2,
+    }
+    assert middle["event_log"][-1].endswith("turn 2")
+    assert trajectory[-1]["full_state"]["variables"]["v6"] == 6
+    assert [r["turn"] for r in trajectory[1:3]] == [1, 2]
+    with pytest.raises(IndexError):
+        trajectory.state_at(7)
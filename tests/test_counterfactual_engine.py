@@ -0,0 +1,113 @@
+"""
+Tests for compiled SCM counterfactual inference, batch alignment and the
+LRU result cache.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from causal_model.compiled_scm import CompiledSCM, causal_order
+from causal_model.counterfactual_engine import CounterfactualEngine
+from causal_model.counterfactual_simulator import CounterfactualSimulator
+from causal_model.structural_causal_model import StructuralCausalModel
+
+
+@pytest.fixture
+def chain_scm():
+    # Z <- Y <- X, declared out of order to exercise the topological sort
+    scm = StructuralCausalModel()
+    for var in ["Z", "Y", "X"]:
+        scm.add_variable(var)
+    scm.add_causal_edge("Y", "Z")
+    scm.add_causal_edge("X", "Y")
+    scm.set_equation("Y", {"X": 2.0}, intercept=1.0)
+    scm.set_equation("Z", {"Y": 0.5})
+    return scm
+
+
+def test_abduction_action_prediction(chain_scm):
+    engine = CounterfactualEngine(chain_scm)
+    assert engine._compute_variable_ordering() == ["X", "Y", "Z"]
+
+    # U_Y = 3.5 - 3 = 0.5 and U_Z = 2 - 1.75 = 0.25 carry over to do(X=2)
+    result = engine.predict_counterfactual({"X": 1, "Y": 3.5, "Z": 2}, {"X": 2})
+    assert result == pytest.approx({"X": 2, "Y": 5.5, "Z": 3.0})
+
+    # Unobserved variables follow their equations with zero noise
+    assert engine.predict_counterfactual({}, {"Y": 4.0})["Z"] == pytest.approx(2.0)
+
+
+def test_batch_results_align_with_queries(chain_scm):
+    engine = CounterfactualEngine(chain_scm, max_cache_size=10)
+    queries = [
+        ({"X": i, "Y": 2 * i + 1, "Z": 0.0}, {"X": i + 1}) for i in range(500)
+    ]
+    queries.append(({"X": "not a number"}, {}))
+    queries.append(queries[3])
+
+    results = engine.predict_counterfactuals_batch(queries)
+
+    assert len(results) == len(queries)
+    for i, result in enumerate(results[:500]):
+        assert result["X"] == i + 1
+        assert result["Y"] == pytest.approx(2 * (i + 1) + 1)
+        assert result["Z"] == pytest.approx(1.0)
+    assert "error" in results[500]
+    assert results[501] == results[3]
+
+    singles = [engine.predict_counterfactual(*query) for query in queries[:20]]
+    assert singles == results[:20]
+
+
+def test_lru_cache_evicts_least_recently_used(chain_scm):
+    engine = CounterfactualEngine(chain_scm, max_cache_size=2)
+    first, second, third = ({}, {"X": 1.0}), ({}, {"X": 2.0}), ({}, {"X": 3.0})
+    engine.predict_counterfactual(*first)
+    engine.predict_counterfactual(*second)
+    engine.predict_counterfactual(*first)  # refreshes first
+    engine.predict_counterfactual(*third)  # evicts second
+
+    engine.predict_counterfactual(*first)
+    stats = engine.get_cache_stats()
+    assert stats["cache_size"] == 2 and stats["cache_evictions"] == 1
+    assert stats["cache_hits"] == 2
+    engine.predict_counterfactual(*second)
+    assert engine.get_cache_stats()["cache_misses"] == 4
+
+
+def test_model_changes_invalidate_compilation(chain_scm):
+    engine = CounterfactualEngine(chain_scm)
+    assert engine.predict_counterfactual({}, {"X": 1.0})["Y"] == pytest.approx(3.0)
+    chain_scm.set_equation("Y", {"X": -1.0})
+    assert engine.predict_counterfactual({}, {"X": 1.0})["Y"] == pytest.approx(-1.0)
+
+
+def test_cyclic_graph_drops_feedback_edges():
+    scm = StructuralCausalModel()
+    for a, b in [("A", "B"), ("B", "A"), ("B", "C")]:
+        scm.add_causal_edge(a, b)
+    order, dropped = causal_order(scm)
+    assert order == ["A", "B", "C"] and dropped == [("B", "A")]
+    compiled = CompiledSCM(scm)
+    noise = np.zeros((1, 3))
+    assert compiled.predict(noise).shape == (1, 3)
+
+
+def test_simulator_batch_scenarios_use_fitted_equations(tmp_path):
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=300)
+    data = pd.DataFrame({"x": x, "y": 3.0 * x + rng.normal(scale=0.1, size=300)})
+    simulator = CounterfactualSimulator(
+        {"storage_enabled": False, "model_path": str(tmp_path)}
+    )
+    simulator.build_scm(data)
+
+    scenarios = [
+        simulator.create_scenario(f"s{k}", "", {"x": float(k)}, {"x": 0.0, "y": 0.0})
+        for k in range(50)
+    ]
+    results = simulator.run_batch_scenarios(scenarios)
+    for k, result in enumerate(results):
+        expected = pytest.approx(3.0 * k, rel=0.02, abs=0.1)
+        assert result["complete_values"]["y"] == expected
@@ -0,0 +1,97 @@
+"""
+Import-time budget for the simulation hot path and the lazy-import layer.
+
+Each measurement runs in a fresh interpreter so modules already imported by
+the test session do not hide import costs. The budget can be overridden with
+PULSE_IMPORT_BUDGET_SECONDS on slow machines.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.lazy_import import LazyModule, is_available, is_loaded, lazy_import
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_SECONDS = float(os.getenv("PULSE_IMPORT_BUDGET_SECONDS", "0.8"))
+HEAVY_MODULES = ["matplotlib", "torch", "sklearn", "networkx", "faiss"]
+
+
+def _measure_import(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy, "
+        "'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_simulate_forward_import_within_budget():
+    runs = [
+        _measure_import("from engine.simulator_core import simulate_forward")
+        for _ in range(3)
+    ]
+    assert runs[0]["heavy"] == [], "heavy optional dependencies imported eagerly"
+    best = min(run["elapsed"] for run in runs)
+    assert best < IMPORT_BUDGET_SECONDS, (
+        f"simulate_forward import took {best:.3f}s "
+        f"(budget {IMPORT_BUDGET_SECONDS:.3f}s)"
+    )
+
+
+def test_cli_import_is_side_effect_free():
+    run = _measure_import("import cli.main")
+    assert run["heavy"] == []
+    assert "engine.simulator_core" not in run["modules"]
+    assert "ingestion.utils.historical_data_repair" not in run["modules"]
+
+
+def test_lazy_import_defers_until_attribute_access():
+    module = lazy_import("json.tool")
+    if "json.tool" not in sys.modules:
+        assert isinstance(module, LazyModule)
+        assert not is_loaded(module)
+    assert callable(module.main)
+    assert is_loaded(module)
+    assert lazy_import("json") is json
+
+
+def test_lazy_import_missing_module_raises_on_use():
+    module = lazy_import("pulse_missing_dependency", "pip install nothing")
+    assert not is_available("pulse_missing_dependency")
+    with pytest.raises(ImportError, match="pip install nothing"):
+        module.anything
+
+
+def test_cli_reports_missing_subsystem_but_not_handler_import_errors(monkeypatch):
+    from cli import main as cli_main
+
+    def handler(args, parser):
+        raise ImportError("raised while running")
+
+    monkeypatch.setitem(cli_main.COMMANDS, "list-versions", handler)
+    monkeypatch.setitem(
+        cli_main.COMMAND_MODULES, "list-versions", ("pulse_missing_dependency",)
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        cli_main.main(["list-versions", "gdp"])
+    assert exit_info.value.code == 1
+
+    monkeypatch.setitem(cli_main.COMMAND_MODULES, "list-versions", ("json",))
+    with pytest.raises(ImportError, match="raised while running"):
+        cli_main.main(["list-versions", "gdp"])
@@ -66,7 +66,7 @@ class TestNasaPowerPlugin(unittest.TestCase):
         self.assertEqual(plugin.concurrency, 2)
         mock_ensure_dir.assert_called_once_with("nasa_power")
 
-    @patch("ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.save_request_metadata"
     )
@@ -114,7 +114,7 @@ class TestNasaPowerPlugin(unittest.TestCase):
         # Check that processed data was saved (8 calls, one per parameter)
         self.assertEqual(mock_save_processed.call_count, 8)
 
-    @patch("ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.nasa_power_plugin.save_request_metadata"
     )
@@ -172,7 +172,7 @@ class TestOpenFdaPlugin(unittest.TestCase):
         field = self.plugin._get_count_field("drug_recalls")
         self.assertEqual(field, "openfda.pharm_class_epc.exact")
 
-    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.openfda_plugin.save_request_metadata"
     )
@@ -216,7 +216,7 @@ class TestOpenFdaPlugin(unittest.TestCase):
         self.assertEqual(metadata["term"], "Headache")
         self.assertEqual(metadata["rank"], 1)
 
-    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.openfda_plugin.save_request_metadata"
     )
@@ -254,7 +254,7 @@ class TestOpenFdaPlugin(unittest.TestCase):
             death_signal["value"], 33.33, places=2
         )  # 1/3 events resulted in death
 
-    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.openfda_plugin.save_request_metadata"
     )
@@ -309,7 +309,7 @@ class TestOpenFdaPlugin(unittest.TestCase):
         self.assertIsNotNone(voluntary_signal)
         self.assertEqual(voluntary_signal["value"], 75.0)  # 3/4 recalls are voluntary
 
-    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.openfda_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.openfda_plugin.save_request_metadata"
     )
@@ -0,0 +1,173 @@
+"""
+Tests for the causal discovery execution layer: shared-memory worker pool,
+adaptive work units and the independence test cache.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import pearsonr
+
+from causal_model import discovery_executor
+from causal_model.discovery_executor import (
+    AdaptiveChunker,
+    DiscoveryExecutor,
+    SharedDataset,
+    get_worker_pool,
+    sequence_index,
+    shutdown_worker_pool,
+)
+from causal_model.optimized_discovery import OptimizedCausalDiscovery
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    a = rng.normal(size=150)
+    b = a + rng.normal(size=150)
+    columns = {"a": a, "b": b, "c": b + rng.normal(size=150)}
+    for k in range(4):
+        columns[f"z{k}"] = rng.normal(size=150) + (0.4 * a if k % 2 else 0.0)
+    return pd.DataFrame(columns)
+
+
+def reference_independent(df, var1, var2, alpha):
+    """Residual-correlation test sequence evaluated one test at a time."""
+    others = [v for v in df.columns if v not in (var1, var2)]
+    for size in range(1, min(3, len(others))):
+        for cond in itertools.combinations(others, size):
+            mean = df[list(cond)].mean(axis=1)
+            _, p = pearsonr(df[var1] - mean, df[var2] - mean)
+            if p > alpha:
+                return True
+    return False
+
+
+def test_pair_decisions_match_reference(data):
+    discovery = OptimizedCausalDiscovery(data, max_workers=1)
+    columns = list(data.columns)
+    for var1, var2 in itertools.combinations(columns, 2):
+        expected = reference_independent(data, var1, var2, 0.05)
+        assert discovery._test_conditional_independence(
+            var1, var2, columns, 0.05
+        ) is expected
+
+    decisions = discovery.executor.independent_pairs(
+        list(itertools.permutations(range(len(columns)), 2)), 0.05
+    )
+    assert len(decisions) == 21
+    for (i, j), independent in decisions.items():
+        assert independent is reference_independent(
+            data, columns[i], columns[j], 0.05
+        )
+
+
+def test_cache_is_keyed_by_conditioning_set(data):
+    executor = DiscoveryExecutor(data.to_numpy(), max_workers=1)
+    executor.independent_pairs([(0, 1)], alpha=1.0 - 1e-12)  # runs every test
+    columns = list(data.columns)
+    for cond in [(2,), (6,), (2, 3), (5, 6)]:
+        mean = data[[columns[k] for k in cond]].mean(axis=1)
+        _, expected = pearsonr(data["a"] - mean, data["b"] - mean)
+        assert executor.cache.p_value(1, 0, cond) == pytest.approx(expected)
+    assert executor.cache.p_value(0, 1, (0,)) is None
+    assert sequence_index(7, 0, 1, (2, 3)) == 5
+
+    # A different alpha is answered from cached p-values
+    tests = executor.stats["tests"]
+    executor.independent_pairs([(1, 0)], alpha=0.05)
+    assert executor.stats["tests"] == tests
+    assert executor.stats["cache_hits"] == 1
+
+
+def test_parallel_runs_reuse_pool_and_cache(data):
+    inline = OptimizedCausalDiscovery(data, max_workers=1)
+    parallel = OptimizedCausalDiscovery(data, max_workers=2)
+    try:
+        expected = sorted(inline.vectorized_pc_algorithm(0.05).graph.edges())
+        assert sorted(parallel.vectorized_pc_algorithm(0.05).graph.edges()) == expected
+        pool = get_worker_pool(2)
+        tests = parallel.executor.stats["tests"]
+
+        assert sorted(parallel.vectorized_pc_algorithm(0.05).graph.edges()) == expected
+        assert get_worker_pool(2) is pool
+        assert parallel.executor.stats["tests"] == tests
+        assert parallel.executor.stats["work_units"] >= 1
+    finally:
+        parallel.close()
+        inline.close()
+
+
+def test_growing_pool_lets_old_pool_drain():
+    shutdown_worker_pool()
+    try:
+        small = get_worker_pool(1)
+        pending = small.submit(pow, 2, 10)
+        large = get_worker_pool(2)
+
+        assert large is not small
+        assert pending.result(timeout=30) == 1024
+        assert large.submit(pow, 3, 3).result(timeout=30) == 27
+    finally:
+        shutdown_worker_pool()
+
+
+def test_failed_work_unit_is_rerun_inline(data, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    class FlakyPool(ThreadPoolExecutor):
+        """Thread pool whose first work unit fails, like a crashed worker."""
+
+        submitted = 0
+
+        def submit(self, fn, *args):
+            FlakyPool.submitted += 1
+            if FlakyPool.submitted == 1:
+                return super().submit(_raise_worker_error)
+            return super().submit(fn, *args)
+
+    pool = FlakyPool(max_workers=2)
+    monkeypatch.setattr(discovery_executor, "get_worker_pool", lambda n: pool)
+    monkeypatch.setattr(
+        discovery_executor, "shutdown_worker_pool", lambda **kwargs: None
+    )
+    pairs = list(itertools.combinations(range(data.shape[1]), 2))
+    expected = DiscoveryExecutor(data.to_numpy()).independent_pairs(pairs, 0.05)
+
+    executor = DiscoveryExecutor(
+        data.to_numpy(), max_workers=2, chunker=AdaptiveChunker(initial_size=2)
+    )
+    try:
+        assert executor.independent_pairs(pairs, 0.05) == expected
+    finally:
+        executor.close()
+        pool.shutdown()
+    assert FlakyPool.submitted > 1
+
+
+def _raise_worker_error():
+    raise RuntimeError("worker process died")
+
+
+def test_shared_dataset_attach_and_close():
+    matrix = np.arange(12, dtype=float).reshape(4, 3)
+    shared = SharedDataset(matrix)
+    try:
+        attached = discovery_executor._attach_shared(shared.spec)
+        np.testing.assert_array_equal(attached, matrix)
+    finally:
+        discovery_executor._ATTACHED.pop(shared.spec[0], None)
+        shared.close()
+    assert shared.closed
+
+
+def test_adaptive_chunker_targets_unit_duration():
+    chunker = AdaptiveChunker(target_seconds=0.1, initial_size=4, max_size=100)
+    assert chunker.size() == 4
+    chunker.record(tasks=4, elapsed=0.004)  # 1ms per task
+    assert chunker.size() == 100
+    for _ in range(20):
+        chunker.record(tasks=10, elapsed=0.5)  # 50ms per task
+    assert chunker.size() == 2
@@ -0,0 +1,114 @@
+"""
+Tests for the retrodiction sweep scheduler: window resolution, per-window
+result files, resume and the aggregated skill report.
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+import engine.retrodiction_scheduler as scheduler_module
+from engine.historical_retrodiction_runner import (
+    RetrodictionLoader,
+    run_retrodiction_tests,
+)
+from engine.retrodiction_scheduler import (
+    REPORT_FILENAME,
+    RetrodictionScheduler,
+    aggregate_skill,
+    resolve_start_turn,
+    window_id,
+)
+
+
+@pytest.fixture
+def truth_path(tmp_path):
+    snapshots = {
+        str(turn): {
+            "turn": turn,
+            "timestamp": f"2020-01-{turn + 1:02d}T00:00:00",
+            "variables": {"energy_cost": 1.0 + 0.1 * turn, "hope": 0.5},
+        }
+        for turn in range(12)
+    }
+    path = tmp_path / "truth.json"
+    path.write_text(json.dumps({"snapshots": snapshots}))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_resolve_start_turn(truth_path):
+    loader = RetrodictionLoader(truth_path)
+    assert resolve_start_turn(loader, "2020-01-04") == 3
+    assert resolve_start_turn(loader, 5) == 5
+    with pytest.raises(ValueError):
+        resolve_start_turn(loader, "2021-01-01")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_writes_windows_and_report(tmp_path, truth_path, workers):
+    output_dir = str(tmp_path / "runs")
+    scheduler = RetrodictionScheduler(
+        truth_path=truth_path, output_dir=output_dir, max_workers=workers
+    )
+    report = scheduler.run(["2020-01-01", "2020-01-05", "2030-01-01"], days=4)
+
+    assert report["windows_total"] == 3
+    assert report["windows_completed"] == 2 and report["windows_failed"] == 1
+    assert [w["status"] for w in report["windows"]] == ["ok", "ok", "error"]
+    assert report["variables"]["energy_cost"]["n"] == 8
+    assert report["mean_window_mae"] is not None
+    assert os.path.exists(os.path.join(output_dir, REPORT_FILENAME))
+
+    with open(os.path.join(output_dir, window_id("2020-01-05", 4) + ".json")) as f:
+        window = json.load(f)
+    assert window["start_turn"] == 4 and window["truth_turns"] == 4
+    assert "energy_cost" in window["skill"]["variables"]
+    assert not os.path.exists(os.path.join(output_dir, "2030-01-01_4d.json"))
+
+
+def test_resume_skips_completed_windows(tmp_path, truth_path, monkeypatch):
+    output_dir = str(tmp_path / "runs")
+    run_retrodiction_tests(
+        ["2020-01-01"],
+        days=3,
+        max_workers=1,
+        truth_path=truth_path,
+        output_dir=output_dir,
+    )
+    calls = []
+    original = scheduler_module.run_window
+    monkeypatch.setattr(
+        scheduler_module,
+        "run_window",
+        lambda start, *args: calls.append(start) or original(start, *args),
+    )
+    report = run_retrodiction_tests(
+        ["2020-01-01", "2020-01-02"],
+        days=3,
+        max_workers=1,
+        truth_path=truth_path,
+        output_dir=output_dir,
+    )
+    assert calls == ["2020-01-02"]
+    assert report["windows_completed"] == 2
+
+
+def test_pooled_directional_accuracy_weights_by_counted_moves():
+    def window(accuracy, moves):
+        score = {"n": 10, "mae": 1.0, "rmse": 1.0, "bias": 0.0}
+        score.update(directional_accuracy=accuracy, moves=moves)
+        return {"status": "ok", "skill": {"variables": {"x": score}, "mean_mae": 1.0}}
+
+    # Gaps in the second window leave only 2 of its 9 moves scoreable
+    report = aggregate_skill([window(1.0, 9), window(0.0, 2)])
+
+    assert report["variables"]["x"]["directional_accuracy"] == pytest.approx(9 / 11)
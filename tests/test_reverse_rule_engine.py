@@ -1,4 +1,12 @@
-from rules.reverse_rule_engine import fuzzy_match_rule_by_delta
+import pytest
+
+from rules.reverse_rule_engine import (
+    ReverseRuleEngine,
+    fuzzy_match_rule_by_delta,
+    get_engine,
+    match_rule_by_delta,
+    trace_causal_paths,
+)
 
 
 def test_fuzzy_match_exact():
@@ -20,3 +28,70 @@ def test_fuzzy_match_none():
     fingerprints = [{"rule_id": "r3", "effects": {"a": 2.0}}]
     matches = fuzzy_match_rule_by_delta(delta, fingerprints, tol=0.01)
     assert not matches
+
+
+FINGERPRINTS = [
+    {"rule_id": "A", "effects": {"hope": 0.1}, "trust": 0.9},
+    {"rule_id": "B", "effects": {"despair": -0.05}, "trust": 0.2},
+    {"rule_id": "C", "effects": {"hope": 0.1, "despair": -0.05}, "trust": 0.5},
+    {"rule_id": "D", "effects": {"rage": 0.3}},
+    {"rule_id": "bad", "effects": ["not", "a", "dict"]},
+]
+
+
+def test_engine_candidates_match_linear_matchers():
+    engine = ReverseRuleEngine(FINGERPRINTS)
+    delta = {"hope": 0.1, "despair": -0.05}
+    for min_match in (0.3, 0.5, 1.0):
+        expected = match_rule_by_delta(delta, FINGERPRINTS, min_match=min_match)
+        found = [
+            (engine.rule_ids[row], score)
+            for row, score in engine.candidates(delta, min_match)
+        ]
+        assert sorted(found) == sorted(expected)
+    fuzzy = engine.candidates({"hope": 0.12}, fuzzy=True, tol=0.05)
+    expected = fuzzy_match_rule_by_delta({"hope": 0.12}, FINGERPRINTS[:4], tol=0.05)
+    assert [(engine.rule_ids[row], score) for row, score in fuzzy] == [
+        (rule_id, pytest.approx(score)) for rule_id, score in expected
+    ]
+
+
+def test_search_ranks_chains_and_dedupes_permutations():
+    engine = ReverseRuleEngine(FINGERPRINTS)
+    results = engine.search({"hope": 0.1, "despair": -0.05, "rage": 0.3})
+    chains = [sorted(result["chain"]) for result in results]
+    # Full matches first (higher trust first), then chains using C's partial
+    # match; each set of rules is reported in one order only.
+    assert chains == [["A", "B", "D"], ["C", "D"], ["A", "C", "D"], ["B", "C", "D"]]
+    assert [result["score"] for result in results] == [1.0, 1.0, 0.5, 0.5]
+    assert results[0]["trust"] == pytest.approx(1.1)
+    assert engine.search({"hope": 0.1, "despair": -0.05}, max_depth=1) == [
+        {"chain": ["C"], "score": 1.0, "trust": 0.5}
+    ]
+
+
+def test_search_respects_expansion_budget():
+    fingerprints = [
+        {"rule_id": f"r{i}", "effects": {"x": 0.1, f"k{i}": 0.1}} for i in range(300)
+    ]
+    engine = ReverseRuleEngine(fingerprints)
+    delta = {"x": 0.3}  # every rule half-matches, none explain it
+    assert engine.search(delta, max_depth=3, max_expansions=50) == []
+    assert len(engine._candidates) <= 50
+
+
+def test_candidate_memo_is_bounded_lru():
+    engine = ReverseRuleEngine(FINGERPRINTS, max_cached_candidates=2)
+    engine.candidates({"hope": 0.1})
+    engine.candidates({"rage": 0.3})
+    engine.candidates({"hope": 0.1})  # refreshes the first entry
+    engine.candidates({"despair": -0.05})
+    assert len(engine._candidates) == 2
+    cached = [dict(key[0]) for key in engine._candidates]
+    assert cached == [{"hope": 0.1}, {"despair": -0.05}]
+
+
+def test_trace_causal_paths_returns_chains():
+    chains = trace_causal_paths({"hope": 0.1}, FINGERPRINTS, max_depth=2)
+    assert chains == [["A"], ["C"]]
+    assert get_engine(FINGERPRINTS) is get_engine(FINGERPRINTS)
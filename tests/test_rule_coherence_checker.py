@@ -0,0 +1,57 @@
+"""
+Tests for the indexed rule coherence checks and incremental re-checking.
+"""
+
+from rules.rule_coherence_checker import (
+    RuleCoherenceIndex,
+    detect_conflicting_triggers,
+    detect_duplicate_rules,
+    detect_opposite_effects,
+)
+
+RULES = {
+    "R1": {"rule_id": "R1", "trigger": "t1", "effect": {"hope": "+-up"}},
+    "R2": {"rule_id": "R2", "trigger": "t1", "effect": {"hope": "down"}},
+    "R3": {"rule_id": "R3", "trigger": "t2", "effect": {"hope": "+-up"}},
+    "R4": {"rule_id": "R4", "trigger": "t1", "effect": {"hope": "down"}},
+}
+
+
+def test_detectors_report_pairs():
+    assert detect_opposite_effects(RULES) == [
+        ("R1", "R2", "Opposite effect on hope"),
+        ("R1", "R4", "Opposite effect on hope"),
+        ("R3", "R4", "Opposite effect on hope"),
+    ]
+    assert detect_duplicate_rules(RULES) == [("R2", "R4")]
+    assert detect_conflicting_triggers(RULES) == [
+        ("R1", "R2", "Same trigger, different effects"),
+        ("R1", "R4", "Same trigger, different effects"),
+    ]
+
+
+def test_incremental_updates_match_full_scan():
+    rules = {rid: dict(rule) for rid, rule in RULES.items()}
+    index = RuleCoherenceIndex(rules)
+
+    rules["R5"] = {"rule_id": "R5", "trigger": "t2", "effect": {"hope": "-+x"}}
+    issues = index.add_rule("R5", rules["R5"])
+    assert issues["conflicting_triggers"] == [
+        ("R3", "R5", "Same trigger, different effects")
+    ]
+    assert len(issues["opposite_effects"]) == 4
+    assert issues["duplicate_rules"] == [] and issues["schema_errors"] == []
+
+    rules["R4"]["effect"] = {"hope": "+-up"}  # mutated in place
+    issues = index.update_rule("R4")
+    assert issues["duplicate_rules"] == [("R1", "R4")]
+    index.remove_rule("R2")
+    rules.pop("R2")
+    assert index.report() == {
+        "schema_errors": [],
+        "conflicting_triggers": detect_conflicting_triggers(rules),
+        "opposite_effects": detect_opposite_effects(rules),
+        "duplicate_rules": detect_duplicate_rules(rules),
+        "total_rules": 4,
+    }
+    assert index.duplicate_rules() == [("R1", "R4")]
@@ -46,3 +46,49 @@ def test_registry_visibility(sample_rule):
     # The original test verified the rule was visible in all modules
     # But this caused issues due to module-level caching
     # This simplified test just verifies the rule was added to the registry
+
+
+def test_batch_matching_matches_single_delta_calls():
+    fingerprints = [
+        {"rule_id": "A", "effects": {"hope": 0.1}},
+        {"rule_id": "B", "effects": {"hope": 0.1, "despair": -0.05}},
+        {"rule_id": "C", "effects": {"despair": -0.2, "rage": 0.3}},
+        {"rule_id": "bad", "effects": ["not", "a", "dict"]},
+    ]
+    deltas = [{"hope": 0.1}, {"hope": 0.12, "despair": -0.05}, {"rage": 0.3}, {}]
+    matcher = rule_matching_utils.FingerprintMatcher(fingerprints)
+    assert matcher.match_batch(deltas) == [
+        rule_matching_utils.match_rule_by_delta(delta, fingerprints)
+        for delta in deltas
+    ]
+    assert matcher.match_batch([deltas[0]])[0] == [("A", 1.0), ("B", 0.5)]
+    fuzzy = matcher.fuzzy_match_batch(deltas, tol=0.05)
+    assert [[rule_id for rule_id, _ in found] for found in fuzzy] == [
+        ["A", "B"],
+        ["B", "A"],
+        ["C"],
+        ["A", "B", "C"],
+    ]
+    assert fuzzy[1][0][1] == pytest.approx(0.98)
+
+
+def test_registry_matcher_rebuilt_when_registry_changes(sample_rule):
+    registry = rule_matching_utils._registry
+    matcher = rule_matching_utils.get_matcher()
+    assert rule_matching_utils.get_matcher() is matcher
+    rule = dict(
+        sample_rule,
+        symbolic_tags=[],
+        source="test",
+        trust_weight=0.5,
+        enabled=True,
+        type="test",
+    )
+    registry.add_rule(rule)
+    try:
+        rebuilt = rule_matching_utils.get_matcher()
+        assert rebuilt is not matcher
+        assert "R999_TEST" in rebuilt.rule_ids
+    finally:
+        registry.rules.remove(rule)
+        registry.version += 1
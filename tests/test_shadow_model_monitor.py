@@ -253,3 +253,39 @@ def test_check_trigger_rolling_window_effect():
     monitor.record_step({"var1": 1.0}, {"var1": 0.1}, 3)
     triggered, _ = monitor.check_trigger()
     assert not triggered  # VE is 0.5, not > 0.5
+
+
+def test_running_sums_match_full_recomputation():
+    """Running sums stay exact through evictions, including a dominant outlier."""
+    monitor = ShadowModelMonitor(
+        threshold=0.5, window_steps=4, critical_variables=["var1", "var2"]
+    )
+    history = []
+    steps = [({"var1": 0.1}, {"var1": 1e8, "var2": 2.0})] + [
+        ({"var1": 0.5 * k, "var2": 1.0}, {"var1": 0.3}) for k in range(1, 12)
+    ]
+    for step, (causal, gravity) in enumerate(steps):
+        monitor.record_step(causal, gravity, step)
+        history.append((causal, gravity))
+        window = history[-4:]
+        for var in ("var1", "var2"):
+            sum_sq_gravity = sum(g.get(var, 0.0) ** 2 for _, g in window)
+            sum_sq_causal = sum(c.get(var, 0.0) ** 2 for c, _ in window)
+            total = sum_sq_gravity + sum_sq_causal
+            expected = sum_sq_gravity / total if total else 0.0
+            assert monitor.calculate_variance_explained(var) == pytest.approx(
+                expected, rel=1e-12
+            )
+    assert list(monitor.delta_window) == history[-4:]
+
+
+def test_monitor_all_variables():
+    """With "*" every numeric variable recorded is monitored."""
+    monitor = ShadowModelMonitor(threshold=0.5, window_steps=2, critical_variables="*")
+    assert monitor.critical_variables == [] and monitor.active
+    monitor.record_step({"a": 1.0}, {"a": 0.1}, 0)
+    monitor.record_step({"a": 1.0, "b": 0.1}, {"a": 0.1, "b": 1.0}, 1)
+    assert monitor.critical_variables == ["a", "b"]
+    assert monitor.watched_variables({"c": 2.0, "label": "x"}) == ["a", "b", "c"]
+    assert monitor.check_trigger() == (True, ["b"])
+    assert monitor.variance_explained()["c"] == 0.0
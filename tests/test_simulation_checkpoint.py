@@ -0,0 +1,135 @@
+"""
+Tests for binary checkpoint chains: delta reconstruction, corruption
+handling, retention and resuming simulate_forward.
+"""
+
+import logging
+import os
+
+import pytest
+
+from analytics.trust_service import TrustService
+from engine.simulation_checkpoint import (
+    CheckpointWriter,
+    available_turns,
+    list_segments,
+    load_checkpoint,
+    resume_checkpoint,
+)
+from engine.simulator_core import simulate_forward
+from engine.worldstate import WorldState
+
+
+class Fabric:
+    def __init__(self):
+        self.weights = {}
+
+
+def step(state, trust, turn):
+    state.turn = turn + 1
+    state.overlays.hope = 0.5 + 0.01 * turn
+    state.variables.data["price"] = 100.0 + turn
+    state.variables.data["tags"] = ["t"] * (turn % 3)
+    if turn == 4:
+        del state.variables.data["price"]
+    state.metadata["phase"] = turn // 3
+    state.log_event(f"turn {turn}")
+    state._gravity_fabric.weights["hope"] = turn // 2
+    trust.update(f"rule_{turn % 2}", turn % 3 == 0)
+
+
+def comparable(snapshot):
+    return {k: v for k, v in snapshot.items() if k != "timestamp"}
+
+
+def run_chain(directory, turns, **kwargs):
+    trust = TrustService()
+    state = WorldState(sim_id="chain")
+    state._gravity_fabric = Fabric()
+    expected = []
+    with CheckpointWriter(directory, trust=trust, **kwargs) as writer:
+        for turn in range(turns):
+            step(state, trust, turn)
+            writer.record(state, turn)
+            expected.append((state.snapshot(), sorted(trust.export_entries())))
+    return expected
+
+
+def test_every_turn_restores_exactly(tmp_path):
+    expected = run_chain(str(tmp_path), 12, full_every=5, keep_full=None)
+    assert [start for start, _ in list_segments(str(tmp_path))] == [0, 5, 10]
+    assert available_turns(str(tmp_path)) == list(range(12))
+
+    for turn, (snapshot, trust_entries) in enumerate(expected):
+        restored = load_checkpoint(str(tmp_path), turn)
+        assert restored.turn_index == turn
+        assert comparable(restored.state_dict) == comparable(snapshot)
+        assert sorted(restored.trust_entries) == trust_entries
+        state = restored.world_state()
+        assert state._gravity_fabric.weights == {"hope": turn // 2}
+
+    assert load_checkpoint(str(tmp_path)).turn_index == 11
+    assert load_checkpoint(str(tmp_path), 12) is None
+
+
+def test_truncated_record_falls_back_and_retention(tmp_path):
+    run_chain(str(tmp_path), 9, full_every=3, keep_full=2)
+    segments = list_segments(str(tmp_path))
+    assert [start for start, _ in segments] == [3, 6]
+    assert load_checkpoint(str(tmp_path), 1) is None
+
+    last = segments[-1][1]
+    with open(last, "r+b") as f:
+        f.truncate(os.path.getsize(last) - 3)  # killed mid-write
+    assert load_checkpoint(str(tmp_path)).turn_index == 7
+
+    with open(last, "r+b") as f:
+        f.truncate(8)  # only part of the first record
+    assert load_checkpoint(str(tmp_path)).turn_index == 5
+
+
+def test_resume_restores_trust_and_discards_stale_records(tmp_path):
+    expected = run_chain(str(tmp_path), 10, full_every=4)
+    trust = TrustService()
+    state, next_turn = resume_checkpoint(str(tmp_path), turn_index=6, trust=trust)
+    assert next_turn == 7 and state.turn == 7
+    assert sorted(trust.export_entries()) == expected[6][1]
+
+    writer = CheckpointWriter(str(tmp_path), full_every=4, trust=trust, start_turn=7)
+    assert available_turns(str(tmp_path)) == list(range(7))
+    step(state, trust, 7)
+    writer.record(state, 7)
+    writer.close()
+    assert load_checkpoint(str(tmp_path)).turn_index == 7
+
+
+def test_simulate_forward_checkpoint_and_resume(tmp_path):
+    directory = str(tmp_path / "run")
+    logging.disable(logging.WARNING)
+    try:
+        state = WorldState(sim_id="sim")
+        simulate_forward(
+            state,
+            turns=6,
+            checkpoint_path=directory,
+            checkpoint_every=4,
+            use_symbolism=False,
+        )
+        resumed, next_turn = resume_checkpoint(directory, turn_index=3, trust=False)
+        assert next_turn == 4
+        results = simulate_forward(
+            resumed,
+            turns=6,
+            start_turn=next_turn,
+            checkpoint_path=directory,
+            checkpoint_every=4,
+            use_symbolism=False,
+        )
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert len(results) == 2
+    assert resumed.overlays.as_dict() == pytest.approx(state.overlays.as_dict())
+    assert available_turns(directory) == list(range(6))
+    with pytest.raises(ValueError):
+        simulate_forward(WorldState(), turns=3, start_turn=3)
@@ -284,9 +284,9 @@ def test_simulate_turn_invalid_return_mode(basic_worldstate):
 @patch("trust_system.trust_engine.TrustEngine.apply_all")
 @patch("engine.simulator_core.log_simulation_trace")
 @patch("engine.simulator_core.log_episode_event")
-@patch("analytics.bayesian_trust_tracker.bayesian_trust_tracker")
+@patch("analytics.trust_service.trust_service")
 def test_simulate_forward_basic(
-    mock_bayesian_trust_tracker,
+    mock_trust_service,
     mock_log_episode_event,
     mock_log_simulation_trace,
     mock_apply_all,
@@ -306,7 +306,7 @@ def test_simulate_forward_basic(
     mock_apply_all.assert_called_once_with(results)
     mock_log_simulation_trace.assert_not_called()  # Not in counterfactual mode
     mock_log_episode_event.assert_not_called()  # Not in retrodiction mode
-    mock_bayesian_trust_tracker.batch_update.assert_not_called()  # Not in retrodiction mode
+    mock_trust_service.batch_update.assert_not_called()  # Not in retrodiction mode
 
 
 def test_simulate_forward_invalid_turns(basic_worldstate):
@@ -326,9 +326,9 @@ def test_simulate_forward_invalid_turns(basic_worldstate):
 @patch("trust_system.trust_engine.TrustEngine.apply_all")
 @patch("engine.simulator_core.log_simulation_trace")
 @patch("engine.simulator_core.log_episode_event")
-@patch("analytics.bayesian_trust_tracker.bayesian_trust_tracker")
+@patch("analytics.trust_service.trust_service")
 def test_simulate_forward_retrodiction_strict(
-    mock_bayesian_trust_tracker,
+    mock_trust_service,
     mock_log_episode_event,
     mock_log_simulation_trace,
     mock_apply_all,
@@ -371,7 +371,7 @@ def test_simulate_forward_retrodiction_strict(
     assert mock_update_numeric_variable.call_count == 3
     assert mock_adjust_capital.call_count == 3
     mock_log_episode_event.assert_called()  # Should log comparisons
-    mock_bayesian_trust_tracker.batch_update.assert_called()  # Should update trust tracker
+    mock_trust_service.batch_update.assert_called()  # Should update trust tracker
 
 
 @patch("engine.state_mutation.adjust_overlay")
@@ -381,9 +381,9 @@ def test_simulate_forward_retrodiction_strict(
 @patch("trust_system.trust_engine.TrustEngine.apply_all")
 @patch("engine.simulator_core.log_simulation_trace")
 @patch("engine.simulator_core.log_episode_event")
-@patch("analytics.bayesian_trust_tracker.bayesian_trust_tracker")
+@patch("analytics.trust_service.trust_service")
 def test_simulate_forward_retrodiction_seed(
-    mock_bayesian_trust_tracker,
+    mock_trust_service,
     mock_log_episode_event,
     mock_log_simulation_trace,
     mock_apply_all,
@@ -426,7 +426,7 @@ def test_simulate_forward_retrodiction_seed(
     assert mock_update_numeric_variable.call_count == 0
     assert mock_adjust_capital.call_count == 0
     mock_log_episode_event.assert_called()  # Should log comparisons
-    mock_bayesian_trust_tracker.batch_update.assert_called()  # Should update trust tracker
+    mock_trust_service.batch_update.assert_called()  # Should update trust tracker
 
 
 # Test simulate_backward (requires mocking)
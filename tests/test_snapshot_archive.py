@@ -0,0 +1,155 @@
+"""
+Tests for delta-encoded snapshot archives and archive-backed replay.
+"""
+
+import json
+import logging
+import math
+import os
+
+import numpy as np
+import pytest
+
+from engine.utils.simulation_replayer import ReplayerConfig, SimulationReplayer
+from engine.utils.snapshot_archive import pack_snapshots
+from engine.worldstate import WorldState
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def write_snapshots(directory, turns, start=0):
+    state = WorldState(turn=0, sim_id="sim", timestamp=1.6e9)
+    for turn in range(turns):
+        state.turn = turn
+        state.timestamp = 1.6e9 + 86400 * turn
+        state.overlays.hope = 0.5 + 0.01 * (turn % 5)
+        state.variables.data["count"] = turn // 2
+        state.variables.data["price"] = 100.0 + turn
+        state.variables.data["regime"] = "bull" if turn % 4 < 2 else "bear"
+        if turn % 3 == 0:
+            state.event_log.append(f"event {turn}")
+        if turn == 5:
+            state.variables.data.pop("count")
+        snapshot = state.snapshot()
+        snapshot["overlays"]["_dynamic_overlays"] = {"anticipation": 0.1 * turn}
+        if turn >= start:
+            name = f"worldstate_snapshot_turn_{turn:03d}_ts_0.json"
+            with open(os.path.join(directory, name), "w") as f:
+                json.dump(snapshot, f)
+
+
+def load_file(directory, turn):
+    name = f"worldstate_snapshot_turn_{turn:03d}_ts_0.json"
+    with open(os.path.join(directory, name)) as f:
+        return WorldState.from_json(f.read()).snapshot()
+
+
+def test_state_at_rebuilds_every_snapshot(tmp_path):
+    directory = str(tmp_path / "snapshots")
+    os.makedirs(directory)
+    write_snapshots(directory, 12)
+    archive = pack_snapshots(directory, keyframe_interval=4)
+    assert len(archive) == 12
+    for turn in range(12):
+        rebuilt = WorldState.from_dict(archive.state_at(turn)).snapshot()
+        assert rebuilt == load_file(directory, turn)
+    assert archive.state_at(3)["variables"]["count"] == 1
+    assert "count" not in archive.state_at(5)["variables"]
+
+
+def test_pack_appends_new_snapshots(tmp_path):
+    directory = str(tmp_path / "snapshots")
+    os.makedirs(directory)
+    write_snapshots(directory, 6)
+    first = pack_snapshots(directory, keyframe_interval=4)
+    assert pack_snapshots(directory, keyframe_interval=4).path == first.path
+    write_snapshots(directory, 10, start=6)
+    appended = pack_snapshots(directory, keyframe_interval=4)
+    rebuilt = pack_snapshots(
+        directory, str(tmp_path / "rebuilt"), keyframe_interval=4
+    )
+    assert len(appended) == 10
+    for name in (
+        "keyframes",
+        "keyframe_present",
+        "change_cols",
+        "change_vals",
+        "change_ints",
+        "change_present",
+    ):
+        assert np.array_equal(
+            getattr(appended, name), getattr(rebuilt, name), equal_nan=True
+        )
+    assert appended.index["object_deltas"] == rebuilt.index["object_deltas"]
+
+
+@pytest.mark.parametrize("mode", ["audit", "diagnostic"])
+def test_archive_replay_matches_json_replay(tmp_path, mode):
+    directory = str(tmp_path / "snapshots")
+    os.makedirs(directory)
+    write_snapshots(directory, 10)
+
+    def replay(**kwargs):
+        config = ReplayerConfig(
+            mode=mode, verbose=False, log_path=str(tmp_path / "logs"), **kwargs
+        )
+        replayer = SimulationReplayer(directory, config)
+        replayer.replay_simulation()
+        return replayer.replay_log_entries
+
+    assert replay(use_archive=True) == replay()
+    window = replay(use_archive=True, start_turn=3, step_limit=4)
+    assert window == replay(start_turn=3, step_limit=4)
+    assert [entry["turn"] for entry in window] == [3, 4, 5, 6]
+    if mode == "diagnostic":
+        assert window[1]["variable_diffs"]["price"] == {"old": 103.0, "new": 104.0}
+        assert window[2]["variable_diffs"]["count"] == {"old": 2, "new": None}
+
+
+def test_nan_values_are_kept(tmp_path):
+    directory = str(tmp_path / "snapshots")
+    os.makedirs(directory)
+    write_snapshots(directory, 6)
+    for turn, value in ((1, float("nan")), (2, float("nan")), (3, 4.0)):
+        path = os.path.join(directory, f"worldstate_snapshot_turn_{turn:03d}_ts_0.json")
+        with open(path) as f:
+            snapshot = json.load(f)
+        snapshot["variables"]["gap"] = value
+        with open(path, "w") as f:
+            json.dump(snapshot, f)
+
+    archive = pack_snapshots(directory, keyframe_interval=4)
+    assert "gap" not in archive.state_at(0)["variables"]
+    assert math.isnan(archive.state_at(1)["variables"]["gap"])
+    assert archive.state_at(3)["variables"]["gap"] == 4.0
+    assert "gap" not in archive.state_at(4)["variables"]
+    streamed = [snapshot["variables"] for _, snapshot in archive.iter_states()]
+    assert math.isnan(streamed[2]["gap"]) and "gap" not in streamed[5]
+
+    gap_diffs = [d.get("gap") for _, d, _ in archive.iter_diffs()]
+    assert gap_diffs[0]["old"] is None and math.isnan(gap_diffs[0]["new"])
+    assert gap_diffs[1] is None  # NaN -> NaN is unchanged
+    assert math.isnan(gap_diffs[2]["old"]) and gap_diffs[2]["new"] == 4.0
+    assert gap_diffs[3] == {"old": 4.0, "new": None}
+
+
+def test_retrodiction_mode_replays_json_files(tmp_path):
+    directory = str(tmp_path / "snapshots")
+    os.makedirs(directory)
+    write_snapshots(directory, 4)
+    config = ReplayerConfig(
+        mode="retrodiction",
+        verbose=False,
+        log_path=str(tmp_path / "logs"),
+        use_archive=True,
+    )
+    replayer = SimulationReplayer(directory, config)
+    replayer.replay_simulation()
+
+    assert [entry["turn"] for entry in replayer.replay_log_entries] == [0, 1, 2, 3]
+    assert not os.path.exists(directory + ".replay")
@@ -0,0 +1,136 @@
+"""
+Tests for the LRU/TTL SymbolicCache, structural keys and the
+cached_symbolic decorator.
+"""
+
+from dataclasses import dataclass, field
+
+import pytest
+
+import symbolic_system.optimization as optimization
+from symbolic_system.optimization import SymbolicCache, cached_symbolic, freeze
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@dataclass
+class State:
+    values: dict = field(default_factory=dict)
+    log: list = field(default_factory=list)
+
+
+def test_lru_eviction_order():
+    cache = SymbolicCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1) and cache.get("c") == (True, 3)
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1 and stats["size"] == 2
+
+
+def test_ttl_expiry_and_default_ttl():
+    clock = FakeClock()
+    cache = SymbolicCache(ttl_seconds=10, clock=clock)
+    cache.set("short", 1, ttl_seconds=1)
+    cache.set("default", 2)
+    unbounded = SymbolicCache(ttl_seconds=None, clock=clock)
+    unbounded.set("forever", 3)
+
+    clock.now = 5
+    assert cache.get("short") == (False, None)
+    assert cache.get("default") == (True, 2)
+    clock.now = 11
+    assert cache.purge_expired() == 1
+    clock.now = 1e9
+    assert unbounded.get("forever") == (True, 3)
+    assert cache.get_stats()["expirations"] == 2
+
+
+def test_byte_budget_evicts_oldest():
+    cache = SymbolicCache(max_size=100, max_bytes=3000)
+    for i in range(10):
+        cache.set(i, "x" * 1000)
+    stats = cache.get_stats()
+    assert 0 < stats["bytes"] <= 3000
+    assert stats["size"] < 10 and cache.get(9)[0]
+    cache.set("huge", "x" * 10_000)
+    assert not cache.get("huge")[0]
+
+    cache.clear()
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_freeze_is_structural():
+    assert freeze({"a": 1, "b": [1, 2]}) == freeze({"b": [1, 2], "a": 1})
+    assert freeze([1, 2]) != freeze((1, 2))
+    assert freeze(["1"]) != freeze([1])
+    assert freeze(State({"x": 1.0}, ["e"])) == freeze(State({"x": 1.0}, ["e"]))
+    assert freeze(State({"x": 1.0})) != freeze(State({"x": 2.0}))
+    assert freeze({1, 2}) == freeze({2, 1})
+    marker = object()
+    assert freeze([marker]) == freeze([marker]) and hash(freeze({"k": [marker]}))
+
+
+def test_decorator_keys_and_per_function_stats(monkeypatch):
+    monkeypatch.setattr(optimization, "ENABLE_SYMBOLIC_SYSTEM", True)
+    monkeypatch.setattr(optimization, "_symbolic_cache", SymbolicCache())
+    calls = []
+
+    @cached_symbolic(ttl_seconds=60)
+    def total(state: State) -> float:
+        calls.append(state)
+        return sum(state.values.values())
+
+    @cached_symbolic(ttl_seconds=60, key=lambda state, scale: scale)
+    def scaled(state: State, scale: float) -> float:
+        calls.append(scale)
+        return scale * 2
+
+    state = State({"a": 1.0, "b": 2.0})
+    assert total(state) == total(State({"b": 2.0, "a": 1.0})) == 3.0
+    state.values["c"] = 4.0  # mutation changes the key
+    assert total(state) == 7.0
+    assert len(calls) == 2
+
+    assert scaled(state, 3) == scaled(State(), 3) == 6
+    assert total.cache_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "expirations": 0,
+    }
+    assert scaled.cache_stats()["hits"] == 1
+
+
+def test_decorator_bypassed_when_disabled(monkeypatch):
+    monkeypatch.setattr(optimization, "ENABLE_SYMBOLIC_SYSTEM", False)
+    calls = []
+
+    @cached_symbolic()
+    def f(x):
+        calls.append(x)
+        return x
+
+    f(1)
+    f(1)
+    assert calls == [1, 1]
+    assert f.cache_stats()["hits"] == 0
+
+
+@pytest.mark.parametrize("size", [10, 1000])
+def test_insert_cost_does_not_grow_with_size(size):
+    cache = SymbolicCache(max_size=size)
+    for i in range(5 * size):
+        cache.set(i, i)
+    assert len(cache.cache) == size
+    assert next(iter(cache.cache)) == 4 * size
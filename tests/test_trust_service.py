@@ -0,0 +1,133 @@
+"""
+Tests for the sharded TrustService.
+"""
+
+import pickle
+import threading
+
+import pytest
+
+from analytics.trust_service import TrustService
+
+
+@pytest.fixture
+def service():
+    return TrustService(num_shards=4, buffer_threshold=10)
+
+
+def test_update_matches_beta_posterior(service):
+    service.update("rule_A", True)
+    service.update("rule_A", True)
+    service.update("rule_A", False, 0.5)
+    assert service.get_stats("rule_A") == (3.0, 1.5)
+    assert service.get_trust("rule_A") == pytest.approx(3.0 / 4.5)
+    assert service.get_sample_size("rule_A") == 2
+    assert service.get_trust("unseen") == 0.5
+
+
+def test_batch_update_accepts_two_and_three_tuples(service):
+    service.batch_update([("a", True), ("a", False, 2.0), ("b", True, 0.5)])
+    assert service.get_stats("a") == (2.0, 3.0)
+    assert service.get_stats("b") == (1.5, 1.0)
+
+
+def test_buffer_aggregates_until_flush(service):
+    service.buffer_update("x", True)
+    service.buffer_update("x", True)
+    service.buffer_update("x", False)
+    assert service.get_stats("x") == (1.0, 1.0)
+    assert service.pending_count() == 3
+    assert service.flush() == 3
+    assert service.get_stats("x") == (3.0, 2.0)
+    assert service.pending_count() == 0
+
+
+def test_buffer_auto_flushes_at_threshold(service):
+    flushed = [service.buffer_update("k", True) for _ in range(10)]
+    assert flushed[-1] is True
+    assert service.get_stats("k") == (11.0, 1.0)
+
+
+def test_concurrent_updates_are_not_lost(service):
+    def worker(prefix):
+        for i in range(500):
+            service.update(f"{prefix}_{i % 5}", True)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in "abcd"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = sum(service.get_stats(k)[0] - 1.0 for k in service.keys())
+    assert total == 2000
+
+
+def test_snapshot_round_trip(service, tmp_path):
+    service.batch_update([("rule_α", True, 2.5), ("var_1", False, 1.0)])
+    service.buffer_update("var_2", True)
+    path = str(tmp_path / "trust.bin")
+
+    assert service.save_snapshot(path) == 3
+
+    restored = TrustService(num_shards=7)
+    assert restored.load_snapshot(path)
+    assert restored.stats == service.stats
+
+
+def test_load_snapshot_rejects_bad_file(service, tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a snapshot")
+    assert service.load_snapshot(str(path)) is False
+    assert service.load_snapshot(str(tmp_path / "missing.bin")) is False
+
+
+def test_json_export_import_round_trip(service, tmp_path):
+    service.update("r", True)
+    path = str(tmp_path / "trust.json")
+    service.export_to_file(path)
+    other = TrustService()
+    assert other.import_from_file(path)
+    assert other.get_stats("r") == (2.0, 1.0)
+    assert len(other.get_history("r")) == 1
+
+
+def test_worker_deltas_merge_into_coordinator():
+    coordinator = TrustService()
+    coordinator.update("shared", True)
+
+    deltas = []
+    for outcome in (True, False):
+        worker = TrustService(track_deltas=True)
+        worker.buffer_updates([("shared", outcome, 1.0), ("local", outcome, 2.0)])
+        # Deltas travel between processes, so they must survive pickling
+        deltas.append(pickle.loads(pickle.dumps(worker.export_deltas())))
+        assert worker.export_deltas() == {}
+
+    for delta in deltas:
+        coordinator.merge_deltas(delta)
+
+    assert coordinator.get_stats("shared") == (3.0, 2.0)
+    assert coordinator.get_stats("local") == (3.0, 3.0)
+
+
+def test_merge_deltas_keeps_worker_update_time(service):
+    service.merge_deltas({"rule": [1.0, 0.0, 1000.0]})
+    assert service._shard("rule").last_update["rule"] == 1000.0
+    assert service.get_history("rule")[0][0] == 1000.0
+    # An older delta never rewinds the last update
+    service.merge_deltas({"rule": [1.0, 0.0, 500.0]})
+    assert service._shard("rule").last_update["rule"] == 1000.0
+    assert service.service_stats["deltas_merged"] == 2
+
+
+def test_export_deltas_requires_tracking(service):
+    with pytest.raises(RuntimeError):
+        service.export_deltas()
+
+
+def test_generate_report_counts_active_entities(service):
+    service.batch_update([("busy", True)] * 10 + [("quiet", False)])
+    report = service.generate_report(min_sample_size=5)
+    assert report["summary"]["total_entities"] == 2
+    assert report["summary"]["active_entities"] == 1
+    assert [entry["key"] for entry in report["high_trust"]] == ["busy"]
@@ -0,0 +1,114 @@
+"""
+Tests for the memory-mapped truth store and RetrodictionLoader backends.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from engine.historical_retrodiction_runner import RetrodictionLoader
+from engine.truth_store import (
+    TruthStore,
+    convert_json_truth,
+    is_fresh,
+    truth_cache_path,
+)
+
+
+def write_truth(path, snapshots):
+    with open(path, "w") as f:
+        json.dump({"snapshots": snapshots}, f)
+    return str(path)
+
+
+NESTED = {
+    str(turn): {
+        "turn": turn,
+        "timestamp": f"2024-01-0{turn + 1}",
+        "variables": {"spx": 100.0 + turn, "vix": 20 - turn, "regime": "calm"},
+    }
+    for turn in range(5)
+}
+del NESTED["3"]["variables"]["vix"]
+
+
+def test_convert_round_trips_nested_snapshots(tmp_path):
+    path = write_truth(tmp_path / "truth.json", NESTED)
+    store = convert_json_truth(path)
+    assert store.path == truth_cache_path(path)
+    assert isinstance(store.data, np.memmap)
+    assert store.variables == ["spx", "vix"]
+    assert len(store) == 5 and 4 in store and 5 not in store
+
+    for turn, snapshot in NESTED.items():
+        assert store.get_snapshot(int(turn)) == snapshot
+    assert store.get_snapshot(1, variables=["vix"])["variables"] == {
+        "vix": 19.0,
+        "regime": "calm",
+    }
+    assert TruthStore.open(store.path) is store
+
+
+def test_slice_by_turn_range_and_variables(tmp_path):
+    snapshots = {str(turn): {"a": float(turn), "b": -turn} for turn in range(0, 20, 2)}
+    store = convert_json_truth(write_truth(tmp_path / "flat.json", snapshots))
+
+    turns, values = store.slice(3, 9, variables=["b"])
+    assert turns.tolist() == [4, 6, 8]
+    assert values[:, 0].tolist() == [-4, -6, -8]
+    turns, values = store.slice(stop_turn=3)
+    assert turns.tolist() == [0, 2] and values.shape == (2, 2)
+    with pytest.raises(KeyError):
+        store.slice(variables=["missing"])
+
+
+def test_loader_backends_agree(tmp_path):
+    path = write_truth(tmp_path / "truth.json", NESTED)
+    json_loader = RetrodictionLoader(path, backend="json")
+    assert isinstance(json_loader.snapshots, dict)
+    assert RetrodictionLoader(path).store is None  # no converted file yet
+
+    array_loader = RetrodictionLoader(path, backend="array")
+    assert array_loader.store is not None and is_fresh(path)
+    assert RetrodictionLoader(path).store is array_loader.store
+    assert RetrodictionLoader(truth_cache_path(path)).store is array_loader.store
+
+    assert dict(array_loader.snapshots) == json_loader.snapshots
+    for turn in [0, 3, 4, 7]:
+        assert array_loader.get_snapshot_by_turn(
+            turn
+        ) == json_loader.get_snapshot_by_turn(turn)
+
+    for loader in (json_loader, array_loader):
+        turns, names, values = loader.get_range(1, 4, variables=["vix", "spx"])
+        assert turns.tolist() == [1, 2, 3] and names == ["vix", "spx"]
+        assert np.isnan(values[2, 0]) and values[:, 1].tolist() == [101, 102, 103]
+
+
+def test_stale_conversion_is_ignored(tmp_path):
+    path = write_truth(tmp_path / "truth.json", {"0": {"x": 1.0}})
+    convert_json_truth(path)
+    write_truth(tmp_path / "truth.json", {"0": {"x": 2.0}})
+    stamp = os.path.getmtime(truth_cache_path(path)) + 10
+    os.utime(path, (stamp, stamp))
+
+    assert not is_fresh(path)
+    assert RetrodictionLoader(path).get_snapshot_by_turn(0) == {"x": 2.0}
+    assert RetrodictionLoader(path, backend="array").get_snapshot_by_turn(0) == {
+        "x": 2.0
+    }
+
+
+def test_matrix_not_matching_sidecar_is_rejected(tmp_path):
+    path = write_truth(tmp_path / "truth.json", {"0": {"x": 1.0}})
+    array_path = convert_json_truth(path).path
+    # A conversion interrupted between the matrix and the sidecar write
+    np.save(array_path, np.zeros((2, 2)))
+
+    assert not is_fresh(path)
+    with pytest.raises(ValueError):
+        TruthStore(array_path)
+    assert RetrodictionLoader(path).get_snapshot_by_turn(0) == {"x": 1.0}
+    assert RetrodictionLoader(path, backend="array").store is not None
@@ -0,0 +1,81 @@
+"""
+Tests for VariableRegistry indexes and coalesced persistence.
+"""
+
+import json
+import time
+
+import pytest
+
+from engine.variable_registry import VARIABLE_REGISTRY, VariableRegistry
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    return str(tmp_path / "configs" / "variable_registry.json")
+
+
+def test_indexes_track_registrations(registry_path):
+    registry = VariableRegistry(path=registry_path, flush_interval=None)
+    assert registry.filter_by_type("economic") == [
+        name for name, meta in VARIABLE_REGISTRY.items() if meta["type"] == "economic"
+    ]
+
+    registry.register_variable(
+        "dyn_a", {"type": "dynamic", "source": "fred", "tags": ["x", "y"]}
+    )
+    registry.register_variable("dyn_b", {"type": "dynamic", "tags": ["x"]})
+    assert registry.filter_by_tag("x") == ["dyn_a", "dyn_b"]
+    assert registry.filter_by_source("fred") == ["dyn_a"]
+    assert registry.get_variable_names("dynamic") == ["dyn_a", "dyn_b"]
+
+    # Re-registering moves the entry between index buckets
+    registry.register_variable("dyn_a", {"type": "market", "tags": ["y"]})
+    assert registry.filter_by_tag("x") == ["dyn_b"]
+    assert registry.filter_by_type("dynamic") == ["dyn_b"]
+    assert "dyn_a" in registry.filter_by_type("market")
+    assert registry.filter_by_source("fred") == []
+
+
+def test_registrations_are_coalesced_into_one_write(registry_path):
+    registry = VariableRegistry(path=registry_path, flush_interval=None)
+    for i in range(2000):
+        registry.register_variable(f"dyn_{i}", {"type": "dynamic"})
+    assert registry.write_count == 0 and registry.dirty
+
+    assert registry.flush()
+    assert registry.write_count == 1 and not registry.dirty
+    assert not registry.flush()
+
+    with open(registry_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert len(saved) == len(VARIABLE_REGISTRY) + 2000
+
+    reloaded = VariableRegistry(path=registry_path, flush_interval=None)
+    assert len(reloaded.filter_by_type("dynamic")) == 2000
+
+
+def test_batch_and_timer_flush(registry_path):
+    registry = VariableRegistry(path=registry_path, flush_interval=0.05)
+    with registry.batch():
+        registry.register_variables(
+            {f"dyn_{i}": {"type": "dynamic"} for i in range(50)}
+        )
+        registry.register_variable("extra", {"type": "dynamic"})
+        time.sleep(0.1)
+        assert registry.write_count == 0
+    assert registry.write_count == 1
+
+    registry.register_variable("late", {"type": "dynamic"})
+    registry.register_variable("later", {"type": "dynamic"})
+    deadline = time.monotonic() + 2.0
+    while registry.write_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert registry.write_count == 2 and not registry.dirty
+
+
+def test_example_forecasts_are_opt_in(registry_path):
+    assert VariableRegistry(path=registry_path).get_forecast_variables() == []
+    demo = VariableRegistry(path=registry_path, example_forecasts=True)
+    assert set(demo.get_forecast_variables()) == set(demo.all())
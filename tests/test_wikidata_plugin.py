@@ -230,7 +230,7 @@ class TestWikidataPlugin(unittest.TestCase):
         query_type = self.plugin._get_query_type_for_domain("unknown_domain")
         self.assertEqual(query_type, "company_info")
 
-    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.wikidata_plugin.save_request_metadata"
     )
@@ -269,7 +269,7 @@ class TestWikidataPlugin(unittest.TestCase):
         self.assertEqual(result["industryLabel"], "software industry")
         self.assertEqual(result["ceoLabel"], "Satya Nadella")
 
-    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.wikidata_plugin.save_request_metadata"
     )
@@ -344,7 +344,7 @@ class TestWikidataPlugin(unittest.TestCase):
         # Check that processed data was saved
         self.assertEqual(mock_save_processed.call_count, len(signals))
 
-    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.wikidata_plugin.save_request_metadata"
     )
@@ -404,7 +404,7 @@ class TestWikidataPlugin(unittest.TestCase):
         self.assertIsNotNone(unemployment_signal)
         self.assertEqual(unemployment_signal["value"], 3.8)
 
-    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.requests.get")
+    @patch("ingestion.iris_plugins_variable_ingestion.wikidata_plugin.http_get")
     @patch(
         "ingestion.iris_plugins_variable_ingestion.wikidata_plugin.save_request_metadata"
     )
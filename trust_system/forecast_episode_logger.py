@@ -17,8 +17,10 @@ import os
 import json
 from datetime import datetime, timezone
 from typing import List, Dict, Any
-import matplotlib.pyplot as plt
 from collections import Counter
+from utils.lazy_import import lazy_import
+
+plt = lazy_import("matplotlib.pyplot")
 
 EPISODE_LOG_PATH = "logs/forecast_episodes.jsonl"
 
@@ -28,6 +28,8 @@ def run_retrodiction_simulation(
     retrodiction_loader: Optional[object] = None,
     logger_fn: Optional[Callable[[str], None]] = None,
     injection_mode: str = "seed_then_free",
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Runs retrodiction simulation using the unified simulate_forward function in retrodiction mode.
@@ -38,19 +40,35 @@ def run_retrodiction_simulation(
         retrodiction_loader (Optional[object]): Loader providing ground truth snapshots for retrodiction.
         logger_fn (Optional[Callable]): Optional logger function.
         injection_mode (str): Injection mode for retrodiction variables ("seed_then_free" or "strict_injection").
+        checkpoint_dir (Optional[str]): Directory for binary checkpoints of the run.
+        resume (bool): Continue from the latest checkpoint in checkpoint_dir,
+            restoring state, trust and gravity fabric, instead of initial_state.
 
     Returns:
-        List[Dict[str, Any]]: List of simulation results per turn with trust metadata.
+        List[Dict[str, Any]]: List of simulation results per turn with trust metadata
+        (only the turns run by this call when resuming).
     """
     from engine.simulator_core import simulate_forward
 
+    start_turn = 0
+    if resume and checkpoint_dir:
+        from engine.simulation_checkpoint import resume_checkpoint
+
+        resumed = resume_checkpoint(checkpoint_dir)
+        if resumed is not None:
+            initial_state, start_turn = resumed
+            if start_turn >= turns:
+                return []
+
     results = simulate_forward(
         state=initial_state,
         turns=turns,
         retrodiction_mode=True,
         retrodiction_loader=retrodiction_loader,
-        logger=logger_fn,
+        module_logger=logger_fn,
         injection_mode=injection_mode,
+        checkpoint_path=checkpoint_dir,
+        start_turn=start_turn,
     )
     return results
 
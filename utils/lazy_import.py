@@ -0,0 +1,94 @@
+"""
+Lazy imports for heavy optional dependencies.
+
+Modules such as matplotlib, torch, sklearn, networkx and faiss cost hundreds
+of milliseconds to import. ``lazy_import`` returns a module proxy that
+performs the real import on first attribute access, so code keeps its usual
+``plt.plot(...)`` / ``nx.DiGraph()`` style while importing the module that
+holds it stays cheap:
+
+    plt = lazy_import("matplotlib.pyplot")
+    nx = lazy_import("networkx")
+
+``is_available`` checks for an optional dependency without importing it.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Optional
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_hint"] = install_hint
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    try:
+                        module = importlib.import_module(self.__name__)
+                    except ImportError as e:
+                        hint = self.__dict__["_lazy_hint"]
+                        if hint:
+                            raise ImportError(
+                                f"{self.__name__} is required for this feature ({hint})"
+                            ) from e
+                        raise
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> types.ModuleType:
+    """
+    Return a module that is imported on first use.
+
+    Args:
+        name: Fully qualified module name, e.g. "matplotlib.pyplot".
+        install_hint: Added to the ImportError raised on first use when the
+            module is missing, e.g. "pip install torch".
+
+    Returns:
+        The module itself if it is already imported, otherwise a LazyModule.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, install_hint)
+
+
+def is_available(name: str) -> bool:
+    """Return True if a module can be imported, without importing it."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """Return True if a module (or LazyModule proxy) has actually been imported."""
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_module"] is not None
+    return True
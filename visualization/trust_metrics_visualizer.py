@@ -9,7 +9,7 @@ Author: Pulse v0.32
 import matplotlib.pyplot as plt
 from typing import Dict, Any, Optional
 import os
-from analytics.bayesian_trust_tracker import bayesian_trust_tracker
+from analytics.trust_service import trust_service
 from analytics.pulse_learning_log import generate_trust_report
 
 
@@ -24,7 +24,7 @@ def plot_trust_evolution(
         kind: 'variable' or 'rule'
         save_path: Optional path to save the figure
     """
-    timestamps = bayesian_trust_tracker.timestamps.get(key, [])
+    timestamps = trust_service.get_history(key)
     if not timestamps:
         print(f"No timestamp data available for {kind} {key}")
         return
@@ -40,12 +40,10 @@ def plot_trust_evolution(
 
     # Add confidence intervals if we have at least 5 data points
     if len(times) >= 5:
-        ci_low, ci_high = bayesian_trust_tracker.get_confidence_interval(key)
+        ci_low, ci_high = trust_service.get_confidence_interval(key)
         plt.axhline(y=ci_low, color="r", linestyle="--", alpha=0.5)
         plt.axhline(y=ci_high, color="r", linestyle="--", alpha=0.5)
-        plt.axhline(
-            y=bayesian_trust_tracker.get_trust(key), color="g", linestyle="-", alpha=0.5
-        )
+        plt.axhline(y=trust_service.get_trust(key), color="g", linestyle="-", alpha=0.5)
 
     plt.title(f"Trust Evolution for {kind.capitalize()} {key}")
     plt.xlabel("Time (hours)")
@@ -491,7 +489,7 @@ if __name__ == "__main__":
         rule_id = f"R{i + 1:03d}"
         for j in range(random.randint(5, 20)):
             success = random.random() > 0.3
-            bayesian_trust_tracker.update(rule_id, success)
+            trust_service.update(rule_id, success)
 
     # Generate dashboard
     generate_trust_dashboard()